@@ -18,6 +18,10 @@ from app.models.work_experience import WorkExperience  # noqa
 from app.models.education import Education  # noqa
 from app.models.skill import Skill  # noqa
 from app.models.project import Project  # noqa
+from app.models.share_link import ShareLink  # noqa
+from app.models.job import Job  # noqa
+from app.models.translation_segment import TranslationSegment  # noqa
+from app.models.translated_cv import TranslatedCV  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,26 @@
+"""add profile picture variants to user
+
+Revision ID: 3d8e4f1a2b6c
+Revises: 6275f7ac4957
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3d8e4f1a2b6c"
+down_revision = "6275f7ac4957"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "user", sa.Column("profile_picture_variants", sa.JSON(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("user", "profile_picture_variants")
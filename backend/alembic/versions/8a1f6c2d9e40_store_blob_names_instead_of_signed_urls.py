@@ -0,0 +1,110 @@
+"""store blob names instead of signed urls
+
+Revision ID: 8a1f6c2d9e40
+Revises: 3d8e4f1a2b6c
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from urllib.parse import unquote, urlparse
+from uuid import uuid4
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8a1f6c2d9e40"
+down_revision = "3d8e4f1a2b6c"
+branch_labels = None
+depends_on = None
+
+
+def _blob_name(url, prefix):
+    """Recover the blob name from a previously stored signed URL."""
+    if not url:
+        return None
+    path = unquote(urlparse(url).path)
+    index = path.find(prefix)
+    return path[index:] if index >= 0 else None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # User: profile_picture_url -> profile_picture_blob,
+    # profile_picture_variants (urls) -> profile_picture_variant_blobs
+    op.add_column("user", sa.Column("profile_picture_blob", sa.String(), nullable=True))
+    op.add_column(
+        "user",
+        sa.Column("profile_picture_variant_blobs", sa.JSON(), nullable=True),
+    )
+    user = sa.table(
+        "user",
+        sa.column("id", sa.Integer()),
+        sa.column("profile_picture_url", sa.String()),
+        sa.column("profile_picture_variants", sa.JSON()),
+        sa.column("profile_picture_blob", sa.String()),
+        sa.column("profile_picture_variant_blobs", sa.JSON()),
+    )
+    rows = bind.execute(
+        sa.select(
+            user.c.id, user.c.profile_picture_url, user.c.profile_picture_variants
+        ).where(user.c.profile_picture_url.isnot(None))
+    ).fetchall()
+    for row in rows:
+        variants = {
+            size: _blob_name(url, "profile_pictures/")
+            for size, url in (row.profile_picture_variants or {}).items()
+        }
+        bind.execute(
+            user.update()
+            .where(user.c.id == row.id)
+            .values(
+                profile_picture_blob=_blob_name(
+                    row.profile_picture_url, "profile_pictures/"
+                ),
+                profile_picture_variant_blobs={
+                    size: name for size, name in variants.items() if name
+                }
+                or None,
+            )
+        )
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.drop_column("profile_picture_variants")
+        batch_op.drop_column("profile_picture_url")
+
+    # ShareLink: keep the URL handed out, add blob name and public id
+    op.add_column("sharelink", sa.Column("public_id", sa.String(32), nullable=True))
+    op.add_column("sharelink", sa.Column("blob_name", sa.Text(), nullable=True))
+    sharelink = sa.table(
+        "sharelink",
+        sa.column("id", sa.Integer()),
+        sa.column("url", sa.Text()),
+        sa.column("public_id", sa.String()),
+        sa.column("blob_name", sa.Text()),
+    )
+    for row in bind.execute(sa.select(sharelink.c.id, sharelink.c.url)).fetchall():
+        bind.execute(
+            sharelink.update()
+            .where(sharelink.c.id == row.id)
+            .values(public_id=uuid4().hex, blob_name=_blob_name(row.url, "cvs/"))
+        )
+    op.create_index(
+        op.f("ix_sharelink_public_id"), "sharelink", ["public_id"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_sharelink_public_id"), table_name="sharelink")
+    with op.batch_alter_table("sharelink") as batch_op:
+        batch_op.drop_column("blob_name")
+        batch_op.drop_column("public_id")
+
+    # Signed URLs cannot be recreated offline; users re-upload their pictures.
+    op.add_column(
+        "user", sa.Column("profile_picture_variants", sa.JSON(), nullable=True)
+    )
+    op.add_column("user", sa.Column("profile_picture_url", sa.String(), nullable=True))
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.drop_column("profile_picture_variant_blobs")
+        batch_op.drop_column("profile_picture_blob")
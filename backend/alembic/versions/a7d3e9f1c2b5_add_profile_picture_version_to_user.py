@@ -0,0 +1,26 @@
+"""add profile picture version to user
+
+Revision ID: a7d3e9f1c2b5
+Revises: f3c7b2e8a9d4
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a7d3e9f1c2b5"
+down_revision = "f3c7b2e8a9d4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "user",
+        sa.Column("profile_picture_version", sa.String(length=16), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("user", "profile_picture_version")
@@ -0,0 +1,34 @@
+"""add sharelink active lookup index
+
+Revision ID: c4b7e2a91f35
+Revises: 8a1f6c2d9e40
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c4b7e2a91f35"
+down_revision = "8a1f6c2d9e40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Covers (cv_id, user_id, expires_at DESC) lookups and stores url in the
+    # index on PostgreSQL; the leading cv_id makes ix_sharelink_cv_id redundant.
+    op.create_index(
+        "ix_sharelink_cv_user_expires",
+        "sharelink",
+        ["cv_id", "user_id", sa.text("expires_at DESC")],
+        unique=False,
+        postgresql_include=["url"],
+    )
+    op.drop_index(op.f("ix_sharelink_cv_id"), table_name="sharelink")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_sharelink_cv_id"), "sharelink", ["cv_id"], unique=False)
+    op.drop_index("ix_sharelink_cv_user_expires", table_name="sharelink")
@@ -0,0 +1,43 @@
+"""add translationsegment table
+
+Revision ID: e5a1c9d3f2b8
+Revises: d2e6a8b4c1f7
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e5a1c9d3f2b8"
+down_revision = "d2e6a8b4c1f7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "translationsegment",
+        sa.Column("source_language", sa.String(length=10), nullable=False),
+        sa.Column("target_language", sa.String(length=10), nullable=False),
+        sa.Column("text_hash", sa.String(length=64), nullable=False),
+        sa.Column("translated_text", sa.Text(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "source_language",
+            "target_language",
+            "text_hash",
+            name="uq_translationsegment_lookup",
+        ),
+    )
+    op.create_index(
+        op.f("ix_translationsegment_id"), "translationsegment", ["id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_translationsegment_id"), table_name="translationsegment")
+    op.drop_table("translationsegment")
@@ -0,0 +1,42 @@
+"""add translatedcv table
+
+Revision ID: f3c7b2e8a9d4
+Revises: e5a1c9d3f2b8
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f3c7b2e8a9d4"
+down_revision = "e5a1c9d3f2b8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "translatedcv",
+        sa.Column("cv_id", sa.Integer(), nullable=False),
+        sa.Column("language", sa.String(length=10), nullable=False),
+        sa.Column("source_language", sa.String(length=10), nullable=False),
+        sa.Column("content", sa.JSON(), nullable=False),
+        sa.Column("segments", sa.JSON(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["cv_id"], ["cv.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("cv_id", "language", name="uq_translatedcv_cv_language"),
+    )
+    op.create_index(op.f("ix_translatedcv_id"), "translatedcv", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_translatedcv_cv_id"), "translatedcv", ["cv_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_translatedcv_cv_id"), table_name="translatedcv")
+    op.drop_index(op.f("ix_translatedcv_id"), table_name="translatedcv")
+    op.drop_table("translatedcv")
@@ -2,14 +2,18 @@ from fastapi import APIRouter
 
 from app.api.v1.endpoints import (
     ai,
+    assets,
     auth,
+    cv_translations,
     cvs,
     dashboard,
     educations,
     exports,
     health,
+    jobs,
     projects,
     skills,
+    storage,
     translation,
     work_experiences,
 )
@@ -40,5 +44,17 @@ api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboar
 # Export/share endpoints
 api_router.include_router(exports.router)
 
+# Long-lived asset URLs (redirect to cached signed storage URLs)
+api_router.include_router(assets.router)
+
+# Signed downloads for the local storage backend
+api_router.include_router(storage.router)
+
 # Translation endpoints
 api_router.include_router(translation.router)
+
+# Stored CV translations, updated incrementally
+api_router.include_router(cv_translations.router)
+
+# Background job status and results
+api_router.include_router(jobs.router)
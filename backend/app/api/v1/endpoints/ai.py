@@ -1,29 +1,319 @@
 """AI optimization endpoints."""
 
+import json
+from datetime import date
+from typing import AsyncIterator, List
+
+import anyio
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user, get_db
+from app.core.deps import (
+    AIRateLimit,
+    get_current_active_superuser,
+    get_current_user,
+    get_db,
+)
+from app.core.monitoring import label_llm_endpoint, llm_metrics, monitoring
+from app.core.rate_limit import get_ai_rate_limiter
 from app.models.cv import CV
+from app.models.job import Job
 from app.models.user import User
 from app.schemas.ai import (
+    AICacheStatsResponse,
+    AIQuotaResponse,
     GenerateSummaryRequest,
     GenerateSummaryResponse,
     GenerateSummaryPreviewRequest,
+    LLMMetricsResponse,
+    OptimizeAllItemResult,
+    OptimizeAllRequest,
+    OptimizeAllResponse,
     OptimizeDescriptionRequest,
     OptimizeDescriptionResponse,
     ScoreCVRequest,
     ScoreCVResponse,
+    SectionScoreResult,
+)
+from app.services.ai_batch import (
+    BatchItem,
+    BatchItemResult,
+    get_batch_limiter,
+    optimize_items,
 )
-from app.services.ai_service import get_ai_service
+from app.schemas.cv import CVWithRelations
+from app.schemas.job import JobResponse
+from app.services.ai_service import CompletionRequest, get_ai_service
+from app.services.cv_scoring import score_cv_locally
+from app.services.job_queue import PermanentJobError, enqueue_job, job_handler
+from app.services.section_scoring import (
+    cv_sections,
+    score_cv_by_section,
+    uncached_sections,
+)
+
+# LLM calls made while serving these routes are reported per route
+router = APIRouter(dependencies=[Depends(label_llm_endpoint)])
+
+# Estimated LLM tokens per call (prompt scaffolding + completion budget),
+# charged against the caller's quota before the request is processed
+_optimize_limit = [Depends(AIRateLimit(estimated_tokens=900))]
+_summary_limit = [Depends(AIRateLimit(estimated_tokens=900))]
+# mode=fast makes no LLM call; mode=sections is charged per section below
+_score_limit = [
+    Depends(
+        AIRateLimit(
+            estimated_tokens=2500,
+            exempt=lambda body: body.get("mode") in ("fast", "sections"),
+        )
+    )
+]
+_section_score_rate = AIRateLimit(estimated_tokens=700)
+# One description is charged up front, the others once the CV is loaded
+_optimize_all_rate = AIRateLimit(estimated_tokens=900)
+_optimize_all_limit = [Depends(_optimize_all_rate)]
+
+
+def _release_connection(db: Session) -> None:
+    """
+    Return the request's pooled DB connection before awaiting the LLM.
+
+    Loaded attributes stay readable; the session reconnects if used again.
+    Without this every in-flight LLM call would pin one pooled connection.
+    """
+    db.close()
+
+
+def _get_owned_cv(db: Session, cv_id: int, user_id: int) -> CV:
+    """Fetch a CV owned by the user or raise 404."""
+    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == user_id).first()
+
+    if not cv:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="CV not found",
+        )
+    return cv
+
+
+def _iso(value: date | None) -> str | None:
+    """ISO date for ordering prompt entries by recency."""
+    return value.isoformat() if value else None
+
+
+def _summary_cv_data(cv: CV) -> dict:
+    """CV data used to generate a professional summary."""
+    return {
+        "work_experiences": [
+            {
+                "position": exp.position,
+                "company": exp.company,
+                "description": exp.description,
+                "start_date": _iso(exp.start_date),
+            }
+            for exp in cv.work_experiences
+        ],
+        "educations": [
+            {
+                "degree": edu.degree,
+                "institution": edu.institution,
+                "field_of_study": edu.field_of_study,
+                "start_date": _iso(edu.start_date),
+            }
+            for edu in cv.educations
+        ],
+        "skills": [{"name": skill.name} for skill in cv.skills],
+    }
+
+
+def _score_cv_data(cv: CV) -> dict:
+    """CV data used to score a CV."""
+    return {
+        "general": {
+            "title": cv.title,
+            "summary": cv.summary,
+            "has_phone": True if cv.phone else False,
+            "has_location": True if cv.location else False,
+            "has_email": True if cv.email else False,
+        },
+        "work_experiences": [
+            {
+                "position": exp.position,
+                "company": exp.company,
+                "description": exp.description,
+                "has_dates": True if exp.start_date else False,
+                "has_location": True if exp.location else False,
+                "start_date": _iso(exp.start_date),
+            }
+            for exp in cv.work_experiences
+        ],
+        "educations": [
+            {
+                "degree": edu.degree,
+                "institution": edu.institution,
+                "field_of_study": edu.field_of_study,
+                "has_dates": True if edu.start_date else False,
+                "start_date": _iso(edu.start_date),
+            }
+            for edu in cv.educations
+        ],
+        "skills": [{"name": skill.name} for skill in cv.skills],
+        "projects": [
+            {
+                "name": project.name,
+                "description": project.description,
+                "technologies": project.technologies,
+                "has_url": True if (project.url or project.github_url) else False,
+                "start_date": _iso(project.start_date),
+            }
+            for project in cv.projects
+        ],
+    }
+
+
+def _duration(start: date | None, end: date | None) -> str | None:
+    """Tenure phrased like the editor does, e.g. "3.5 years"."""
+    if start is None:
+        return None
+    years = round(((end or date.today()) - start).days / 365, 1)
+    return f"{years:g} years" if years > 0 else "Less than 1 year"
+
+
+def _optimize_all_items(cv: CV, sections: List[str]) -> List[BatchItem]:
+    """Entries with a description to optimize, in section and display order."""
+
+    def ordered(entries):
+        return sorted(entries, key=lambda entry: (entry.display_order, entry.id))
 
-router = APIRouter()
+    items: List[BatchItem] = []
+    if "work_experience" in sections:
+        items.extend(
+            BatchItem(
+                section="work_experience",
+                item_id=exp.id,
+                field_type="work_experience",
+                original_text=exp.description,
+                context={
+                    "position": exp.position,
+                    "company": exp.company,
+                    "duration": _duration(exp.start_date, exp.end_date),
+                },
+            )
+            for exp in ordered(cv.work_experiences)
+            if exp.description and exp.description.strip()
+        )
+    if "project" in sections:
+        items.extend(
+            BatchItem(
+                section="project",
+                item_id=project.id,
+                field_type="project",
+                original_text=project.description,
+                context={
+                    "position": project.role,
+                    "duration": _duration(project.start_date, project.end_date),
+                },
+            )
+            for project in ordered(cv.projects)
+            if project.description and project.description.strip()
+        )
+    if "education" in sections:
+        items.extend(
+            BatchItem(
+                section="education",
+                item_id=edu.id,
+                field_type="education",
+                original_text=edu.description,
+                context={
+                    "position": edu.degree,
+                    "company": edu.institution,
+                    "duration": _duration(edu.start_date, edu.end_date),
+                },
+            )
+            for edu in ordered(cv.educations)
+            if edu.description and edu.description.strip()
+        )
+    return items
+
+
+def _item_result(result: BatchItemResult) -> OptimizeAllItemResult:
+    return OptimizeAllItemResult(
+        section=result.item.section,
+        item_id=result.item.item_id,
+        original=result.item.original_text,
+        optimized=result.optimized,
+        error=result.error,
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 
-@router.post("/optimize-description", response_model=OptimizeDescriptionResponse)
-def optimize_description(
+async def _stream_completion(
+    request: CompletionRequest, regenerate: bool
+) -> StreamingResponse:
+    """
+    Stream a completion to the client as Server-Sent Events.
+
+    The first delta is awaited before the response starts so that an
+    unreachable or unconfigured AI service still yields a proper 503. The
+    stream then emits ``token`` events and a final ``done`` event with the
+    full text, or an ``error`` event if generation fails midway. When the
+    client disconnects the generator is cancelled, which closes the upstream
+    Groq stream.
+    """
+    chunks = get_ai_service().stream(request, regenerate=regenerate)
+    try:
+        first = await anext(chunks)
+    except StopAsyncIteration:
+        first = ""
+    except ConnectionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"{request.error_message}: {str(e)}",
+        )
+
+    async def events() -> AsyncIterator[str]:
+        parts = [first]
+        try:
+            if first:
+                yield _sse("token", {"text": first})
+            async for chunk in chunks:
+                parts.append(chunk)
+                yield _sse("token", {"text": chunk})
+        except Exception as e:
+            yield _sse("error", {"detail": f"{request.error_message}: {str(e)}"})
+            return
+        finally:
+            with anyio.CancelScope(shield=True):
+                await chunks.aclose()
+        yield _sse("done", {"text": "".join(parts).strip()})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/optimize-description",
+    response_model=OptimizeDescriptionResponse,
+    dependencies=_optimize_limit,
+)
+async def optimize_description(
     request: OptimizeDescriptionRequest,
     current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ) -> OptimizeDescriptionResponse:
     """
     Optimize a CV field description using AI.
@@ -32,12 +322,14 @@ def optimize_description(
     - **field_type**: Type of field (work_experience, education, project, summary)
     - **context**: Additional context (position, company, duration, etc.)
     """
+    _release_connection(db)
     try:
         ai_service = get_ai_service()
-        optimized = ai_service.optimize_description(
+        optimized = await ai_service.optimize_description(
             original_text=request.original_text,
             field_type=request.field_type,
             context=request.context,
+            regenerate=request.regenerate,
         )
 
         return OptimizeDescriptionResponse(
@@ -60,8 +352,12 @@ def optimize_description(
         )
 
 
-@router.post("/generate-summary", response_model=GenerateSummaryResponse)
-def generate_summary(
+@router.post(
+    "/generate-summary",
+    response_model=GenerateSummaryResponse,
+    dependencies=_summary_limit,
+)
+async def generate_summary(
     request: GenerateSummaryRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -72,44 +368,16 @@ def generate_summary(
     - **cv_id**: ID of the CV to generate summary for
     - **tone**: Tone of summary (professional, casual, formal)
     """
-    # Fetch CV with all relations
-    cv = (
-        db.query(CV)
-        .filter(CV.id == request.cv_id, CV.user_id == current_user.id)
-        .first()
-    )
-
-    if not cv:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="CV not found",
-        )
-
-    # Build CV data dict
-    cv_data = {
-        "work_experiences": [
-            {
-                "position": exp.position,
-                "company": exp.company,
-                "description": exp.description,
-            }
-            for exp in cv.work_experiences
-        ],
-        "educations": [
-            {
-                "degree": edu.degree,
-                "institution": edu.institution,
-                "field_of_study": edu.field_of_study,
-            }
-            for edu in cv.educations
-        ],
-        "skills": [{"name": skill.name} for skill in cv.skills],
-    }
+    cv = _get_owned_cv(db, request.cv_id, current_user.id)
+    cv_data = _summary_cv_data(cv)
+    _release_connection(db)
 
     try:
         ai_service = get_ai_service()
-        summary = ai_service.generate_summary(
-            cv_data=cv_data, tone=request.tone or "professional"
+        summary = await ai_service.generate_summary(
+            cv_data=cv_data,
+            tone=request.tone or "professional",
+            regenerate=request.regenerate,
         )
 
         return GenerateSummaryResponse(summary=summary)
@@ -130,19 +398,27 @@ def generate_summary(
         )
 
 
-@router.post("/generate-summary-preview", response_model=GenerateSummaryResponse)
-def generate_summary_preview(
+@router.post(
+    "/generate-summary-preview",
+    response_model=GenerateSummaryResponse,
+    dependencies=_summary_limit,
+)
+async def generate_summary_preview(
     request: GenerateSummaryPreviewRequest,
     current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ) -> GenerateSummaryResponse:
     """
     Generate a professional summary based on provided CV data (no DB lookup).
     """
+    _release_connection(db)
     cv_data = request.cv_data or {}
     try:
         ai_service = get_ai_service()
-        summary = ai_service.generate_summary(
-            cv_data=cv_data, tone=request.tone or "professional"
+        summary = await ai_service.generate_summary(
+            cv_data=cv_data,
+            tone=request.tone or "professional",
+            regenerate=request.regenerate,
         )
         return GenerateSummaryResponse(summary=summary)
     except ConnectionError as e:
@@ -162,8 +438,69 @@ def generate_summary_preview(
         )
 
 
-@router.post("/score-cv", response_model=ScoreCVResponse)
-def score_cv(
+def _score_input(cv: CV, mode: str) -> CVWithRelations | dict:
+    """CV content a score is computed from, read before the DB is released."""
+    if mode == "deep":
+        return _score_cv_data(cv)
+    return CVWithRelations.model_validate(cv)
+
+
+def _section_calls(content: CVWithRelations | dict, mode: str, regenerate: bool) -> int:
+    """LLM calls a score will make per section (0 unless mode=sections)."""
+    if mode != "sections":
+        return 0
+    try:
+        ai_service = get_ai_service()
+    except ValueError:
+        # Reported when scoring; nothing reaches the LLM
+        return 0
+    return uncached_sections(ai_service, cv_sections(content), regenerate)
+
+
+async def _score(
+    content: CVWithRelations | dict, mode: str, user_id: int, regenerate: bool
+) -> ScoreCVResponse:
+    """
+    Score CV content returned by ``_score_input``.
+
+    Raises ValueError if the AI service is not configured and ConnectionError
+    if it cannot be reached.
+    """
+    if mode == "fast":
+        result = score_cv_locally(content)
+        return ScoreCVResponse(raw=json.dumps(result), mode="fast", **result)
+    ai_service = get_ai_service()
+    if mode == "sections":
+        result, section_scores = await score_cv_by_section(
+            ai_service,
+            content,
+            user_id=user_id,
+            limiter=get_batch_limiter(),
+            regenerate=regenerate,
+        )
+        return ScoreCVResponse(
+            raw=json.dumps(result),
+            mode="sections",
+            sections=[
+                SectionScoreResult(
+                    key=score.section.key,
+                    label=score.section.label,
+                    scorer=score.scorer,
+                    cached=score.cached,
+                    fallback_reason=score.fallback_reason,
+                    metrics=score.metrics,
+                )
+                for score in section_scores
+            ],
+            local_sections=sum(score.scorer == "local" for score in section_scores),
+            **result,
+        )
+    score = await ai_service.score_cv(cv_data=content, regenerate=regenerate)
+    return ScoreCVResponse(raw=score)
+
+
+@router.post("/score-cv", response_model=ScoreCVResponse, dependencies=_score_limit)
+async def score_cv(
     request: ScoreCVRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -172,64 +509,21 @@ def score_cv(
     Score a CV and provide feedback/assessment.
 
     - **cv_id**: ID of the CV to evaluate
+    - **mode**: ``fast`` scores locally in milliseconds (not rate limited);
+      ``sections`` scores each section separately and only re-scores
+      sections changed since the last run; ``deep`` (default) asks the LLM
+      for a review of the whole CV
     """
 
-    cv = (
-        db.query(CV)
-        .filter(CV.id == request.cv_id, CV.user_id == current_user.id)
-        .first()
+    cv = _get_owned_cv(db, request.cv_id, current_user.id)
+    content = _score_input(cv, request.mode)
+    _release_connection(db)
+    await _section_score_rate.acharge(
+        current_user.id, _section_calls(content, request.mode, request.regenerate)
     )
 
-    if not cv:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="CV not found",
-        )
-
-    # Build CV data dict
-    cv_data = {
-        "general": {
-            "title": cv.title,
-            "summary": cv.summary,
-            "has_phone": True if cv.phone else False,
-            "has_location": True if cv.location else False,
-            "has_email": True if cv.email else False,
-        },
-        "work_experiences": [
-            {
-                "position": exp.position,
-                "company": exp.company,
-                "description": exp.description,
-                "has_dates": True if exp.start_date else False,
-                "has_location": True if exp.location else False,
-            }
-            for exp in cv.work_experiences
-        ],
-        "educations": [
-            {
-                "degree": edu.degree,
-                "institution": edu.institution,
-                "field_of_study": edu.field_of_study,
-                "has_dates": True if edu.start_date else False,
-            }
-            for edu in cv.educations
-        ],
-        "skills": [{"name": skill.name} for skill in cv.skills],
-        "projects": [
-            {
-                "name": project.name,
-                "description": project.description,
-                "technologies": project.technologies,
-                "has_url": True if (project.url or project.github_url) else False,
-            }
-            for project in cv.projects
-        ],
-    }
-
     try:
-        ai_service = get_ai_service()
-        score = ai_service.score_cv(cv_data=cv_data)
-        return ScoreCVResponse(raw=score)
+        return await _score(content, request.mode, current_user.id, request.regenerate)
     except ConnectionError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -245,3 +539,251 @@ def score_cv(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to score CV: {str(e)}",
         )
+
+
+@job_handler("score_cv")
+async def _score_cv_job(payload: dict, user_id: int) -> dict:
+    mode = payload["mode"]
+    content = payload["cv"]
+    if mode != "deep":
+        content = CVWithRelations.model_validate(content)
+    try:
+        response = await _score(content, mode, user_id, payload["regenerate"])
+    except ValueError as e:
+        raise PermanentJobError(f"AI service not configured: {str(e)}") from e
+    return response.model_dump(mode="json")
+
+
+@router.post(
+    "/score-cv/jobs",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=_score_limit,
+)
+def start_score_cv_job(
+    request: ScoreCVRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Job:
+    """
+    Queue a CV score and return the job at once.
+
+    Takes the same body as ``/score-cv``. The CV is scored as it is now by a
+    background worker; poll ``GET /jobs/{id}`` for the ``ScoreCVResponse``.
+    """
+    cv = _get_owned_cv(db, request.cv_id, current_user.id)
+    content = _score_input(cv, request.mode)
+    _section_score_rate.charge(
+        current_user.id, _section_calls(content, request.mode, request.regenerate)
+    )
+    return enqueue_job(
+        db,
+        user_id=current_user.id,
+        kind="score_cv",
+        payload={
+            "mode": request.mode,
+            "regenerate": request.regenerate,
+            "cv": jsonable_encoder(content),
+        },
+    )
+
+
+@router.post("/optimize-description/stream", dependencies=_optimize_limit)
+async def optimize_description_stream(
+    request: OptimizeDescriptionRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Stream an optimized CV field description as Server-Sent Events.
+
+    Emits ``token`` events (``{"text": delta}``) followed by ``done``
+    (``{"text": full_text}``) or ``error`` (``{"detail": message}``).
+    """
+    _release_connection(db)
+    try:
+        completion = get_ai_service().build_optimize_request(
+            original_text=request.original_text,
+            field_type=request.field_type,
+            context=request.context,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"AI service not configured: {str(e)}",
+        )
+    return await _stream_completion(completion, regenerate=request.regenerate)
+
+
+@router.post("/generate-summary/stream", dependencies=_summary_limit)
+async def generate_summary_stream(
+    request: GenerateSummaryRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Stream a professional summary for a CV as Server-Sent Events."""
+    cv = _get_owned_cv(db, request.cv_id, current_user.id)
+    cv_data = _summary_cv_data(cv)
+    _release_connection(db)
+    try:
+        completion = get_ai_service().build_summary_request(
+            cv_data=cv_data, tone=request.tone or "professional"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"AI service not configured: {str(e)}",
+        )
+    return await _stream_completion(completion, regenerate=request.regenerate)
+
+
+@router.post("/score-cv/stream", dependencies=_score_limit)
+async def score_cv_stream(
+    request: ScoreCVRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream a CV score/assessment as Server-Sent Events (deep mode only)."""
+    if request.mode != "deep":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{request.mode.capitalize()} scoring is not streamed; "
+            "use POST /ai/score-cv",
+        )
+    cv = _get_owned_cv(db, request.cv_id, current_user.id)
+    cv_data = _score_cv_data(cv)
+    _release_connection(db)
+    try:
+        completion = get_ai_service().build_score_request(cv_data=cv_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"AI service not configured: {str(e)}",
+        )
+    return await _stream_completion(completion, regenerate=request.regenerate)
+
+
+@router.post(
+    "/cvs/{cv_id}/optimize-all",
+    response_model=OptimizeAllResponse,
+    dependencies=_optimize_all_limit,
+)
+async def optimize_all_descriptions(
+    cv_id: int,
+    request: OptimizeAllRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Optimize every work experience, project and education description of a CV.
+
+    The CV is loaded once and the entries are optimized concurrently, bounded
+    per user and process-wide. An entry that fails carries an ``error``
+    instead of failing the whole batch. With ``stream`` set, each result is
+    sent as an ``item`` event as soon as it is ready, followed by ``done``
+    (``{"succeeded": n, "failed": n}``).
+
+    - **sections**: Sections to optimize (default: all three)
+    - **regenerate**: Bypass cached responses
+    """
+    cv = _get_owned_cv(db, cv_id, current_user.id)
+    items = _optimize_all_items(cv, request.sections)
+    _release_connection(db)
+    await _optimize_all_rate.acharge(current_user.id, len(items) - 1)
+
+    try:
+        ai_service = get_ai_service()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"AI service not configured: {str(e)}",
+        )
+    results = optimize_items(
+        ai_service,
+        items,
+        user_id=current_user.id,
+        limiter=get_batch_limiter(),
+        regenerate=request.regenerate,
+    )
+
+    if request.stream:
+
+        async def events() -> AsyncIterator[str]:
+            succeeded = failed = 0
+            try:
+                async for result in results:
+                    if result.error is None:
+                        succeeded += 1
+                    else:
+                        failed += 1
+                    yield _sse("item", _item_result(result).model_dump())
+            finally:
+                with anyio.CancelScope(shield=True):
+                    await results.aclose()
+            yield _sse("done", {"succeeded": succeeded, "failed": failed})
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    by_item = {
+        (result.item.section, result.item.item_id): result async for result in results
+    }
+    ordered = [_item_result(by_item[item.section, item.item_id]) for item in items]
+    failed = sum(1 for result in ordered if result.error is not None)
+    return OptimizeAllResponse(
+        cv_id=cv_id,
+        results=ordered,
+        succeeded=len(ordered) - failed,
+        failed=failed,
+    )
+
+
+@router.get("/cache-stats", response_model=AICacheStatsResponse)
+def get_cache_stats(
+    current_user: User = Depends(get_current_active_superuser),
+) -> AICacheStatsResponse:
+    """
+    Report AI response cache effectiveness (superusers only).
+
+    Includes hit rate and the LLM tokens saved by serving cached responses.
+    """
+    try:
+        cache = get_ai_service().cache
+    except ValueError:
+        cache = None
+    if cache is None:
+        return AICacheStatsResponse(enabled=False)
+    return AICacheStatsResponse(enabled=True, **cache.stats())
+
+
+@router.get("/llm-metrics", response_model=LLMMetricsResponse)
+def get_llm_metrics(
+    current_user: User = Depends(get_current_active_superuser),
+) -> LLMMetricsResponse:
+    """
+    Report LLM call metrics per endpoint (superusers only).
+
+    Latency, time-to-first-token and Groq queue time histograms (ms), token
+    counters, outcomes and retries since startup, recorded whether or not
+    Azure Application Insights is enabled.
+    """
+    return LLMMetricsResponse(
+        azure_insights_enabled=monitoring.enabled, endpoints=llm_metrics.snapshot()
+    )
+
+
+@router.get("/quota", response_model=AIQuotaResponse)
+def get_quota(current_user: User = Depends(get_current_user)) -> AIQuotaResponse:
+    """
+    Report the current user's remaining AI allowance.
+
+    Requests and estimated LLM tokens are budgeted per minute and refill
+    continuously; ``reset_seconds`` is the time until fully refilled.
+    """
+    limiter = get_ai_rate_limiter()
+    if limiter is None:
+        return AIQuotaResponse(enabled=False)
+    return AIQuotaResponse(enabled=True, **limiter.usage(current_user.id))
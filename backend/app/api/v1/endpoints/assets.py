@@ -0,0 +1,84 @@
+"""Long-lived asset URLs that redirect to short-lived signed storage URLs."""
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import RedirectResponse
+from sqlalchemy.orm import Session
+
+from app.db.base import get_db
+from app.models.share_link import ShareLink
+from app.models.user import User
+from app.services.storage_service import (
+    PDF_CONTAINER,
+    PFP_CONTAINER,
+    get_signed_url_cache,
+)
+
+router = APIRouter(prefix="/assets", tags=["assets"])
+
+
+def _not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found"
+    )
+
+
+def _redirect(
+    container: str, blob_name: str, valid_until: datetime | None = None
+) -> RedirectResponse:
+    """302 to a cached signed URL with caching headers matching its lifetime."""
+    try:
+        cache = get_signed_url_cache()
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
+
+    url, expires_at = cache.get(container, blob_name)
+    if valid_until is not None:
+        expires_at = min(expires_at, valid_until)
+    max_age = cache.cache_seconds(expires_at)
+    return RedirectResponse(
+        url,
+        status_code=status.HTTP_302_FOUND,
+        headers={"Cache-Control": f"public, max-age={max_age}, s-maxage={max_age}"},
+    )
+
+
+@router.get("/pfp/{user_id}")
+def get_profile_picture(
+    user_id: int, size: str | None = None, db: Session = Depends(get_db)
+) -> RedirectResponse:
+    """
+    Redirect to a user's profile picture.
+
+    - **size**: optional variant edge length (e.g. 64, 256, 512)
+    """
+    blobs = (
+        db.query(User.profile_picture_blob, User.profile_picture_variant_blobs)
+        .filter(User.id == user_id, User.is_active.is_(True))
+        .first()
+    )
+    if not blobs or not blobs.profile_picture_blob:
+        raise _not_found()
+
+    blob_name = blobs.profile_picture_blob
+    if size is not None:
+        blob_name = (blobs.profile_picture_variant_blobs or {}).get(size)
+        if not blob_name:
+            raise _not_found()
+    return _redirect(PFP_CONTAINER, blob_name)
+
+
+@router.get("/share/{public_id}")
+def get_shared_cv(public_id: str, db: Session = Depends(get_db)) -> RedirectResponse:
+    """Redirect to a shared CV PDF while its share link has not expired."""
+    link = (
+        db.query(ShareLink.blob_name, ShareLink.expires_at)
+        .filter(ShareLink.public_id == public_id)
+        .first()
+    )
+    if not link or not link.blob_name or link.expires_at <= datetime.utcnow():
+        raise _not_found()
+    return _redirect(PDF_CONTAINER, link.blob_name, valid_until=link.expires_at)
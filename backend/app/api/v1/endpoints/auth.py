@@ -2,6 +2,8 @@
 Authentication endpoints for user registration and login.
 """
 
+import asyncio
+import logging
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
@@ -10,14 +12,25 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.deps import get_current_user
+from app.core.resilience import CircuitOpenError
 from app.core.security import create_access_token, get_password_hash, verify_password
 from app.db.base import get_db
 from app.models.user import User
 from app.schemas.user import Token, User as UserSchema, UserCreate
-from app.services.blob_service import get_blob_service
+from app.services.image_service import (
+    process_profile_picture_async,
+    variant_file_type,
+)
+from app.services.storage_service import (
+    PFP_CONTAINER,
+    get_signed_url_cache,
+    get_storage,
+)
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
 
 @router.post(
     "/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED
@@ -138,6 +151,14 @@ async def upload_profile_picture(
 ):
     """
     Upload a profile picture for the current user and return the updated user.
+
+    The image is decoded and stripped of metadata in a worker pool, and
+    resized square variants (PROFILE_PICTURE_SIZES) are stored next to the
+    original so clients can request only the size they need. The stored
+    type follows the decoded image, not the uploaded name or header, and
+    sizes larger than the picture are not generated. Blob names carry a
+    hash of the upload, which is also the ``v`` of the returned URLs, so
+    caches never serve the previous picture; its blobs are deleted.
     """
     if file.content_type not in ("image/jpeg", "image/png"):
         raise HTTPException(
@@ -151,23 +172,65 @@ async def upload_profile_picture(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty"
         )
 
-    blob_service = get_blob_service()
     try:
-        url, _ = blob_service.upload_profile_picture(
-            user_id=current_user.id, data=data, filename=file.filename or "avatar"
-        )
+        picture = await process_profile_picture_async(data)
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
         ) from exc
+
+    extension, content_type = variant_file_type(settings.PROFILE_PICTURE_FORMAT.lower())
+    try:
+        storage = get_storage()
+        blob_name, variant_blobs = await asyncio.gather(
+            storage.upload_profile_picture(
+                user_id=current_user.id,
+                data=picture.original,
+                content_type=picture.content_type,
+                version=picture.version,
+                filename=file.filename or f"avatar.{picture.extension}",
+            ),
+            storage.upload_profile_picture_variants(
+                user_id=current_user.id,
+                variants=picture.variants,
+                extension=extension,
+                content_type=content_type,
+                version=picture.version,
+            ),
+        )
+    except (CircuitOpenError, ValueError) as exc:
+        # Breaker open, or storage not configured
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="Failed to upload profile picture",
         ) from exc
 
-    current_user.profile_picture_url = url
+    previous = {
+        current_user.profile_picture_blob,
+        *(current_user.profile_picture_variant_blobs or {}).values(),
+    }
+    current_user.profile_picture_blob = blob_name
+    current_user.profile_picture_variant_blobs = variant_blobs
+    current_user.profile_picture_version = picture.version
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+
+    current = {blob_name, *variant_blobs.values()}
+    url_cache = get_signed_url_cache()
+    for name in (previous | current) - {None}:
+        url_cache.invalidate(PFP_CONTAINER, name)
+    # Best effort: a blob left behind only costs storage
+    stale = sorted(previous - current - {None})
+    results = await asyncio.gather(
+        *(storage.delete(PFP_CONTAINER, name) for name in stale),
+        return_exceptions=True,
+    )
+    for name, result in zip(stale, results):
+        if isinstance(result, Exception):
+            logger.warning("Failed to delete old profile picture %s: %s", name, result)
     return current_user
@@ -0,0 +1,305 @@
+"""Endpoints for stored, incrementally updated CV translations."""
+
+import json
+import logging
+from typing import AsyncIterator, List
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.deps import get_current_user, get_db
+from app.models.cv import CV
+from app.models.translated_cv import TranslatedCV
+from app.models.user import User
+from app.schemas.cv import CVWithRelations
+from app.schemas.translation import (
+    CVTranslation,
+    MultiTranslateCVResponse,
+    RetranslateCVResponse,
+    TargetTranslationResult,
+    TranslatedCVResponse,
+)
+from app.services.translation_service import (
+    TargetTranslation,
+    TranslationService,
+    get_translation_service,
+    normalize_language,
+)
+from app.services.translation_variants import is_stale, update_variant
+
+router = APIRouter(prefix="/cvs", tags=["translation"])
+
+logger = logging.getLogger(__name__)
+
+
+def _get_owned_cv(cv_id: int, user_id: int, db: Session) -> CV:
+    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == user_id).first()
+    if not cv:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="CV not found"
+        )
+    return cv
+
+
+def _get_owned_cv_with_sections(cv_id: int, user_id: int, db: Session) -> CV:
+    """Load a CV and all its translatable sections up front."""
+    cv = (
+        db.query(CV)
+        .options(
+            selectinload(CV.work_experiences),
+            selectinload(CV.educations),
+            selectinload(CV.skills),
+            selectinload(CV.projects),
+        )
+        .filter(CV.id == cv_id, CV.user_id == user_id)
+        .first()
+    )
+    if not cv:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="CV not found"
+        )
+    return cv
+
+
+def _target_languages(
+    service: TranslationService, source_language: str, targets: str
+) -> tuple[str, List[str]]:
+    """Validate a comma-separated target list; duplicates are dropped."""
+    source = normalize_language(source_language)
+    languages: List[str] = []
+    for target in targets.split(","):
+        if not target.strip():
+            continue
+        try:
+            language = service.direction(source_language, target)[1]
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+            ) from exc
+        if language not in languages:
+            languages.append(language)
+    if not languages:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one target language is required",
+        )
+    return source, languages
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _target_result(result: TargetTranslation) -> TargetTranslationResult:
+    return TargetTranslationResult(
+        language=result.language,
+        translation=result.translation,
+        error=result.error,
+    )
+
+
+def _get_variant(cv_id: int, language: str, db: Session) -> TranslatedCV | None:
+    return (
+        db.query(TranslatedCV)
+        .filter(TranslatedCV.cv_id == cv_id, TranslatedCV.language == language)
+        .first()
+    )
+
+
+def _source(cv: CV) -> CVTranslation:
+    return CVTranslation.model_validate(
+        CVWithRelations.model_validate(cv).model_dump(mode="json")
+    )
+
+
+@router.post("/{cv_id}/translations/{language}", response_model=RetranslateCVResponse)
+async def translate_cv_variant(
+    cv_id: int,
+    language: str,
+    source_language: str = Query("en", description="Language the CV is written in"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> RetranslateCVResponse:
+    """
+    Create or bring up to date the stored translation of a CV.
+
+    Only text fields that are new or whose source text changed since the
+    last translation are sent for translation; the rest is kept.
+    """
+    cv = _get_owned_cv(cv_id=cv_id, user_id=current_user.id, db=db)
+    service = get_translation_service()
+    try:
+        source, target = service.direction(source_language, language)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+
+    content = _source(cv)
+    variant = _get_variant(cv_id, target, db)
+    previous = (
+        variant.segments
+        if variant is not None and variant.source_language == source
+        else None
+    )
+    # Return the pooled DB connection while waiting for the translation
+    db.close()
+
+    try:
+        update = await update_variant(service, content, source, target, previous)
+    except ConnectionError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
+    except RuntimeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)
+        ) from exc
+
+    values = {
+        "source_language": source,
+        "content": update.content,
+        "segments": update.segments,
+    }
+    variant = _get_variant(cv_id, target, db)
+    if variant is None:
+        variant = TranslatedCV(cv_id=cv_id, language=target, **values)
+        db.add(variant)
+    else:
+        for field, value in values.items():
+            setattr(variant, field, value)
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request stored this translation first; overwrite it
+        db.rollback()
+        variant = _get_variant(cv_id, target, db)
+        if variant is None:
+            # The conflict was not a stored translation, e.g. the CV was
+            # deleted meanwhile
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The CV changed while it was being translated",
+            )
+        for field, value in values.items():
+            setattr(variant, field, value)
+        db.commit()
+    db.refresh(variant)
+    logger.info(
+        "Translated CV %s to %s: %d fields translated, %d reused",
+        cv_id,
+        target,
+        update.translated_fields,
+        update.reused_fields,
+    )
+
+    return RetranslateCVResponse(
+        cv_id=cv_id,
+        language=target,
+        source_language=source,
+        translation=variant.content,
+        updated_at=variant.updated_at,
+        translated_fields=update.translated_fields,
+        reused_fields=update.reused_fields,
+    )
+
+
+@router.get("/{cv_id}/translations/{language}", response_model=TranslatedCVResponse)
+def get_cv_variant(
+    cv_id: int,
+    language: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> TranslatedCVResponse:
+    """
+    Return the stored translation of a CV without translating anything.
+
+    ``stale`` is set when the CV text changed since it was translated; POST
+    to the same path to update it.
+    """
+    cv = _get_owned_cv(cv_id=cv_id, user_id=current_user.id, db=db)
+    variant = _get_variant(cv_id, normalize_language(language), db)
+    if variant is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No stored translation for this language",
+        )
+    return TranslatedCVResponse(
+        cv_id=cv_id,
+        language=variant.language,
+        source_language=variant.source_language,
+        translation=variant.content,
+        updated_at=variant.updated_at,
+        stale=is_stale(_source(cv).model_dump(mode="json"), variant.segments),
+    )
+
+
+@router.post("/{cv_id}/translate", response_model=MultiTranslateCVResponse)
+async def translate_cv_targets(
+    cv_id: int,
+    targets: str = Query(..., description="Comma-separated languages, e.g. de,fr"),
+    source_language: str = Query("en", description="Language the CV is written in"),
+    stream: bool = Query(False, description="Stream each language as it is ready"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Translate a stored CV into several languages at once.
+
+    The CV is read on the server, so nothing is uploaded, and the languages
+    are translated concurrently. A language that fails carries an ``error``
+    instead of failing the others. With ``stream`` set, each language is
+    sent as a ``translation`` event as soon as it is ready, followed by
+    ``done`` (``{"succeeded": n, "failed": n}``).
+    """
+    cv = _get_owned_cv_with_sections(cv_id=cv_id, user_id=current_user.id, db=db)
+    service = get_translation_service()
+    source, languages = _target_languages(service, source_language, targets)
+    content = _source(cv)
+    # Return the pooled DB connection while waiting for the translations
+    db.close()
+
+    results = service.translate_cv_targets(content, source, languages)
+
+    if stream:
+
+        async def events() -> AsyncIterator[str]:
+            succeeded = failed = 0
+            try:
+                async for result in results:
+                    if result.error is None:
+                        succeeded += 1
+                    else:
+                        failed += 1
+                    yield _sse(
+                        "translation", _target_result(result).model_dump(mode="json")
+                    )
+            finally:
+                with anyio.CancelScope(shield=True):
+                    await results.aclose()
+            yield _sse("done", {"succeeded": succeeded, "failed": failed})
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    by_language = {result.language: result async for result in results}
+    ordered = [_target_result(by_language[language]) for language in languages]
+    failed = sum(1 for result in ordered if result.error is not None)
+    return MultiTranslateCVResponse(
+        cv_id=cv_id,
+        source_language=source,
+        results=ordered,
+        succeeded=len(ordered) - failed,
+        failed=failed,
+    )
@@ -1,17 +1,21 @@
-"""Endpoints for exporting CVs to Azure Blob Storage and generating shareable links."""
+"""Endpoints for exporting CVs to file storage and generating shareable links."""
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
+from uuid import uuid4
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.deps import get_current_user, get_db
+from app.core.resilience import CircuitOpenError
 from app.models.cv import CV
 from app.models.share_link import ShareLink
 from app.models.user import User
 from app.schemas.export import ShareLinkResponse
-from app.services.blob_service import get_blob_service
+from app.services.storage_service import asset_url, get_storage
 
 router = APIRouter(prefix="/cvs", tags=["exports"])
 
@@ -27,11 +31,16 @@ def _get_owned_cv(cv_id: int, user_id: int, db: Session) -> CV:
     return cv
 
 
-def _get_existing_share_link(cv_id: int, user_id: int, db: Session) -> ShareLink | None:
-    """Return the most recent non-expired share link for this CV/user, if any."""
+def _get_existing_share_link(cv_id: int, user_id: int, db: Session) -> Row | None:
+    """
+    Return (url, expires_at) of the most recent non-expired share link, if any.
+
+    Only columns stored in ix_sharelink_cv_user_expires are selected so the
+    lookup can be answered by an index-only scan.
+    """
     now = datetime.utcnow()
     return (
-        db.query(ShareLink)
+        db.query(ShareLink.url, ShareLink.expires_at)
         .filter(
             ShareLink.cv_id == cv_id,
             ShareLink.user_id == user_id,
@@ -50,7 +59,10 @@ async def create_share_link(
     db: Session = Depends(get_db),
 ) -> ShareLinkResponse:
     """
-    Upload a CV PDF to Azure Blob Storage and return a shareable SAS link.
+    Upload a CV PDF to file storage and return a shareable link.
+
+    The link points at ``/assets/share/{public_id}``, which redirects to a
+    freshly signed storage URL until the link expires.
 
     If a non-expired link already exists for this CV/user, it is returned without
     re-uploading.
@@ -73,31 +85,40 @@ async def create_share_link(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty"
         )
 
-    blob_service = get_blob_service()
     try:
-        url, expires_at = blob_service.upload_cv_pdf(
+        storage = get_storage()
+        blob_name = await storage.upload_cv_pdf(
             user_id=current_user.id,
             cv_id=cv_id,
             data=pdf_bytes,
             filename=file.filename or f"cv-{cv_id}.pdf",
         )
+    except CircuitOpenError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
     except ValueError as exc:
+        # Storage not configured or misconfigured, as on /assets
         logger.exception("Storage configuration error while uploading CV")
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
         ) from exc
     except Exception as exc:
-        logger.exception("Failed to upload CV to Azure Blob Storage")
+        logger.exception("Failed to upload CV to storage")
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="Failed to upload CV to storage",
         ) from exc
 
+    public_id = uuid4().hex
     new_link = ShareLink(
         cv_id=cv_id,
         user_id=current_user.id,
-        url=url,
-        expires_at=expires_at,
+        public_id=public_id,
+        blob_name=blob_name,
+        url=asset_url("share", public_id),
+        expires_at=datetime.utcnow()
+        + timedelta(minutes=max(settings.SHARE_LINK_TTL_MINUTES, 1)),
     )
     db.add(new_link)
     db.commit()
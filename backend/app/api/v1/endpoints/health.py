@@ -2,8 +2,16 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.db.base import get_db
+from app.core.coalescing import coalescing_stats
 from app.core.config import settings
+from app.core.deps import get_current_active_superuser
 from app.core.monitoring import get_monitoring_status
+from app.core.resilience import CircuitBreaker, circuit_breaker_states
+from app.models.user import User
+from app.services.translation_service import (
+    translation_memory_stats,
+    translation_routing_stats,
+)
 
 router = APIRouter()
 
@@ -17,6 +25,9 @@ def health_check(db: Session = Depends(get_db)):
     - Application info (name, version)
     - Database connection status
     - Azure Application Insights monitoring status
+    - Circuit breaker state of outbound dependencies (storage, AI, translation)
+
+    Cache and routing statistics are served by ``/health/stats``.
     """
     # Test database connection
     try:
@@ -28,14 +39,22 @@ def health_check(db: Session = Depends(get_db)):
     # Get monitoring status
     monitoring_status = get_monitoring_status()
 
-    # Determine overall status
-    overall_status = "healthy" if db_status == "healthy" else "unhealthy"
+    dependencies = circuit_breaker_states()
+
+    # Determine overall status; an open circuit means reduced functionality
+    if db_status != "healthy":
+        overall_status = "unhealthy"
+    elif any(dep["state"] != CircuitBreaker.CLOSED for dep in dependencies.values()):
+        overall_status = "degraded"
+    else:
+        overall_status = "healthy"
 
     return {
         "status": overall_status,
         "app_name": settings.APP_NAME,
         "version": settings.APP_VERSION,
         "database": db_status,
+        "dependencies": dependencies,
         "monitoring": {
             "azure_insights_enabled": settings.ENABLE_AZURE_INSIGHTS,
             "azure_insights_configured": monitoring_status.get("configured", False),
@@ -45,3 +64,20 @@ def health_check(db: Session = Depends(get_db)):
             "initialization_error": monitoring_status.get("initialization_error"),
         },
     }
+
+
+@router.get("/health/stats")
+def health_stats(current_user: User = Depends(get_current_active_superuser)):
+    """
+    Internal request statistics (superusers only).
+
+    Returns:
+    - How many identical AI/translation calls were coalesced
+    - Translation memory hit rate
+    - Translation routing decisions and per-backend latency
+    """
+    return {
+        "coalescing": coalescing_stats(),
+        "translation_memory": translation_memory_stats(),
+        "translation_routing": translation_routing_stats(),
+    }
@@ -0,0 +1,123 @@
+"""Signed download endpoint for the local filesystem storage backend."""
+
+import re
+import time
+from pathlib import Path
+from typing import Iterator
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import Response, StreamingResponse
+
+from app.services.storage_service import (
+    LocalStorageBackend,
+    get_storage,
+    verify_blob_signature,
+)
+
+router = APIRouter(prefix="/storage", tags=["storage"])
+
+CHUNK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single ``Range: bytes=start-end`` header into inclusive offsets.
+
+    Returns None when the header is malformed or unsatisfiable.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match or size == 0:
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range: the final N bytes.
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+def _iter_file(path: Path, start: int, end: int) -> Iterator[bytes]:
+    """Yield the inclusive byte range [start, end] of a file in chunks."""
+    remaining = end - start + 1
+    with path.open("rb") as handle:
+        handle.seek(start)
+        while remaining > 0:
+            chunk = handle.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+@router.get("/{container}/{blob_name:path}")
+def download_blob(
+    container: str,
+    blob_name: str,
+    expires: int,
+    signature: str,
+    request: Request,
+):
+    """
+    Stream a blob from local storage using a time-limited signed URL.
+
+    Supports single ``Range`` requests so PDF viewers can fetch pages lazily.
+    """
+    if not verify_blob_signature(container, blob_name, expires, signature):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired signature",
+        )
+
+    try:
+        storage = get_storage()
+    except ValueError:
+        storage = None
+    if not isinstance(storage, LocalStorageBackend):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    try:
+        path = storage.resolve_path(container, blob_name)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Not found"
+        ) from exc
+    if not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    size = path.stat().st_size
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": f"private, max-age={max(expires - int(time.time()), 0)}",
+    }
+    media_type = storage.guess_content_type(path)
+
+    range_header = request.headers.get("range")
+    if range_header:
+        byte_range = _parse_range(range_header, size)
+        if byte_range is None:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{size}"},
+            )
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            _iter_file(path, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=media_type,
+            headers=headers,
+        )
+
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(
+        _iter_file(path, 0, size - 1), media_type=media_type, headers=headers
+    )
@@ -3,10 +3,14 @@
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_db
+from app.models.job import Job
 from app.models.user import User
+from app.schemas.job import JobResponse
 from app.schemas.translation import TranslateCVRequest, TranslateCVResponse
+from app.services.job_queue import PermanentJobError, enqueue_job, job_handler
 from app.services.translation_service import get_translation_service
 
 router = APIRouter(prefix="/translation", tags=["translation"])
@@ -14,8 +18,16 @@ router = APIRouter(prefix="/translation", tags=["translation"])
 logger = logging.getLogger(__name__)
 
 
+def _check_owner(request: TranslateCVRequest, user: User) -> None:
+    if request.cv.user_id and request.cv.user_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to translate this CV",
+        )
+
+
 @router.post("/translate-cv", response_model=TranslateCVResponse)
-def translate_cv_endpoint(
+async def translate_cv_endpoint(
     request: TranslateCVRequest,
     current_user: User = Depends(get_current_user),
 ) -> TranslateCVResponse:
@@ -25,16 +37,12 @@ def translate_cv_endpoint(
     - input_language/output_language: ISO-like codes (en, es, de, fr, it)
     - cv: CV payload (full or partial) to translate
     """
-    if request.cv.user_id and request.cv.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to translate this CV",
-        )
+    _check_owner(request, current_user)
 
     service = get_translation_service()
 
     try:
-        translated = service.translate_cv(
+        translated = await service.translate_cv(
             cv=request.cv,
             input_language=request.input_language,
             output_language=request.output_language,
@@ -61,3 +69,44 @@ def translate_cv_endpoint(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to translate CV: {exc}",
         ) from exc
+
+
+@job_handler("translate_cv")
+async def _translate_cv_job(payload: dict, user_id: int) -> dict:
+    request = TranslateCVRequest.model_validate(payload)
+    service = get_translation_service()
+    try:
+        translated = await service.translate_cv(
+            cv=request.cv,
+            input_language=request.input_language,
+            output_language=request.output_language,
+        )
+    except ValueError as exc:
+        # Unsupported direction or no translation backend configured
+        raise PermanentJobError(str(exc)) from exc
+    return TranslateCVResponse(translation=translated).model_dump(mode="json")
+
+
+@router.post(
+    "/translate-cv/jobs",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def start_translate_cv_job(
+    request: TranslateCVRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Job:
+    """
+    Queue a CV translation and return the job at once.
+
+    Takes the same body as ``/translate-cv``; poll ``GET /jobs/{id}`` for the
+    ``TranslateCVResponse``.
+    """
+    _check_owner(request, current_user)
+    return enqueue_job(
+        db,
+        user_id=current_user.id,
+        kind="translate_cv",
+        payload=request.model_dump(mode="json"),
+    )
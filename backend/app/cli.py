@@ -0,0 +1,100 @@
+"""
+Command line entry point for maintenance tasks.
+
+Usage:
+    python -m app.cli reap-share-links [--batch-size N] [--max-batches N]
+    python -m app.cli run-jobs [--concurrency N] [--kind KIND ...] [--burst]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import List, Optional
+
+from app.services.ai_service import close_ai_service, init_ai_service
+from app.services.job_queue import run_worker
+from app.services.share_link_reaper import reap_expired_share_links
+from app.services.translation_service import (
+    close_translation_service,
+    init_translation_service,
+)
+from app.services.storage_service import close_storage, init_storage
+
+
+async def _reap_share_links(args: argparse.Namespace) -> int:
+    if await init_storage() is None:
+        print("File storage is not configured", file=sys.stderr)
+        return 1
+    try:
+        result = await reap_expired_share_links(
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+            max_seconds=args.max_seconds,
+            concurrency=args.concurrency,
+        )
+    finally:
+        await close_storage()
+    print(json.dumps(result.as_dict()))
+    return 0
+
+
+async def _run_jobs(args: argparse.Namespace) -> int:
+    # Job handlers are registered next to the endpoints that enqueue them
+    import app.api.v1.api  # noqa: F401
+
+    init_ai_service()
+    init_translation_service()
+    try:
+        processed = await run_worker(
+            concurrency=args.concurrency,
+            poll_interval=args.poll_interval,
+            kinds=args.kind,
+            burst=args.burst,
+        )
+    finally:
+        await close_ai_service()
+        await close_translation_service()
+    print(json.dumps({"jobs_run": processed}))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reap = subparsers.add_parser(
+        "reap-share-links",
+        help="Delete expired share links and their stored PDFs",
+    )
+    reap.add_argument("--batch-size", type=int, help="Rows per batch")
+    reap.add_argument("--max-batches", type=int, help="Batches per run")
+    reap.add_argument("--max-seconds", type=float, help="Time limit per run")
+    reap.add_argument("--concurrency", type=int, help="Parallel blob deletions")
+    reap.set_defaults(handler=_reap_share_links)
+
+    jobs = subparsers.add_parser(
+        "run-jobs",
+        help="Run queued background jobs (AI scoring, translation)",
+    )
+    jobs.add_argument("--concurrency", type=int, help="Jobs run at a time")
+    jobs.add_argument("--poll-interval", type=float, help="Seconds between polls")
+    jobs.add_argument(
+        "--kind", action="append", help="Only run jobs of this kind (repeatable)"
+    )
+    jobs.add_argument(
+        "--burst", action="store_true", help="Exit once no job is runnable"
+    )
+    jobs.set_defaults(handler=_run_jobs)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args(argv)
+    return asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
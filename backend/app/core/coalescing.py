@@ -0,0 +1,354 @@
+"""
+Single-flight coalescing of identical concurrent upstream calls.
+
+Double-clicks and duplicate tabs send the same AI or translation request at
+the same moment. Each caller passes a normalized request hash as the key;
+while a call for that key is running, identical calls wait for its result
+instead of paying for another upstream request.
+
+Within a process, callers share one future; this works for coroutines and
+worker threads alike. With ``COALESCE_LOCK_DIR`` set, a ``FileLockStore``
+extends this across workers on the same host. The worker holding the key's
+file lock makes the call and publishes the result, and waiters in other
+workers pick it up. ``coalescing_stats`` feeds the superuser-only
+``/health/stats`` endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# How often a waiter checks the lock store for a published result
+_POLL_SECONDS = 0.05
+
+
+def request_key(*parts: Any) -> str:
+    """Stable hash of JSON-serializable request parts."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FileLockStore:
+    """
+    Cross-process leader election and result hand-off through a directory.
+
+    The worker that wins a key's ``flock`` makes the upstream call and
+    publishes the result before releasing the lock. Waiters accept only
+    results published after they started waiting, so finished calls are
+    never served as a cache. Old files are pruned as results are published.
+    Unix only.
+    """
+
+    def __init__(self, directory: str, file_ttl: float = 600.0) -> None:
+        import fcntl
+
+        self._fcntl = fcntl
+        self.directory = directory
+        self.file_ttl = file_ttl
+        self._last_prune = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str, key: str, suffix: str) -> str:
+        digest = hashlib.sha256(f"{name}:{key}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}{suffix}")
+
+    def try_acquire(self, name: str, key: str) -> Optional[int]:
+        """Return a lock handle, or None if another process holds the key."""
+        fd = os.open(self._path(name, key, ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._fcntl.flock(fd, self._fcntl.LOCK_EX | self._fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    def release(self, handle: int) -> None:
+        try:
+            self._fcntl.flock(handle, self._fcntl.LOCK_UN)
+        finally:
+            os.close(handle)
+
+    def publish(self, name: str, key: str, data: str) -> None:
+        path = self._path(name, key, ".result")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"published_at": time.time(), "data": data}, f)
+        os.replace(tmp_path, path)
+        self._prune()
+
+    def read(self, name: str, key: str, since: float) -> Optional[str]:
+        """Result published at or after ``since`` (a ``time.time()``), if any."""
+        try:
+            with open(self._path(name, key, ".result"), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("published_at", 0) < since:
+            return None
+        return entry.get("data")
+
+    def _prune(self) -> None:
+        now = time.time()
+        if now - self._last_prune < 60:
+            return
+        self._last_prune = now
+        for entry in os.scandir(self.directory):
+            try:
+                if now - entry.stat().st_mtime > self.file_ttl:
+                    os.unlink(entry.path)
+            except OSError:
+                continue
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time and shares its outcome.
+
+    Args:
+        name: Name reported in ``coalescing_stats``.
+        lock_store: Optional store for coalescing across processes.
+        encode/decode: Convert results to and from ``str`` for the lock
+            store; identity by default.
+        wait_timeout: Longest a waiter in another process waits for the
+            lock holder before calling upstream itself.
+        enabled: When False every call goes straight upstream.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        lock_store: Optional[FileLockStore] = None,
+        encode: Callable[[Any], str] = str,
+        decode: Callable[[str], Any] = str,
+        wait_timeout: float = 60.0,
+        enabled: bool = True,
+    ) -> None:
+        self.name = name
+        self.lock_store = lock_store
+        self.encode = encode
+        self.decode = decode
+        self.wait_timeout = wait_timeout
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+        # Keeps leader tasks referenced until they finish
+        self._tasks: Set[asyncio.Task] = set()
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.shared_across_workers = 0
+
+    def _join(self, key: str) -> tuple[concurrent.futures.Future, bool]:
+        """Return the key's shared future and whether this caller leads."""
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = concurrent.futures.Future()
+            self._in_flight[key] = future
+            return future, True
+
+    def _settle(
+        self,
+        key: str,
+        future: concurrent.futures.Future,
+        result: Any = None,
+        exc: Optional[BaseException] = None,
+    ) -> None:
+        """Hand the outcome to every waiter; later calls start afresh."""
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    def _count(self, attribute: str) -> None:
+        with self._lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Blocking variant for code running in worker threads."""
+        if not self.enabled:
+            self._count("executions")
+            return fn()
+        future, leader = self._join(key)
+        if leader:
+            try:
+                result = self._call_across_workers(key, fn)
+            except BaseException as exc:
+                self._settle(key, future, exc=exc)
+            else:
+                self._settle(key, future, result)
+        return future.result()
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``fn()`` or an identical call already in flight.
+
+        The shared call runs in its own task, so a caller that is cancelled
+        (e.g. its client disconnected) does not fail the others.
+        """
+        if not self.enabled:
+            self._count("executions")
+            return await fn()
+        future, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(self._lead(key, future, fn))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    async def _lead(
+        self,
+        key: str,
+        future: concurrent.futures.Future,
+        fn: Callable[[], Awaitable[T]],
+    ) -> None:
+        try:
+            result = await self._acall_across_workers(key, fn)
+        except BaseException as exc:
+            self._settle(key, future, exc=exc)
+        else:
+            self._settle(key, future, result)
+
+    def _call_across_workers(self, key: str, fn: Callable[[], T]) -> T:
+        store = self.lock_store
+        if store is None:
+            self._count("executions")
+            return fn()
+        started = time.time()
+        deadline = time.monotonic() + self.wait_timeout
+        handle = store.try_acquire(self.name, key)
+        while handle is None and time.monotonic() < deadline:
+            time.sleep(_POLL_SECONDS)
+            data = store.read(self.name, key, since=started)
+            if data is not None:
+                self._count("shared_across_workers")
+                return self.decode(data)
+            handle = store.try_acquire(self.name, key)
+        try:
+            data = store.read(self.name, key, since=started)
+            if data is not None:
+                self._count("shared_across_workers")
+                return self.decode(data)
+            self._count("executions")
+            result = fn()
+            store.publish(self.name, key, self.encode(result))
+            return result
+        finally:
+            if handle is not None:
+                store.release(handle)
+
+    async def _acall_across_workers(
+        self, key: str, fn: Callable[[], Awaitable[T]]
+    ) -> T:
+        store = self.lock_store
+        if store is None:
+            self._count("executions")
+            return await fn()
+        started = time.time()
+        deadline = time.monotonic() + self.wait_timeout
+        handle = store.try_acquire(self.name, key)
+        while handle is None and time.monotonic() < deadline:
+            await asyncio.sleep(_POLL_SECONDS)
+            data = store.read(self.name, key, since=started)
+            if data is not None:
+                self._count("shared_across_workers")
+                return self.decode(data)
+            handle = store.try_acquire(self.name, key)
+        try:
+            data = store.read(self.name, key, since=started)
+            if data is not None:
+                self._count("shared_across_workers")
+                return self.decode(data)
+            self._count("executions")
+            result = await fn()
+            store.publish(self.name, key, self.encode(result))
+            return result
+        finally:
+            if handle is not None:
+                store.release(handle)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "shared_across_workers": self.shared_across_workers,
+                "in_flight": len(self._in_flight),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.calls = self.executions = 0
+            self.coalesced = self.shared_across_workers = 0
+
+
+_flights: Dict[str, SingleFlight] = {}
+_registry_lock = threading.Lock()
+_lock_store: Optional[FileLockStore] = None
+
+
+def _get_lock_store() -> Optional[FileLockStore]:
+    global _lock_store
+    if not settings.COALESCE_LOCK_DIR:
+        return None
+    if _lock_store is None or _lock_store.directory != settings.COALESCE_LOCK_DIR:
+        _lock_store = FileLockStore(settings.COALESCE_LOCK_DIR)
+    return _lock_store
+
+
+def register_flight(
+    name: str,
+    *,
+    encode: Callable[[Any], str] = str,
+    decode: Callable[[str], Any] = str,
+) -> SingleFlight:
+    """Return the single-flight group called ``name``, creating it on first use."""
+    with _registry_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = SingleFlight(
+                name,
+                lock_store=_get_lock_store(),
+                encode=encode,
+                decode=decode,
+                wait_timeout=settings.COALESCE_WAIT_SECONDS,
+                enabled=settings.COALESCE_REQUESTS,
+            )
+            _flights[name] = flight
+        return flight
+
+
+def coalescing_stats() -> Dict[str, Dict[str, Any]]:
+    """Coalescing counters for every registered group."""
+    with _registry_lock:
+        flights = list(_flights.values())
+    return {flight.name: flight.stats() for flight in flights}
+
+
+def reset_coalescing() -> None:
+    """Forget all groups so they are rebuilt from current settings (tests)."""
+    global _lock_store
+    with _registry_lock:
+        _flights.clear()
+        _lock_store = None
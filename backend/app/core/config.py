@@ -1,6 +1,8 @@
+import logging
+import os
 from typing import List
 
-from pydantic import field_validator
+from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -16,11 +18,26 @@ def parse_cors_origins(v: str | List[str]) -> List[str]:
     return []
 
 
+logger = logging.getLogger(__name__)
+
+
+def _env_files() -> tuple[str, ...]:
+    """``.env``, then ``.env.<SETTINGS_PROFILE>`` whose values take priority."""
+    profile = os.getenv("SETTINGS_PROFILE")
+    return (".env", f".env.{profile}") if profile else (".env",)
+
+
 class Settings(BaseSettings):
-    """Application settings loaded from environment variables."""
+    """
+    Application settings loaded from environment variables.
+
+    Variables set in the environment win over the dotenv files. Set
+    SETTINGS_PROFILE=mock to layer ``.env.mock`` (local mock servers) on top
+    of ``.env``.
+    """
 
     model_config = SettingsConfigDict(
-        env_file=".env",
+        env_file=_env_files(),
         env_file_encoding="utf-8",
         case_sensitive=True,
         extra="ignore",
@@ -56,18 +73,132 @@ class Settings(BaseSettings):
     # AI/LLM
     GROQ_API_KEY: str = ""
     GROQ_MODEL: str = "llama-3.1-8b-instant"
+    # Override the API endpoint, e.g. to point at a local mock server
+    GROQ_BASE_URL: str = ""
+    GROQ_TIMEOUT_SECONDS: float = 30.0
+    # Size of the HTTP connection pool shared by all AI requests
+    GROQ_MAX_CONNECTIONS: int = 100
+    GROQ_MAX_RETRIES: int = 1
+    # Estimated tokens of CV content allowed in the score and summary prompts;
+    # longer CVs are compacted (older entries and long descriptions first)
+    AI_SCORE_PROMPT_TOKEN_BUDGET: int = 3000
+    AI_SUMMARY_PROMPT_TOKEN_BUDGET: int = 600
+    # USD per million tokens, for the cost estimate in /ai/llm-metrics
+    LLM_PROMPT_COST_PER_MILLION_TOKENS: float = 0.05
+    LLM_COMPLETION_COST_PER_MILLION_TOKENS: float = 0.08
+    # Cache of AI responses keyed by model, prompt version and normalized input.
+    # Score mode=sections relies on it to re-score only changed sections.
+    AI_CACHE_ENABLED: bool = True
+    AI_CACHE_BACKEND: str = "memory"
+    AI_CACHE_TTL_SECONDS: int = 86400
+    AI_CACHE_MAX_ENTRIES: int = 5000
+    # Concurrent AI calls made by optimize-all, across all users and per user
+    AI_BATCH_MAX_CONCURRENCY: int = 20
+    AI_BATCH_MAX_CONCURRENCY_PER_USER: int = 4
+    # Identical concurrent AI/translation requests share one upstream call.
+    # Set COALESCE_LOCK_DIR to a directory shared by the workers on a host to
+    # coalesce across processes too.
+    COALESCE_REQUESTS: bool = True
+    COALESCE_LOCK_DIR: str = ""
+    COALESCE_WAIT_SECONDS: float = 60.0
+    # Token buckets for /ai/*, per minute (0 disables a bucket). Tokens are
+    # estimated LLM tokens. "memory" keeps counters per process, so with N
+    # workers every limit (global ones included) is N times the value;
+    # "database" shares them between all workers.
+    AI_RATE_LIMIT_ENABLED: bool = True
+    AI_RATE_LIMIT_BACKEND: str = "memory"
+    AI_RATE_LIMIT_USER_REQUESTS_PER_MINUTE: int = 20
+    AI_RATE_LIMIT_USER_TOKENS_PER_MINUTE: int = 30000
+    AI_RATE_LIMIT_GLOBAL_REQUESTS_PER_MINUTE: int = 600
+    AI_RATE_LIMIT_GLOBAL_TOKENS_PER_MINUTE: int = 500000
 
     # Translation services
     TRANSLATION_SERVICE_URL: str = ""
 
     EXTERNAL_TRANSLATION_API_URL: str = ""
     EXTERNAL_TRANSLATION_API_KEY: str = ""
+    TRANSLATION_TIMEOUT_SECONDS: float = 15.0
+    TRANSLATION_MAX_RETRIES: int = 2
+    # Pooled keep-alive connections shared by the translation clients; HTTP/2
+    # is used where the server supports it and the h2 package is installed
+    TRANSLATION_MAX_CONNECTIONS: int = 50
+    TRANSLATION_KEEPALIVE_SECONDS: float = 30.0
+    TRANSLATION_HTTP2: bool = True
+    # Google Translate requests are split to stay within the API's per-request
+    # limits; the batches of one CV are sent this many at a time
+    TRANSLATION_BATCH_MAX_SEGMENTS: int = 128
+    TRANSLATION_BATCH_MAX_CHARACTERS: int = 30000
+    TRANSLATION_BATCH_CONCURRENCY: int = 4
+    # en -> es goes to the in-house service while its error rate and p95 over
+    # the last window stay within limits, otherwise to the external API.
+    # Hedging sends a second request to the other backend after the first
+    # backend's p95 (at least TRANSLATION_HEDGE_MIN_DELAY_MS) has passed.
+    TRANSLATION_ROUTING_WINDOW_SECONDS: int = 300
+    TRANSLATION_ROUTING_MIN_SAMPLES: int = 20
+    TRANSLATION_ROUTING_MAX_ERROR_RATE: float = 0.2
+    TRANSLATION_ROUTING_MAX_P95_MS: float = 3000.0
+    TRANSLATION_HEDGE_ENABLED: bool = False
+    TRANSLATION_HEDGE_MIN_DELAY_MS: float = 100.0
+    # Translation memory: segments already translated are served from a
+    # per-process LRU (and the translationsegment table when persisted)
+    TRANSLATION_MEMORY_ENABLED: bool = True
+    TRANSLATION_MEMORY_MAX_ENTRIES: int = 20000
+    TRANSLATION_MEMORY_PERSIST: bool = False
+
+    # File storage: "azure" (Blob Storage) or "local" (filesystem)
+    STORAGE_BACKEND: str = "azure"
+    LOCAL_STORAGE_PATH: str = "storage"
+    # Public base URL of this API, prepended to /assets and local signed URLs
+    # (e.g. https://api.example.com); relative URLs are returned when empty
+    STORAGE_PUBLIC_BASE_URL: str = ""
+
+    # Lifetime of share links handed out for exported CVs
+    SHARE_LINK_TTL_MINUTES: int = 60
+    # Signed URLs behind /assets redirects: lifetime, re-sign margin, cache size
+    ASSET_URL_TTL_MINUTES: int = 60
+    ASSET_URL_REFRESH_MARGIN_SECONDS: int = 300
+    ASSET_URL_CACHE_SIZE: int = 10000
+    # Background cleanup of expired share links and their PDFs
+    SHARE_LINK_REAPER_ENABLED: bool = True
+    SHARE_LINK_REAPER_INTERVAL_SECONDS: int = 3600
+    SHARE_LINK_REAPER_BATCH_SIZE: int = 500
+    SHARE_LINK_REAPER_MAX_BATCHES: int = 20
+    SHARE_LINK_REAPER_MAX_SECONDS: float = 120.0
+    SHARE_LINK_REAPER_CONCURRENCY: int = 16
+
+    # Background jobs run by `python -m app.cli run-jobs` workers. A claimed
+    # job is leased for the visibility timeout and retried with exponential
+    # backoff (base seconds, doubling per attempt) up to the attempt limit.
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = 300.0
+    JOB_RETRY_BACKOFF_SECONDS: float = 10.0
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_WORKER_CONCURRENCY: int = 4
+
+    # Profile picture processing
+    PROFILE_PICTURE_SIZES: str = "64,256,512"
+    PROFILE_PICTURE_FORMAT: str = "webp"
+    PROFILE_PICTURE_QUALITY: int = 82
+    IMAGE_PROCESSING_WORKERS: int = 2
 
     AZURE_STORAGE_CONNECTION_STRING: str = ""
     AZURE_STORAGE_ACCOUNT_NAME: str = ""
     AZURE_STORAGE_PDF_CONTAINER_NAME: str = ""
     AZURE_STORAGE_PFP_CONTAINER_NAME: str = ""
+    # Deprecated alias of ASSET_URL_TTL_MINUTES, used when that is not set
     AZURE_STORAGE_SAS_TTL_MINUTES: str = ""
+    AZURE_STORAGE_MAX_CONNECTIONS: int = 100
+    AZURE_STORAGE_KEEPALIVE_SECONDS: float = 30.0
+    AZURE_STORAGE_TIMEOUT_SECONDS: float = 30.0
+    AZURE_STORAGE_MAX_RETRIES: int = 2
+
+    # Outbound call resilience shared by storage, AI and translation clients:
+    # jittered exponential backoff between retries, and a circuit breaker that
+    # fails fast after N consecutive failures for the recovery period
+    RETRY_BACKOFF_BASE_SECONDS: float = 0.2
+    RETRY_BACKOFF_MAX_SECONDS: float = 2.0
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RECOVERY_SECONDS: float = 30.0
 
     @field_validator("BACKEND_CORS_ORIGINS", mode="after")
     @classmethod
@@ -77,5 +208,23 @@ class Settings(BaseSettings):
             return []
         return [origin.strip() for origin in v.split(",") if origin.strip()]
 
+    @model_validator(mode="after")
+    def _sas_ttl_alias(self) -> "Settings":
+        """Honour the pre-/assets AZURE_STORAGE_SAS_TTL_MINUTES setting."""
+        if not self.AZURE_STORAGE_SAS_TTL_MINUTES:
+            return self
+        if "ASSET_URL_TTL_MINUTES" in self.model_fields_set:
+            logger.warning(
+                "AZURE_STORAGE_SAS_TTL_MINUTES is deprecated and ignored "
+                "because ASSET_URL_TTL_MINUTES is set"
+            )
+            return self
+        logger.warning(
+            "AZURE_STORAGE_SAS_TTL_MINUTES is deprecated; "
+            "use ASSET_URL_TTL_MINUTES instead"
+        )
+        self.ASSET_URL_TTL_MINUTES = int(self.AZURE_STORAGE_SAS_TTL_MINUTES)
+        return self
+
 
 settings = Settings()
@@ -3,11 +3,19 @@ Dependencies for FastAPI endpoints.
 Includes authentication and database session management.
 """
 
-from fastapi import Depends, HTTPException, status
+from typing import Callable
+
+import anyio
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.rate_limit import (
+    AIRateLimiter,
+    RateLimitExceeded,
+    get_ai_rate_limiter,
+)
 from app.core.security import decode_access_token
 from app.db.base import get_db
 from app.models.user import User
@@ -69,3 +77,89 @@ def get_current_active_superuser(
             detail="The user doesn't have enough privileges",
         )
     return current_user
+
+
+class AIRateLimit:
+    """
+    Dependency charging an AI request against the caller's and global quotas.
+
+    Runs before any database or upstream work: the user is identified from
+    the JWT alone, and a rejected request gets 429 with ``Retry-After``.
+    Routes that fan out into several LLM calls are charged for one here and
+    call ``charge``/``acharge`` for the rest once they know how many they
+    will make.
+
+    Args:
+        estimated_tokens: LLM tokens one call of the route typically spends
+            (prompt scaffolding plus completion budget); a quarter of the
+            request body size is added for caller-supplied text.
+        exempt: Predicate on the JSON body for requests that do not reach
+            the LLM (e.g. local scoring) or are charged by the route itself.
+    """
+
+    def __init__(
+        self,
+        estimated_tokens: int,
+        exempt: Callable[[dict], bool] | None = None,
+    ) -> None:
+        self.estimated_tokens = estimated_tokens
+        self.exempt = exempt
+
+    async def __call__(
+        self, request: Request, token: str = Depends(oauth2_scheme)
+    ) -> None:
+        limiter = get_ai_rate_limiter()
+        if limiter is None:
+            return
+        if self.exempt is not None:
+            try:
+                body = await request.json()
+            except ValueError:
+                body = None
+            if isinstance(body, dict) and self.exempt(body):
+                return
+        user_id = int(decode_access_token(token)["sub"])
+        try:
+            body_bytes = int(request.headers.get("content-length") or 0)
+        except ValueError:
+            body_bytes = 0
+        tokens = self.estimated_tokens + body_bytes // 4
+        if limiter.store.blocking:
+            await anyio.to_thread.run_sync(self._check, limiter, user_id, tokens, 1)
+        else:
+            self._check(limiter, user_id, tokens, 1)
+
+    def charge(self, user_id: int, calls: int) -> None:
+        """
+        Charge ``calls`` more LLM calls at this route's per-call estimate.
+
+        Blocks on I/O with a database store; async routes use ``acharge``.
+
+        Raises:
+            HTTPException: 429 if the quota cannot pay; nothing is charged.
+        """
+        limiter = get_ai_rate_limiter()
+        if limiter is None or calls <= 0:
+            return
+        self._check(limiter, user_id, self.estimated_tokens * calls, calls)
+
+    async def acharge(self, user_id: int, calls: int) -> None:
+        """``charge`` without blocking the event loop."""
+        limiter = get_ai_rate_limiter()
+        if limiter is not None and limiter.store.blocking:
+            await anyio.to_thread.run_sync(self.charge, user_id, calls)
+        else:
+            self.charge(user_id, calls)
+
+    @staticmethod
+    def _check(
+        limiter: AIRateLimiter, user_id: int, tokens: int, requests: int
+    ) -> None:
+        try:
+            limiter.check(user_id, tokens, requests)
+        except RateLimitExceeded as exc:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=str(exc),
+                headers={"Retry-After": exc.retry_after_header},
+            ) from exc
@@ -1,8 +1,11 @@
 """Azure Application Insights monitoring integration for FastAPI."""
 
 import logging
+import threading
 import time
-from typing import Callable, Optional, Any
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Any, Sequence
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
@@ -22,6 +25,160 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (ms) of the LLM latency histogram buckets
+LLM_LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+# Route that LLM calls are attributed to; "background" outside a request
+_llm_endpoint: ContextVar[str] = ContextVar("llm_endpoint", default="background")
+
+
+async def label_llm_endpoint(request: Request) -> None:
+    """
+    Route dependency attributing the LLM calls of a request to its route.
+
+    Must stay async: sync dependencies run in a worker thread whose context
+    changes are not seen by the endpoint.
+    """
+    # Path parameter values become their names, e.g. /cvs/{cv_id}/...
+    names = {str(value): name for name, value in request.path_params.items()}
+    _llm_endpoint.set(
+        "/".join(
+            f"{{{names[segment]}}}" if segment in names else segment
+            for segment in request.url.path.split("/")
+        )
+    )
+
+
+def current_llm_endpoint() -> str:
+    """Route of the request being served, or "background"."""
+    return _llm_endpoint.get()
+
+
+@dataclass(frozen=True)
+class LLMCallRecord:
+    """Measurements of one upstream LLM call (including its retries)."""
+
+    endpoint: str
+    operation: str
+    model: str
+    outcome: str
+    latency_ms: float
+    time_to_first_token_ms: Optional[float] = None
+    upstream_queue_ms: Optional[float] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+    streamed: bool = False
+
+
+class Histogram:
+    """Fixed-bucket histogram with cumulative counts per upper bound."""
+
+    def __init__(self, bounds: Sequence[float] = LLM_LATENCY_BUCKETS_MS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = next(
+            (i for i, bound in enumerate(self.bounds) if value <= bound),
+            len(self.bounds),
+        )
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets: Dict[str, int] = {}
+        running = 0
+        for bound, count in zip((*self.bounds, "+Inf"), self.counts):
+            running += count
+            buckets[str(bound)] = running
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 1),
+            "mean": round(self.sum / self.count, 1) if self.count else 0.0,
+            "buckets": buckets,
+        }
+
+
+class _EndpointLLMMetrics:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.outcomes: Dict[str, int] = {}
+        self.models: Dict[str, int] = {}
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency_ms = Histogram()
+        self.time_to_first_token_ms = Histogram()
+        self.upstream_queue_ms = Histogram()
+
+
+class LLMMetrics:
+    """
+    In-process LLM call metrics grouped by endpoint.
+
+    Kept whether or not Azure Application Insights is enabled, so latency
+    and token usage can always be read from ``/ai/llm-metrics``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _EndpointLLMMetrics] = {}
+
+    def record(self, call: LLMCallRecord) -> None:
+        with self._lock:
+            metrics = self._endpoints.setdefault(call.endpoint, _EndpointLLMMetrics())
+            metrics.calls += 1
+            metrics.outcomes[call.outcome] = metrics.outcomes.get(call.outcome, 0) + 1
+            metrics.models[call.model] = metrics.models.get(call.model, 0) + 1
+            metrics.retries += call.retries
+            metrics.prompt_tokens += call.prompt_tokens
+            metrics.completion_tokens += call.completion_tokens
+            metrics.latency_ms.observe(call.latency_ms)
+            if call.time_to_first_token_ms is not None:
+                metrics.time_to_first_token_ms.observe(call.time_to_first_token_ms)
+            if call.upstream_queue_ms is not None:
+                metrics.upstream_queue_ms.observe(call.upstream_queue_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Counters and histograms per endpoint, with an estimated cost."""
+        with self._lock:
+            return {
+                endpoint: {
+                    "calls": m.calls,
+                    "outcomes": dict(m.outcomes),
+                    "models": dict(m.models),
+                    "retries": m.retries,
+                    "prompt_tokens": m.prompt_tokens,
+                    "completion_tokens": m.completion_tokens,
+                    "estimated_cost_usd": round(
+                        llm_cost_usd(m.prompt_tokens, m.completion_tokens), 6
+                    ),
+                    "latency_ms": m.latency_ms.snapshot(),
+                    "time_to_first_token_ms": m.time_to_first_token_ms.snapshot(),
+                    "upstream_queue_ms": m.upstream_queue_ms.snapshot(),
+                }
+                for endpoint, m in self._endpoints.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+
+def llm_cost_usd(prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated spend at the configured per-million-token prices."""
+    return (
+        prompt_tokens * settings.LLM_PROMPT_COST_PER_MILLION_TOKENS
+        + completion_tokens * settings.LLM_COMPLETION_COST_PER_MILLION_TOKENS
+    ) / 1_000_000
+
+
+llm_metrics = LLMMetrics()
+
 
 class AzureInsightsMonitoring:
     """Azure Application Insights monitoring manager."""
@@ -37,6 +194,11 @@ class AzureInsightsMonitoring:
         self.request_duration_histogram: Any = None
         self.request_counter: Any = None
         self.error_counter: Any = None
+        self.llm_duration_histogram: Any = None
+        self.llm_ttft_histogram: Any = None
+        self.llm_token_counter: Any = None
+        self.llm_call_counter: Any = None
+        self.llm_retry_counter: Any = None
 
         # Status tracking
         self.initialization_error: Optional[str] = None
@@ -119,6 +281,33 @@ class AzureInsightsMonitoring:
                 unit="errors",
             )
 
+            # LLM calls made by the AI service
+            self.llm_duration_histogram = self.meter.create_histogram(
+                name="llm.request.duration",
+                description="Duration of LLM calls including retries",
+                unit="ms",
+            )
+            self.llm_ttft_histogram = self.meter.create_histogram(
+                name="llm.request.time_to_first_token",
+                description="Time until the first LLM token was received",
+                unit="ms",
+            )
+            self.llm_token_counter = self.meter.create_counter(
+                name="llm.tokens",
+                description="LLM tokens used, by token type",
+                unit="tokens",
+            )
+            self.llm_call_counter = self.meter.create_counter(
+                name="llm.request.count",
+                description="Number of LLM calls, by outcome",
+                unit="requests",
+            )
+            self.llm_retry_counter = self.meter.create_counter(
+                name="llm.request.retries",
+                description="Retried LLM call attempts",
+                unit="retries",
+            )
+
         except Exception as e:
             logger.error(f"Failed to set up custom metrics: {e}")
 
@@ -168,6 +357,51 @@ class AzureInsightsMonitoring:
         except Exception as e:
             logger.error(f"Failed to track request: {e}")
 
+    def track_llm_call(self, call: LLMCallRecord):
+        """
+        Track one LLM call.
+
+        Always recorded in ``llm_metrics``; also exported to Azure
+        Application Insights when enabled.
+
+        Args:
+            call: Measurements of the call
+        """
+        llm_metrics.record(call)
+        if not self.enabled:
+            return
+
+        try:
+            attributes = {
+                "http.route": call.endpoint,
+                "llm.operation": call.operation,
+                "llm.model": call.model,
+                "llm.outcome": call.outcome,
+                "llm.streamed": call.streamed,
+            }
+            if self.llm_duration_histogram:
+                self.llm_duration_histogram.record(call.latency_ms, attributes)
+            if self.llm_ttft_histogram and call.time_to_first_token_ms is not None:
+                self.llm_ttft_histogram.record(call.time_to_first_token_ms, attributes)
+            if self.llm_call_counter:
+                self.llm_call_counter.add(1, attributes)
+            if self.llm_retry_counter and call.retries:
+                self.llm_retry_counter.add(call.retries, attributes)
+            if self.llm_token_counter:
+                for token_type, tokens in (
+                    ("prompt", call.prompt_tokens),
+                    ("completion", call.completion_tokens),
+                ):
+                    if tokens:
+                        self.llm_token_counter.add(
+                            tokens, {**attributes, "llm.token_type": token_type}
+                        )
+
+            self.telemetry_sent = True
+
+        except Exception as e:
+            logger.error(f"Failed to track LLM call: {e}")
+
     def track_exception(self, exception: Exception, properties: Optional[dict] = None):
         """
         Track an exception.
@@ -357,6 +591,10 @@ def get_monitoring_status() -> dict:
 # Export monitoring instance and utilities
 __all__ = [
     "monitoring",
+    "llm_metrics",
+    "LLMCallRecord",
+    "label_llm_endpoint",
+    "current_llm_endpoint",
     "MonitoringMiddleware",
     "initialize_monitoring",
     "shutdown_monitoring",
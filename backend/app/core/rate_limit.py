@@ -0,0 +1,360 @@
+"""
+Token-bucket rate limiting for the AI endpoints.
+
+Every AI request draws from four buckets: the user's request and LLM-token
+buckets and the global ones shared by all users. Buckets hold a minute's
+worth of allowance and refill continuously. A request is admitted only if
+all four buckets can pay, and nothing is charged when it is rejected.
+
+Bucket levels live in a ``RateLimitStore``. The in-memory store is per
+process, so with N workers every limit (the "global" ones included) is
+effectively N times the configured value; the database store shares the
+levels between all workers.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.rate_limit_bucket import RateLimitBucket
+
+
+class Bucket(NamedTuple):
+    """A bucket to draw ``cost`` from; ``rate`` is refill per second."""
+
+    key: str
+    capacity: float
+    rate: float
+    cost: float
+
+
+def _refilled(
+    tokens: float, updated_at: float, capacity: float, rate: float, now: float
+) -> float:
+    return min(capacity, tokens + max(now - updated_at, 0.0) * rate)
+
+
+def _retry_after(buckets: List[Bucket], levels: List[float]) -> float:
+    """Seconds until every bucket can pay its cost (0 if they can now)."""
+    retry_after = 0.0
+    for bucket, level in zip(buckets, levels):
+        if level < bucket.cost:
+            if bucket.cost > bucket.capacity or bucket.rate <= 0:
+                # Can never be paid; report a full refill period
+                wait = bucket.capacity / bucket.rate if bucket.rate else 60.0
+            else:
+                wait = (bucket.cost - level) / bucket.rate
+            retry_after = max(retry_after, wait)
+    return retry_after
+
+
+class RateLimitStore(ABC):
+    """Atomic storage for bucket levels; implementations must be thread-safe."""
+
+    # Whether calls do I/O and should run off the event loop
+    blocking = False
+
+    @abstractmethod
+    def acquire(self, buckets: List[Bucket], now: float) -> float:
+        """
+        Charge every bucket or none.
+
+        Returns 0 when admitted, otherwise the seconds until all buckets
+        could pay.
+        """
+
+    @abstractmethod
+    def level(self, key: str, capacity: float, rate: float, now: float) -> float:
+        """Current level of a bucket (full if never used)."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Refill every bucket."""
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """Per-process bucket levels."""
+
+    # Buckets are forgotten once full so idle users do not accumulate
+    PRUNE_THRESHOLD = 10_000
+
+    def __init__(self) -> None:
+        self._levels: Dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _level(self, key: str, capacity: float, rate: float, now: float) -> float:
+        entry = self._levels.get(key)
+        if entry is None:
+            return capacity
+        return _refilled(*entry, capacity, rate, now)
+
+    def acquire(self, buckets: List[Bucket], now: float) -> float:
+        with self._lock:
+            levels = [self._level(b.key, b.capacity, b.rate, now) for b in buckets]
+            retry_after = _retry_after(buckets, levels)
+            if retry_after:
+                return retry_after
+            for bucket, level in zip(buckets, levels):
+                self._levels[bucket.key] = (level - bucket.cost, now)
+            if len(self._levels) > self.PRUNE_THRESHOLD:
+                self._prune(now)
+            return 0.0
+
+    def _prune(self, now: float) -> None:
+        # Buckets refill from empty within a minute, so entries idle for
+        # longer are full and equivalent to no entry at all
+        stale = [
+            key
+            for key, (_, updated_at) in self._levels.items()
+            if now - updated_at > 60.0
+        ]
+        for key in stale:
+            del self._levels[key]
+
+    def level(self, key: str, capacity: float, rate: float, now: float) -> float:
+        with self._lock:
+            return self._level(key, capacity, rate, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._levels.clear()
+
+
+class DatabaseRateLimitStore(RateLimitStore):
+    """
+    Bucket levels in the application database, shared by every worker.
+
+    A charge reads the buckets' rows and writes the new levels with UPDATEs
+    conditional on each row's ``version``, all in one transaction. Two
+    workers spending the same tokens conflict and the loser retries, which
+    also holds on SQLite, where ``FOR UPDATE`` is a no-op. Levels are
+    stamped with wall-clock time so every process reads them the same way.
+    """
+
+    blocking = True
+    # Conflicting charges retried before asking the client to back off
+    MAX_CONFLICTS = 5
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal) -> None:
+        self.session_factory = session_factory
+
+    def _charge(self, db: Session, buckets: List[Bucket], now: float) -> float | None:
+        """Charge once; None if another worker changed a bucket meanwhile."""
+        rows = {
+            row.key: row
+            for row in db.query(RateLimitBucket)
+            .filter(RateLimitBucket.key.in_([b.key for b in buckets]))
+            .order_by(RateLimitBucket.key)
+            .with_for_update()
+        }
+        levels = []
+        for bucket in buckets:
+            row = rows.get(bucket.key)
+            if row is None:
+                levels.append(bucket.capacity)
+            else:
+                levels.append(
+                    _refilled(
+                        row.tokens, row.refilled_at, bucket.capacity, bucket.rate, now
+                    )
+                )
+        retry_after = _retry_after(buckets, levels)
+        if retry_after:
+            db.rollback()
+            return retry_after
+        for bucket, level in zip(buckets, levels):
+            row = rows.get(bucket.key)
+            if row is None:
+                db.add(
+                    RateLimitBucket(
+                        key=bucket.key,
+                        tokens=level - bucket.cost,
+                        refilled_at=now,
+                        version=0,
+                    )
+                )
+                continue
+            updated = (
+                db.query(RateLimitBucket)
+                .filter(
+                    RateLimitBucket.id == row.id,
+                    RateLimitBucket.version == row.version,
+                )
+                .update(
+                    {
+                        RateLimitBucket.tokens: level - bucket.cost,
+                        RateLimitBucket.refilled_at: now,
+                        RateLimitBucket.version: row.version + 1,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            if not updated:
+                db.rollback()
+                return None
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker created one of the buckets first
+            db.rollback()
+            return None
+        return 0.0
+
+    def acquire(self, buckets: List[Bucket], now: float) -> float:
+        for _ in range(self.MAX_CONFLICTS):
+            with self.session_factory() as db:
+                retry_after = self._charge(db, buckets, now)
+            if retry_after is not None:
+                return retry_after
+        # Heavily contended; a short back-off beats spinning here
+        return 1.0
+
+    def level(self, key: str, capacity: float, rate: float, now: float) -> float:
+        with self.session_factory() as db:
+            row = db.query(RateLimitBucket).filter(RateLimitBucket.key == key).first()
+            if row is None:
+                return capacity
+            return _refilled(row.tokens, row.refilled_at, capacity, rate, now)
+
+    def clear(self) -> None:
+        with self.session_factory() as db:
+            db.query(RateLimitBucket).delete(synchronize_session=False)
+            db.commit()
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request would overdraw a bucket."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Rate limit exceeded; retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Whole seconds for the ``Retry-After`` header (at least 1)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class AIRateLimiter:
+    """
+    Per-user and global request/token budgets for AI calls.
+
+    Limits are per minute; a value of 0 disables that bucket.
+    """
+
+    def __init__(
+        self,
+        store: RateLimitStore,
+        *,
+        user_requests: int,
+        user_tokens: int,
+        global_requests: int,
+        global_tokens: int,
+        clock=time.time,
+    ) -> None:
+        self.store = store
+        self.user_requests = user_requests
+        self.user_tokens = user_tokens
+        self.global_requests = global_requests
+        self.global_tokens = global_tokens
+        self.clock = clock
+
+    @staticmethod
+    def _bucket(key: str, per_minute: int, cost: float) -> Optional[Bucket]:
+        if per_minute <= 0:
+            return None
+        return Bucket(key, float(per_minute), per_minute / 60.0, float(cost))
+
+    def _buckets(self, user_id: int, tokens: int, requests: int) -> List[Bucket]:
+        candidates = [
+            self._bucket(f"user:{user_id}:requests", self.user_requests, requests),
+            self._bucket(f"user:{user_id}:tokens", self.user_tokens, tokens),
+            self._bucket("global:requests", self.global_requests, requests),
+            self._bucket("global:tokens", self.global_tokens, tokens),
+        ]
+        return [bucket for bucket in candidates if bucket is not None]
+
+    def check(self, user_id: int, estimated_tokens: int, requests: int = 1) -> None:
+        """
+        Charge ``requests`` LLM calls and ``estimated_tokens`` to the user
+        and globally.
+
+        Raises:
+            RateLimitExceeded: If any bucket cannot pay; nothing is charged.
+        """
+        retry_after = self.store.acquire(
+            self._buckets(user_id, estimated_tokens, requests), self.clock()
+        )
+        if retry_after:
+            raise RateLimitExceeded(retry_after)
+
+    def usage(self, user_id: int) -> Dict[str, Dict[str, Any]]:
+        """Remaining allowance for the user's request and token buckets."""
+        now = self.clock()
+        report: Dict[str, Dict[str, Any]] = {}
+        for name, per_minute in (
+            ("requests", self.user_requests),
+            ("tokens", self.user_tokens),
+        ):
+            if per_minute <= 0:
+                report[name] = {"limit": None, "remaining": None, "reset_seconds": 0}
+                continue
+            rate = per_minute / 60.0
+            level = self.store.level(
+                f"user:{user_id}:{name}", float(per_minute), rate, now
+            )
+            report[name] = {
+                "limit": per_minute,
+                "remaining": int(level),
+                "reset_seconds": math.ceil((per_minute - level) / rate),
+            }
+        return report
+
+
+def create_rate_limit_store() -> RateLimitStore:
+    """Build the store selected by AI_RATE_LIMIT_BACKEND."""
+    backend_name = settings.AI_RATE_LIMIT_BACKEND.lower()
+    if backend_name == "memory":
+        return InMemoryRateLimitStore()
+    if backend_name == "database":
+        return DatabaseRateLimitStore()
+    raise ValueError(
+        f"Unsupported AI_RATE_LIMIT_BACKEND: {settings.AI_RATE_LIMIT_BACKEND}"
+    )
+
+
+_rate_limiter: Optional[AIRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_ai_rate_limiter() -> Optional[AIRateLimiter]:
+    """Process-wide limiter, or None when AI rate limiting is disabled."""
+    global _rate_limiter
+    if not settings.AI_RATE_LIMIT_ENABLED:
+        return None
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = AIRateLimiter(
+                create_rate_limit_store(),
+                user_requests=settings.AI_RATE_LIMIT_USER_REQUESTS_PER_MINUTE,
+                user_tokens=settings.AI_RATE_LIMIT_USER_TOKENS_PER_MINUTE,
+                global_requests=settings.AI_RATE_LIMIT_GLOBAL_REQUESTS_PER_MINUTE,
+                global_tokens=settings.AI_RATE_LIMIT_GLOBAL_TOKENS_PER_MINUTE,
+            )
+        return _rate_limiter
+
+
+def reset_ai_rate_limiter() -> None:
+    """Drop the limiter so it is rebuilt from current settings (tests)."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = None
@@ -0,0 +1,300 @@
+"""
+Timeouts, retries and circuit breaking for outbound dependencies.
+
+Each external dependency (Azure Blob Storage, Groq, translation APIs) is
+registered once as a ``Dependency`` that owns its timeout, retry budget and
+circuit breaker. Service code wraps outbound calls with ``Dependency.call``
+(sync) or ``Dependency.acall`` (async); ``circuit_breaker_states`` feeds the
+``/health`` endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(
+            f"{name} is temporarily unavailable; retry in {retry_after:.0f}s"
+        )
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` transient failures in a row the circuit opens
+    and calls fail fast with CircuitOpenError. Once ``recovery_seconds`` have
+    passed a single probe call is let through (half-open); its outcome closes
+    or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int,
+        recovery_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.recovery_seconds = recovery_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if (
+            self._state == self.OPEN
+            and self._clock() - self._opened_at >= self.recovery_seconds
+        ):
+            self._state = self.HALF_OPEN
+        return self._state
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            retry_after = max(
+                self.recovery_seconds - (self._clock() - self._opened_at), 0.0
+            )
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit for %s closed", self.name)
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or (
+                self._failures >= self.failure_threshold
+            ):
+                if self._state != self.OPEN:
+                    logger.warning(
+                        "Circuit for %s opened after %d failures",
+                        self.name,
+                        self._failures,
+                    )
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """Give up a half-open probe without judging the dependency."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            retry_after = None
+            if state == self.OPEN:
+                retry_after = round(
+                    max(self.recovery_seconds - (self._clock() - self._opened_at), 0),
+                    1,
+                )
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_after_seconds": retry_after,
+            }
+
+
+def _never_transient(exc: BaseException) -> bool:
+    return False
+
+
+class Dependency:
+    """
+    Resilience policy for one outbound dependency.
+
+    Args:
+        name: Name reported on /health and in errors.
+        timeout: Per-attempt timeout in seconds. ``acall`` enforces it;
+            sync clients should pass it to their HTTP library.
+        max_retries: Extra attempts for idempotent calls.
+        transient: Predicate deciding whether an exception is a dependency
+            failure worth retrying (and counting against the breaker).
+            Other exceptions propagate at once and count as a healthy reply.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        timeout: float,
+        max_retries: int,
+        transient: Callable[[BaseException], bool] = _never_transient,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.name = name
+        self.timeout = timeout
+        self.max_retries = max(max_retries, 0)
+        self.transient = transient
+        self.backoff_base = (
+            settings.RETRY_BACKOFF_BASE_SECONDS
+            if backoff_base is None
+            else backoff_base
+        )
+        self.backoff_max = (
+            settings.RETRY_BACKOFF_MAX_SECONDS if backoff_max is None else backoff_max
+        )
+        self.breaker = breaker or CircuitBreaker(
+            name,
+            failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            recovery_seconds=settings.CIRCUIT_BREAKER_RECOVERY_SECONDS,
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number ``attempt``."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def _is_transient(self, exc: BaseException) -> bool:
+        return isinstance(exc, TimeoutError) or self.transient(exc)
+
+    def _attempts(self, idempotent: bool) -> int:
+        return 1 + (self.max_retries if idempotent else 0)
+
+    def call(
+        self, fn: Callable[..., T], *args: Any, idempotent: bool = True, **kwargs: Any
+    ) -> T:
+        """Call a blocking function under this dependency's policy."""
+        attempts = self._attempts(idempotent)
+        for attempt in range(attempts):
+            self.breaker.before_call()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as exc:
+                if not self._is_transient(exc):
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt + 1 >= attempts:
+                    raise
+                logger.info(
+                    "Retrying %s after %s (attempt %d)", self.name, exc, attempt + 1
+                )
+                time.sleep(self.backoff(attempt))
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+        raise AssertionError("unreachable")
+
+    async def acall(
+        self,
+        fn: Callable[..., Awaitable[T]],
+        *args: Any,
+        idempotent: bool = True,
+        **kwargs: Any,
+    ) -> T:
+        """Await a coroutine function with a timeout under this policy."""
+        attempts = self._attempts(idempotent)
+        for attempt in range(attempts):
+            self.breaker.before_call()
+            try:
+                result = await asyncio.wait_for(fn(*args, **kwargs), self.timeout)
+            except Exception as exc:
+                if not self._is_transient(exc):
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt + 1 >= attempts:
+                    raise
+                logger.info(
+                    "Retrying %s after %r (attempt %d)", self.name, exc, attempt + 1
+                )
+                await asyncio.sleep(self.backoff(attempt))
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+        raise AssertionError("unreachable")
+
+
+_dependencies: Dict[str, Dependency] = {}
+_registry_lock = threading.Lock()
+
+
+def register_dependency(
+    name: str,
+    *,
+    timeout: float,
+    max_retries: int,
+    transient: Callable[[BaseException], bool] = _never_transient,
+) -> Dependency:
+    """Return the dependency called ``name``, creating it on first use."""
+    with _registry_lock:
+        dependency = _dependencies.get(name)
+        if dependency is None:
+            dependency = Dependency(
+                name, timeout=timeout, max_retries=max_retries, transient=transient
+            )
+            _dependencies[name] = dependency
+        return dependency
+
+
+def circuit_breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Breaker snapshot for every registered dependency."""
+    with _registry_lock:
+        dependencies = list(_dependencies.values())
+    return {dep.name: dep.breaker.snapshot() for dep in dependencies}
+
+
+def reset_circuit_breakers() -> None:
+    """Close every breaker (used by tests and after maintenance)."""
+    with _registry_lock:
+        dependencies = list(_dependencies.values())
+    for dependency in dependencies:
+        dependency.breaker.reset()
@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -11,6 +12,17 @@ from app.core.monitoring import (
     shutdown_monitoring,
     monitoring,
 )
+from app.services.ai_service import close_ai_service, init_ai_service
+from app.services.image_service import (
+    init_image_processing,
+    shutdown_image_processing,
+)
+from app.services.share_link_reaper import start_share_link_reaper
+from app.services.storage_service import close_storage, init_storage
+from app.services.translation_service import (
+    close_translation_service,
+    init_translation_service,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -49,11 +61,27 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("Azure Application Insights monitoring is disabled")
 
+    # Shared file storage backend (Azure Blob or local filesystem)
+    await init_storage()
+    init_image_processing()
+    init_ai_service()
+    init_translation_service()
+    reaper_task = start_share_link_reaper()
+
     yield
 
     # Shutdown
     logger.info("Shutting down application...")
 
+    if reaper_task is not None:
+        reaper_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await reaper_task
+    await close_storage()
+    shutdown_image_processing()
+    await close_ai_service()
+    await close_translation_service()
+
     # Shutdown monitoring and flush telemetry
     if settings.ENABLE_AZURE_INSIGHTS:
         logger.info("Flushing Azure Application Insights telemetry...")
@@ -5,6 +5,10 @@ from app.models.education import Education
 from app.models.skill import Skill
 from app.models.project import Project
 from app.models.share_link import ShareLink
+from app.models.job import Job
+from app.models.translation_segment import TranslationSegment
+from app.models.translated_cv import TranslatedCV
+from app.models.rate_limit_bucket import RateLimitBucket
 
 __all__ = [
     "User",
@@ -14,4 +18,8 @@ __all__ = [
     "Skill",
     "Project",
     "ShareLink",
+    "Job",
+    "TranslationSegment",
+    "TranslatedCV",
+    "RateLimitBucket",
 ]
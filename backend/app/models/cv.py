@@ -32,3 +32,6 @@ class CV(Base, BaseModel):
     share_links = relationship(
         "ShareLink", back_populates="cv", cascade="all, delete-orphan"
     )
+    translations = relationship(
+        "TranslatedCV", back_populates="cv", cascade="all, delete-orphan"
+    )
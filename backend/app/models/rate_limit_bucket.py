@@ -0,0 +1,18 @@
+"""Shared token-bucket levels for AI rate limiting."""
+
+from sqlalchemy import Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.base_class import BaseModel
+
+
+class RateLimitBucket(Base, BaseModel):
+    """Level of one rate limit bucket, shared by every worker process."""
+
+    key: Mapped[str] = mapped_column(String(128), unique=True, nullable=False)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    # Wall-clock time (epoch seconds) the level was last computed at
+    refilled_at: Mapped[float] = mapped_column(Float, nullable=False)
+    # Bumped on every charge; concurrent charges of the same level conflict
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,6 +1,6 @@
 """Shareable link model for CV exports."""
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -10,14 +10,29 @@ from app.db.base_class import BaseModel
 class ShareLink(Base, BaseModel):
     """Stores generated shareable links for CV PDFs."""
 
-    cv_id = Column(
-        Integer, ForeignKey("cv.id", ondelete="CASCADE"), nullable=False, index=True
-    )
+    # Indexed through ix_sharelink_cv_user_expires (leading column)
+    cv_id = Column(Integer, ForeignKey("cv.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(
         Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True
     )
+    # Public /assets URL handed to recipients; redirects to a fresh signed URL
     url = Column(Text, nullable=False)
+    # Unguessable identifier used in the public URL
+    public_id = Column(String(32), nullable=True, unique=True, index=True)
+    blob_name = Column(Text, nullable=True)
     expires_at = Column(DateTime, nullable=False, index=True)
 
     cv = relationship("CV", back_populates="share_links")
     user = relationship("User", back_populates="share_links")
+
+    __table_args__ = (
+        # Serves the "latest active link for this CV" lookup; on PostgreSQL the
+        # url is stored in the index so the lookup is an index-only scan.
+        Index(
+            "ix_sharelink_cv_user_expires",
+            "cv_id",
+            "user_id",
+            expires_at.desc(),
+            postgresql_include=["url"],
+        ),
+    )
@@ -0,0 +1,28 @@
+"""Stored translations of a CV."""
+
+from sqlalchemy import JSON, Column, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+from app.db.base_class import BaseModel
+
+
+class TranslatedCV(Base, BaseModel):
+    """A CV translated into one language, kept to be served and updated."""
+
+    cv_id = Column(
+        Integer, ForeignKey("cv.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    language = Column(String(10), nullable=False)
+    source_language = Column(String(10), nullable=False)
+    # Translated CVTranslation payload served to clients
+    content = Column(JSON, nullable=False)
+    # Per text field: hash of the source text it was translated from and the
+    # translation, keyed e.g. "summary" or "work_experiences/12/description"
+    segments = Column(JSON, nullable=False, default=dict)
+
+    cv = relationship("CV", back_populates="translations")
+
+    __table_args__ = (
+        UniqueConstraint("cv_id", "language", name="uq_translatedcv_cv_language"),
+    )
@@ -0,0 +1,25 @@
+"""Persistent translation memory entries."""
+
+from sqlalchemy import Column, String, Text, UniqueConstraint
+
+from app.db.base import Base
+from app.db.base_class import BaseModel
+
+
+class TranslationSegment(Base, BaseModel):
+    """A translated text segment, shared across users and CVs."""
+
+    source_language = Column(String(10), nullable=False)
+    target_language = Column(String(10), nullable=False)
+    # SHA-256 of the normalized source text; the text itself is not stored
+    text_hash = Column(String(64), nullable=False)
+    translated_text = Column(Text, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "source_language",
+            "target_language",
+            "text_hash",
+            name="uq_translationsegment_lookup",
+        ),
+    )
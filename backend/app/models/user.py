@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String
+from sqlalchemy import JSON, Boolean, Column, String
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from app.db.base import Base
 from app.db.base_class import BaseModel
@@ -10,7 +10,17 @@ class User(Base, BaseModel):
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     full_name = Column(String, nullable=True)
-    profile_picture_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Blob names (not signed URLs) so links never expire in the database
+    profile_picture_blob: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Resized renditions of the profile picture: {"64": blob_name, ...}
+    profile_picture_variant_blobs: Mapped[dict | None] = mapped_column(
+        JSON, nullable=True
+    )
+    # Content hash of the current upload, part of its blob names; used as
+    # the ``v`` of asset URLs so caches drop the previous picture
+    profile_picture_version: Mapped[str | None] = mapped_column(
+        String(16), nullable=True
+    )
     is_active = Column(Boolean, default=True, nullable=False)
     is_superuser = Column(Boolean, default=False, nullable=False)
 
@@ -19,3 +29,4 @@ class User(Base, BaseModel):
     share_links = relationship(
         "ShareLink", back_populates="user", cascade="all, delete-orphan"
     )
+    jobs = relationship("Job", back_populates="user", cascade="all, delete-orphan")
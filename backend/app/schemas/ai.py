@@ -1,6 +1,6 @@
 """Pydantic schemas for AI optimization endpoints."""
 
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -17,6 +17,9 @@ class OptimizeDescriptionRequest(BaseModel):
         default_factory=dict,
         description="Additional context (position, company, duration, etc.)",
     )
+    regenerate: bool = Field(
+        default=False, description="Bypass cached responses and ask the AI again"
+    )
 
 
 class OptimizeDescriptionResponse(BaseModel):
@@ -26,6 +29,47 @@ class OptimizeDescriptionResponse(BaseModel):
     optimized: str = Field(..., description="AI-optimized text")
 
 
+class OptimizeAllRequest(BaseModel):
+    """Request schema for optimizing every description in a CV."""
+
+    sections: List[Literal["work_experience", "project", "education"]] = Field(
+        default_factory=lambda: ["work_experience", "project", "education"],
+        description="CV sections whose descriptions are optimized",
+    )
+    stream: bool = Field(
+        default=False,
+        description="Stream each result as a Server-Sent Event as it completes",
+    )
+    regenerate: bool = Field(
+        default=False, description="Bypass cached responses and ask the AI again"
+    )
+
+
+class OptimizeAllItemResult(BaseModel):
+    """Optimization outcome for a single CV entry."""
+
+    section: str = Field(..., description="CV section of the entry")
+    item_id: int = Field(..., description="ID of the entry within its section")
+    original: str = Field(..., description="Original description")
+    optimized: Optional[str] = Field(
+        default=None, description="AI-optimized description, if successful"
+    )
+    error: Optional[str] = Field(
+        default=None, description="Why this entry could not be optimized"
+    )
+
+
+class OptimizeAllResponse(BaseModel):
+    """Response schema for optimizing every description in a CV."""
+
+    cv_id: int = Field(..., description="Optimized CV")
+    results: List[OptimizeAllItemResult] = Field(
+        ..., description="Per-entry results, in CV order"
+    )
+    succeeded: int = Field(..., description="Entries optimized successfully")
+    failed: int = Field(..., description="Entries that failed")
+
+
 class GenerateSummaryRequest(BaseModel):
     """Request schema for generating professional summary."""
 
@@ -33,6 +77,9 @@ class GenerateSummaryRequest(BaseModel):
     tone: Optional[str] = Field(
         default="professional", description="Tone (professional, casual, formal)"
     )
+    regenerate: bool = Field(
+        default=False, description="Bypass cached responses and ask the AI again"
+    )
 
 
 class GenerateSummaryResponse(BaseModel):
@@ -48,12 +95,27 @@ class GenerateSummaryPreviewRequest(BaseModel):
     tone: Optional[str] = Field(
         default="professional", description="Tone (professional, casual, formal)"
     )
+    regenerate: bool = Field(
+        default=False, description="Bypass cached responses and ask the AI again"
+    )
 
 
 class ScoreCVRequest(BaseModel):
     """Request schema for scoring a CV."""
 
     cv_id: int = Field(..., description="CV ID to score")
+    mode: Literal["deep", "sections", "fast"] = Field(
+        default="deep",
+        description=(
+            "deep: LLM review of the whole CV; sections: LLM review per "
+            "section, re-scoring only sections changed since the last run "
+            "(requires the AI response cache); fast: local deterministic "
+            "scoring"
+        ),
+    )
+    regenerate: bool = Field(
+        default=False, description="Bypass cached responses and ask the AI again"
+    )
 
 
 class MetricScore(BaseModel):
@@ -63,15 +125,134 @@ class MetricScore(BaseModel):
     reason: str = Field(..., description="Short explanation for the score")
 
 
+class SectionScoreResult(BaseModel):
+    """Scores for one CV section in sections mode."""
+
+    key: str = Field(
+        ..., description="Section key, e.g. general, work_experience:3, education"
+    )
+    label: str = Field(..., description="Human-readable section name")
+    scorer: Literal["llm", "local"] = Field(
+        ..., description="llm, or local when the LLM could not score the section"
+    )
+    cached: bool = Field(
+        default=False, description="Served from cache; the section was unchanged"
+    )
+    fallback_reason: str | None = Field(
+        default=None, description="Why the local engine scored the section"
+    )
+    metrics: Dict[str, MetricScore] = Field(
+        default_factory=dict, description="Scores for the metrics that apply"
+    )
+
+
 class ScoreCVResponse(BaseModel):
     """Response schema for CV score/assessment."""
 
     raw: str = Field(..., description="Raw score/feedback string returned by AI")
+    mode: Literal["deep", "sections", "fast"] = Field(
+        default="deep", description="Scorer that produced this result"
+    )
     impact_achievement_density: MetricScore | None = None
     clarity_readability: MetricScore | None = None
     action_verb_strength: MetricScore | None = None
     professionalism: MetricScore | None = None
+    section_completeness: MetricScore | None = Field(
+        default=None, description="Presence of key sections (fast mode only)"
+    )
     summary_insight: str | None = Field(
         default=None,
         description="Optional combined overview of strengths and weaknesses",
     )
+    sections: List[SectionScoreResult] | None = Field(
+        default=None, description="Per-section scores (sections mode only)"
+    )
+    local_sections: int | None = Field(
+        default=None,
+        description=(
+            "Sections scored by the local engine because the LLM could not "
+            "(sections mode only)"
+        ),
+    )
+
+
+class AICacheStatsResponse(BaseModel):
+    """Response schema for AI response cache statistics."""
+
+    enabled: bool = Field(..., description="Whether responses are cached")
+    backend: str | None = Field(default=None, description="Cache backend in use")
+    entries: int = Field(default=0, description="Stored responses")
+    hits: int = Field(default=0, description="Lookups served from the cache")
+    misses: int = Field(default=0, description="Lookups that called the AI")
+    hit_rate: float = Field(default=0.0, description="hits / (hits + misses)")
+    saved_tokens: int = Field(
+        default=0, description="LLM tokens not spent thanks to cache hits"
+    )
+
+
+class LatencyHistogram(BaseModel):
+    """Histogram of durations in milliseconds."""
+
+    count: int = Field(default=0, description="Observations")
+    sum: float = Field(default=0.0, description="Sum of observed values (ms)")
+    mean: float = Field(default=0.0, description="Mean observed value (ms)")
+    buckets: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Cumulative count of observations <= each bound (ms)",
+    )
+
+
+class LLMEndpointMetrics(BaseModel):
+    """LLM calls made while serving one endpoint."""
+
+    calls: int = Field(default=0, description="Upstream LLM calls")
+    outcomes: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Calls by outcome (success, error, timeout, circuit_open, cancelled)",
+    )
+    models: Dict[str, int] = Field(default_factory=dict, description="Calls by model")
+    retries: int = Field(default=0, description="Retried attempts")
+    prompt_tokens: int = Field(default=0, description="Prompt tokens used")
+    completion_tokens: int = Field(default=0, description="Completion tokens used")
+    estimated_cost_usd: float = Field(
+        default=0.0, description="Token spend at the configured prices"
+    )
+    latency_ms: LatencyHistogram = Field(default_factory=LatencyHistogram)
+    time_to_first_token_ms: LatencyHistogram = Field(default_factory=LatencyHistogram)
+    upstream_queue_ms: LatencyHistogram = Field(
+        default_factory=LatencyHistogram,
+        description="Time spent queued at Groq, when reported",
+    )
+
+
+class LLMMetricsResponse(BaseModel):
+    """Response schema for LLM call metrics."""
+
+    azure_insights_enabled: bool = Field(
+        ..., description="Whether metrics are also exported to Application Insights"
+    )
+    endpoints: Dict[str, LLMEndpointMetrics] = Field(
+        default_factory=dict, description="Metrics keyed by route path"
+    )
+
+
+class QuotaUsage(BaseModel):
+    """Remaining allowance in one per-minute budget."""
+
+    limit: int | None = Field(default=None, description="Allowance per minute")
+    remaining: int | None = Field(default=None, description="Allowance left now")
+    reset_seconds: int = Field(
+        default=0, description="Seconds until the allowance is fully refilled"
+    )
+
+
+class AIQuotaResponse(BaseModel):
+    """Response schema for the current user's AI quota."""
+
+    enabled: bool = Field(..., description="Whether AI calls are rate limited")
+    requests: QuotaUsage = Field(
+        default_factory=QuotaUsage, description="AI requests per minute"
+    )
+    tokens: QuotaUsage = Field(
+        default_factory=QuotaUsage, description="Estimated LLM tokens per minute"
+    )
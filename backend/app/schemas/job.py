@@ -0,0 +1,26 @@
+"""Schemas for background job endpoints."""
+
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class JobResponse(BaseModel):
+    """Status of a background job, with its result once it has succeeded."""
+
+    id: int
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    attempts: int = Field(..., description="Attempts started so far")
+    max_attempts: int
+    result: Optional[Dict[str, Any]] = Field(
+        default=None, description="Same body the synchronous endpoint returns"
+    )
+    error: Optional[str] = Field(
+        default=None, description="Error of the latest failed attempt"
+    )
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
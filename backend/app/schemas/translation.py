@@ -113,3 +113,49 @@ class TranslateCVResponse(BaseModel):
     """Response payload for translated CV."""
 
     translation: CVTranslation
+
+
+class TranslatedCVResponse(BaseModel):
+    """A stored translation of a CV."""
+
+    cv_id: int
+    language: str
+    source_language: str
+    translation: CVTranslation
+    updated_at: datetime
+    stale: bool = Field(
+        False, description="Whether the CV text changed since it was translated"
+    )
+
+
+class RetranslateCVResponse(TranslatedCVResponse):
+    """A stored translation of a CV just brought up to date."""
+
+    translated_fields: int = Field(
+        ..., description="Text fields sent for translation by this request"
+    )
+    reused_fields: int = Field(
+        ..., description="Text fields kept from the stored translation"
+    )
+
+
+class TargetTranslationResult(BaseModel):
+    """Translation of a CV into one of several requested languages."""
+
+    language: str
+    translation: Optional[CVTranslation] = None
+    error: Optional[str] = Field(
+        default=None, description="Why this language could not be translated"
+    )
+
+
+class MultiTranslateCVResponse(BaseModel):
+    """Translations of a stored CV into several languages."""
+
+    cv_id: int
+    source_language: str
+    results: List[TargetTranslationResult] = Field(
+        ..., description="Per-language results, in the requested order"
+    )
+    succeeded: int
+    failed: int
@@ -1,5 +1,7 @@
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, model_validator
+
+from app.services.storage_service import asset_url
 
 
 # Shared properties
@@ -7,6 +9,7 @@ class UserBase(BaseModel):
     email: EmailStr
     full_name: str | None = None
     profile_picture_url: str | None = None
+    profile_picture_variants: dict[str, str] | None = None
     is_active: bool = True
     is_superuser: bool = False
 
@@ -29,9 +32,28 @@ class UserInDBBase(UserBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    # Stored blob names; only the /assets URLs built from them are returned
+    profile_picture_blob: str | None = Field(default=None, exclude=True)
+    profile_picture_variant_blobs: dict[str, str] | None = Field(
+        default=None, exclude=True
+    )
+    profile_picture_version: str | None = Field(default=None, exclude=True)
 
     model_config = ConfigDict(from_attributes=True)
 
+    @model_validator(mode="after")
+    def _profile_picture_urls(self) -> "UserInDBBase":
+        """Long-lived redirect URLs for the picture and its resized variants."""
+        version = self.profile_picture_version
+        if self.profile_picture_blob:
+            self.profile_picture_url = asset_url("pfp", self.id, v=version)
+        if self.profile_picture_variant_blobs:
+            self.profile_picture_variants = {
+                size: asset_url("pfp", self.id, size=size, v=version)
+                for size in self.profile_picture_variant_blobs
+            }
+        return self
+
 
 # Properties to return to client
 class User(UserInDBBase):
@@ -0,0 +1,129 @@
+"""Concurrent optimization of every description in a CV."""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, NamedTuple, Optional
+
+import anyio
+
+from app.core.config import settings
+from app.services.ai_service import AIService
+
+logger = logging.getLogger(__name__)
+
+
+class BatchItem(NamedTuple):
+    """One CV entry whose description should be optimized."""
+
+    section: str
+    item_id: int
+    field_type: str
+    original_text: str
+    context: dict
+
+
+class BatchItemResult(NamedTuple):
+    """Outcome for one entry: ``optimized`` on success, ``error`` otherwise."""
+
+    item: BatchItem
+    optimized: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ConcurrencyLimiter:
+    """
+    Caps concurrent AI calls per user and across the whole process.
+
+    A user's slot is taken before a global one, so a single large batch
+    waiting on its own limit never holds global capacity idle.
+    """
+
+    def __init__(self, global_limit: int, per_user_limit: int) -> None:
+        self.global_limit = max(global_limit, 1)
+        self.per_user_limit = max(per_user_limit, 1)
+        self._global: Optional[anyio.Semaphore] = None
+        # user_id -> [semaphore, number of holders and waiters]
+        self._users: dict[int, list] = {}
+
+    @asynccontextmanager
+    async def slot(self, user_id: int) -> AsyncIterator[None]:
+        if self._global is None:
+            self._global = anyio.Semaphore(self.global_limit)
+        entry = self._users.setdefault(
+            user_id, [anyio.Semaphore(self.per_user_limit), 0]
+        )
+        entry[1] += 1
+        try:
+            async with entry[0], self._global:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._users.pop(user_id, None)
+
+    def active_users(self) -> int:
+        return len(self._users)
+
+
+_limiter: Optional[ConcurrencyLimiter] = None
+
+
+def get_batch_limiter() -> ConcurrencyLimiter:
+    """Process-wide limiter shared by all optimize-all requests."""
+    global _limiter
+    if _limiter is None:
+        _limiter = ConcurrencyLimiter(
+            global_limit=settings.AI_BATCH_MAX_CONCURRENCY,
+            per_user_limit=settings.AI_BATCH_MAX_CONCURRENCY_PER_USER,
+        )
+    return _limiter
+
+
+def reset_batch_limiter() -> None:
+    """Drop the limiter so it is rebuilt from current settings."""
+    global _limiter
+    _limiter = None
+
+
+async def optimize_items(
+    ai_service: AIService,
+    items: Iterable[BatchItem],
+    *,
+    user_id: int,
+    limiter: ConcurrencyLimiter,
+    regenerate: bool = False,
+) -> AsyncIterator[BatchItemResult]:
+    """
+    Optimize ``items`` concurrently and yield results as they complete.
+
+    Failures are reported on the item's result instead of raised, so one
+    bad entry does not fail the batch. If the consumer stops early, the
+    remaining calls are cancelled.
+    """
+
+    async def optimize(item: BatchItem) -> BatchItemResult:
+        async with limiter.slot(user_id):
+            try:
+                optimized = await ai_service.optimize_description(
+                    original_text=item.original_text,
+                    field_type=item.field_type,
+                    context=item.context,
+                    regenerate=regenerate,
+                )
+            except Exception as e:
+                logger.warning(
+                    "Optimizing %s %s failed: %s", item.section, item.item_id, e
+                )
+                return BatchItemResult(item, error=str(e))
+        return BatchItemResult(item, optimized=optimized)
+
+    tasks = [asyncio.create_task(optimize(item)) for item in items]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+        with anyio.CancelScope(shield=True):
+            await asyncio.gather(*tasks, return_exceptions=True)
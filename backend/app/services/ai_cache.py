@@ -0,0 +1,173 @@
+"""Response cache for AI completions keyed by a hash of the request inputs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CachedCompletion(NamedTuple):
+    """A stored completion and the tokens it cost to produce."""
+
+    text: str
+    total_tokens: int
+
+
+class AICacheBackend(ABC):
+    """Storage for cached completions; implementations must be thread-safe."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedCompletion]:
+        """Return the entry for ``key`` or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: CachedCompletion, ttl_seconds: int) -> None:
+        """Store ``value`` under ``key`` for ``ttl_seconds``."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored (possibly expired) entries."""
+
+
+class InMemoryCacheBackend(AICacheBackend):
+    """Per-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(max_entries, 1)
+        self._entries: OrderedDict[str, tuple[float, CachedCompletion]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedCompletion]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedCompletion, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace so trivial edits still hit."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+class AIResponseCache:
+    """
+    Cache of AI completions with hit-rate and saved-token accounting.
+
+    Keys hash the model, prompt template version, operation (e.g. the field
+    type being optimized) and the normalized inputs, so a prompt or model
+    change never serves stale output.
+    """
+
+    def __init__(self, backend: AICacheBackend, ttl_seconds: int) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+
+    @staticmethod
+    def make_key(
+        *, model: str, template_version: int, operation: str, inputs: Any
+    ) -> str:
+        payload = json.dumps(
+            {
+                "model": model,
+                "template_version": template_version,
+                "operation": operation,
+                "inputs": inputs,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.saved_tokens += value.total_tokens
+        return value.text
+
+    def set(self, key: str, text: str, total_tokens: int) -> None:
+        self.backend.set(key, CachedCompletion(text, total_tokens), self.ttl_seconds)
+
+    def contains(self, key: str) -> bool:
+        """Whether ``key`` is cached, without counting a lookup."""
+        return self.backend.get(key) is not None
+
+    def delete(self, key: str) -> None:
+        """Forget a response, e.g. one that turned out to be unusable."""
+        self.backend.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "entries": len(self.backend),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "saved_tokens": self.saved_tokens,
+            }
+
+
+def create_ai_response_cache() -> Optional[AIResponseCache]:
+    """Build the cache selected by AI_CACHE_BACKEND, or None when disabled."""
+    if not settings.AI_CACHE_ENABLED:
+        return None
+    backend_name = settings.AI_CACHE_BACKEND.lower()
+    if backend_name == "memory":
+        backend: AICacheBackend = InMemoryCacheBackend(settings.AI_CACHE_MAX_ENTRIES)
+    else:
+        raise ValueError(f"Unsupported AI_CACHE_BACKEND: {settings.AI_CACHE_BACKEND}")
+    return AIResponseCache(backend, ttl_seconds=settings.AI_CACHE_TTL_SECONDS)
@@ -1,33 +1,308 @@
 """AI optimization service using Groq LLM."""
 
-from groq import APIConnectionError, Groq
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, NamedTuple, Sequence
+
+import anyio
+import httpx
+from groq import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    AsyncGroq,
+    InternalServerError,
+    RateLimitError,
+)
 
 from app.core.config import settings
+from app.core.coalescing import register_flight
+from app.core.monitoring import LLMCallRecord, current_llm_endpoint, monitoring
+from app.core.resilience import CircuitOpenError, register_dependency
+from app.services.ai_cache import (
+    AIResponseCache,
+    create_ai_response_cache,
+    normalize_text,
+)
+from app.services.prompt_budget import (
+    BudgetItem,
+    by_recency,
+    fit_to_budget,
+    truncate_words,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a prompt below changes so cached responses are not reused
+PROMPT_TEMPLATE_VERSION = 2
+# Descriptions, summaries and skill lists are shortened to these sizes
+# when a CV-wide prompt exceeds its token budget
+_TRIMMED_DESCRIPTION_WORDS = 40
+_TRIMMED_SUMMARY_WORDS = 60
+_TRIMMED_SKILL_COUNTS = (20, 10)
+# Context keys that feed the optimize prompt (and therefore the cache key)
+OPTIMIZE_CONTEXT_KEYS = ("position", "company", "duration")
+# What each scoring metric measures, as described in section score prompts
+SCORE_METRIC_CRITERIA = {
+    "impact_achievement_density": (
+        "Impact & Achievement Density - presence of accomplishments, results "
+        "and quantifiable outcomes, beyond task lists."
+    ),
+    "clarity_readability": (
+        "Clarity & Readability - sentence simplicity, skimmability, structure "
+        "and absence of filler."
+    ),
+    "action_verb_strength": (
+        "Action Verb Strength - bullet points and descriptions start with "
+        "strong, specific, active verbs and avoid passive language."
+    ),
+    "professionalism": (
+        "Professionalism - tone consistency, formality, appropriate language "
+        "and correct tense."
+    ),
+}
+GROQ_UNREACHABLE = (
+    "Unable to reach Groq API. Check internet connectivity and GROQ_API_KEY."
+)
+
+
+class CompletionRequest(NamedTuple):
+    """A fully rendered prompt plus its sampling options and cache key."""
+
+    prompt: str
+    temperature: float
+    max_tokens: int
+    cache_key: str
+    error_message: str
+    # Reported with the call's metrics, e.g. "optimize:project"
+    operation: str = "completion"
+    # The prompt asks for a JSON object; replies without one are not cached
+    expects_json: bool = False
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Connection failures, timeouts, throttling and 5xx replies."""
+    if isinstance(exc, (APIConnectionError, RateLimitError, InternalServerError)):
+        return True
+    return isinstance(exc, APIStatusError) and exc.status_code >= 500
+
+
+def _skill_levels(names: Sequence[str]) -> tuple[str, ...]:
+    """All skills, then the first few, as budget levels."""
+    return tuple(
+        ", ".join(names[:limit]) for limit in (len(names), *_TRIMMED_SKILL_COUNTS)
+    )
+
+
+def _described_levels(
+    entry: dict, render: Callable[[dict, str | None], str]
+) -> tuple[str, ...]:
+    """Budget levels for an entry: full, trimmed description, headline, omitted."""
+    description = entry.get("description")
+    return (
+        render(entry, description),
+        render(entry, truncate_words(description, _TRIMMED_DESCRIPTION_WORDS)),
+        render(entry, "(omitted for length)" if description else None),
+        "",
+    )
+
+
+def _entry_lines(rendered: Sequence[str]) -> str:
+    """Join the kept entries and note how many were left out."""
+    kept = [text for text in rendered if text]
+    omitted = len(rendered) - len(kept)
+    if omitted:
+        noun = "entry" if omitted == 1 else "entries"
+        kept.append(f"({omitted} older {noun} omitted for length)")
+    return "\n".join(kept) if kept else "Not provided"
+
+
+def _is_cacheable(text: str, expects_json: bool) -> bool:
+    """Whether a reply is worth serving again: non-empty and, if asked, JSON."""
+    if not text:
+        return False
+    if not expects_json:
+        return True
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        return False
+    try:
+        return isinstance(json.loads(text[start : end + 1]), dict)
+    except ValueError:
+        return False
+
+
+def _outcome(exc: BaseException | None) -> str:
+    if exc is None:
+        return "success"
+    if isinstance(exc, (asyncio.CancelledError, GeneratorExit)):
+        return "cancelled"
+    if isinstance(exc, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(exc, (TimeoutError, APITimeoutError)):
+        return "timeout"
+    return "error"
+
+
+class _LLMCall:
+    """Times one upstream completion, counts its attempts and reports it."""
+
+    def __init__(
+        self, client: AsyncGroq, model: str, operation: str, streamed: bool
+    ) -> None:
+        self.client = client
+        self.model = model
+        self.operation = operation
+        self.streamed = streamed
+        self.attempts = 0
+        self.usage: Any = None
+        self.started = time.perf_counter()
+        self.first_token_at: float | None = None
+
+    async def create(self, **kwargs: Any) -> Any:
+        """``chat.completions.create``; called once per (re)try."""
+        self.attempts += 1
+        return await self.client.chat.completions.create(**kwargs)
+
+    def first_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+    def finish(self, exc: BaseException | None = None) -> None:
+        finished = time.perf_counter()
+        usage = self.usage
+        # Groq reports how long the request waited in its queue
+        queue_time = getattr(usage, "queue_time", None)
+        monitoring.track_llm_call(
+            LLMCallRecord(
+                endpoint=current_llm_endpoint(),
+                operation=self.operation,
+                model=self.model,
+                outcome=_outcome(exc),
+                latency_ms=(finished - self.started) * 1000,
+                time_to_first_token_ms=(
+                    (self.first_token_at - self.started) * 1000
+                    if self.first_token_at is not None
+                    else None
+                ),
+                upstream_queue_ms=(
+                    queue_time * 1000 if isinstance(queue_time, (int, float)) else None
+                ),
+                prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+                retries=max(self.attempts - 1, 0),
+                streamed=self.streamed,
+            )
+        )
 
 
 class AIService:
     """Service for AI-powered CV optimization."""
 
-    def __init__(self):
-        """Initialize Groq client."""
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient | None = None,
+        cache: AIResponseCache | None = None,
+    ):
+        """
+        Initialize the async Groq client.
+
+        Args:
+            http_client: Shared connection pool; the SDK creates its own
+                when omitted.
+            cache: Response cache consulted before calling the LLM.
+        """
         if not settings.GROQ_API_KEY:
             raise ValueError("GROQ_API_KEY not configured")
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+        # Retries are handled by the "groq" resilience policy instead
+        self.client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            base_url=settings.GROQ_BASE_URL or None,
+            timeout=settings.GROQ_TIMEOUT_SECONDS,
+            max_retries=0,
+            http_client=http_client,
+        )
         self.model = settings.GROQ_MODEL or "llama3-70b-8192"
+        self.dependency = register_dependency(
+            "groq",
+            timeout=settings.GROQ_TIMEOUT_SECONDS,
+            max_retries=settings.GROQ_MAX_RETRIES,
+            transient=_is_transient,
+        )
+        self.cache = cache
+
+    def _cache_key(self, operation: str, inputs: dict) -> str:
+        return AIResponseCache.make_key(
+            model=self.model,
+            template_version=PROMPT_TEMPLATE_VERSION,
+            operation=operation,
+            inputs=inputs,
+        )
 
-    def optimize_description(
-        self, original_text: str, field_type: str, context: dict
+    async def _complete(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        *,
+        cache_key: str | None = None,
+        regenerate: bool = False,
+        operation: str = "completion",
+        expects_json: bool = False,
     ) -> str:
         """
-        Optimize a CV field description using AI.
+        Run a single-prompt chat completion and return the stripped text.
+
+        With a ``cache_key`` a cached response is returned when available;
+        ``regenerate`` skips the lookup but still stores the fresh response.
+        Empty replies, and replies without a JSON object when
+        ``expects_json`` is set, are returned but not cached. Calls that
+        reach the LLM are reported to monitoring.
+        """
+        cache = self.cache
+        if cache is not None and cache_key is not None and not regenerate:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        call = _LLMCall(self.client, self.model, operation, streamed=False)
+        try:
+            response = await self.dependency.acall(
+                call.create,
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        except BaseException as exc:
+            call.finish(exc)
+            raise
+        # Without streaming the first token arrives with the whole reply
+        call.first_token()
+        call.usage = getattr(response, "usage", None)
+        call.finish()
+        text = (response.choices[0].message.content or "").strip()
+        if (
+            cache is not None
+            and cache_key is not None
+            and _is_cacheable(text, expects_json)
+        ):
+            usage = getattr(response, "usage", None)
+            cache.set(cache_key, text, getattr(usage, "total_tokens", 0) or 0)
+        return text
+
+    def build_optimize_request(
+        self, original_text: str, field_type: str, context: dict
+    ) -> CompletionRequest:
+        """
+        Build the completion request for optimizing a CV field description.
 
         Args:
             original_text: Original description text
             field_type: Type of field (work_experience, education, project, summary)
             context: Additional context (position, company, duration, etc.)
-
-        Returns:
-            Optimized description text
         """
         # Build context string
         context_parts = []
@@ -122,64 +397,68 @@ Original text:
 
 Return the improved version, keeping the same general format."""
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,  # Balanced creativity and consistency
-                max_tokens=600,  # Allow for detailed responses
-            )
-
-            optimized_text = response.choices[0].message.content.strip()
-            return optimized_text
-
-        except APIConnectionError as e:
-            # Surface a clearer error so the API can return 503 (service unavailable)
-            raise ConnectionError(
-                "Unable to reach Groq API. Check internet connectivity and GROQ_API_KEY."
-            ) from e
-        except Exception as e:
-            raise Exception(f"Failed to optimize text: {str(e)}") from e
+        # Balanced creativity and consistency; allow for detailed responses
+        return CompletionRequest(
+            prompt=prompt,
+            temperature=0.7,
+            max_tokens=600,
+            cache_key=self._cache_key(
+                f"optimize:{field_type}",
+                {
+                    "text": normalize_text(original_text),
+                    "context": {
+                        key: normalize_text(str(context[key]))
+                        for key in OPTIMIZE_CONTEXT_KEYS
+                        if context.get(key)
+                    },
+                },
+            ),
+            error_message="Failed to optimize text",
+            operation=f"optimize:{field_type}",
+        )
 
-    def generate_summary(self, cv_data: dict, tone: str = "professional") -> str:
+    def build_summary_request(
+        self, cv_data: dict, tone: str = "professional"
+    ) -> CompletionRequest:
         """
-        Generate a professional summary based on CV data.
+        Build the completion request for a professional summary.
 
         Args:
             cv_data: Full CV data including work experiences, education, skills
             tone: Tone of the summary (professional, casual, formal)
-
-        Returns:
-            Generated professional summary
         """
-        # Extract key information
-        work_experiences = cv_data.get("work_experiences", [])
-        educations = cv_data.get("educations", [])
-        skills = cv_data.get("skills", [])
-
-        # Build context
-        work_summary = []
-        for exp in work_experiences[:3]:  # Use top 3 experiences
-            work_summary.append(f"- {exp.get('position')} at {exp.get('company')}")
-
-        education_summary = []
-        for edu in educations[:2]:  # Use top 2 education entries
-            education_summary.append(
-                f"- {edu.get('degree')} from {edu.get('institution')}"
+        # Most recent entries are kept longest when the CV exceeds the budget
+        work_experiences = by_recency(cv_data.get("work_experiences", []))
+        educations = by_recency(cv_data.get("educations", []))
+        skill_names = [s.get("name") for s in cv_data.get("skills", [])]
+
+        items = [
+            BudgetItem((f"- {exp.get('position')} at {exp.get('company')}", ""), rank)
+            for rank, exp in enumerate(work_experiences)
+        ]
+        items += [
+            BudgetItem(
+                (f"- {edu.get('degree')} from {edu.get('institution')}", ""), rank + 1
             )
+            for rank, edu in enumerate(educations)
+        ]
+        items.append(BudgetItem(_skill_levels(skill_names), 2))
+        rendered = fit_to_budget(items, settings.AI_SUMMARY_PROMPT_TOKEN_BUDGET)
 
-        skills_list = [s.get("name") for s in skills[:10]]  # Top 10 skills
+        work_summary = _entry_lines(rendered[: len(work_experiences)])
+        education_summary = _entry_lines(rendered[len(work_experiences) : -1])
+        skills_list = rendered[-1]
 
         prompt = f"""You are a professional CV writer. Generate a compelling professional summary for this candidate.
 
 Work Experience:
-{chr(10).join(work_summary) if work_summary else "Not provided"}
+{work_summary}
 
 Education:
-{chr(10).join(education_summary) if education_summary else "Not provided"}
+{education_summary}
 
 Key Skills:
-{", ".join(skills_list) if skills_list else "Not provided"}
+{skills_list or "Not provided"}
 
 Requirements:
 - Create a {tone} professional summary
@@ -191,27 +470,19 @@ Requirements:
 
 Return ONLY the professional summary as a single paragraph."""
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.8,  # Slightly higher for creative summaries
-                max_tokens=400,
-            )
-
-            summary = response.choices[0].message.content.strip()
-            return summary
-
-        except APIConnectionError as e:
-            raise ConnectionError(
-                "Unable to reach Groq API. Check internet connectivity and GROQ_API_KEY."
-            ) from e
-        except Exception as e:
-            raise Exception(f"Failed to generate summary: {str(e)}") from e
+        # Slightly higher temperature for creative summaries
+        return CompletionRequest(
+            prompt=prompt,
+            temperature=0.8,
+            max_tokens=400,
+            cache_key=self._cache_key("summary", {"prompt": prompt}),
+            error_message="Failed to generate summary",
+            operation="summary",
+        )
 
-    def score_cv(self, cv_data: dict) -> str:
+    def build_score_request(self, cv_data: dict) -> CompletionRequest:
         """
-        Evaluate key quality metrics for a CV:
+        Build the completion request evaluating key quality metrics for a CV:
         - Impact & Achievement Density
         - Clarity & Readability
         - Action Verb Strength
@@ -219,76 +490,96 @@ Return ONLY the professional summary as a single paragraph."""
 
         Args:
             cv_data: Full CV data including general info, work experiences, education, skills, and projects.
-
-        Returns:
-            AI-generated score/assessment text.
         """
 
-        # Extract sections
+        # Extract sections, most recent entries first
         general = cv_data.get("general", {})
-        work_experiences = cv_data.get("work_experiences", [])
-        educations = cv_data.get("educations", [])
-        skills = cv_data.get("skills", [])
-        projects = cv_data.get("projects", [])
+        work_experiences = by_recency(cv_data.get("work_experiences", []))
+        educations = by_recency(cv_data.get("educations", []))
+        skill_names = [s.get("name") for s in cv_data.get("skills", [])]
+        projects = by_recency(cv_data.get("projects", []))
 
         # GENERAL SECTION
-        general_section = [
-            f"Title: {general.get('title') or 'Not provided'}",
-            f"Summary: {general.get('summary') or 'Not provided'}",
-            f"Has Phone: {general.get('has_phone')}",
-            f"Has Location: {general.get('has_location')}",
-            f"Has Email: {general.get('has_email')}",
-        ]
-        general_text = "\n".join(general_section)
+        def general_block(summary: str | None) -> str:
+            return "\n".join(
+                [
+                    f"Title: {general.get('title') or 'Not provided'}",
+                    f"Summary: {summary or 'Not provided'}",
+                    f"Has Phone: {general.get('has_phone')}",
+                    f"Has Location: {general.get('has_location')}",
+                    f"Has Email: {general.get('has_email')}",
+                ]
+            )
 
         # WORK EXPERIENCE
-        work_section = []
-        for exp in work_experiences:
-            work_section.append(
+        def work_block(exp: dict, description: str | None) -> str:
+            return (
                 f"Position: {exp.get('position')}\n"
                 f"Company: {exp.get('company')}\n"
-                f"Description: {exp.get('description') or 'Not provided'}\n"
+                f"Description: {description or 'Not provided'}\n"
                 f"Has Dates: {exp.get('has_dates')}\n"
                 f"Has Location: {exp.get('has_location')}\n"
                 "---"
             )
-        work_text = "\n".join(work_section) if work_section else "Not provided"
 
         # EDUCATION
-        education_section = []
-        for edu in educations:
-            education_section.append(
+        def education_block(edu: dict) -> str:
+            return (
                 f"Degree: {edu.get('degree')}\n"
                 f"Institution: {edu.get('institution')}\n"
                 f"Field of Study: {edu.get('field_of_study') or 'Not provided'}\n"
                 f"Has Dates: {edu.get('has_dates')}\n"
                 "---"
             )
-        education_text = (
-            "\n".join(education_section) if education_section else "Not provided"
-        )
-
-        # SKILLS
-        skills_list = (
-            ", ".join([s.get("name") for s in skills]) if skills else "Not provided"
-        )
 
         # PROJECTS
-        project_section = []
-        for proj in projects:
-            tech_list = (
-                ", ".join(proj.get("technologies", []))
-                if proj.get("technologies")
-                else "None"
-            )
-            project_section.append(
+        def project_block(proj: dict, description: str | None) -> str:
+            technologies = proj.get("technologies")
+            if isinstance(technologies, (list, tuple)):
+                technologies = ", ".join(technologies)
+            return (
                 f"Name: {proj.get('name')}\n"
-                f"Description: {proj.get('description') or 'Not provided'}\n"
-                f"Technologies: {tech_list}\n"
+                f"Description: {description or 'Not provided'}\n"
+                f"Technologies: {technologies or 'None'}\n"
                 f"Has URL: {proj.get('has_url')}\n"
                 "---"
             )
-        project_text = "\n".join(project_section) if project_section else "Not provided"
+
+        # Fit the CV into the token budget: trim long descriptions first,
+        # then reduce older entries to their headline, then drop them
+        summary = general.get("summary")
+        items = [
+            BudgetItem(
+                (
+                    general_block(summary),
+                    general_block(truncate_words(summary, _TRIMMED_SUMMARY_WORDS)),
+                ),
+                0,
+            )
+        ]
+        items += [
+            BudgetItem(_described_levels(exp, work_block), rank + 1)
+            for rank, exp in enumerate(work_experiences)
+        ]
+        items += [
+            BudgetItem((education_block(edu), ""), rank + 2)
+            for rank, edu in enumerate(educations)
+        ]
+        items.append(BudgetItem(_skill_levels(skill_names), 1))
+        items += [
+            BudgetItem(_described_levels(proj, project_block), rank + 2)
+            for rank, proj in enumerate(projects)
+        ]
+        rendered = fit_to_budget(items, settings.AI_SCORE_PROMPT_TOKEN_BUDGET)
+
+        general_text = rendered[0]
+        offset = 1
+        work_text = _entry_lines(rendered[offset : offset + len(work_experiences)])
+        offset += len(work_experiences)
+        education_text = _entry_lines(rendered[offset : offset + len(educations)])
+        offset += len(educations)
+        skills_list = rendered[offset] or "Not provided"
+        project_text = _entry_lines(rendered[offset + 1 :])
 
         # FINAL PROMPT
         prompt = f"""
@@ -377,29 +668,270 @@ Return ONLY the professional summary as a single paragraph."""
         Return ONLY valid JSON with no additional commentary.
         """
 
+        return CompletionRequest(
+            prompt=prompt,
+            temperature=0.4,
+            max_tokens=600,
+            cache_key=self._cache_key("score", {"prompt": prompt}),
+            error_message="Failed to score CV",
+            operation="score",
+            expects_json=True,
+        )
+
+    def build_section_score_request(
+        self, section_name: str, section_text: str, metrics: Sequence[str]
+    ) -> CompletionRequest:
+        """
+        Build a small completion request scoring one CV section.
+
+        The cache key covers only this section's text, so sections left
+        unchanged by an edit are served from the response cache.
+
+        Args:
+            section_name: Human-readable section kind (e.g. "work experience")
+            section_text: Rendered content of the section
+            metrics: Names of the metrics (keys of SCORE_METRIC_CRITERIA)
+                that apply to the section
+        """
+        criteria = "\n".join(
+            f"{number}. {SCORE_METRIC_CRITERIA[name]}"
+            for number, name in enumerate(metrics, start=1)
+        )
+        return_format = json.dumps(
+            {
+                name: {"score": "<int>", "reason": "<short explanation>"}
+                for name in metrics
+            },
+            indent=2,
+        )
+        prompt = f"""You are an expert CV analyst. Evaluate this {section_name} section of a CV on the metrics below.
+
+{section_text}
+
+Metrics:
+{criteria}
+
+Assign each metric an integer score from 1 to 10 and a one-sentence reason.
+
+Return ONLY valid JSON in this format:
+{return_format}"""
+
+        # Low temperature so re-scoring unchanged text stays stable
+        return CompletionRequest(
+            prompt=prompt,
+            temperature=0.2,
+            max_tokens=300,
+            cache_key=self._cache_key(
+                f"score_section:{section_name}",
+                {"text": normalize_text(section_text), "metrics": list(metrics)},
+            ),
+            error_message=f"Failed to score {section_name} section",
+            operation=f"score_section:{section_name}",
+            expects_json=True,
+        )
+
+    async def run(self, request: CompletionRequest, regenerate: bool = False) -> str:
+        """
+        Run a completion request and return the full response text.
+
+        Raises:
+            ConnectionError: If Groq is unreachable or its circuit is open
+            RuntimeError: For any other failure, prefixed with the request's
+                error message
+        """
+        # Identical concurrent requests (double clicks, several tabs) share
+        # one upstream call; regenerate never joins a cache-served call
+        flight_key = f"{request.cache_key}:{int(regenerate)}"
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.4,
-                max_tokens=600,
+            return await register_flight("groq").ado(
+                flight_key,
+                lambda: self._complete(
+                    request.prompt,
+                    temperature=request.temperature,
+                    max_tokens=request.max_tokens,
+                    cache_key=request.cache_key,
+                    regenerate=regenerate,
+                    operation=request.operation,
+                    expects_json=request.expects_json,
+                ),
             )
-            return response.choices[0].message.content.strip()
+        except ConnectionError:
+            # Circuit open: the dependency is already known to be down
+            raise
         except APIConnectionError as e:
-            raise ConnectionError(
-                "Unable to reach Groq API. Check internet connectivity and GROQ_API_KEY."
-            ) from e
+            # Surface a clearer error so the API can return 503 (service unavailable)
+            raise ConnectionError(GROQ_UNREACHABLE) from e
         except Exception as e:
-            raise Exception(f"Failed to score CV: {str(e)}") from e
+            raise RuntimeError(f"{request.error_message}: {str(e)}") from e
+
+    async def stream(
+        self, request: CompletionRequest, regenerate: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Yield the completion for ``request`` as text deltas.
+
+        A cached response is yielded as a single delta. When the consumer
+        stops early (e.g. the HTTP client disconnected) the upstream stream is
+        closed so Groq stops generating; only complete responses are cached,
+        and only when they would be cached by ``run``.
 
+        Raises:
+            ConnectionError: If Groq is unreachable or its circuit is open
+        """
+        cache = self.cache
+        cache_key = request.cache_key
+        if cache is not None and cache_key is not None and not regenerate:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        call = _LLMCall(self.client, self.model, request.operation, streamed=True)
+        try:
+            stream = await self.dependency.acall(
+                call.create,
+                model=self.model,
+                messages=[{"role": "user", "content": request.prompt}],
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+                stream=True,
+            )
+        except BaseException as e:
+            call.finish(e)
+            if isinstance(e, APIConnectionError):
+                raise ConnectionError(GROQ_UNREACHABLE) from e
+            raise
+
+        parts: list[str] = []
+        total_tokens = 0
+        error: BaseException | None = None
+        try:
+            async for chunk in stream:
+                usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+                if usage is not None:
+                    call.usage = usage
+                    total_tokens = usage.total_tokens or 0
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    call.first_token()
+                    parts.append(delta)
+                    yield delta
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            # Runs on normal completion, errors and cancellation alike
+            with anyio.CancelScope(shield=True):
+                await stream.close()
+            call.finish(error)
+
+        text = "".join(parts).strip()
+        if (
+            cache is not None
+            and cache_key is not None
+            and _is_cacheable(text, request.expects_json)
+        ):
+            cache.set(cache_key, text, total_tokens)
+
+    async def optimize_description(
+        self,
+        original_text: str,
+        field_type: str,
+        context: dict,
+        regenerate: bool = False,
+    ) -> str:
+        """
+        Optimize a CV field description using AI.
 
-# Singleton instance
+        Args:
+            original_text: Original description text
+            field_type: Type of field (work_experience, education, project, summary)
+            context: Additional context (position, company, duration, etc.)
+            regenerate: Bypass the response cache and ask the LLM again
+
+        Returns:
+            Optimized description text
+        """
+        return await self.run(
+            self.build_optimize_request(original_text, field_type, context),
+            regenerate=regenerate,
+        )
+
+    async def generate_summary(
+        self, cv_data: dict, tone: str = "professional", regenerate: bool = False
+    ) -> str:
+        """
+        Generate a professional summary based on CV data.
+
+        Args:
+            cv_data: Full CV data including work experiences, education, skills
+            tone: Tone of the summary (professional, casual, formal)
+            regenerate: Bypass the response cache and ask the LLM again
+
+        Returns:
+            Generated professional summary
+        """
+        return await self.run(
+            self.build_summary_request(cv_data, tone), regenerate=regenerate
+        )
+
+    async def score_cv(self, cv_data: dict, regenerate: bool = False) -> str:
+        """
+        Score a CV on impact, clarity, action verbs and professionalism.
+
+        Args:
+            cv_data: Full CV data including general info, work experiences, education, skills, and projects.
+            regenerate: Bypass the response cache and ask the LLM again
+
+        Returns:
+            AI-generated score/assessment text.
+        """
+        return await self.run(self.build_score_request(cv_data), regenerate=regenerate)
+
+
+# Singleton instance and the connection pool it shares across requests
 _ai_service: AIService | None = None
+_http_client: httpx.AsyncClient | None = None
+
+
+def init_ai_service() -> AIService | None:
+    """
+    Create the AI service and its pooled HTTP client during app startup.
+
+    Returns None when GROQ_API_KEY is not configured.
+    """
+    global _ai_service, _http_client
+    if not settings.GROQ_API_KEY:
+        logger.info("AI service disabled: GROQ_API_KEY not configured")
+        return None
+    if _ai_service is None:
+        _http_client = httpx.AsyncClient(
+            timeout=settings.GROQ_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.GROQ_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GROQ_MAX_CONNECTIONS,
+            ),
+        )
+        _ai_service = AIService(
+            http_client=_http_client, cache=create_ai_response_cache()
+        )
+    return _ai_service
+
+
+async def close_ai_service() -> None:
+    """Close the pooled HTTP client during app shutdown."""
+    global _ai_service, _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _ai_service = None
+    _http_client = None
 
 
 def get_ai_service() -> AIService:
     """Get or create AI service instance."""
     global _ai_service
     if _ai_service is None:
-        _ai_service = AIService()
+        _ai_service = AIService(cache=create_ai_response_cache())
     return _ai_service
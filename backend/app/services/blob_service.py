@@ -1,27 +1,58 @@
-"""Azure Blob Storage service for exporting CV PDFs."""
+"""Azure Blob Storage backend for CV PDFs and profile pictures."""
 
 from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta
-from typing import Tuple
-from uuid import uuid4
-
-from azure.core.exceptions import ResourceExistsError
-from azure.storage.blob import (
-    BlobSasPermissions,
-    BlobServiceClient,
-    ContentSettings,
-    generate_blob_sas,
+from typing import Optional, Tuple
+
+import aiohttp
+from azure.core.exceptions import (
+    HttpResponseError,
+    ResourceExistsError,
+    ResourceNotFoundError,
+    ServiceRequestError,
+    ServiceResponseError,
 )
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.storage.blob import BlobSasPermissions, ContentSettings, generate_blob_sas
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
 
 from app.core.config import settings
+from app.core.resilience import register_dependency
+from app.services.storage_service import (
+    PDF_CONTAINER,
+    BlobNotFoundError,
+    StorageBackend,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class AzureBlobService:
-    """Helper for uploading CV PDFs to Azure Blob Storage and generating SAS links."""
+def _is_transient(exc: BaseException) -> bool:
+    """Network errors, throttling and 5xx replies are worth retrying."""
+    if isinstance(
+        exc, (ServiceRequestError, ServiceResponseError, aiohttp.ClientError)
+    ):
+        return True
+    if isinstance(exc, HttpResponseError):
+        code = exc.status_code or 0
+        return code >= 500 or code in (408, 429)
+    return False
+
+
+class AsyncAzureBlobService(StorageBackend):
+    """
+    Storage backend built on the async Azure Blob SDK.
+
+    All container clients share one aiohttp session, so uploads reuse pooled
+    keep-alive connections instead of opening a socket per request. Instances
+    are created once in the application lifespan via init_storage().
+
+    Every call runs under the shared "azure_storage" resilience policy
+    (timeout, jittered retries, circuit breaker); the SDK's own retry policy
+    is disabled so attempts are not multiplied.
+    """
 
     def __init__(self) -> None:
         if not settings.AZURE_STORAGE_CONNECTION_STRING:
@@ -31,8 +62,22 @@ class AzureBlobService:
         if not settings.AZURE_STORAGE_PFP_CONTAINER_NAME:
             raise ValueError("AZURE_STORAGE_PFP_CONTAINER_NAME not configured")
 
-        self._client = BlobServiceClient.from_connection_string(
-            settings.AZURE_STORAGE_CONNECTION_STRING
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=settings.AZURE_STORAGE_MAX_CONNECTIONS,
+                keepalive_timeout=settings.AZURE_STORAGE_KEEPALIVE_SECONDS,
+            )
+        )
+        self._client = AsyncBlobServiceClient.from_connection_string(
+            settings.AZURE_STORAGE_CONNECTION_STRING,
+            transport=AioHttpTransport(session=self._session, session_owner=False),
+            retry_total=0,
+        )
+        self._dependency = register_dependency(
+            "azure_storage",
+            timeout=settings.AZURE_STORAGE_TIMEOUT_SECONDS,
+            max_retries=settings.AZURE_STORAGE_MAX_RETRIES,
+            transient=_is_transient,
         )
         self._pdf_container = self._client.get_container_client(
             settings.AZURE_STORAGE_PDF_CONTAINER_NAME
@@ -41,25 +86,27 @@ class AzureBlobService:
             settings.AZURE_STORAGE_PFP_CONTAINER_NAME
         )
 
-        try:
-            self._pdf_container.create_container()
-            logger.info(
-                "Created Azure blob container '%s'",
-                settings.AZURE_STORAGE_PDF_CONTAINER_NAME,
-            )
-        except ResourceExistsError:
-            # Container already exists; nothing to do.
-            pass
+    def _container_client(self, container: str):
+        return (
+            self._pdf_container if container == PDF_CONTAINER else self._pfp_container
+        )
 
-        try:
-            self._pfp_container.create_container()
-            logger.info(
-                "Created Azure blob container '%s'",
-                settings.AZURE_STORAGE_PFP_CONTAINER_NAME,
-            )
-        except ResourceExistsError:
-            # Container already exists; nothing to do.
-            pass
+    async def initialize(self) -> None:
+        """Create the PDF and profile picture containers if they are missing."""
+        for container in (self._pdf_container, self._pfp_container):
+            try:
+                await self._dependency.acall(container.create_container)
+                logger.info(
+                    "Created Azure blob container '%s'", container.container_name
+                )
+            except ResourceExistsError:
+                # Container already exists; nothing to do.
+                pass
+
+    async def close(self) -> None:
+        """Close the SDK client and release the pooled connections."""
+        await self._client.close()
+        await self._session.close()
 
     def _get_account_key(self) -> str:
         """
@@ -73,14 +120,12 @@ class AzureBlobService:
             raise ValueError("No azure key available from connection string")
         return account_key
 
-    def _generate_sas_url(
-        self, blob_name: str, ttl_minutes: int, container: str = "pdf"
+    def generate_signed_url(
+        self, container: str, blob_name: str, ttl_minutes: int
     ) -> Tuple[str, datetime]:
         """Generate a SAS URL for a blob with a given TTL."""
         expires_at = datetime.utcnow() + timedelta(minutes=max(ttl_minutes, 1))
-        container_client = (
-            self._pdf_container if container == "pdf" else self._pfp_container
-        )
+        container_client = self._container_client(container)
         sas_token = generate_blob_sas(
             account_name=self._client.account_name,
             container_name=container_client.container_name,
@@ -91,97 +136,51 @@ class AzureBlobService:
         )
         return f"{container_client.url}/{blob_name}?{sas_token}", expires_at
 
-    def upload_cv_pdf(
-        self, *, user_id: int, cv_id: int, data: bytes, filename: str
-    ) -> Tuple[str, datetime]:
-        """
-        Upload a CV PDF and return a time-limited SAS URL.
+    async def upload(
+        self,
+        container: str,
+        blob_name: str,
+        data: bytes,
+        *,
+        content_type: str,
+        metadata: Optional[dict] = None,
+    ) -> None:
+        # Overwriting PUTs are idempotent, so they are safe to retry
+        await self._dependency.acall(
+            self._container_client(container).upload_blob,
+            name=blob_name,
+            data=data,
+            overwrite=True,
+            content_settings=ContentSettings(content_type=content_type),
+            metadata=metadata,
+        )
 
-        Args:
-            user_id: ID of the owner.
-            cv_id: CV identifier.
-            data: PDF bytes.
-            filename: Original filename for metadata.
-
-        Returns:
-            Tuple containing the SAS URL and expiry datetime.
-        """
-        blob_name = f"cvs/user-{user_id}/cv-{cv_id}-{uuid4()}.pdf"
+    async def download(self, container: str, blob_name: str) -> bytes:
+        async def _download() -> bytes:
+            stream = await self._container_client(container).download_blob(blob_name)
+            return await stream.readall()
 
         try:
-            self._pdf_container.upload_blob(
-                name=blob_name,
-                data=data,
-                overwrite=True,
-                content_settings=ContentSettings(content_type="application/pdf"),
-                metadata={
-                    "cv_id": str(cv_id),
-                    "user_id": str(user_id),
-                    "filename": filename,
-                },
-            )
-        except Exception:
-            logger.exception("Failed to upload CV PDF to Azure Blob Storage")
-            raise
-
-        ttl_minutes = max(settings.AZURE_STORAGE_SAS_TTL_MINUTES or 60, 1)
-        return self._generate_sas_url(blob_name, ttl_minutes, container="pdf")
-
-    def upload_profile_picture(
-        self, *, user_id: int, data: bytes, filename: str
-    ) -> Tuple[str, datetime]:
-        """
-        Upload a profile picture and return a time-limited SAS URL.
-
-        Args:
-            user_id: Owner's ID.
-            data: Image file bytes.
-            filename: Original filename for metadata.
-
-        Returns:
-            Tuple containing the SAS URL and expiry datetime.
-        """
-        ext = (filename.rsplit(".", 1)[-1] or "").lower()
-        if ext in ("jpg", "jpeg"):
-            content_type = "image/jpeg"
-            suffix = "jpg"
-        elif ext == "png":
-            content_type = "image/png"
-            suffix = "png"
-        else:
-            raise ValueError("Unsupported image format (use jpg or png)")
-
-        # Only one picture per user: stable blob name
-        blob_name = f"profile_pictures/user-{user_id}/profile.{suffix}"
+            return await self._dependency.acall(_download)
+        except ResourceNotFoundError as exc:
+            raise BlobNotFoundError(f"{container}/{blob_name}") from exc
 
+    async def get_size(self, container: str, blob_name: str) -> Optional[int]:
+        blob_client = self._container_client(container).get_blob_client(blob_name)
         try:
-            self._pfp_container.upload_blob(
-                name=blob_name,
-                data=data,
-                overwrite=True,
-                content_settings=ContentSettings(content_type=content_type),
-                metadata={
-                    "user_id": str(user_id),
-                    "filename": filename,
-                },
-            )
-
-            # Long expiry for profile pictures (90 days)
-            sas_url, expiry = self._generate_sas_url(
-                blob_name, ttl_minutes=90 * 24 * 60, container="pfp"
+            properties = await self._dependency.acall(blob_client.get_blob_properties)
+        except ResourceNotFoundError:
+            return None
+        return properties.size
+
+    async def delete(self, container: str, blob_name: str) -> int:
+        size = await self.get_size(container, blob_name)
+        if size is None:
+            return 0
+        try:
+            await self._dependency.acall(
+                self._container_client(container).delete_blob, blob_name
             )
-            return sas_url, expiry
-
-        except Exception as e:
-            raise RuntimeError(f"Failed to upload profile picture: {e}")
-
-
-_blob_service: AzureBlobService | None = None
-
-
-def get_blob_service() -> AzureBlobService:
-    """Return a singleton AzureBlobService instance."""
-    global _blob_service
-    if _blob_service is None:
-        _blob_service = AzureBlobService()
-    return _blob_service
+        except ResourceNotFoundError:
+            return 0
+        return size
@@ -0,0 +1,364 @@
+"""
+Deterministic local CV scoring.
+
+Computes the same four quality metrics the LLM scorer reports (impact and
+achievement density, clarity and readability, action verb strength,
+professionalism) plus section completeness, from the CV alone and in
+milliseconds. Every descriptive text is split into statements (bullets or
+sentences) and tokenized once; the metrics are then aggregates over those
+statement features.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Tuple, TypedDict
+
+from app.schemas.cv import CVWithRelations
+
+# Strong openers for achievement statements, in base and past tense
+ACTION_VERBS = frozenset(
+    """
+    accelerate accelerated achieve achieved architect architected automate
+    automated build built championed coordinate coordinated create created
+    cut decrease decreased define defined deliver delivered deploy deployed
+    design designed develop developed direct directed drive drove eliminate
+    eliminated engineer engineered enhance enhanced establish established
+    execute executed expand expanded generate generated grow grew guide
+    guided implement implemented improve improved increase increased
+    initiate initiated integrate integrated introduce introduced launch
+    launched lead led maintain maintained manage managed mentor mentored
+    migrate migrated modernize modernized negotiate negotiated optimize
+    optimized orchestrate orchestrated organize organized overhaul overhauled
+    own owned pioneer pioneered plan planned produce produced published
+    rebuild rebuilt redesign redesigned reduce reduced refactor refactored
+    resolve resolved restructure restructured revamp revamped save saved
+    scale scaled secure secured ship shipped simplify simplified spearhead
+    spearheaded standardize standardized streamline streamlined strengthen
+    strengthened supervise supervised taught teach train trained transform
+    transformed troubleshoot troubleshot unified unify upgrade upgraded won
+    write wrote analyze analyzed audit audited authored conduct conducted
+    consolidate consolidated debug debugged earned founded invent invented
+    """.split()
+)
+
+# Openers that describe duties rather than results
+WEAK_OPENERS = frozenset(
+    """
+    responsible helped help assisted assist worked work participated
+    participate involved tasked duties handled handle did do tried
+    """.split()
+)
+
+# Words that signal an outcome even without a number
+RESULT_WORDS = frozenset(
+    """
+    increase increased increasing reduce reduced reducing improve improved
+    improving save saved saving grow grew growth cut decrease decreased
+    faster revenue uptime latency conversion retention adoption award
+    awarded ranked record
+    """.split()
+)
+
+FILLER_WORDS = frozenset(
+    """
+    various etc things stuff very really basically just actually several
+    many lots kind sort somewhat
+    """.split()
+)
+
+INFORMAL_WORDS = frozenset(
+    """
+    gonna wanna kinda gotta awesome cool lol stuff guys tons super yeah ok
+    okay nope
+    """.split()
+)
+
+FIRST_PERSON = frozenset("i me my mine myself".split())
+
+_STATEMENT_SPLIT = re.compile(r"(?:\r?\n)+|(?<=[.!?;])\s+(?=[A-Z•\-\*])")
+_BULLET_PREFIX = re.compile(r"^\s*(?:[•\-\*–·▪]|\d+[.)])\s*")
+_WORD = re.compile(r"[A-Za-z][A-Za-z'\-]*")
+_QUANTITY = re.compile(
+    r"(?:[$€£]\s?\d)|(?:\d+(?:[.,]\d+)?\s?(?:%|percent|x\b|k\b|m\b|\+))|\b\d{2,}\b"
+    r"|\b\d+\s+(?:users|customers|clients|people|engineers|projects|teams)\b",
+    re.IGNORECASE,
+)
+_PASSIVE = re.compile(r"\b(?:was|were|been|being|is|are)\s+\w+ed\b", re.IGNORECASE)
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+# Readable statements stay within this many words
+_IDEAL_WORDS = (8, 25)
+
+
+@dataclass(frozen=True)
+class Statement:
+    """Features of one bullet or sentence."""
+
+    section: str
+    words: Tuple[str, ...]
+    quantified: bool
+    passive: bool
+    exclamation: bool
+    shouting: bool
+
+    @property
+    def opener(self) -> str:
+        return self.words[0] if self.words else ""
+
+
+def _syllables(word: str) -> int:
+    groups = len(_VOWEL_GROUPS.findall(word))
+    if word.endswith("e") and groups > 1 and not word.endswith("le"):
+        groups -= 1
+    return max(groups, 1)
+
+
+def _split_statements(section: str, text: str | None) -> Iterable[Statement]:
+    for raw in _STATEMENT_SPLIT.split(text or ""):
+        line = _BULLET_PREFIX.sub("", raw).strip()
+        if not line:
+            continue
+        tokens = _WORD.findall(line)
+        if not tokens:
+            continue
+        yield Statement(
+            section=section,
+            words=tuple(token.lower() for token in tokens),
+            quantified=bool(_QUANTITY.search(line)),
+            passive=bool(_PASSIVE.search(line)),
+            exclamation="!" in line,
+            shouting=sum(1 for t in tokens if len(t) > 3 and t.isupper()) > 1,
+        )
+
+
+def extract_statements(cv: CVWithRelations) -> List[Statement]:
+    """Tokenize every descriptive text of the CV in one pass."""
+    sources: List[Tuple[str, str | None]] = [("summary", cv.summary)]
+    sources += [("work_experience", exp.description) for exp in cv.work_experiences]
+    sources += [("project", project.description) for project in cv.projects]
+    sources += [("education", edu.description) for edu in cv.educations]
+    return [
+        statement
+        for section, text in sources
+        for statement in _split_statements(section, text)
+    ]
+
+
+def _count(n: int, noun: str) -> str:
+    return f"{n} {noun}" if n == 1 else f"{n} {noun}s"
+
+
+class Metric(TypedDict):
+    """One scored metric, as in the LLM scorer's JSON."""
+
+    score: int
+    reason: str
+
+
+def _clamp(score: float) -> int:
+    return int(min(10, max(1, round(score))))
+
+
+def _metric(score: float, reason: str) -> Metric:
+    return Metric(score=_clamp(score), reason=reason)
+
+
+def _impact(statements: List[Statement]) -> Metric:
+    achievements = [
+        s for s in statements if s.section in ("work_experience", "project")
+    ]
+    if not achievements:
+        return _metric(1, "No work experience or project descriptions to assess.")
+    quantified = sum(1 for s in achievements if s.quantified)
+    outcomes = sum(
+        1
+        for s in achievements
+        if not s.quantified and RESULT_WORDS.intersection(s.words)
+    )
+    # Half the statements carrying a number earns full marks
+    density = (quantified + 0.5 * outcomes) / len(achievements)
+    score = 1 + 9 * min(density / 0.5, 1.0)
+    return _metric(
+        score,
+        f"Measurable results in {quantified} of "
+        f"{_count(len(achievements), 'experience and project statement')}"
+        + (f"; {outcomes} more name an outcome." if outcomes else "."),
+    )
+
+
+def _clarity(statements: List[Statement]) -> Metric:
+    if not statements:
+        return _metric(1, "No descriptive text to assess.")
+    lengths = [len(s.words) for s in statements]
+    total_words = sum(lengths)
+    average = total_words / len(statements)
+    syllables = sum(_syllables(word) for s in statements for word in s.words)
+    # Flesch reading ease: ~60+ reads easily, below ~30 is dense
+    reading_ease = 206.835 - 1.015 * average - 84.6 * (syllables / total_words)
+    long_share = sum(1 for n in lengths if n > _IDEAL_WORDS[1]) / len(statements)
+    filler_share = (
+        sum(1 for s in statements for word in s.words if word in FILLER_WORDS)
+        / total_words
+    )
+
+    score = 10.0
+    score -= 4 * long_share
+    if average < _IDEAL_WORDS[0]:
+        score -= 1
+    score -= min(max(40 - reading_ease, 0) / 10, 3)
+    score -= min(filler_share * 100, 3)
+    return _metric(
+        score,
+        f"Statements average {average:.0f} words with {long_share:.0%} over "
+        f"{_IDEAL_WORDS[1]} words; reading ease {reading_ease:.0f}.",
+    )
+
+
+def _action_verbs(statements: List[Statement]) -> Metric:
+    bullets = [s for s in statements if s.section != "summary"]
+    if not bullets:
+        return _metric(1, "No bullet points to assess.")
+    strong = sum(1 for s in bullets if s.opener in ACTION_VERBS)
+    weak = sum(1 for s in bullets if s.opener in WEAK_OPENERS)
+    passive = sum(1 for s in bullets if s.passive)
+    share = strong / len(bullets)
+    score = 1 + 9 * share - 3 * (weak / len(bullets)) - 2 * (passive / len(bullets))
+    reason = f"Strong action verbs open {strong} of {_count(len(bullets), 'statement')}"
+    if weak:
+        reason += f"; duty phrasing such as 'responsible for' opens {weak}"
+    return _metric(score, reason + ".")
+
+
+def _professionalism(
+    statements: List[Statement], contact_complete: bool | None = None
+) -> Metric:
+    issues: List[str] = []
+    score = 10.0
+    first_person = sum(
+        1 for s in statements for word in s.words if word in FIRST_PERSON
+    )
+    informal = sum(1 for s in statements for word in s.words if word in INFORMAL_WORDS)
+    exclamations = sum(1 for s in statements if s.exclamation)
+    shouting = sum(1 for s in statements if s.shouting)
+    if first_person:
+        score -= min(first_person, 3)
+        issues.append(_count(first_person, "first-person pronoun"))
+    if informal:
+        score -= min(2 * informal, 4)
+        issues.append(_count(informal, "informal word"))
+    if exclamations:
+        score -= min(exclamations, 2)
+        issues.append(_count(exclamations, "exclamation mark"))
+    if shouting:
+        score -= min(shouting, 2)
+        issues.append("words in all caps")
+    if contact_complete is False:
+        score -= 1
+        issues.append("incomplete contact details")
+    if not issues:
+        if contact_complete is None:
+            return _metric(score, "Consistent, formal tone.")
+        return _metric(score, "Consistent, formal tone with complete contact details.")
+    return _metric(score, "Found " + ", ".join(issues) + ".")
+
+
+def _completeness(cv: CVWithRelations) -> Metric:
+    checks = {
+        "a summary": bool(cv.summary and len(cv.summary.split()) >= 15),
+        "work experience": bool(cv.work_experiences),
+        "described experience": any(exp.description for exp in cv.work_experiences),
+        "education": bool(cv.educations),
+        "at least 5 skills": len(cv.skills) >= 5,
+        "projects": bool(cv.projects),
+        "phone and location": bool(cv.phone and cv.location),
+    }
+    missing = [name for name, present in checks.items() if not present]
+    score = 10 * (len(checks) - len(missing)) / len(checks)
+    if not missing:
+        return _metric(score, "All key sections are present.")
+    return _metric(score, "Missing " + ", ".join(missing) + ".")
+
+
+_LABELS = {
+    "impact_achievement_density": "impact and measurable achievements",
+    "clarity_readability": "clarity and readability",
+    "action_verb_strength": "action verb usage",
+    "professionalism": "professional tone",
+    "section_completeness": "section completeness",
+}
+
+
+def metrics_insight(metrics: Mapping[str, Metric]) -> str:
+    """One-paragraph overview naming the strongest and weakest metric."""
+    ranked = sorted(metrics.items(), key=lambda item: item[1]["score"])
+    weakest, strongest = ranked[0], ranked[-1]
+    if weakest[1]["score"] >= 8:
+        return (
+            "The CV scores well across the board; "
+            f"{_LABELS[strongest[0]]} is its strongest point."
+        )
+    return (
+        f"Strongest area: {_LABELS[strongest[0]]}. "
+        f"Priority improvement: {_LABELS[weakest[0]]}. {weakest[1]['reason']}"
+    )
+
+
+def score_cv_locally(cv: CVWithRelations) -> Dict[str, object]:
+    """
+    Score a CV without calling the LLM.
+
+    Returns the same JSON shape as the LLM scorer (each metric as
+    ``{"score": 1-10, "reason": ...}`` plus ``summary_insight``), with an
+    extra ``section_completeness`` metric.
+    """
+    statements = extract_statements(cv)
+    metrics = {
+        "impact_achievement_density": _impact(statements),
+        "clarity_readability": _clarity(statements),
+        "action_verb_strength": _action_verbs(statements),
+        "professionalism": _professionalism(
+            statements, contact_complete=bool(cv.phone and cv.location)
+        ),
+        "section_completeness": _completeness(cv),
+    }
+    return {**metrics, "summary_insight": metrics_insight(metrics)}
+
+
+_SECTION_SCORERS = {
+    "impact_achievement_density": _impact,
+    "clarity_readability": _clarity,
+    "action_verb_strength": _action_verbs,
+}
+
+
+def score_section_locally(
+    sources: Iterable[Tuple[str, str | None]],
+    metrics: Iterable[str],
+    contact_complete: bool | None = None,
+) -> Dict[str, Metric]:
+    """
+    Score the texts of one CV section on the given metrics.
+
+    Args:
+        sources: ``(statement section, text)`` pairs, where the statement
+            section is ``summary``, ``work_experience``, ``project`` or
+            ``education`` as in ``extract_statements``.
+        metrics: Names of the metrics to compute.
+        contact_complete: Whether phone and location are present; only
+            known for the general section, otherwise not assessed.
+    """
+    statements = [
+        statement
+        for section, text in sources
+        for statement in _split_statements(section, text)
+    ]
+    return {
+        name: (
+            _professionalism(statements, contact_complete)
+            if name == "professionalism"
+            else _SECTION_SCORERS[name](statements)
+        )
+        for name in metrics
+    }
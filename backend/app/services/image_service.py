@@ -0,0 +1,170 @@
+"""Profile picture processing: decoding, metadata stripping and resizing."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Source format -> (file extension, content type) of the stored original
+SOURCE_FORMATS = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "PNG": ("png", "image/png"),
+}
+# Variant format name -> (Pillow format, file extension, content type)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "webp", "image/webp"),
+    "jpeg": ("JPEG", "jpg", "image/jpeg"),
+    "jpg": ("JPEG", "jpg", "image/jpeg"),
+}
+
+
+def parse_variant_sizes(value: str) -> List[int]:
+    """Parse a comma-separated list of pixel sizes, largest first."""
+    sizes = {int(part) for part in value.split(",") if part.strip()}
+    return sorted((size for size in sizes if size > 0), reverse=True)
+
+
+def variant_file_type(variant_format: str) -> Tuple[str, str]:
+    """Return (file extension, content type) for a variant format."""
+    if variant_format not in VARIANT_FORMATS:
+        raise ValueError(f"Unsupported variant format: {variant_format}")
+    _, extension, content_type = VARIANT_FORMATS[variant_format]
+    return extension, content_type
+
+
+class ProcessedPicture(NamedTuple):
+    """Renditions of an uploaded profile picture."""
+
+    original: bytes
+    # Detected from the decoded image, not from the upload's name or header
+    extension: str
+    content_type: str
+    variants: Dict[int, bytes]
+
+    @property
+    def version(self) -> str:
+        """Short content hash identifying this upload's renditions."""
+        digest = hashlib.sha256(self.original)
+        for size in sorted(self.variants):
+            digest.update(self.variants[size])
+        return digest.hexdigest()[:16]
+
+
+def _encode(image: Image.Image, pil_format: str, quality: int) -> bytes:
+    """Encode an image without EXIF/ICC/XMP metadata."""
+    if pil_format == "JPEG" and image.mode != "RGB":
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        rgba = image.convert("RGBA")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        image = background
+    elif pil_format == "WEBP" and image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    buffer = io.BytesIO()
+    if pil_format == "PNG":
+        image.save(buffer, format="PNG")
+    else:
+        image.save(buffer, format=pil_format, quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def process_profile_picture(
+    data: bytes, sizes: Sequence[int], variant_format: str, quality: int
+) -> ProcessedPicture:
+    """
+    Decode an uploaded picture and build metadata-free renditions.
+
+    The image is rotated according to its EXIF orientation, re-encoded in its
+    source format without metadata, and cropped to squares of each requested
+    size. Sizes larger than the image's shorter edge are skipped rather than
+    upscaled. Smaller variants are derived from the next larger one to avoid
+    resampling the full-size image repeatedly.
+
+    Args:
+        data: Uploaded JPEG or PNG bytes.
+        sizes: Square edge lengths in pixels.
+        variant_format: "webp" or "jpeg".
+        quality: Lossy encoder quality (1-100).
+
+    Returns:
+        The cleaned original with its detected file type, and
+        ``{size: variant bytes}``.
+
+    Raises:
+        ValueError: If the data is not a supported, decodable image.
+    """
+    if variant_format not in VARIANT_FORMATS:
+        raise ValueError(f"Unsupported variant format: {variant_format}")
+    pil_variant_format = VARIANT_FORMATS[variant_format][0]
+
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            source_format = source.format
+            if source_format not in SOURCE_FORMATS:
+                raise ValueError("Only JPEG or PNG images are supported")
+            image = ImageOps.exif_transpose(source)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        raise ValueError("Uploaded file is not a valid image") from exc
+
+    original = _encode(image, source_format, quality=95)
+
+    variants: Dict[int, bytes] = {}
+    current = image
+    for size in sorted(sizes, reverse=True):
+        if size > min(image.size):
+            continue
+        current = ImageOps.fit(current, (size, size), method=Image.Resampling.LANCZOS)
+        variants[size] = _encode(current, pil_variant_format, quality)
+    extension, content_type = SOURCE_FORMATS[source_format]
+    return ProcessedPicture(original, extension, content_type, variants)
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def init_image_processing() -> ThreadPoolExecutor:
+    """
+    Create the worker pool used for image processing.
+
+    Pillow releases the GIL while decoding, resampling and encoding, so a
+    thread pool keeps that CPU work off the event loop without the start-up
+    and pickling cost of worker processes.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_PROCESSING_WORKERS,
+            thread_name_prefix="image-processing",
+        )
+    return _executor
+
+
+def shutdown_image_processing() -> None:
+    """Stop the image processing worker pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+async def process_profile_picture_async(data: bytes) -> ProcessedPicture:
+    """Run process_profile_picture in the worker pool with configured options."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        init_image_processing(),
+        process_profile_picture,
+        data,
+        parse_variant_sizes(settings.PROFILE_PICTURE_SIZES),
+        settings.PROFILE_PICTURE_FORMAT.lower(),
+        settings.PROFILE_PICTURE_QUALITY,
+    )
@@ -0,0 +1,354 @@
+"""
+Durable background jobs stored in the database.
+
+Endpoints enqueue a job row and return its id; workers started with
+``python -m app.cli run-jobs`` claim and run them. Claims use
+``SELECT ... FOR UPDATE SKIP LOCKED`` on PostgreSQL so any number of workers
+share the table without a broker, and every claim is confirmed by a
+conditional UPDATE so SQLite (which has no row locks) stays correct too.
+
+A claimed job is leased for JOB_VISIBILITY_TIMEOUT_SECONDS. A worker gives up
+on an attempt shortly before the lease runs out, keeping some time to record
+the outcome, and if the worker dies the job becomes
+claimable again once the lease has expired. Failed attempts are retried with
+exponential backoff up to the job's ``max_attempts``; handlers raise
+PermanentJobError for failures that retrying cannot fix.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+from uuid import uuid4
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.job import (
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    Job,
+)
+
+logger = logging.getLogger(__name__)
+
+# Runs one job: (payload, user_id) -> JSON-serializable result
+JobHandler = Callable[[Dict[str, Any], int], Awaitable[Dict[str, Any]]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+# Claims lost to another worker before giving up until the next poll
+_MAX_CLAIM_CONFLICTS = 5
+
+# Part of the lease kept back to record an attempt's outcome (capped)
+_LEASE_MARGIN_SHARE = 0.1
+_MAX_LEASE_MARGIN_SECONDS = 10.0
+
+
+class PermanentJobError(Exception):
+    """A job failure that retrying cannot fix; the job fails immediately."""
+
+
+class ClaimedJob(NamedTuple):
+    """The parts of a claimed job a worker needs to run it."""
+
+    id: int
+    kind: str
+    user_id: int
+    payload: Dict[str, Any]
+    attempt: int
+    locked_until: datetime
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the decorated coroutine as the handler for ``kind`` jobs."""
+
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        return handler
+
+    return register
+
+
+def get_job_handler(kind: str) -> Optional[JobHandler]:
+    return _handlers.get(kind)
+
+
+def enqueue_job(
+    db: Session,
+    *,
+    user_id: int,
+    kind: str,
+    payload: Dict[str, Any],
+    max_attempts: Optional[int] = None,
+) -> Job:
+    """Store a new queued job and return it."""
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job = Job(
+        user_id=user_id,
+        kind=kind,
+        status=JOB_QUEUED,
+        payload=payload,
+        attempts=0,
+        max_attempts=max(max_attempts or settings.JOB_MAX_ATTEMPTS, 1),
+        run_after=datetime.utcnow(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def retry_delay(attempt: int) -> float:
+    """Seconds to wait before retrying after failed attempt number ``attempt``."""
+    return settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** max(attempt - 1, 0)
+
+
+def claim_job(
+    db: Session, worker_id: str, kinds: Optional[Sequence[str]] = None
+) -> Optional[ClaimedJob]:
+    """
+    Lease the next runnable job to ``worker_id``.
+
+    Runnable jobs are queued jobs whose ``run_after`` has passed and running
+    jobs whose lease has expired (their worker died or gave up). A job whose
+    lease expired on its last attempt is marked failed instead.
+    """
+    for _ in range(_MAX_CLAIM_CONFLICTS):
+        now = datetime.utcnow()
+        query = db.query(Job).filter(
+            or_(
+                and_(Job.status == JOB_QUEUED, Job.run_after <= now),
+                and_(Job.status == JOB_RUNNING, Job.locked_until <= now),
+            )
+        )
+        if kinds:
+            query = query.filter(Job.kind.in_(kinds))
+        job = (
+            query.order_by(Job.run_after, Job.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            db.rollback()
+            return None
+
+        expected = (job.id, job.status, job.attempts)
+        expired = job.status == JOB_RUNNING and job.attempts >= job.max_attempts
+        locked_until = now + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT_SECONDS)
+        changes: Dict[Any, Any]
+        if expired:
+            changes = {
+                Job.status: JOB_FAILED,
+                Job.error: "Job did not finish within its visibility timeout",
+                Job.locked_by: None,
+                Job.locked_until: None,
+                Job.finished_at: now,
+            }
+        else:
+            changes = {
+                Job.status: JOB_RUNNING,
+                Job.attempts: job.attempts + 1,
+                Job.locked_by: worker_id,
+                Job.locked_until: locked_until,
+            }
+        # attempts doubles as a version: only one claimer can win this update
+        updated = (
+            db.query(Job)
+            .filter(
+                Job.id == expected[0],
+                Job.status == expected[1],
+                Job.attempts == expected[2],
+            )
+            .update(changes, synchronize_session=False)
+        )
+        db.commit()
+        if not updated or expired:
+            continue
+        return ClaimedJob(
+            id=job.id,
+            kind=job.kind,
+            user_id=job.user_id,
+            payload=job.payload,
+            attempt=expected[2] + 1,
+            locked_until=locked_until,
+        )
+    return None
+
+
+def complete_job(
+    db: Session, job_id: int, worker_id: str, result: Dict[str, Any]
+) -> bool:
+    """
+    Record a successful attempt.
+
+    Returns False, keeping the job unchanged, if the lease was lost to
+    another worker in the meantime.
+    """
+    updated = (
+        db.query(Job)
+        .filter(Job.id == job_id, Job.status == JOB_RUNNING, Job.locked_by == worker_id)
+        .update(
+            {
+                Job.status: JOB_SUCCEEDED,
+                Job.result: result,
+                Job.error: None,
+                Job.locked_by: None,
+                Job.locked_until: None,
+                Job.finished_at: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return bool(updated)
+
+
+def fail_job(
+    db: Session, job_id: int, worker_id: str, error: str, *, retry: bool = True
+) -> bool:
+    """
+    Record a failed attempt, re-queueing the job with backoff if it may retry.
+
+    Returns False if the lease was lost to another worker in the meantime.
+    """
+    job = (
+        db.query(Job)
+        .filter(Job.id == job_id, Job.status == JOB_RUNNING, Job.locked_by == worker_id)
+        .with_for_update()
+        .first()
+    )
+    if job is None:
+        db.rollback()
+        return False
+    now = datetime.utcnow()
+    job.error = error
+    job.locked_by = None
+    job.locked_until = None
+    if retry and job.attempts < job.max_attempts:
+        job.status = JOB_QUEUED
+        job.run_after = now + timedelta(seconds=retry_delay(job.attempts))
+    else:
+        job.status = JOB_FAILED
+        job.finished_at = now
+    db.commit()
+    return True
+
+
+def _in_session(session_factory: Callable[[], Session], fn: Callable, *args, **kw):
+    db = session_factory()
+    try:
+        return fn(db, *args, **kw)
+    finally:
+        db.close()
+
+
+def lease_seconds_left(job: ClaimedJob) -> float:
+    """Seconds an attempt may still run before it must stop to record its outcome."""
+    margin = min(
+        settings.JOB_VISIBILITY_TIMEOUT_SECONDS * _LEASE_MARGIN_SHARE,
+        _MAX_LEASE_MARGIN_SECONDS,
+    )
+    return (job.locked_until - datetime.utcnow()).total_seconds() - margin
+
+
+async def run_claimed_job(
+    job: ClaimedJob,
+    worker_id: str,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> bool:
+    """Run one claimed job and record its outcome; returns True on success."""
+    handler = get_job_handler(job.kind)
+    try:
+        if handler is None:
+            raise PermanentJobError(f"No handler for job kind {job.kind!r}")
+        # The lease started at claim time; stop before it expires so no
+        # other worker runs the job concurrently
+        timeout = lease_seconds_left(job)
+        if timeout <= 0:
+            raise TimeoutError("Lease expired before the job started")
+        result = await asyncio.wait_for(
+            handler(job.payload, job.user_id), timeout=timeout
+        )
+    except PermanentJobError as e:
+        logger.warning("Job %s (%s) failed: %s", job.id, job.kind, e)
+        await asyncio.to_thread(
+            _in_session,
+            session_factory,
+            fail_job,
+            job.id,
+            worker_id,
+            str(e),
+            retry=False,
+        )
+        return False
+    except Exception as e:
+        error = str(e) or type(e).__name__
+        logger.warning(
+            "Job %s (%s) attempt %d failed: %s", job.id, job.kind, job.attempt, error
+        )
+        await asyncio.to_thread(
+            _in_session, session_factory, fail_job, job.id, worker_id, error
+        )
+        return False
+    await asyncio.to_thread(
+        _in_session, session_factory, complete_job, job.id, worker_id, result
+    )
+    return True
+
+
+async def run_worker(
+    *,
+    concurrency: Optional[int] = None,
+    poll_interval: Optional[float] = None,
+    kinds: Optional[Sequence[str]] = None,
+    burst: bool = False,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> int:
+    """
+    Claim and run jobs until cancelled.
+
+    Runs up to ``concurrency`` jobs at a time (JOB_WORKER_CONCURRENCY),
+    polling every ``poll_interval`` seconds (JOB_POLL_INTERVAL_SECONDS) while
+    the queue is empty. With ``burst`` the worker returns once no job is
+    runnable. Returns the number of jobs run.
+    """
+    concurrency = max(concurrency or settings.JOB_WORKER_CONCURRENCY, 1)
+    poll_interval = poll_interval or settings.JOB_POLL_INTERVAL_SECONDS
+    prefix = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+    processed = 0
+
+    async def slot(index: int) -> None:
+        nonlocal processed
+        worker_id = f"{prefix}:{index}"
+        while True:
+            job = await asyncio.to_thread(
+                _in_session, session_factory, claim_job, worker_id, kinds
+            )
+            if job is None:
+                if burst:
+                    return
+                await asyncio.sleep(poll_interval)
+                continue
+            await run_claimed_job(job, worker_id, session_factory)
+            processed += 1
+
+    await asyncio.gather(*(slot(index) for index in range(concurrency)))
+    return processed
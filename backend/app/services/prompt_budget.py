@@ -0,0 +1,83 @@
+"""
+Token budgeting for prompts built from a whole CV.
+
+Every entry of a CV-wide prompt (a job, a project, the skills list) is
+rendered at a few levels of detail, from complete down to omitted, and
+given a priority. When the rendered entries exceed the token budget, the
+lowest-priority entries are shortened one level at a time until they fit:
+first every long description is trimmed, then entries are cut to their
+headline, and only then are entries dropped. The result depends only on the
+CV content, so compacted prompts still hit the response cache.
+"""
+
+import math
+from typing import List, NamedTuple, Sequence, Tuple
+
+# Rough characters per token for English prose (matches the rate limiter)
+CHARS_PER_TOKEN = 4
+
+
+class BudgetItem(NamedTuple):
+    """
+    One prompt entry at decreasing levels of detail.
+
+    ``levels[0]`` is the full rendering and each following level is shorter;
+    an empty string means the entry is omitted. Higher ``priority`` values
+    are shortened first.
+    """
+
+    levels: Tuple[str, ...]
+    priority: int
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM token count of ``text``."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_words(text: str | None, max_words: int) -> str:
+    """First ``max_words`` words of ``text``, marked with an ellipsis if cut."""
+    words = (text or "").split()
+    if len(words) <= max_words:
+        return " ".join(words)
+    return " ".join(words[:max_words]) + " …"
+
+
+def by_recency(entries: Sequence[dict]) -> List[dict]:
+    """Entries with the latest ``start_date`` first; undated ones keep their order last."""
+    dated = [entry for entry in entries if entry.get("start_date")]
+    undated = [entry for entry in entries if not entry.get("start_date")]
+    return (
+        sorted(dated, key=lambda entry: str(entry["start_date"]), reverse=True)
+        + undated
+    )
+
+
+def fit_to_budget(items: Sequence[BudgetItem], budget_tokens: int) -> List[str]:
+    """
+    Choose a rendering for every item so the total fits ``budget_tokens``.
+
+    Returns the chosen renderings in item order. If the budget cannot be met
+    even at the shortest levels, those are returned.
+    """
+    chosen = [0] * len(items)
+    total = sum(estimate_tokens(item.levels[0]) for item in items)
+    # Lowest priority first; among equals the later entry goes first
+    order = sorted(
+        range(len(items)), key=lambda index: (-items[index].priority, -index)
+    )
+    depth = 1
+    max_depth = max((len(item.levels) for item in items), default=1)
+    while total > budget_tokens and depth < max_depth:
+        for index in order:
+            if total <= budget_tokens:
+                break
+            levels = items[index].levels
+            if chosen[index] + 1 != depth or depth >= len(levels):
+                continue
+            total += estimate_tokens(levels[depth]) - estimate_tokens(
+                levels[chosen[index]]
+            )
+            chosen[index] = depth
+        depth += 1
+    return [item.levels[level] for item, level in zip(items, chosen)]
@@ -0,0 +1,329 @@
+"""
+Incremental CV scoring, one section at a time.
+
+A CV is split into sections: general information, each work experience,
+each project and education. Every section is scored by its own small LLM
+prompt whose cache key hashes only that section's content, so after an
+edit only the changed sections miss the response cache and reach the LLM.
+Incremental re-scoring therefore depends on the response cache: with
+AI_CACHE_ENABLED=false every section is sent to the LLM on every run.
+A section the LLM cannot score (unreachable, unusable reply) is scored by
+the local engine instead and marked with the reason. Section scores are then combined into the overall
+metrics, weighted by how much text each section holds.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.schemas.cv import CVWithRelations
+from app.services.ai_batch import ConcurrencyLimiter
+from app.services.ai_service import AIService
+from app.services.cv_scoring import Metric, metrics_insight, score_section_locally
+
+logger = logging.getLogger(__name__)
+
+IMPACT = "impact_achievement_density"
+CLARITY = "clarity_readability"
+ACTION_VERBS = "action_verb_strength"
+PROFESSIONALISM = "professionalism"
+METRICS = (IMPACT, CLARITY, ACTION_VERBS, PROFESSIONALISM)
+
+# Metrics that can be judged from each kind of section alone
+SECTION_METRICS = {
+    "general": (CLARITY, PROFESSIONALISM),
+    "work_experience": METRICS,
+    "project": METRICS,
+    "education": (CLARITY, PROFESSIONALISM),
+}
+
+# Short sections still count for this many words when combining scores
+_MIN_WEIGHT = 20
+
+# Whether the missing response cache has been reported
+_warned_no_cache = False
+
+
+class CVSection(NamedTuple):
+    """One independently scored part of a CV."""
+
+    key: str
+    kind: str
+    label: str
+    text: str
+    # (statement section, text) pairs for the local engine
+    sources: List[Tuple[str, Optional[str]]]
+    contact_complete: Optional[bool] = None
+
+    @property
+    def metrics(self) -> Tuple[str, ...]:
+        return SECTION_METRICS[self.kind]
+
+    @property
+    def weight(self) -> int:
+        words = sum(len((text or "").split()) for _, text in self.sources)
+        return max(words, _MIN_WEIGHT)
+
+
+class SectionScore(NamedTuple):
+    """Metric scores for one section and how they were obtained."""
+
+    section: CVSection
+    metrics: Dict[str, Metric]
+    scorer: str
+    cached: bool = False
+    # Why the local engine scored the section instead of the LLM
+    fallback_reason: Optional[str] = None
+
+
+def _field(name: str, value: object) -> str:
+    return f"{name}: {value if value not in (None, '') else 'Not provided'}"
+
+
+def _ordered(entries):
+    return sorted(entries, key=lambda entry: (entry.display_order, entry.id))
+
+
+def cv_sections(cv: CVWithRelations) -> List[CVSection]:
+    """Split a CV into the sections that are scored separately."""
+    contact_complete = bool(cv.phone and cv.location)
+    sections = [
+        CVSection(
+            key="general",
+            kind="general",
+            label="General information",
+            text="\n".join(
+                [
+                    _field("Title", cv.title),
+                    _field("Summary", cv.summary),
+                    _field("Skills", ", ".join(skill.name for skill in cv.skills)),
+                    _field("Has Phone", bool(cv.phone)),
+                    _field("Has Location", bool(cv.location)),
+                    _field("Has Email", bool(cv.email)),
+                ]
+            ),
+            sources=[("summary", cv.summary)],
+            contact_complete=contact_complete,
+        )
+    ]
+    for exp in _ordered(cv.work_experiences):
+        sections.append(
+            CVSection(
+                key=f"work_experience:{exp.id}",
+                kind="work_experience",
+                label=f"{exp.position} at {exp.company}",
+                text="\n".join(
+                    [
+                        _field("Position", exp.position),
+                        _field("Company", exp.company),
+                        _field("Description", exp.description),
+                        _field("Has Dates", bool(exp.start_date)),
+                        _field("Has Location", bool(exp.location)),
+                    ]
+                ),
+                sources=[("work_experience", exp.description)],
+            )
+        )
+    for project in _ordered(cv.projects):
+        sections.append(
+            CVSection(
+                key=f"project:{project.id}",
+                kind="project",
+                label=project.name,
+                text="\n".join(
+                    [
+                        _field("Name", project.name),
+                        _field("Role", project.role),
+                        _field("Description", project.description),
+                        _field("Technologies", project.technologies),
+                        _field("Has URL", bool(project.url or project.github_url)),
+                    ]
+                ),
+                sources=[("project", project.description)],
+            )
+        )
+    if cv.educations:
+        educations = _ordered(cv.educations)
+        sections.append(
+            CVSection(
+                key="education",
+                kind="education",
+                label="Education",
+                text="\n---\n".join(
+                    "\n".join(
+                        [
+                            _field("Degree", edu.degree),
+                            _field("Institution", edu.institution),
+                            _field("Field of Study", edu.field_of_study),
+                            _field("Description", edu.description),
+                            _field("Has Dates", bool(edu.start_date)),
+                        ]
+                    )
+                    for edu in educations
+                ),
+                sources=[("education", edu.description) for edu in educations],
+            )
+        )
+    return sections
+
+
+def parse_section_metrics(
+    text: str, metrics: Tuple[str, ...]
+) -> Optional[Dict[str, Metric]]:
+    """
+    Extract ``{metric: {"score", "reason"}}`` from an LLM reply.
+
+    Returns None unless every requested metric has an integer score.
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        return None
+    try:
+        data = json.loads(text[start : end + 1])
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    parsed: Dict[str, Metric] = {}
+    for name in metrics:
+        entry = data.get(name)
+        if not isinstance(entry, dict):
+            return None
+        try:
+            score = int(entry.get("score"))
+        except (TypeError, ValueError):
+            return None
+        parsed[name] = Metric(
+            score=min(10, max(1, score)),
+            reason=str(entry.get("reason") or ""),
+        )
+    return parsed
+
+
+def uncached_sections(
+    ai_service: AIService, sections: List[CVSection], regenerate: bool = False
+) -> int:
+    """How many of ``sections`` need an LLM call (no cached score)."""
+    cache = ai_service.cache
+    if regenerate or cache is None:
+        return len(sections)
+    return sum(
+        not cache.contains(
+            ai_service.build_section_score_request(
+                section.kind.replace("_", " "), section.text, section.metrics
+            ).cache_key
+        )
+        for section in sections
+    )
+
+
+def score_locally(
+    section: CVSection, fallback_reason: Optional[str] = None
+) -> SectionScore:
+    """Score a section with the local engine."""
+    return SectionScore(
+        section,
+        score_section_locally(
+            section.sources, section.metrics, section.contact_complete
+        ),
+        scorer="local",
+        fallback_reason=fallback_reason,
+    )
+
+
+async def score_sections(
+    ai_service: AIService,
+    sections: List[CVSection],
+    *,
+    user_id: int,
+    limiter: ConcurrencyLimiter,
+    regenerate: bool = False,
+) -> List[SectionScore]:
+    """
+    Score every section concurrently, reusing cached section results.
+
+    Sections whose content is unchanged are answered by the response cache
+    without an LLM call; without a cache every section reaches the LLM.
+    Results are returned in section order.
+    """
+    global _warned_no_cache
+    if ai_service.cache is None and not _warned_no_cache:
+        _warned_no_cache = True
+        logger.warning(
+            "AI response cache is disabled; sections mode re-scores every "
+            "section on every run"
+        )
+
+    async def score(section: CVSection) -> SectionScore:
+        request = ai_service.build_section_score_request(
+            section.kind.replace("_", " "), section.text, section.metrics
+        )
+        cache = ai_service.cache
+        cached = (
+            not regenerate and cache is not None and cache.contains(request.cache_key)
+        )
+        try:
+            if cached:
+                reply = await ai_service.run(request)
+            else:
+                async with limiter.slot(user_id):
+                    reply = await ai_service.run(request, regenerate=regenerate)
+        except Exception as e:
+            logger.warning("Scoring section %s failed: %s", section.key, e)
+            return score_locally(section, f"LLM call failed: {e}")
+        metrics = parse_section_metrics(reply, section.metrics)
+        if metrics is None:
+            logger.warning("Unusable score for section %s: %r", section.key, reply)
+            if cache is not None:
+                # Do not serve the unusable reply again for the same content
+                cache.delete(request.cache_key)
+            return score_locally(section, "LLM reply could not be parsed")
+        return SectionScore(section, metrics, scorer="llm", cached=cached)
+
+    return list(await asyncio.gather(*(score(section) for section in sections)))
+
+
+def combine_section_scores(scores: List[SectionScore]) -> Dict[str, object]:
+    """
+    Combine section scores into the overall metrics.
+
+    Each metric is the weighted mean over the sections it applies to; its
+    reason is that of the weakest such section.
+    """
+    combined: Dict[str, Metric] = {}
+    for name in METRICS:
+        rated = [s for s in scores if name in s.metrics]
+        if not rated:
+            combined[name] = Metric(score=1, reason="No section to assess.")
+            continue
+        total_weight = sum(s.section.weight for s in rated)
+        mean = (
+            sum(s.metrics[name]["score"] * s.section.weight for s in rated)
+            / total_weight
+        )
+        weakest = min(rated, key=lambda s: s.metrics[name]["score"])
+        reason = weakest.metrics[name]["reason"]
+        if len(rated) > 1:
+            reason = f"Weakest in {weakest.section.label}: {reason}"
+        combined[name] = Metric(score=int(min(10, max(1, round(mean)))), reason=reason)
+    return {**combined, "summary_insight": metrics_insight(combined)}
+
+
+async def score_cv_by_section(
+    ai_service: AIService,
+    cv: CVWithRelations,
+    *,
+    user_id: int,
+    limiter: ConcurrencyLimiter,
+    regenerate: bool = False,
+) -> Tuple[Dict[str, object], List[SectionScore]]:
+    """Score a CV section by section; returns the combined result and sections."""
+    scores = await score_sections(
+        ai_service,
+        cv_sections(cv),
+        user_id=user_id,
+        limiter=limiter,
+        regenerate=regenerate,
+    )
+    return combine_section_scores(scores), scores
@@ -0,0 +1,208 @@
+"""Background cleanup of expired share links and their stored PDFs."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.share_link import ShareLink
+from app.services.storage_service import (
+    PDF_CONTAINER,
+    StorageBackend,
+    get_signed_url_cache,
+    get_storage,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReapResult:
+    """Summary of one reaper run."""
+
+    rows_deleted: int = 0
+    blobs_deleted: int = 0
+    bytes_reclaimed: int = 0
+    batches: int = 0
+    failed_ids: Set[int] = field(default_factory=set)
+
+    def as_dict(self) -> dict:
+        return {
+            "rows_deleted": self.rows_deleted,
+            "blobs_deleted": self.blobs_deleted,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "batches": self.batches,
+            "failed": len(self.failed_ids),
+        }
+
+
+def _fetch_expired_batch(
+    session_factory: Callable[[], Session],
+    now: datetime,
+    batch_size: int,
+    skip_ids: Set[int],
+) -> List[Tuple[int, Optional[str]]]:
+    """Select the oldest expired links (walks ix_sharelink_expires_at)."""
+    db = session_factory()
+    try:
+        query = db.query(ShareLink.id, ShareLink.blob_name).filter(
+            ShareLink.expires_at <= now
+        )
+        if skip_ids:
+            query = query.filter(ShareLink.id.notin_(skip_ids))
+        rows = query.order_by(ShareLink.expires_at).limit(batch_size).all()
+        return [(row.id, row.blob_name) for row in rows]
+    finally:
+        db.close()
+
+
+def _delete_rows(session_factory: Callable[[], Session], ids: List[int]) -> int:
+    db = session_factory()
+    try:
+        deleted = (
+            db.query(ShareLink)
+            .filter(ShareLink.id.in_(ids))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+async def reap_expired_share_links(
+    *,
+    storage: Optional[StorageBackend] = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+    max_seconds: Optional[float] = None,
+    concurrency: Optional[int] = None,
+) -> ReapResult:
+    """
+    Delete expired share links and their PDFs in bounded batches.
+
+    Each batch selects up to ``batch_size`` expired rows in ``expires_at``
+    order, deletes their blobs concurrently (at most ``concurrency`` at a
+    time) and then deletes the rows whose blobs are gone. Rows whose blob
+    could not be deleted are kept and retried on the next run. The run stops
+    after ``max_batches`` batches or ``max_seconds`` seconds.
+
+    Args:
+        storage: Storage backend holding the PDFs (defaults to the app's).
+        session_factory: Callable returning a new database session.
+        batch_size: Rows per batch (SHARE_LINK_REAPER_BATCH_SIZE).
+        max_batches: Batch limit per run (SHARE_LINK_REAPER_MAX_BATCHES).
+        max_seconds: Time limit per run (SHARE_LINK_REAPER_MAX_SECONDS).
+        concurrency: Parallel blob deletions (SHARE_LINK_REAPER_CONCURRENCY).
+
+    Returns:
+        ReapResult with the rows and bytes reclaimed.
+    """
+    storage = storage or get_storage()
+    batch_size = max(batch_size or settings.SHARE_LINK_REAPER_BATCH_SIZE, 1)
+    max_batches = max(max_batches or settings.SHARE_LINK_REAPER_MAX_BATCHES, 1)
+    max_seconds = max_seconds or settings.SHARE_LINK_REAPER_MAX_SECONDS
+    semaphore = asyncio.Semaphore(
+        max(concurrency or settings.SHARE_LINK_REAPER_CONCURRENCY, 1)
+    )
+    try:
+        url_cache = get_signed_url_cache()
+    except ValueError:
+        url_cache = None
+
+    async def delete_blob(link_id: int, blob_name: Optional[str]) -> Tuple[int, int]:
+        if not blob_name:
+            return link_id, 0
+        async with semaphore:
+            freed = await storage.delete(PDF_CONTAINER, blob_name)
+        if url_cache is not None:
+            url_cache.invalidate(PDF_CONTAINER, blob_name)
+        return link_id, freed
+
+    result = ReapResult()
+    now = datetime.utcnow()
+    deadline = time.monotonic() + max_seconds
+
+    while result.batches < max_batches and time.monotonic() < deadline:
+        batch = await asyncio.to_thread(
+            _fetch_expired_batch,
+            session_factory,
+            now,
+            batch_size,
+            set(result.failed_ids),
+        )
+        if not batch:
+            break
+        result.batches += 1
+
+        outcomes = await asyncio.gather(
+            *(delete_blob(link_id, blob_name) for link_id, blob_name in batch),
+            return_exceptions=True,
+        )
+        deletable: List[int] = []
+        for (link_id, blob_name), outcome in zip(batch, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.warning(
+                    "Failed to delete blob %s for share link %s: %s",
+                    blob_name,
+                    link_id,
+                    outcome,
+                )
+                result.failed_ids.add(link_id)
+                continue
+            deletable.append(link_id)
+            if blob_name:
+                result.blobs_deleted += 1
+                result.bytes_reclaimed += outcome[1]
+
+        if deletable:
+            result.rows_deleted += await asyncio.to_thread(
+                _delete_rows, session_factory, deletable
+            )
+        if len(batch) < batch_size:
+            break
+
+    logger.info(
+        "Share link reaper removed %d rows and %d blobs (%d bytes) in %d batches",
+        result.rows_deleted,
+        result.blobs_deleted,
+        result.bytes_reclaimed,
+        result.batches,
+    )
+    return result
+
+
+async def run_share_link_reaper(interval_seconds: float) -> None:
+    """Run the reaper every ``interval_seconds`` until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await reap_expired_share_links()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Share link reaper run failed")
+
+
+def start_share_link_reaper() -> Optional[asyncio.Task]:
+    """Schedule the periodic reaper task if enabled and storage is available."""
+    if not settings.SHARE_LINK_REAPER_ENABLED:
+        return None
+    try:
+        get_storage()
+    except ValueError:
+        logger.info("Share link reaper not started: file storage is not configured")
+        return None
+    return asyncio.create_task(
+        run_share_link_reaper(settings.SHARE_LINK_REAPER_INTERVAL_SECONDS),
+        name="share-link-reaper",
+    )
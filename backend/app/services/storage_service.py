@@ -0,0 +1,485 @@
+"""Pluggable storage backends for CV PDFs and profile pictures."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import mimetypes
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, urlencode
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.resilience import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# Logical container names shared by every backend.
+PDF_CONTAINER = "pdf"
+PFP_CONTAINER = "pfp"
+CONTAINERS = (PDF_CONTAINER, PFP_CONTAINER)
+
+
+class BlobNotFoundError(LookupError):
+    """Raised when a blob does not exist in the storage backend."""
+
+
+# Content type -> file extension of a stored profile picture original
+PROFILE_PICTURE_EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png"}
+
+
+def _profile_picture_blob(user_id: int, content_type: str, version: str) -> str:
+    """Return the blob name for a user's profile picture."""
+    if content_type not in PROFILE_PICTURE_EXTENSIONS:
+        raise ValueError("Unsupported image format (use jpg or png)")
+
+    # Versioned so a new upload never reuses the name (and signed URLs) of
+    # the previous picture
+    suffix = PROFILE_PICTURE_EXTENSIONS[content_type]
+    return f"profile_pictures/user-{user_id}/profile-{version}.{suffix}"
+
+
+class StorageBackend(ABC):
+    """
+    Interface every storage backend implements.
+
+    Backends provide blob primitives (upload, download, delete, size and
+    signed URLs) for the logical ``pdf`` and ``pfp`` containers; the CV and
+    profile picture helpers are built on top of them.
+    """
+
+    async def initialize(self) -> None:
+        """Prepare the backend (create containers, directories, ...)."""
+
+    async def close(self) -> None:
+        """Release any resources held by the backend."""
+
+    @abstractmethod
+    async def upload(
+        self,
+        container: str,
+        blob_name: str,
+        data: bytes,
+        *,
+        content_type: str,
+        metadata: Optional[dict] = None,
+    ) -> None:
+        """Store ``data`` under ``blob_name``, overwriting any existing blob."""
+
+    @abstractmethod
+    async def download(self, container: str, blob_name: str) -> bytes:
+        """Return the blob contents or raise BlobNotFoundError."""
+
+    @abstractmethod
+    async def get_size(self, container: str, blob_name: str) -> Optional[int]:
+        """Return the blob size in bytes, or None if it does not exist."""
+
+    @abstractmethod
+    async def delete(self, container: str, blob_name: str) -> int:
+        """Delete a blob and return the bytes freed (0 if it did not exist)."""
+
+    @abstractmethod
+    def generate_signed_url(
+        self, container: str, blob_name: str, ttl_minutes: int
+    ) -> Tuple[str, datetime]:
+        """Return a time-limited read URL for a blob and its expiry."""
+
+    async def upload_cv_pdf(
+        self, *, user_id: int, cv_id: int, data: bytes, filename: str
+    ) -> str:
+        """
+        Upload a CV PDF and return its blob name.
+
+        Args:
+            user_id: ID of the owner.
+            cv_id: CV identifier.
+            data: PDF bytes.
+            filename: Original filename for metadata.
+
+        Returns:
+            Name of the uploaded blob in the PDF container.
+        """
+        blob_name = f"cvs/user-{user_id}/cv-{cv_id}-{uuid4()}.pdf"
+
+        try:
+            await self.upload(
+                PDF_CONTAINER,
+                blob_name,
+                data,
+                content_type="application/pdf",
+                metadata={
+                    "cv_id": str(cv_id),
+                    "user_id": str(user_id),
+                    "filename": filename,
+                },
+            )
+        except Exception:
+            logger.exception("Failed to upload CV PDF to storage")
+            raise
+
+        return blob_name
+
+    async def upload_profile_picture(
+        self,
+        *,
+        user_id: int,
+        data: bytes,
+        content_type: str,
+        version: str,
+        filename: str,
+    ) -> str:
+        """
+        Upload a profile picture and return its blob name.
+
+        Args:
+            user_id: Owner's ID.
+            data: Image file bytes.
+            content_type: MIME type detected from the image data.
+            version: Identifier of this upload, part of the blob name.
+            filename: Original filename for metadata.
+
+        Returns:
+            Name of the uploaded blob in the profile picture container.
+
+        Raises:
+            ValueError: If the content type is not JPEG or PNG.
+            CircuitOpenError: If storage calls are currently being refused.
+            RuntimeError: If the upload fails.
+        """
+        blob_name = _profile_picture_blob(user_id, content_type, version)
+
+        try:
+            await self.upload(
+                PFP_CONTAINER,
+                blob_name,
+                data,
+                content_type=content_type,
+                metadata={
+                    "user_id": str(user_id),
+                    "filename": filename,
+                },
+            )
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to upload profile picture: {e}")
+
+        return blob_name
+
+    async def upload_profile_picture_variants(
+        self,
+        *,
+        user_id: int,
+        variants: Dict[int, bytes],
+        extension: str,
+        content_type: str,
+        version: str,
+    ) -> Dict[str, str]:
+        """
+        Upload resized profile picture variants next to the original.
+
+        Args:
+            user_id: Owner's ID.
+            variants: Encoded image bytes keyed by square edge length in pixels.
+            extension: File extension of the variants ("webp" or "jpg").
+            content_type: MIME type of the variants.
+            version: Identifier of this upload, part of the blob names.
+
+        Returns:
+            Blob name per variant, keyed by size (as a string).
+
+        Raises:
+            CircuitOpenError: If storage calls are currently being refused.
+            RuntimeError: If an upload fails.
+        """
+        prefix = f"profile_pictures/user-{user_id}/profile-{version}"
+        blob_names = {size: f"{prefix}-{size}.{extension}" for size in variants}
+
+        try:
+            await asyncio.gather(
+                *(
+                    self.upload(
+                        PFP_CONTAINER,
+                        blob_names[size],
+                        data,
+                        content_type=content_type,
+                        metadata={"user_id": str(user_id), "size": str(size)},
+                    )
+                    for size, data in variants.items()
+                )
+            )
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to upload profile picture variants: {e}")
+
+        return {str(size): blob_name for size, blob_name in blob_names.items()}
+
+
+def sign_blob_path(container: str, blob_name: str, expires: int) -> str:
+    """Return the HMAC signature for a local blob URL."""
+    message = f"{container}/{blob_name}:{expires}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify_blob_signature(
+    container: str, blob_name: str, expires: int, signature: str
+) -> bool:
+    """Check a local blob URL signature and that it has not expired."""
+    if expires < int(time.time()):
+        return False
+    expected = sign_blob_path(container, blob_name, expires)
+    return hmac.compare_digest(expected, signature)
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Filesystem storage backend.
+
+    Blobs are written below ``LOCAL_STORAGE_PATH/<container>/``. Signed URLs
+    point at the backend's own ``/storage`` endpoint, which verifies an HMAC
+    signature and streams the file with ``Range`` support.
+    """
+
+    def __init__(self, root: str | Path | None = None) -> None:
+        self.root = Path(root or settings.LOCAL_STORAGE_PATH).resolve()
+
+    async def initialize(self) -> None:
+        for container in CONTAINERS:
+            (self.root / container).mkdir(parents=True, exist_ok=True)
+
+    def resolve_path(self, container: str, blob_name: str) -> Path:
+        """Map a blob to its file path, refusing names that escape the container."""
+        if container not in CONTAINERS:
+            raise ValueError(f"Unknown storage container: {container}")
+        base = self.root / container
+        path = (base / blob_name).resolve()
+        if not blob_name or not path.is_relative_to(base):
+            raise ValueError(f"Invalid blob name: {blob_name}")
+        return path
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _remove(path: Path) -> int:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return 0
+        return size
+
+    async def upload(
+        self,
+        container: str,
+        blob_name: str,
+        data: bytes,
+        *,
+        content_type: str,
+        metadata: Optional[dict] = None,
+    ) -> None:
+        path = self.resolve_path(container, blob_name)
+        await asyncio.to_thread(self._write, path, data)
+
+    async def download(self, container: str, blob_name: str) -> bytes:
+        path = self.resolve_path(container, blob_name)
+        try:
+            return await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError as exc:
+            raise BlobNotFoundError(f"{container}/{blob_name}") from exc
+
+    async def get_size(self, container: str, blob_name: str) -> Optional[int]:
+        path = self.resolve_path(container, blob_name)
+        try:
+            return (await asyncio.to_thread(path.stat)).st_size
+        except FileNotFoundError:
+            return None
+
+    async def delete(self, container: str, blob_name: str) -> int:
+        path = self.resolve_path(container, blob_name)
+        return await asyncio.to_thread(self._remove, path)
+
+    def generate_signed_url(
+        self, container: str, blob_name: str, ttl_minutes: int
+    ) -> Tuple[str, datetime]:
+        expires = int(time.time()) + max(ttl_minutes, 1) * 60
+        expires_at = datetime.fromtimestamp(expires, timezone.utc).replace(tzinfo=None)
+        query = urlencode(
+            {
+                "expires": expires,
+                "signature": sign_blob_path(container, blob_name, expires),
+            }
+        )
+        path = f"{settings.API_V1_PREFIX}/storage/{container}/{quote(blob_name)}"
+        base_url = settings.STORAGE_PUBLIC_BASE_URL.rstrip("/")
+        return f"{base_url}{path}?{query}", expires_at
+
+    @staticmethod
+    def guess_content_type(path: Path) -> str:
+        return mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+
+class SignedUrlCache:
+    """
+    In-process cache of signed read URLs.
+
+    Signing is cheap but not free, and handing out the same URL lets browsers
+    and CDNs reuse what they already fetched. Entries are re-signed once they
+    are within ``refresh_margin_seconds`` of expiring, and the least recently
+    used entries are evicted beyond ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        *,
+        ttl_minutes: int,
+        refresh_margin_seconds: int,
+        max_entries: int,
+    ) -> None:
+        self.backend = backend
+        self.ttl_minutes = max(ttl_minutes, 1)
+        self.refresh_margin = timedelta(seconds=max(refresh_margin_seconds, 0))
+        self.max_entries = max(max_entries, 1)
+        self._entries: OrderedDict[Tuple[str, str], Tuple[str, datetime]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, container: str, blob_name: str) -> Tuple[str, datetime]:
+        """Return a signed URL and its expiry, re-signing when close to expiry."""
+        key = (container, blob_name)
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] - now > self.refresh_margin:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = self.backend.generate_signed_url(container, blob_name, self.ttl_minutes)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def cache_seconds(self, expires_at: datetime) -> int:
+        """Seconds a client may reuse a URL expiring at ``expires_at``."""
+        remaining = expires_at - datetime.utcnow() - self.refresh_margin
+        return max(int(remaining.total_seconds()), 0)
+
+    def invalidate(self, container: str, blob_name: str) -> None:
+        """Drop a cached URL (e.g. after the blob was deleted)."""
+        with self._lock:
+            self._entries.pop((container, blob_name), None)
+
+
+def asset_url(kind: str, asset_id: int | str, **params: object) -> str:
+    """Build the long-lived ``/assets`` redirect URL for a stored file."""
+    path = f"{settings.API_V1_PREFIX}/assets/{kind}/{asset_id}"
+    query = urlencode({k: v for k, v in params.items() if v is not None})
+    base_url = settings.STORAGE_PUBLIC_BASE_URL.rstrip("/")
+    return f"{base_url}{path}?{query}" if query else f"{base_url}{path}"
+
+
+_storage: StorageBackend | None = None
+_signed_urls: SignedUrlCache | None = None
+
+
+def create_storage_backend() -> StorageBackend:
+    """
+    Build the backend selected by STORAGE_BACKEND.
+
+    Raises:
+        ValueError: If the backend is unknown or not configured.
+    """
+    backend = settings.STORAGE_BACKEND.lower()
+    if backend == "local":
+        return LocalStorageBackend()
+    if backend == "azure":
+        from app.services.blob_service import AsyncAzureBlobService
+
+        return AsyncAzureBlobService()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+
+
+async def init_storage() -> StorageBackend | None:
+    """
+    Create the shared storage backend during application startup.
+
+    Returns None (and leaves uploads disabled) when storage is not configured.
+    """
+    global _storage, _signed_urls
+    if _storage is not None:
+        return _storage
+    try:
+        storage = create_storage_backend()
+    except ValueError as exc:
+        logger.warning("File storage disabled: %s", exc)
+        return None
+    try:
+        await storage.initialize()
+    except Exception:
+        logger.exception("Failed to initialize %s storage", settings.STORAGE_BACKEND)
+        await storage.close()
+        return None
+    _storage = storage
+    _signed_urls = SignedUrlCache(
+        storage,
+        ttl_minutes=settings.ASSET_URL_TTL_MINUTES,
+        refresh_margin_seconds=settings.ASSET_URL_REFRESH_MARGIN_SECONDS,
+        max_entries=settings.ASSET_URL_CACHE_SIZE,
+    )
+    return _storage
+
+
+async def close_storage() -> None:
+    """Close the shared storage backend during application shutdown."""
+    global _storage, _signed_urls
+    if _storage is not None:
+        await _storage.close()
+        _storage = None
+        _signed_urls = None
+
+
+def get_storage() -> StorageBackend:
+    """
+    Return the storage backend created in the application lifespan.
+
+    Raises:
+        ValueError: If file storage is not configured.
+    """
+    if _storage is None:
+        raise ValueError("File storage is not configured")
+    return _storage
+
+
+def get_signed_url_cache() -> SignedUrlCache:
+    """
+    Return the signed URL cache for the active storage backend.
+
+    Raises:
+        ValueError: If file storage is not configured.
+    """
+    if _signed_urls is None:
+        raise ValueError("File storage is not configured")
+    return _signed_urls
@@ -0,0 +1,244 @@
+"""
+Segment-level translation memory.
+
+Translated text segments (a job title, a skill, a paragraph) are remembered
+by language pair and a hash of the normalized source text, so re-translating
+a CV only sends the fields that changed upstream, and common strings such as
+"Python" or a university name are translated once for every user. Entries
+live in a bounded per-process LRU and, optionally, in the
+``translationsegment`` table so they survive restarts and are shared between
+workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.translation_segment import TranslationSegment
+from app.services.ai_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+_Key = Tuple[str, str, str]
+
+
+def segment_hash(text: str) -> str:
+    """Hash of the normalized text, so whitespace-only edits still hit."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def _load_segments(
+    db: Session, source: str, targets: Sequence[str], hashes: Sequence[str]
+) -> Dict[_Key, str]:
+    """Stored translations of ``hashes`` into any of ``targets``, in one query."""
+    rows = db.query(
+        TranslationSegment.target_language,
+        TranslationSegment.text_hash,
+        TranslationSegment.translated_text,
+    ).filter(
+        TranslationSegment.source_language == source,
+        TranslationSegment.target_language.in_(targets),
+        TranslationSegment.text_hash.in_(hashes),
+    )
+    return {
+        (source, target, text_hash): translated
+        for target, text_hash, translated in rows
+    }
+
+
+def _save_segments(
+    db: Session, source: str, target: str, translations: Dict[str, str]
+) -> None:
+    existing = {
+        text_hash
+        for _, _, text_hash in _load_segments(db, source, [target], list(translations))
+    }
+    db.add_all(
+        TranslationSegment(
+            source_language=source,
+            target_language=target,
+            text_hash=text_hash,
+            translated_text=translated,
+        )
+        for text_hash, translated in translations.items()
+        if text_hash not in existing
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker stored the same segments first
+        db.rollback()
+
+
+def _in_session(session_factory: Callable[[], Session], fn: Callable, *args):
+    db = session_factory()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+class TranslationMemory:
+    """
+    Bounded LRU of translated segments with an optional database tier.
+
+    ``session_factory`` enables the persistent tier; database errors are
+    logged and treated as misses, since the memory is only an optimization.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ) -> None:
+        self.max_entries = max(max_entries, 1)
+        self.session_factory = session_factory
+        self._entries: OrderedDict[_Key, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: _Key, translated: str) -> None:
+        self._entries[key] = translated
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def lookup(
+        self, source: str, target: str, texts: Sequence[str]
+    ) -> List[Optional[str]]:
+        """
+        Known translations of ``texts``, None where a segment is missing.
+
+        Counts as one request in the hit-rate statistics and logs its own
+        hit ratio.
+        """
+        return (await self.lookup_targets(source, [target], texts))[target]
+
+    async def lookup_targets(
+        self, source: str, targets: Sequence[str], texts: Sequence[str]
+    ) -> Dict[str, List[Optional[str]]]:
+        """
+        ``lookup`` into several target languages at once.
+
+        The texts are hashed once and the database tier is queried once for
+        all targets. Each target counts as one request in the statistics.
+        """
+        hashes = [segment_hash(text) for text in texts]
+        found: Dict[_Key, str] = {}
+        with self._lock:
+            for target in targets:
+                for text_hash in hashes:
+                    key = (source, target, text_hash)
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                        found[key] = self._entries[key]
+
+        missing = {
+            text_hash
+            for target in targets
+            for text_hash in hashes
+            if (source, target, text_hash) not in found
+        }
+        if missing and self.session_factory is not None:
+            try:
+                stored = await asyncio.to_thread(
+                    _in_session,
+                    self.session_factory,
+                    _load_segments,
+                    source,
+                    list(targets),
+                    list(missing),
+                )
+            except SQLAlchemyError:
+                logger.warning("Translation memory lookup failed", exc_info=True)
+                stored = {}
+            with self._lock:
+                for key, translated in stored.items():
+                    self._remember(key, translated)
+            found.update(stored)
+
+        results: Dict[str, List[Optional[str]]] = {}
+        for target in targets:
+            translations = [
+                found.get((source, target, text_hash)) for text_hash in hashes
+            ]
+            hits = sum(translated is not None for translated in translations)
+            with self._lock:
+                self.requests += 1
+                self.hits += hits
+                self.misses += len(texts) - hits
+            if texts:
+                logger.info(
+                    "Translation memory %s -> %s: %d/%d segments hit (%.0f%%)",
+                    source,
+                    target,
+                    hits,
+                    len(texts),
+                    100 * hits / len(texts),
+                )
+            results[target] = translations
+        return results
+
+    async def store(
+        self, source: str, target: str, pairs: Iterable[Tuple[str, str]]
+    ) -> None:
+        """Remember ``(text, translated)`` pairs."""
+        translations = {segment_hash(text): translated for text, translated in pairs}
+        if not translations:
+            return
+        with self._lock:
+            for text_hash, translated in translations.items():
+                self._remember((source, target, text_hash), translated)
+        if self.session_factory is None:
+            return
+        try:
+            await asyncio.to_thread(
+                _in_session,
+                self.session_factory,
+                _save_segments,
+                source,
+                target,
+                translations,
+            )
+        except SQLAlchemyError:
+            logger.warning("Translation memory write failed", exc_info=True)
+
+    def clear(self) -> None:
+        """Forget in-process entries and counters (the table is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.requests = self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "persistent": self.session_factory is not None,
+                "entries": len(self._entries),
+                "requests": self.requests,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def create_translation_memory() -> Optional[TranslationMemory]:
+    """Build the memory configured by TRANSLATION_MEMORY_*, or None when off."""
+    if not settings.TRANSLATION_MEMORY_ENABLED:
+        return None
+    return TranslationMemory(
+        settings.TRANSLATION_MEMORY_MAX_ENTRIES,
+        session_factory=SessionLocal if settings.TRANSLATION_MEMORY_PERSIST else None,
+    )
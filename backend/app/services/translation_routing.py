@@ -0,0 +1,260 @@
+"""
+Latency-aware routing between the in-house and the external translator.
+
+Every upstream HTTP call a translation client makes records its latency and
+outcome against its backend over a rolling time window; replies served from
+the translation memory are not samples. A preferred backend (the in-house service
+for the directions it supports) is used while its circuit is not open and
+its recent error rate and p95 latency are within limits; otherwise requests
+go straight to the fallback. A failed call is retried on the other backend.
+With hedging enabled, a second request is sent to the other backend once
+the first has taken longer than its own p95, and the first reply wins.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Deque,
+    Dict,
+    Iterator,
+    NamedTuple,
+    Optional,
+)
+
+import anyio
+
+from app.core.config import settings
+from app.core.resilience import CircuitBreaker, CircuitOpenError
+
+INTERNAL = "internal"
+EXTERNAL = "external"
+
+# Failures after which the other backend is tried
+_FALLBACK_ERRORS = (ConnectionError, RuntimeError)
+
+
+class Backend(NamedTuple):
+    """A translator the router can send one request to."""
+
+    name: str
+    call: Callable[[], Coroutine[Any, Any, Any]]
+    breaker: CircuitBreaker
+
+
+class BackendStats:
+    """Latency and outcome samples of one backend over a rolling window."""
+
+    def __init__(
+        self,
+        window_seconds: float,
+        max_samples: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (recorded at, latency in ms, succeeded)
+        self._samples: Deque[tuple[float, float, bool]] = deque(maxlen=max_samples)
+
+    def _prune(self) -> None:
+        horizon = self._clock() - self.window_seconds
+        while self._samples and self._samples[0][0] < horizon:
+            self._samples.popleft()
+
+    def record(self, latency_ms: float, ok: bool) -> None:
+        with self._lock:
+            self._samples.append((self._clock(), latency_ms, ok))
+            self._prune()
+
+    @contextmanager
+    def timing(self) -> Iterator[None]:
+        """
+        Record the enclosed upstream call.
+
+        A cancelled call (a lost hedge, a client that went away) is recorded
+        as a success with the time it had taken, a lower bound of its
+        latency, so a backend whose calls keep being cut short still looks
+        slow. Calls refused by an open circuit never reached the backend and
+        are not recorded.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        except CircuitOpenError:
+            raise
+        except asyncio.CancelledError:
+            self.record((time.perf_counter() - started) * 1000, ok=True)
+            raise
+        except Exception:
+            self.record((time.perf_counter() - started) * 1000, ok=False)
+            raise
+        self.record((time.perf_counter() - started) * 1000, ok=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Sample count, error rate and latency percentiles of successes."""
+        with self._lock:
+            self._prune()
+            samples = list(self._samples)
+        latencies = sorted(latency for _, latency, ok in samples if ok)
+        errors = sum(1 for _, _, ok in samples if not ok)
+
+        def percentile(share: float) -> Optional[float]:
+            if not latencies:
+                return None
+            index = max(math.ceil(share * len(latencies)) - 1, 0)
+            return round(latencies[index], 1)
+
+        return {
+            "samples": len(samples),
+            "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+        }
+
+
+class TranslationRouter:
+    """
+    Picks the translator for each request and keeps routing counters.
+
+    Backends are judged only once they have ``min_samples`` calls in the
+    window, so an idle or recovering backend gets traffic again once its
+    old samples expire.
+    """
+
+    def __init__(
+        self,
+        *,
+        window_seconds: float,
+        min_samples: int,
+        max_error_rate: float,
+        max_p95_ms: float,
+        hedge: bool = False,
+        hedge_min_delay_ms: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_samples = max(min_samples, 1)
+        self.max_error_rate = max_error_rate
+        self.max_p95_ms = max_p95_ms
+        self.hedge = hedge
+        self.hedge_min_delay_ms = hedge_min_delay_ms
+        self.backends = {
+            name: BackendStats(window_seconds, clock=clock)
+            for name in (INTERNAL, EXTERNAL)
+        }
+        self._lock = threading.Lock()
+        self.decisions: Dict[str, int] = {}
+
+    def _count(self, decision: str) -> None:
+        with self._lock:
+            self.decisions[decision] = self.decisions.get(decision, 0) + 1
+
+    def is_healthy(self, backend: Backend) -> bool:
+        """Circuit not open and recent errors and p95 within limits."""
+        if backend.breaker.state == CircuitBreaker.OPEN:
+            return False
+        stats = self.backends[backend.name].snapshot()
+        if stats["samples"] < self.min_samples:
+            return True
+        if stats["error_rate"] > self.max_error_rate:
+            return False
+        return stats["p95_ms"] is None or stats["p95_ms"] <= self.max_p95_ms
+
+    def hedge_delay(self, backend: Backend) -> Optional[float]:
+        """Seconds to wait on ``backend`` before hedging, or None."""
+        if not self.hedge:
+            return None
+        stats = self.backends[backend.name].snapshot()
+        if stats["samples"] < self.min_samples or stats["p95_ms"] is None:
+            return None
+        return max(stats["p95_ms"], self.hedge_min_delay_ms) / 1000
+
+    async def run(
+        self, preferred: Optional[Backend], fallback: Optional[Backend]
+    ) -> Any:
+        """
+        Translate with ``preferred`` when healthy, else with ``fallback``.
+
+        Either may be None when not configured; ValueError if both are.
+        Backends record their upstream calls in ``self.backends`` themselves.
+        """
+        primary: Optional[Backend]
+        if preferred is not None and (fallback is None or self.is_healthy(preferred)):
+            primary, secondary = preferred, fallback
+        else:
+            if preferred is not None:
+                self._count("rerouted")
+            primary, secondary = fallback, None
+        if primary is None:
+            raise ValueError("No translation backend is configured")
+        self._count(f"routed_{primary.name}")
+        if secondary is None:
+            return await primary.call()
+
+        first = asyncio.create_task(primary.call())
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(primary))
+            if done:
+                error = first.exception()
+                if error is None:
+                    return first.result()
+                if not isinstance(error, _FALLBACK_ERRORS):
+                    raise error
+                self._count("fallbacks")
+                return await secondary.call()
+
+            self._count("hedged")
+            second = asyncio.create_task(secondary.call())
+            tasks.add(second)
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self._count("hedge_wins")
+                        return task.result()
+                    error = task.exception()
+            if error is None:
+                raise RuntimeError("no translation route available")
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            with anyio.CancelScope(shield=True):
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            decisions = dict(self.decisions)
+        return {
+            "hedging": self.hedge,
+            "decisions": decisions,
+            "backends": {
+                name: stats.snapshot() for name, stats in self.backends.items()
+            },
+        }
+
+
+def create_translation_router() -> TranslationRouter:
+    """Build the router configured by TRANSLATION_ROUTING_* settings."""
+    return TranslationRouter(
+        window_seconds=settings.TRANSLATION_ROUTING_WINDOW_SECONDS,
+        min_samples=settings.TRANSLATION_ROUTING_MIN_SAMPLES,
+        max_error_rate=settings.TRANSLATION_ROUTING_MAX_ERROR_RATE,
+        max_p95_ms=settings.TRANSLATION_ROUTING_MAX_P95_MS,
+        hedge=settings.TRANSLATION_HEDGE_ENABLED,
+        hedge_min_delay_ms=settings.TRANSLATION_HEDGE_MIN_DELAY_MS,
+    )
@@ -2,14 +2,98 @@
 
 from __future__ import annotations
 
-import httpx
-from typing import Any, Callable, List, MutableMapping, Optional, cast
+import asyncio
+import contextlib
+import copy
+import importlib.util
+import logging
 
+import anyio
+import httpx
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Dict,
+    List,
+    Mapping,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from app.core.coalescing import register_flight, request_key
 from app.core.config import settings
+from app.core.resilience import Dependency, register_dependency
 from app.schemas.translation import CVTranslation
-
-
-def _normalize_language(lang: str) -> str:
+from app.services.translation_memory import (
+    TranslationMemory,
+    create_translation_memory,
+)
+from app.services.translation_routing import (
+    EXTERNAL,
+    INTERNAL,
+    Backend,
+    BackendStats,
+    create_translation_router,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Transport errors, throttling and 5xx replies are worth retrying."""
+    if isinstance(exc, httpx.RequestError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        return code >= 500 or code == 429
+    return False
+
+
+def _translation_dependency(name: str) -> Dependency:
+    return register_dependency(
+        name,
+        timeout=settings.TRANSLATION_TIMEOUT_SECONDS,
+        max_retries=settings.TRANSLATION_MAX_RETRIES,
+        transient=_is_transient,
+    )
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Pooled client shared by the translation clients.
+
+    Connections (and their TLS sessions) are kept alive between requests,
+    and HTTP/2 is negotiated where the server supports it (needs the ``h2``
+    package, e.g. ``pip install httpx[http2]``).
+    """
+    http2 = settings.TRANSLATION_HTTP2 and importlib.util.find_spec("h2") is not None
+    if settings.TRANSLATION_HTTP2 and not http2:
+        logger.info("HTTP/2 disabled for translation: the h2 package is missing")
+    return httpx.AsyncClient(
+        timeout=settings.TRANSLATION_TIMEOUT_SECONDS,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.TRANSLATION_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.TRANSLATION_MAX_CONNECTIONS,
+            keepalive_expiry=settings.TRANSLATION_KEEPALIVE_SECONDS,
+        ),
+    )
+
+
+async def _post(client: httpx.AsyncClient, url: str, **kwargs: Any) -> httpx.Response:
+    response = await client.post(url, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+def normalize_language(lang: str) -> str:
     """Normalize language labels to ISO-like short codes."""
     if not lang:
         return ""
@@ -34,28 +118,165 @@ def _normalize_language(lang: str) -> str:
     return aliases.get(cleaned, cleaned)
 
 
+# Translatable text fields of a CV, at the top level and per section entry
+_CV_TEXT_FIELDS = ("title", "full_name", "location", "summary")
+_SECTION_TEXT_FIELDS = {
+    "work_experiences": ("company", "position", "location", "description"),
+    "educations": (
+        "institution",
+        "degree",
+        "field_of_study",
+        "description",
+        "honors",
+        "relevant_subjects",
+        "thesis_title",
+    ),
+    "projects": ("name", "description", "role", "technologies"),
+    "skills": ("name", "category"),
+}
+
+
+class TextSegment(NamedTuple):
+    """
+    A non-empty text field of a dumped CV.
+
+    ``section`` is None at top level; ``position`` is the entry's place in
+    its section.
+    """
+
+    section: Optional[str]
+    position: int
+    field: str
+    text: str
+
+    def container(self, cv: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        if self.section is None:
+            return cv
+        return cast(MutableMapping[str, Any], cv[self.section][self.position])
+
+
+def text_segments(cv: MutableMapping[str, Any]) -> List[TextSegment]:
+    """Every translatable, non-empty text field of ``cv`` in document order."""
+    segments: List[TextSegment] = []
+
+    def collect(
+        container: Mapping[str, Any],
+        fields: Sequence[str],
+        section: Optional[str] = None,
+        position: int = 0,
+    ) -> None:
+        for field in fields:
+            value = container.get(field)
+            cleaned = value.strip() if isinstance(value, str) else ""
+            if cleaned:
+                segments.append(TextSegment(section, position, field, cleaned))
+
+    collect(cv, _CV_TEXT_FIELDS)
+    for section, fields in _SECTION_TEXT_FIELDS.items():
+        for position, entry in enumerate(cv.get(section) or []):
+            collect(entry, fields, section, position)
+    return segments
+
+
+async def _translate_segments(
+    memory: Optional[TranslationMemory],
+    segments: List[TextSegment],
+    source_language: str,
+    target_language: str,
+    translate: Callable[[List[int]], Awaitable[List[str]]],
+    known: Optional[List[Optional[str]]] = None,
+) -> List[str]:
+    """
+    Translations of ``segments``, taking known ones from the memory.
+
+    ``translate`` receives the positions of the segments the memory missed
+    and returns their translations in the same order. ``known`` is the
+    result of a memory lookup the caller already made for these segments.
+    """
+    texts = [segment.text for segment in segments]
+    if known is not None:
+        known = list(known)
+    elif memory is None:
+        known = [None] * len(texts)
+    else:
+        known = await memory.lookup(source_language, target_language, texts)
+    missing = [position for position, text in enumerate(known) if text is None]
+    if missing:
+        fresh = await translate(missing)
+        for position, translated in zip(missing, fresh):
+            known[position] = translated
+        if memory is not None:
+            await memory.store(
+                source_language,
+                target_language,
+                (
+                    (texts[position], translated)
+                    for position, translated in zip(missing, fresh)
+                    if translated
+                ),
+            )
+    return [text or "" for text in known]
+
+
+def _upstream_call(stats: Optional[BackendStats]) -> ContextManager[None]:
+    """Time an upstream HTTP call for routing, if the client is routed."""
+    return stats.timing() if stats is not None else contextlib.nullcontext()
+
+
+def _split_batches(
+    texts: List[str], max_segments: int, max_characters: int
+) -> List[List[str]]:
+    """
+    Group ``texts`` in order into batches of at most ``max_segments`` strings
+    and ``max_characters`` characters; a longer text is sent on its own.
+    """
+    batches: List[List[str]] = []
+    batch: List[str] = []
+    characters = 0
+    for text in texts:
+        if batch and (
+            len(batch) >= max_segments or characters + len(text) > max_characters
+        ):
+            batches.append(batch)
+            batch, characters = [], 0
+        batch.append(text)
+        characters += len(text)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 class CustomTranslationClient:
     """HTTP client for the in-house translation microservice."""
 
-    def __init__(self, base_url: str):
+    def __init__(
+        self,
+        base_url: str,
+        http_client: httpx.AsyncClient,
+        memory: Optional[TranslationMemory] = None,
+        stats: Optional[BackendStats] = None,
+    ):
         if not base_url:
             raise ValueError("TRANSLATION_SERVICE_URL not configured")
         self.base_url = base_url.rstrip("/")
-
-    def translate_cv(
-        self, cv: CVTranslation, source_language: str, target_language: str
-    ) -> CVTranslation:
+        self.http_client = http_client
+        self.memory = memory
+        self.stats = stats
+        self.dependency = _translation_dependency("translation_internal")
+
+    async def _translate_payload(
+        self, cv: Mapping[str, Any], source_language: str, target_language: str
+    ) -> MutableMapping[str, Any]:
         payload = {
             "source_language": source_language,
             "target_language": target_language,
-            "cv": cv.model_dump(mode="json"),
+            "cv": cv,
         }
         try:
-            response = httpx.post(
-                f"{self.base_url}/translate", json=payload, timeout=60.0
+            response = await self.dependency.acall(
+                _post, self.http_client, f"{self.base_url}/translate", json=payload
             )
-            response.raise_for_status()
-        except httpx.RequestError as exc:
+        except (httpx.RequestError, TimeoutError) as exc:
             raise ConnectionError(
                 f"Unable to reach translation service at {self.base_url}"
             ) from exc
@@ -69,7 +290,45 @@ class CustomTranslationClient:
         if "translation" not in data:
             raise RuntimeError("Translation service response missing 'translation'")
 
-        return CVTranslation.model_validate(data["translation"])
+        return CVTranslation.model_validate(data["translation"]).model_dump(mode="json")
+
+    async def translate_cv(
+        self,
+        cv: CVTranslation,
+        source_language: str,
+        target_language: str,
+        known: Optional[List[Optional[str]]] = None,
+    ) -> CVTranslation:
+        translated_cv = cast(MutableMapping[str, Any], cv.model_dump(mode="json"))
+        segments = text_segments(translated_cv)
+
+        async def translate_missing(positions: List[int]) -> List[str]:
+            # Send the CV with only the fields the memory does not know
+            wanted = {segments[position] for position in positions}
+            request_cv = copy.deepcopy(translated_cv)
+            for segment in segments:
+                if segment not in wanted:
+                    segment.container(request_cv)[segment.field] = None
+            with _upstream_call(self.stats):
+                result = await self._translate_payload(
+                    request_cv, source_language, target_language
+                )
+            return [
+                segments[position].container(result).get(segments[position].field) or ""
+                for position in positions
+            ]
+
+        translations = await _translate_segments(
+            self.memory,
+            segments,
+            source_language,
+            target_language,
+            translate_missing,
+            known,
+        )
+        for segment, translated in zip(segments, translations):
+            segment.container(translated_cv)[segment.field] = translated
+        return CVTranslation.model_validate(translated_cv)
 
 
 class ExternalTranslationClient:
@@ -77,20 +336,28 @@ class ExternalTranslationClient:
 
     GOOGLE_V2_ENDPOINT = "https://translation.googleapis.com/language/translate/v2"
 
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        http_client: httpx.AsyncClient,
+        memory: Optional[TranslationMemory] = None,
+        stats: Optional[BackendStats] = None,
+    ):
         if not api_key:
             raise ValueError("EXTERNAL_TRANSLATION_API_KEY not configured")
 
         self.base_url = (base_url or self.GOOGLE_V2_ENDPOINT).rstrip("/")
         self.api_key = api_key
+        self.http_client = http_client
+        self.memory = memory
+        self.stats = stats
+        self.dependency = _translation_dependency("translation_google")
 
-    def _translate_texts(
+    async def _translate_batch(
         self, texts: List[str], source_language: str, target_language: str
     ) -> List[str]:
-        """Translate a batch of text strings, preserving order."""
-        if not texts:
-            return []
-
+        """Translate texts in a single request, preserving order."""
         payload = {
             "q": texts,
             "source": source_language,
@@ -99,14 +366,14 @@ class ExternalTranslationClient:
         }
 
         try:
-            response = httpx.post(
+            response = await self.dependency.acall(
+                _post,
+                self.http_client,
                 self.base_url,
                 params={"key": self.api_key},
                 json=payload,
-                timeout=30.0,
             )
-            response.raise_for_status()
-        except httpx.RequestError as exc:
+        except (httpx.RequestError, TimeoutError) as exc:
             raise ConnectionError(
                 f"Unable to reach Google Translation API at {self.base_url}"
             ) from exc
@@ -123,88 +390,99 @@ class ExternalTranslationClient:
 
         return [item.get("translatedText", "") for item in translations]
 
-    def translate_cv(
-        self, cv: CVTranslation, source_language: str, target_language: str
+    async def _translate_texts(
+        self, texts: List[str], source_language: str, target_language: str
+    ) -> List[str]:
+        """
+        Translate text strings, preserving order.
+
+        Repeated strings are sent once, and the rest is split into requests
+        within Google's limits that run concurrently (up to
+        TRANSLATION_BATCH_CONCURRENCY at a time).
+        """
+        unique = list(dict.fromkeys(texts))
+        if not unique:
+            return []
+        batches = _split_batches(
+            unique,
+            settings.TRANSLATION_BATCH_MAX_SEGMENTS,
+            settings.TRANSLATION_BATCH_MAX_CHARACTERS,
+        )
+        limit = asyncio.Semaphore(max(settings.TRANSLATION_BATCH_CONCURRENCY, 1))
+
+        async def send(batch: List[str]) -> List[str]:
+            async with limit:
+                with _upstream_call(self.stats):
+                    return await self._translate_batch(
+                        batch, source_language, target_language
+                    )
+
+        results = await asyncio.gather(*(send(batch) for batch in batches))
+        translated = {
+            text: translation
+            for batch, translations in zip(batches, results)
+            for text, translation in zip(batch, translations)
+        }
+        return [translated[text] for text in texts]
+
+    async def translate_cv(
+        self,
+        cv: CVTranslation,
+        source_language: str,
+        target_language: str,
+        known: Optional[List[Optional[str]]] = None,
     ) -> CVTranslation:
-        def _dict_setter(
-            container: MutableMapping[str, Any], key: str
-        ) -> Callable[[str], None]:
-            def setter(value: str) -> None:
-                container[key] = value
-
-            return setter
+        translated_cv = cast(MutableMapping[str, Any], cv.model_dump(mode="json"))
+        segments = text_segments(translated_cv)
+
+        async def translate_missing(positions: List[int]) -> List[str]:
+            return await self._translate_texts(
+                [segments[position].text for position in positions],
+                source_language,
+                target_language,
+            )
 
-        translated_cv: MutableMapping[str, Any] = cast(
-            MutableMapping[str, Any], cv.model_dump(mode="json")
+        translations = await _translate_segments(
+            self.memory,
+            segments,
+            source_language,
+            target_language,
+            translate_missing,
+            known,
         )
+        for segment, translated in zip(segments, translations):
+            segment.container(translated_cv)[segment.field] = translated
+        return CVTranslation.model_validate(translated_cv)
 
-        text_queue: List[str] = []
-        setters: List[Callable[[str], None]] = []
-
-        def queue(value: Optional[str], setter: Callable[[str], None]) -> None:
-            cleaned = value.strip() if value else ""
-            if cleaned:
-                text_queue.append(cleaned)
-                setters.append(setter)
-
-        queue(cv.title, _dict_setter(translated_cv, "title"))
-        queue(cv.full_name, _dict_setter(translated_cv, "full_name"))
-        queue(cv.location, _dict_setter(translated_cv, "location"))
-        queue(cv.summary, _dict_setter(translated_cv, "summary"))
 
-        for idx, exp in enumerate(cv.work_experiences):
-            exp_dict = cast(
-                MutableMapping[str, Any], translated_cv["work_experiences"][idx]
-            )
-            queue(exp.company, _dict_setter(exp_dict, "company"))
-            queue(exp.position, _dict_setter(exp_dict, "position"))
-            queue(exp.location, _dict_setter(exp_dict, "location"))
-            queue(exp.description, _dict_setter(exp_dict, "description"))
-
-        for idx, edu in enumerate(cv.educations):
-            edu_dict = cast(MutableMapping[str, Any], translated_cv["educations"][idx])
-            queue(edu.institution, _dict_setter(edu_dict, "institution"))
-            queue(edu.degree, _dict_setter(edu_dict, "degree"))
-            queue(edu.field_of_study, _dict_setter(edu_dict, "field_of_study"))
-            queue(edu.description, _dict_setter(edu_dict, "description"))
-            queue(edu.honors, _dict_setter(edu_dict, "honors"))
-            queue(edu.relevant_subjects, _dict_setter(edu_dict, "relevant_subjects"))
-            queue(edu.thesis_title, _dict_setter(edu_dict, "thesis_title"))
-
-        for idx, project in enumerate(cv.projects):
-            proj_dict = cast(MutableMapping[str, Any], translated_cv["projects"][idx])
-            queue(project.name, _dict_setter(proj_dict, "name"))
-            queue(project.description, _dict_setter(proj_dict, "description"))
-            queue(project.role, _dict_setter(proj_dict, "role"))
-            queue(project.technologies, _dict_setter(proj_dict, "technologies"))
-
-        for idx, skill in enumerate(cv.skills):
-            skill_dict = cast(MutableMapping[str, Any], translated_cv["skills"][idx])
-            queue(skill.name, _dict_setter(skill_dict, "name"))
-            queue(skill.category, _dict_setter(skill_dict, "category"))
-
-        if text_queue:
-            translated_texts = self._translate_texts(
-                text_queue, source_language, target_language
-            )
-            for translated_text, setter in zip(translated_texts, setters):
-                setter(translated_text)
+class TargetTranslation(NamedTuple):
+    """Outcome for one target language: ``translation`` or ``error``."""
 
-        return CVTranslation.model_validate(translated_cv)
+    language: str
+    translation: Optional[CVTranslation] = None
+    error: Optional[str] = None
 
 
 class TranslationService:
     """Selects the correct translation client based on language direction."""
 
     SUPPORTED_EXTERNAL_LANGUAGES = {"en", "es", "de", "fr", "it"}
+    # Directions the in-house translation service handles
+    INTERNAL_DIRECTIONS = {("en", "es")}
 
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self.http_client = http_client or create_http_client()
+        self.memory = create_translation_memory()
+        self.router = create_translation_router()
         self.internal_client: Optional[CustomTranslationClient] = None
         self.external_client: Optional[ExternalTranslationClient] = None
 
         if settings.TRANSLATION_SERVICE_URL:
             self.internal_client = CustomTranslationClient(
-                settings.TRANSLATION_SERVICE_URL
+                settings.TRANSLATION_SERVICE_URL,
+                self.http_client,
+                self.memory,
+                stats=self.router.backends[INTERNAL],
             )
         if (
             settings.EXTERNAL_TRANSLATION_API_URL
@@ -214,36 +492,168 @@ class TranslationService:
                 settings.EXTERNAL_TRANSLATION_API_URL
                 or ExternalTranslationClient.GOOGLE_V2_ENDPOINT,
                 api_key=settings.EXTERNAL_TRANSLATION_API_KEY,
+                http_client=self.http_client,
+                memory=self.memory,
+                stats=self.router.backends[EXTERNAL],
             )
 
-    def translate_cv(
-        self, cv: CVTranslation, input_language: str, output_language: str
-    ) -> CVTranslation:
-        source = _normalize_language(input_language)
-        target = _normalize_language(output_language)
-
-        # if source == "en" and target == "es":
-        #     if not self.internal_client:
-        #         raise ValueError("Internal translation service is not configured")
-        #     return self.internal_client.translate_cv(cv, source, target)
-
+    def direction(self, input_language: str, output_language: str) -> Tuple[str, str]:
+        """Normalized (source, target) codes; ValueError if not supported."""
+        source = normalize_language(input_language)
+        target = normalize_language(output_language)
         if (
-            source in self.SUPPORTED_EXTERNAL_LANGUAGES
-            and target in self.SUPPORTED_EXTERNAL_LANGUAGES
+            source not in self.SUPPORTED_EXTERNAL_LANGUAGES
+            or target not in self.SUPPORTED_EXTERNAL_LANGUAGES
         ):
-            if not self.external_client:
-                raise ValueError("External translation API is not configured")
-            return self.external_client.translate_cv(cv, source, target)
+            raise ValueError(f"Unsupported translation direction: {source} -> {target}")
+        return source, target
+
+    async def translate_cv(
+        self,
+        cv: CVTranslation,
+        input_language: str,
+        output_language: str,
+        known: Optional[List[Optional[str]]] = None,
+    ) -> CVTranslation:
+        """
+        Translate ``cv`` with the routed backend.
+
+        ``known`` is a translation memory lookup already made for the CV's
+        ``text_segments`` into ``output_language``.
+        """
+        source, target = self.direction(input_language, output_language)
+
+        # The in-house service is preferred for the directions it supports;
+        # the router falls back to the external API when it is unhealthy
+        preferred: Optional[Backend] = None
+        fallback: Optional[Backend] = None
+        internal, external = self.internal_client, self.external_client
+        if internal and (source, target) in self.INTERNAL_DIRECTIONS:
+            preferred = Backend(
+                INTERNAL,
+                lambda: internal.translate_cv(cv, source, target, known),
+                internal.dependency.breaker,
+            )
+        if external:
+            fallback = Backend(
+                EXTERNAL,
+                lambda: external.translate_cv(cv, source, target, known),
+                external.dependency.breaker,
+            )
+        if preferred is None and fallback is None:
+            raise ValueError("External translation API is not configured")
+
+        # Identical concurrent requests share one upstream call
+        flight = register_flight(
+            "translation",
+            encode=lambda translated: translated.model_dump_json(),
+            decode=CVTranslation.model_validate_json,
+        )
+        return await flight.ado(
+            request_key(source, target, cv.model_dump(mode="json")),
+            lambda: self.router.run(preferred, fallback),
+        )
 
-        raise ValueError(f"Unsupported translation direction: {source} -> {target}")
+    async def translate_cv_targets(
+        self, cv: CVTranslation, input_language: str, output_languages: List[str]
+    ) -> AsyncIterator[TargetTranslation]:
+        """
+        Translate ``cv`` into every language concurrently, yielding results
+        as they complete.
+
+        The CV's text segments are extracted and hashed once, and the
+        translation memory is queried once for all languages; each language
+        then sends only the segments it is missing upstream.
+
+        A failed language is reported on its result instead of raised. If the
+        consumer stops early, the remaining translations are cancelled.
+        """
+        known_by_language: Dict[str, List[Optional[str]]] = {}
+        if self.memory is not None:
+            directions = {}
+            for language in output_languages:
+                try:
+                    directions[language] = self.direction(input_language, language)
+                except ValueError:
+                    # Reported by translate_cv below
+                    continue
+            if directions:
+                source = next(iter(directions.values()))[0]
+                texts = [
+                    segment.text
+                    for segment in text_segments(
+                        cast(MutableMapping[str, Any], cv.model_dump(mode="json"))
+                    )
+                ]
+                known = await self.memory.lookup_targets(
+                    source, [target for _, target in directions.values()], texts
+                )
+                known_by_language = {
+                    language: known[target]
+                    for language, (_, target) in directions.items()
+                }
+
+        async def translate(language: str) -> TargetTranslation:
+            try:
+                translated = await self.translate_cv(
+                    cv, input_language, language, known_by_language.get(language)
+                )
+            except Exception as exc:
+                logger.warning("Translating CV to %s failed: %s", language, exc)
+                return TargetTranslation(language, error=str(exc))
+            return TargetTranslation(language, translation=translated)
+
+        tasks = [asyncio.create_task(translate(lang)) for lang in output_languages]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+            with anyio.CancelScope(shield=True):
+                await asyncio.gather(*tasks, return_exceptions=True)
 
 
+# Singleton instance and the connection pool it shares across requests
 _translation_service: Optional[TranslationService] = None
+_http_client: Optional[httpx.AsyncClient] = None
 
 
-def get_translation_service() -> TranslationService:
-    """Return singleton translation service instance."""
-    global _translation_service
+def init_translation_service() -> TranslationService:
+    """Create the translation service and its pooled HTTP client at startup."""
+    global _translation_service, _http_client
     if _translation_service is None:
-        _translation_service = TranslationService()
+        if _http_client is None or _http_client.is_closed:
+            _http_client = create_http_client()
+        _translation_service = TranslationService(http_client=_http_client)
     return _translation_service
+
+
+async def close_translation_service() -> None:
+    """Close the pooled HTTP client during app shutdown."""
+    global _translation_service, _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _translation_service = None
+    _http_client = None
+
+
+def get_translation_service() -> TranslationService:
+    """Return singleton translation service instance."""
+    return init_translation_service()
+
+
+def translation_routing_stats() -> Optional[Dict[str, Any]]:
+    """Routing decisions and per-backend latency of the running service."""
+    service = _translation_service
+    if service is None:
+        return None
+    return service.router.stats()
+
+
+def translation_memory_stats() -> Optional[Dict[str, Any]]:
+    """Hit-rate counters of the running service's translation memory."""
+    service = _translation_service
+    if service is None or service.memory is None:
+        return None
+    return service.memory.stats()
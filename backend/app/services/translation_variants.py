@@ -0,0 +1,102 @@
+"""
+Incremental updates of stored CV translations.
+
+A stored translation remembers, per text field, a hash of the source text it
+was translated from. Bringing it up to date only sends the fields whose
+source text changed (or that are new) for translation and keeps the rest.
+Fields are keyed by section entry id rather than position, so reordering
+entries does not count as a change.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, MutableMapping, NamedTuple, Optional
+
+from app.schemas.translation import CVTranslation
+from app.services.translation_memory import segment_hash
+from app.services.translation_service import (
+    TextSegment,
+    TranslationService,
+    text_segments,
+)
+
+
+class VariantUpdate(NamedTuple):
+    """Result of bringing a stored translation up to date."""
+
+    content: Dict[str, Any]
+    segments: Dict[str, Dict[str, str]]
+    translated_fields: int
+    reused_fields: int
+
+
+def segment_key(cv: MutableMapping[str, Any], segment: TextSegment) -> str:
+    """Stable key of a text field, e.g. ``work_experiences/12/description``."""
+    if segment.section is None:
+        return segment.field
+    entry_id = segment.container(cv).get("id")
+    entry = f"#{segment.position}" if entry_id is None else str(entry_id)
+    return f"{segment.section}/{entry}/{segment.field}"
+
+
+def is_stale(cv: MutableMapping[str, Any], segments: Dict[str, Dict[str, str]]) -> bool:
+    """Whether any text field of ``cv`` differs from what was translated."""
+    current = {
+        segment_key(cv, segment): segment_hash(segment.text)
+        for segment in text_segments(cv)
+    }
+    return current != {key: stored["source_hash"] for key, stored in segments.items()}
+
+
+async def update_variant(
+    service: TranslationService,
+    cv: CVTranslation,
+    source_language: str,
+    target_language: str,
+    previous: Optional[Dict[str, Dict[str, str]]] = None,
+) -> VariantUpdate:
+    """
+    Translate ``cv``, reusing ``previous`` segments whose source is unchanged.
+
+    Fields that are not translated (dates, email, ...) are taken from ``cv``
+    as it is now.
+    """
+    previous = previous or {}
+    content = cv.model_dump(mode="json")
+    segments = text_segments(content)
+    keys = [segment_key(content, segment) for segment in segments]
+    hashes = [segment_hash(segment.text) for segment in segments]
+    reused = [
+        previous.get(key, {}).get("source_hash") == source_hash
+        for key, source_hash in zip(keys, hashes)
+    ]
+
+    translated: Optional[Dict[str, Any]] = None
+    if not all(reused):
+        # Translate a copy holding only the changed fields
+        pending = copy.deepcopy(content)
+        for segment, keep in zip(segments, reused):
+            if keep:
+                segment.container(pending)[segment.field] = None
+        result = await service.translate_cv(
+            CVTranslation.model_validate(pending), source_language, target_language
+        )
+        translated = result.model_dump(mode="json")
+
+    stored: Dict[str, Dict[str, str]] = {}
+    for segment, key, source_hash, keep in zip(segments, keys, hashes, reused):
+        if keep:
+            text = previous[key]["text"]
+        else:
+            text = segment.container(translated)[segment.field] or ""
+        segment.container(content)[segment.field] = text
+        stored[key] = {"source_hash": source_hash, "text": text}
+
+    reused_fields = sum(reused)
+    return VariantUpdate(
+        content=content,
+        segments=stored,
+        translated_fields=len(segments) - reused_fields,
+        reused_fields=reused_fields,
+    )
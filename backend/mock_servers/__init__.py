@@ -0,0 +1,25 @@
+"""
+Local stand-ins for the external services the backend calls.
+
+Each mock speaks the subset of the real API the app uses (Groq chat
+completions, Google Translate v2, Azure Blob Storage) with configurable
+latency distributions, error rates and streaming speed. Tests start them
+on free ports; ``python -m mock_servers`` runs all three for load tests
+against a backend started with ``SETTINGS_PROFILE=mock``.
+"""
+
+from mock_servers.blob import BlobEmulator
+from mock_servers.faults import Failures, Latency
+from mock_servers.groq import GroqEmulator, canned_reply
+from mock_servers.server import EmulatorServer
+from mock_servers.translate import TranslateEmulator
+
+__all__ = [
+    "BlobEmulator",
+    "EmulatorServer",
+    "Failures",
+    "GroqEmulator",
+    "Latency",
+    "TranslateEmulator",
+    "canned_reply",
+]
@@ -0,0 +1,100 @@
+"""
+Run the Groq, Google Translate and Azure Blob mocks for load testing.
+
+Usage:
+    python -m mock_servers [--groq-latency 0.4:2.5] [--groq-error-rate 0.01]
+                           [--translate-latency 0.08:0.4] [--seed N] ...
+
+Latencies are ``MEDIAN`` or ``MEDIAN:P99`` seconds (lognormal). The default
+ports match the ``mock`` settings profile in ``.env.mock``; start the
+backend with ``SETTINGS_PROFILE=mock`` to use them.
+"""
+
+import argparse
+import random
+import sys
+import threading
+from typing import List, Optional
+
+from mock_servers.blob import BlobEmulator
+from mock_servers.faults import Failures, Latency
+from mock_servers.groq import GroqEmulator, canned_reply
+from mock_servers.translate import TranslateEmulator
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m mock_servers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible runs")
+
+    groq = parser.add_argument_group("Groq chat completions")
+    groq.add_argument("--groq-port", type=int, default=8101)
+    groq.add_argument("--groq-latency", default="0.35:2.0", help="Time to first token")
+    groq.add_argument(
+        "--groq-token-latency", default="0.01:0.05", help="Between streamed words"
+    )
+    groq.add_argument("--groq-error-rate", type=float, default=0.0)
+    groq.add_argument("--groq-error-status", type=int, default=503)
+
+    translate = parser.add_argument_group("Google Translate v2")
+    translate.add_argument("--translate-port", type=int, default=8102)
+    translate.add_argument("--translate-latency", default="0.08:0.4")
+    translate.add_argument("--translate-error-rate", type=float, default=0.0)
+    translate.add_argument("--translate-error-status", type=int, default=503)
+
+    blob = parser.add_argument_group("Azure Blob Storage")
+    blob.add_argument("--blob-port", type=int, default=8103)
+    blob.add_argument("--blob-latency", default="0.02:0.15")
+    blob.add_argument("--blob-error-rate", type=float, default=0.0)
+    return parser
+
+
+def create_servers(args: argparse.Namespace) -> tuple:
+    """Build (groq, translate, blob) mock servers from parsed arguments."""
+    rng = random.Random(args.seed)
+    groq = GroqEmulator(
+        delay=Latency.parse(args.groq_latency, rng),
+        token_delay=Latency.parse(args.groq_token_latency, rng),
+        reply=canned_reply,
+        failures=Failures(args.groq_error_rate, args.groq_error_status, rng),
+        estimate_usage=True,
+        host=args.host,
+        port=args.groq_port,
+    )
+    translate = TranslateEmulator(
+        delay=Latency.parse(args.translate_latency, rng),
+        failures=Failures(args.translate_error_rate, args.translate_error_status, rng),
+        host=args.host,
+        port=args.translate_port,
+    )
+    blob = BlobEmulator(
+        delay=Latency.parse(args.blob_latency, rng),
+        failures=Failures(args.blob_error_rate, rng=rng),
+        host=args.host,
+        port=args.blob_port,
+    )
+    return groq, translate, blob
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    servers = create_servers(args)
+    groq, translate, blob = servers
+    for server in servers:
+        server.start()
+    print(f"Groq mock:      GROQ_BASE_URL={groq.base_url}")
+    print(f"Translate mock: EXTERNAL_TRANSLATION_API_URL={translate.api_url}")
+    print(f"Blob mock:      AZURE_STORAGE_CONNECTION_STRING={blob.connection_string}")
+    print("Press Ctrl+C to stop")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
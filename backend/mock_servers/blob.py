@@ -0,0 +1,149 @@
+"""
+Mock of the Azure Blob Storage REST API.
+
+Implements the subset used by the blob service (create container,
+put/get/head/delete blob), keeping blobs in memory. Every blob operation
+waits for a delay drawn from ``delay`` to simulate a slow storage
+account, and a share of them set by ``failures`` is answered with the
+storage service's ``ServerBusy`` error.
+"""
+
+from email.utils import formatdate
+
+from fastapi import FastAPI, Request, Response
+
+from mock_servers.faults import Failures, Latency, as_latency
+from mock_servers.server import EmulatorServer
+
+ACCOUNT_NAME = "devstoreaccount1"
+# Well-known Azurite development key; any base64 value works for the emulator.
+ACCOUNT_KEY = (
+    "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsu"
+    "Fq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
+)
+
+
+def _headers(extra: dict | None = None) -> dict:
+    headers = {
+        "ETag": '"0x8D000000000000"',
+        "Last-Modified": formatdate(usegmt=True),
+        "x-ms-request-id": "00000000-0000-0000-0000-000000000000",
+        "x-ms-version": "2021-08-06",
+    }
+    headers.update(extra or {})
+    return headers
+
+
+def _not_found(code: str) -> Response:
+    return Response(status_code=404, headers=_headers({"x-ms-error-code": code}))
+
+
+def _server_busy() -> Response:
+    return Response(
+        status_code=503, headers=_headers({"x-ms-error-code": "ServerBusy"})
+    )
+
+
+def create_emulator_app(
+    delay: float | Latency = 0.0, failures: Failures | None = None
+) -> FastAPI:
+    """Build the mock ASGI app; ``delay`` is added to blob calls."""
+    app = FastAPI()
+    latency = as_latency(delay)
+    failures = failures or Failures()
+    containers: dict[str, dict[str, tuple[bytes, str]]] = {}
+    app.state.containers = containers
+
+    async def blob_call() -> Response | None:
+        """Wait like the storage account would; a Response means it failed."""
+        await latency.wait()
+        return _server_busy() if failures.hit() else None
+
+    @app.put("/{account}/{container}")
+    async def create_container(container: str, request: Request) -> Response:
+        if request.query_params.get("restype") != "container":
+            return Response(status_code=400)
+        if container in containers:
+            return Response(
+                status_code=409,
+                headers=_headers({"x-ms-error-code": "ContainerAlreadyExists"}),
+            )
+        containers[container] = {}
+        return Response(status_code=201, headers=_headers())
+
+    @app.put("/{account}/{container}/{blob:path}")
+    async def put_blob(container: str, blob: str, request: Request) -> Response:
+        if container not in containers:
+            return _not_found("ContainerNotFound")
+        data = await request.body()
+        if failed := await blob_call():
+            return failed
+        content_type = request.headers.get(
+            "x-ms-blob-content-type", "application/octet-stream"
+        )
+        containers[container][blob] = (data, content_type)
+        return Response(
+            status_code=201,
+            headers=_headers({"x-ms-request-server-encrypted": "true"}),
+        )
+
+    @app.api_route("/{account}/{container}/{blob:path}", methods=["GET", "HEAD"])
+    async def get_blob(container: str, blob: str, request: Request) -> Response:
+        if failed := await blob_call():
+            return failed
+        stored = containers.get(container, {}).get(blob)
+        if stored is None:
+            return _not_found("BlobNotFound")
+        data, content_type = stored
+        headers = _headers(
+            {"x-ms-blob-type": "BlockBlob", "Content-Type": content_type}
+        )
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(data))
+            return Response(status_code=200, headers=headers)
+
+        requested = request.headers.get("x-ms-range") or request.headers.get("range")
+        start, end = 0, len(data) - 1
+        if requested and requested.startswith("bytes="):
+            first, _, last = requested[len("bytes=") :].partition("-")
+            start = int(first or 0)
+            end = min(int(last) if last else end, len(data) - 1)
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+        return Response(content=data[start : end + 1], status_code=206, headers=headers)
+
+    @app.delete("/{account}/{container}/{blob:path}")
+    async def delete_blob(container: str, blob: str) -> Response:
+        if failed := await blob_call():
+            return failed
+        if containers.get(container, {}).pop(blob, None) is None:
+            return _not_found("BlobNotFound")
+        return Response(status_code=202, headers=_headers())
+
+    return app
+
+
+class BlobEmulator(EmulatorServer):
+    """Runs the Blob Storage mock with uvicorn in a background thread."""
+
+    def __init__(
+        self,
+        delay: float | Latency = 0.0,
+        failures: Failures | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        super().__init__(
+            create_emulator_app(delay=delay, failures=failures), host=host, port=port
+        )
+
+    @property
+    def connection_string(self) -> str:
+        return (
+            "DefaultEndpointsProtocol=http;"
+            f"AccountName={ACCOUNT_NAME};AccountKey={ACCOUNT_KEY};"
+            f"BlobEndpoint={self.base_url}/{ACCOUNT_NAME};"
+        )
+
+    @property
+    def containers(self) -> dict:
+        return self.app.state.containers
@@ -0,0 +1,75 @@
+"""Latency and error injection shared by the mock servers."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+
+# z-score of the 99th percentile of a standard normal distribution
+_Z_P99 = 2.326
+
+
+class Latency:
+    """
+    Response delay distribution.
+
+    Constant when only ``median`` is given. With ``p99`` the delay is
+    lognormal, the usual shape of network and service latencies: most calls
+    take about ``median`` seconds and one in a hundred takes ``p99`` or more.
+    """
+
+    def __init__(
+        self,
+        median: float = 0.0,
+        p99: float | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        if median < 0 or (p99 is not None and p99 < median):
+            raise ValueError("Latency needs 0 <= median <= p99")
+        self.median = median
+        self.p99 = p99
+        self._rng = rng or random.Random()
+        self._sigma = (
+            math.log(p99 / median) / _Z_P99 if p99 is not None and median > 0 else 0
+        )
+
+    @classmethod
+    def parse(cls, spec: str, rng: random.Random | None = None) -> Latency:
+        """Parse ``"MEDIAN"`` or ``"MEDIAN:P99"`` (seconds)."""
+        median, _, p99 = spec.partition(":")
+        return cls(float(median), float(p99) if p99 else None, rng=rng)
+
+    def sample(self) -> float:
+        if not self._sigma:
+            return self.median
+        return self._rng.lognormvariate(math.log(self.median), self._sigma)
+
+    async def wait(self) -> None:
+        delay = self.sample()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def __repr__(self) -> str:
+        return f"Latency(median={self.median}, p99={self.p99})"
+
+
+def as_latency(value: float | Latency) -> Latency:
+    """Accept a fixed delay in seconds wherever a Latency is expected."""
+    return value if isinstance(value, Latency) else Latency(value)
+
+
+class Failures:
+    """Fails a random ``rate`` (0..1) of calls with HTTP ``status``."""
+
+    def __init__(
+        self, rate: float = 0.0, status: int = 503, rng: random.Random | None = None
+    ) -> None:
+        if not 0 <= rate <= 1:
+            raise ValueError("Failure rate must be between 0 and 1")
+        self.rate = rate
+        self.status = status
+        self._rng = rng or random.Random()
+
+    def hit(self) -> bool:
+        return self.rate > 0 and self._rng.random() < self.rate
@@ -0,0 +1,230 @@
+"""
+Mock of the Groq (OpenAI-compatible) chat completions API.
+
+Answers ``POST /openai/v1/chat/completions`` after a delay drawn from
+``delay``, either as one JSON body or, for ``"stream": true``, as
+Server-Sent Events with one chunk per word ``token_delay`` apart; the
+final chunk carries token usage as Groq's ``x_groq`` field does. A share of
+requests set by ``failures`` is answered with a server error, and prompts
+containing ``fail_on`` are rejected with a 400 error. Records how many
+requests were in flight at once and how many streams were abandoned by the
+client.
+"""
+
+import asyncio
+import json
+import math
+import re
+import time
+from typing import Callable
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from mock_servers.faults import Failures, Latency, as_latency
+from mock_servers.server import EmulatorServer
+
+# Fixed usage reported unless estimate_usage is set (tests assert on it)
+FIXED_USAGE = {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+
+_SCORE_METRICS = (
+    "impact_achievement_density",
+    "clarity_readability",
+    "action_verb_strength",
+    "professionalism",
+)
+_PROSE = (
+    "Results-driven engineer who designed and shipped scalable backend "
+    "services, cut p95 latency by 40% and mentored a team of five. Led the "
+    "migration to event-driven architecture, improved deployment frequency "
+    "threefold and partnered with product to deliver features used by over "
+    "200,000 customers."
+)
+
+
+def canned_reply(prompt: str) -> str:
+    """
+    A plausible completion for the app's prompts.
+
+    Score prompts get JSON scores for the metrics they ask about, so scoring
+    paths behave as with a real model; everything else gets a short
+    paragraph of CV prose.
+    """
+    metrics = [name for name in _SCORE_METRICS if name in prompt]
+    if not metrics:
+        return _PROSE
+    reply = {
+        name: {"score": 7, "reason": "Mock assessment of this section."}
+        for name in metrics
+    }
+    if "summary_insight" in prompt:
+        reply["summary_insight"] = "Solid CV with room for more quantified impact."
+    return json.dumps(reply)
+
+
+def _estimate_usage(prompt: str, reply: str) -> dict:
+    prompt_tokens = math.ceil(len(prompt) / 4)
+    completion_tokens = len(re.findall(r"\S+", reply))
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def create_emulator_app(
+    delay: float | Latency = 0.0,
+    reply: str | Callable[[str], str] = "Optimized text",
+    token_delay: float | Latency = 0.0,
+    fail_on: str | None = None,
+    failures: Failures | None = None,
+    estimate_usage: bool = False,
+) -> FastAPI:
+    """
+    Build the mock ASGI app.
+
+    ``delay`` is added before the response (or first chunk); streamed
+    responses wait ``token_delay`` between chunks. Either may be a fixed
+    number of seconds or a Latency distribution. ``reply`` is the completion
+    text, or a function of the prompt returning it. With ``estimate_usage``
+    token usage is estimated from the prompt and reply instead of fixed.
+    """
+    app = FastAPI()
+    latency = as_latency(delay)
+    token_latency = as_latency(token_delay)
+    failures = failures or Failures()
+    stats = {
+        "requests": 0,
+        "in_flight": 0,
+        "max_in_flight": 0,
+        "chunks_sent": 0,
+        "cancelled": 0,
+        "errors": 0,
+    }
+    app.state.stats = stats
+
+    def _chunk(
+        completion_id: str, model: str, delta: dict, finish=None, usage=None
+    ) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+        }
+        if finish:
+            payload["x_groq"] = {"id": completion_id, "usage": usage}
+        return f"data: {json.dumps(payload)}\n\n"
+
+    async def _stream(completion_id: str, model: str, text: str, usage: dict):
+        words = text.split(" ")
+        try:
+            await latency.wait()
+            for index, word in enumerate(words):
+                if index:
+                    await token_latency.wait()
+                chunk = word if index == len(words) - 1 else f"{word} "
+                stats["chunks_sent"] += 1
+                yield _chunk(completion_id, model, {"content": chunk})
+            yield _chunk(completion_id, model, {}, finish="stop", usage=usage)
+            yield "data: [DONE]\n\n"
+        except asyncio.CancelledError:
+            stats["cancelled"] += 1
+            raise
+        finally:
+            stats["in_flight"] -= 1
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+        prompt = " ".join(m.get("content", "") for m in body.get("messages", []))
+        if fail_on and fail_on in prompt:
+            return JSONResponse(
+                status_code=400,
+                content={
+                    "error": {
+                        "message": "Rejected by emulator",
+                        "type": "invalid_request_error",
+                    }
+                },
+            )
+        if failures.hit():
+            stats["errors"] += 1
+            await latency.wait()
+            return JSONResponse(
+                status_code=failures.status,
+                content={
+                    "error": {
+                        "message": "Service unavailable (injected by mock)",
+                        "type": "internal_server_error",
+                    }
+                },
+            )
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        completion_id = f"chatcmpl-{stats['requests']}"
+        model = body.get("model", "mock")
+        text = reply(prompt) if callable(reply) else reply
+        usage = {
+            **(_estimate_usage(prompt, text) if estimate_usage else FIXED_USAGE),
+            "queue_time": 0.002,
+        }
+        if body.get("stream"):
+            return StreamingResponse(
+                _stream(completion_id, model, text, usage),
+                media_type="text/event-stream",
+            )
+        try:
+            await latency.wait()
+        finally:
+            stats["in_flight"] -= 1
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": usage,
+        }
+
+    return app
+
+
+class GroqEmulator(EmulatorServer):
+    """Runs the Groq mock with uvicorn in a background thread."""
+
+    def __init__(
+        self,
+        delay: float | Latency = 0.0,
+        reply: str | Callable[[str], str] = "Optimized text",
+        token_delay: float | Latency = 0.0,
+        fail_on: str | None = None,
+        failures: Failures | None = None,
+        estimate_usage: bool = False,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        super().__init__(
+            create_emulator_app(
+                delay=delay,
+                reply=reply,
+                token_delay=token_delay,
+                fail_on=fail_on,
+                failures=failures,
+                estimate_usage=estimate_usage,
+            ),
+            host=host,
+            port=port,
+        )
+
+    @property
+    def stats(self) -> dict:
+        return self.app.state.stats
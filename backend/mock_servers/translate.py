@@ -0,0 +1,123 @@
+"""
+Mock of the Google Cloud Translation API v2.
+
+Answers ``POST /language/translate/v2?key=...`` with a JSON body of ``q``
+(one string or a list), ``source``, ``target`` and ``format``, as the
+external translation client sends it. Each text is "translated" by
+prefixing the target language, e.g. ``"[es] Software Engineer"``, so
+results are deterministic and easy to check. Requests without an API key
+or with more segments or characters than Google accepts are rejected as
+Google would. Every request waits for a delay drawn from ``delay``, and a
+share set by ``failures`` is answered with a server error. Records request,
+segment and character counts (Google bills per character) and how many
+requests were in flight at once.
+"""
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from mock_servers.faults import Failures, Latency, as_latency
+from mock_servers.server import EmulatorServer
+
+TRANSLATE_PATH = "/language/translate/v2"
+# Google rejects requests with more text segments or characters than this
+MAX_SEGMENTS = 128
+MAX_CHARACTERS = 30000
+
+
+def _error(status: int, message: str, reason: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        content={
+            "error": {
+                "code": status,
+                "message": message,
+                "errors": [{"message": message, "domain": "global", "reason": reason}],
+            }
+        },
+    )
+
+
+def mock_translate(text: str, target: str) -> str:
+    return f"[{target}] {text}"
+
+
+def create_emulator_app(
+    delay: float | Latency = 0.0, failures: Failures | None = None
+) -> FastAPI:
+    """Build the mock ASGI app; ``delay`` is added to every request."""
+    app = FastAPI()
+    latency = as_latency(delay)
+    failures = failures or Failures()
+    stats = {
+        "requests": 0,
+        "segments": 0,
+        "characters": 0,
+        "errors": 0,
+        "in_flight": 0,
+        "max_in_flight": 0,
+    }
+    app.state.stats = stats
+
+    @app.post(TRANSLATE_PATH)
+    async def translate(request: Request):
+        stats["requests"] += 1
+        if not request.query_params.get("key"):
+            return _error(403, "The request is missing a valid API key.", "forbidden")
+        body = await request.json()
+        texts = body.get("q") or []
+        if isinstance(texts, str):
+            texts = [texts]
+        target = body.get("target")
+        if not target:
+            return _error(400, "Target language is required.", "required")
+        if len(texts) > MAX_SEGMENTS:
+            return _error(400, "Too many text segments", "invalid")
+        if sum(len(text) for text in texts) > MAX_CHARACTERS:
+            return _error(400, "Text too long", "invalid")
+
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            await latency.wait()
+        finally:
+            stats["in_flight"] -= 1
+        if failures.hit():
+            stats["errors"] += 1
+            return _error(failures.status, "Backend Error", "backendError")
+
+        stats["segments"] += len(texts)
+        stats["characters"] += sum(len(text) for text in texts)
+        translations = []
+        for text in texts:
+            translation = {"translatedText": mock_translate(text, target)}
+            if not body.get("source"):
+                translation["detectedSourceLanguage"] = "en"
+            translations.append(translation)
+        return {"data": {"translations": translations}}
+
+    return app
+
+
+class TranslateEmulator(EmulatorServer):
+    """Runs the Google Translate mock with uvicorn in a background thread."""
+
+    def __init__(
+        self,
+        delay: float | Latency = 0.0,
+        failures: Failures | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        super().__init__(
+            create_emulator_app(delay=delay, failures=failures), host=host, port=port
+        )
+
+    @property
+    def api_url(self) -> str:
+        """Value for EXTERNAL_TRANSLATION_API_URL."""
+        return f"{self.base_url}{TRANSLATE_PATH}"
+
+    @property
+    def stats(self) -> dict:
+        return self.app.state.stats
@@ -0,0 +1,207 @@
+"""
+Benchmark the "latest active share link" lookup used by the export endpoint.
+
+Builds a scratch copy of the sharelink table with millions of rows and times
+the lookup against the old layout (single-column indexes, full-row select)
+and the new one (ix_sharelink_cv_user_expires, url/expires_at only).
+
+Usage:
+    DATABASE_URL=postgresql://... uv run python scripts/benchmark_share_links.py \
+        --rows 5000000 --lookups 2000
+
+PostgreSQL is the target; SQLite works for a quick smoke run with fewer rows.
+The scratch table is dropped afterwards unless --keep is given.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+TABLE = "sharelink_benchmark"
+
+BASELINE_INDEXES = [
+    f"CREATE INDEX ix_{TABLE}_cv_id ON {TABLE} (cv_id)",
+    f"CREATE INDEX ix_{TABLE}_user_id ON {TABLE} (user_id)",
+    f"CREATE INDEX ix_{TABLE}_expires_at ON {TABLE} (expires_at)",
+]
+BASELINE_QUERY = (
+    f"SELECT * FROM {TABLE} WHERE cv_id = :cv_id AND user_id = :user_id "
+    "AND expires_at > :now ORDER BY expires_at DESC LIMIT 1"
+)
+COVERING_QUERY = (
+    f"SELECT url, expires_at FROM {TABLE} WHERE cv_id = :cv_id "
+    "AND user_id = :user_id AND expires_at > :now ORDER BY expires_at DESC LIMIT 1"
+)
+
+
+def covering_index(dialect: str) -> str:
+    include = " INCLUDE (url)" if dialect == "postgresql" else ""
+    return (
+        f"CREATE INDEX ix_{TABLE}_cv_user_expires ON {TABLE} "
+        f"(cv_id, user_id, expires_at DESC){include}"
+    )
+
+
+def create_table(engine: Engine) -> None:
+    id_type = (
+        "BIGSERIAL PRIMARY KEY"
+        if engine.dialect.name == "postgresql"
+        else "INTEGER PRIMARY KEY"
+    )
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        conn.execute(
+            text(
+                f"CREATE TABLE {TABLE} ("
+                f"id {id_type}, cv_id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+                "url TEXT NOT NULL, public_id VARCHAR(32), blob_name TEXT, "
+                "expires_at TIMESTAMP NOT NULL, created_at TIMESTAMP NOT NULL, "
+                "updated_at TIMESTAMP NOT NULL)"
+            )
+        )
+
+
+def load_rows(engine: Engine, rows: int, cvs: int, now: datetime) -> None:
+    """Insert ``rows`` links spread over ``cvs`` CVs; ~10% are still active."""
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    f"INSERT INTO {TABLE} (cv_id, user_id, url, public_id, "
+                    "blob_name, expires_at, created_at, updated_at) "
+                    "SELECT g % :cvs + 1, (g % :cvs) / 3 + 1, "
+                    "'/api/v1/assets/share/' || md5(g::text), md5(g::text), "
+                    "'cvs/cv-' || g || '.pdf', "
+                    ":now - (random() * interval '30 days') + interval '3 days', "
+                    ":now, :now FROM generate_series(1, :rows) AS g"
+                ),
+                {"cvs": cvs, "rows": rows, "now": now},
+            )
+        return
+
+    chunk = 50_000
+    insert = text(
+        f"INSERT INTO {TABLE} (cv_id, user_id, url, public_id, blob_name, "
+        "expires_at, created_at, updated_at) VALUES (:cv_id, :user_id, :url, "
+        ":public_id, :blob_name, :expires_at, :now, :now)"
+    )
+    for start in range(0, rows, chunk):
+        batch = []
+        for g in range(start, min(start + chunk, rows)):
+            cv_id = g % cvs + 1
+            batch.append(
+                {
+                    "cv_id": cv_id,
+                    "user_id": (cv_id - 1) // 3 + 1,
+                    "url": f"/api/v1/assets/share/{g:032x}",
+                    "public_id": f"{g:032x}",
+                    "blob_name": f"cvs/cv-{g}.pdf",
+                    "expires_at": now
+                    - timedelta(days=random.random() * 30)
+                    + timedelta(days=3),
+                    "now": now,
+                }
+            )
+        with engine.begin() as conn:
+            conn.execute(insert, batch)
+
+
+def analyze(engine: Engine) -> None:
+    if engine.dialect.name == "postgresql":
+        # VACUUM sets the visibility map bits an index-only scan relies on
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"VACUUM ANALYZE {TABLE}"))
+    else:
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+
+def explain(engine: Engine, query: str, params: dict) -> str:
+    prefix = (
+        "EXPLAIN (ANALYZE, BUFFERS) "
+        if engine.dialect.name == "postgresql"
+        else "EXPLAIN QUERY PLAN "
+    )
+    with engine.connect() as conn:
+        rows = conn.execute(text(prefix + query), params).fetchall()
+    return "\n".join("    " + " ".join(str(col) for col in row) for row in rows)
+
+
+def time_lookups(
+    engine: Engine, query: str, cvs: int, lookups: int, now: datetime
+) -> list[float]:
+    rng = random.Random(42)
+    timings = []
+    with engine.connect() as conn:
+        statement = text(query)
+        for _ in range(lookups):
+            cv_id = rng.randint(1, cvs)
+            params = {"cv_id": cv_id, "user_id": (cv_id - 1) // 3 + 1, "now": now}
+            started = time.perf_counter()
+            conn.execute(statement, params).first()
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<10} mean {statistics.mean(ordered):7.3f} ms   "
+        f"p50 {statistics.median(ordered):7.3f} ms   p95 {p95:7.3f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--cvs", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch table")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    engine = create_engine(args.database_url)
+    now = datetime.utcnow()
+    sample = {"cv_id": 1, "user_id": 1, "now": now}
+
+    print(f"Loading {args.rows:,} rows into {TABLE} ({engine.dialect.name})...")
+    started = time.perf_counter()
+    create_table(engine)
+    load_rows(engine, args.rows, args.cvs, now)
+    print(f"Loaded in {time.perf_counter() - started:.1f} s")
+
+    try:
+        with engine.begin() as conn:
+            for statement in BASELINE_INDEXES:
+                conn.execute(text(statement))
+        analyze(engine)
+        print("\nBaseline plan:\n" + explain(engine, BASELINE_QUERY, sample))
+        baseline = time_lookups(engine, BASELINE_QUERY, args.cvs, args.lookups, now)
+
+        with engine.begin() as conn:
+            conn.execute(text(covering_index(engine.dialect.name)))
+            conn.execute(text(f"DROP INDEX ix_{TABLE}_cv_id"))
+        analyze(engine)
+        print("\nCovering plan:\n" + explain(engine, COVERING_QUERY, sample))
+        covering = time_lookups(engine, COVERING_QUERY, args.cvs, args.lookups, now)
+
+        print(f"\n{args.lookups:,} lookups:")
+        report("baseline", baseline)
+        report("covering", covering)
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,12 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.core.security import get_password_hash
+from app.core.coalescing import reset_coalescing
+from app.core.config import settings
+from app.core.monitoring import llm_metrics
+from app.core.rate_limit import reset_ai_rate_limiter
+from app.core.resilience import reset_circuit_breakers
+from app.core.security import create_access_token, get_password_hash
 from app.db.base import Base, get_db
 from app.main import app
 from app.models.cv import CV
@@ -18,6 +23,9 @@ from app.models.project import Project
 from app.models.skill import Skill
 from app.models.user import User
 from app.models.work_experience import WorkExperience
+from app.services import translation_service
+from app.services.ai_batch import reset_batch_limiter
+from mock_servers import BlobEmulator, GroqEmulator, TranslateEmulator
 
 # Create test database engine using SQLite in memory
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -30,6 +38,53 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+class FakeClock:
+    """A clock that only moves when a test sets ``now``."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """A FakeClock at 0, for code that takes a ``clock`` callable."""
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def _reset_circuit_breakers():
+    """Start every test with closed circuits."""
+    reset_circuit_breakers()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_coalescing():
+    """Start every test with empty coalescing groups and counters."""
+    reset_coalescing()
+
+
+@pytest.fixture(autouse=True)
+def _reset_ai_rate_limiter():
+    """Start every test with full AI quotas."""
+    reset_ai_rate_limiter()
+
+
+@pytest.fixture(autouse=True)
+def _reset_llm_metrics():
+    """Start every test with no recorded LLM calls."""
+    llm_metrics.reset()
+
+
+@pytest.fixture(autouse=True)
+def _reset_batch_limiter():
+    """Rebuild the optimize-all concurrency limiter from current settings."""
+    reset_batch_limiter()
+
+
 @pytest.fixture(scope="function")
 def db():
     """
@@ -62,6 +117,47 @@ def client(db):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def file_db(tmp_path):
+    """
+    File-backed database with a fresh session per request.
+
+    For tests that send requests concurrently or through a real server, where
+    the shared in-memory session of ``db`` cannot be used. Yields auth headers
+    for a user stored in that database.
+    """
+    file_engine = create_engine(
+        f"sqlite:///{tmp_path / 'app.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=file_engine)
+    FileSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=file_engine)
+    with FileSessionLocal() as session:
+        user = User(
+            email="fileuser@example.com",
+            hashed_password=get_password_hash("password123"),
+            full_name="File User",
+            is_active=True,
+        )
+        session.add(user)
+        session.commit()
+        token = create_access_token(user.id)
+
+    def override_get_db():
+        session = FileSessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield {"Authorization": f"Bearer {token}"}
+    finally:
+        app.dependency_overrides.clear()
+        file_engine.dispose()
+
+
 @pytest.fixture
 def test_user(db):
     """
@@ -129,6 +225,16 @@ def auth_headers(client, test_user):
     return {"Authorization": f"Bearer {token}"}
 
 
+@pytest.fixture
+def superuser_headers(db, test_user, auth_headers):
+    """
+    Get authentication headers for test user, promoted to superuser.
+    """
+    test_user.is_superuser = True
+    db.commit()
+    return auth_headers
+
+
 @pytest.fixture
 def auth_headers_user2(client, test_user2):
     """
@@ -264,3 +370,67 @@ def test_project(db, test_cv):
     db.commit()
     db.refresh(project)
     return project
+
+
+@pytest.fixture
+def blob_storage(monkeypatch):
+    """
+    Start a local Azure Blob emulator and point storage settings at it.
+
+    Request this fixture before ``client`` so the app lifespan picks it up.
+    """
+    emulator = BlobEmulator().start()
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "azure")
+    monkeypatch.setattr(
+        settings, "AZURE_STORAGE_CONNECTION_STRING", emulator.connection_string
+    )
+    monkeypatch.setattr(settings, "AZURE_STORAGE_PDF_CONTAINER_NAME", "pdfs")
+    monkeypatch.setattr(settings, "AZURE_STORAGE_PFP_CONTAINER_NAME", "pfp")
+    try:
+        yield emulator
+    finally:
+        emulator.stop()
+
+
+@pytest.fixture
+def groq_server(monkeypatch):
+    """
+    Start a local Groq chat completions emulator and point the AI client at it.
+
+    Request this fixture before ``client`` so the app lifespan picks it up.
+    """
+    emulator = GroqEmulator().start()
+    monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "GROQ_BASE_URL", emulator.base_url)
+    try:
+        yield emulator
+    finally:
+        emulator.stop()
+
+
+@pytest.fixture
+def translate_server(monkeypatch):
+    """
+    Start a local Google Translate v2 mock and point the translation client at it.
+    """
+    emulator = TranslateEmulator().start()
+    monkeypatch.setattr(settings, "EXTERNAL_TRANSLATION_API_URL", emulator.api_url)
+    monkeypatch.setattr(settings, "EXTERNAL_TRANSLATION_API_KEY", "test-key")
+    # The service singleton reads the settings when first created
+    monkeypatch.setattr(translation_service, "_translation_service", None)
+    try:
+        yield emulator
+    finally:
+        emulator.stop()
+
+
+@pytest.fixture
+def local_storage(monkeypatch, tmp_path):
+    """
+    Point file storage at a temporary directory (local filesystem backend).
+
+    Request this fixture before ``client`` so the app lifespan picks it up.
+    """
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_PATH", str(tmp_path))
+    return tmp_path
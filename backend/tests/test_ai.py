@@ -0,0 +1,825 @@
+"""
+Tests for the AI endpoints against a local Groq emulator.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.coalescing import coalescing_stats
+from app.core.config import settings
+from app.main import app
+from app.services import section_scoring
+from app.services.ai_service import get_ai_service
+from app.models.education import Education
+from app.models.project import Project
+from app.models.work_experience import WorkExperience
+from mock_servers import EmulatorServer, GroqEmulator
+
+
+class TestOptimizeDescription:
+    """Tests for /ai/optimize-description."""
+
+    def test_optimize_description(self, groq_server, client, auth_headers):
+        """Test the optimized text comes back from the LLM."""
+        response = client.post(
+            "/api/v1/ai/optimize-description",
+            headers=auth_headers,
+            json={"original_text": "Did backend work", "field_type": "project"},
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "original": "Did backend work",
+            "optimized": "Optimized text",
+        }
+        assert groq_server.stats["requests"] == 1
+
+    def test_optimize_description_not_configured(
+        self, monkeypatch, client, auth_headers
+    ):
+        """Test a missing API key returns 503."""
+        monkeypatch.setattr(settings, "GROQ_API_KEY", "")
+        response = client.post(
+            "/api/v1/ai/optimize-description",
+            headers=auth_headers,
+            json={"original_text": "Did backend work", "field_type": "project"},
+        )
+        assert response.status_code == 503
+
+
+class TestGenerateSummary:
+    """Tests for /ai/generate-summary."""
+
+    def test_generate_summary(self, groq_server, client, auth_headers, test_cv):
+        """Test a summary is generated for an owned CV."""
+        response = client.post(
+            "/api/v1/ai/generate-summary",
+            headers=auth_headers,
+            json={"cv_id": test_cv.id},
+        )
+        assert response.status_code == 200
+        assert response.json()["summary"] == "Optimized text"
+
+    def test_generate_summary_other_users_cv(
+        self, groq_server, client, auth_headers, test_cv_user2
+    ):
+        """Test another user's CV returns 404 without calling the LLM."""
+        response = client.post(
+            "/api/v1/ai/generate-summary",
+            headers=auth_headers,
+            json={"cv_id": test_cv_user2.id},
+        )
+        assert response.status_code == 404
+        assert groq_server.stats["requests"] == 0
+
+
+class TestScoreCV:
+    """Tests for /ai/score-cv."""
+
+    def test_fast_mode_scores_locally(
+        self, monkeypatch, groq_server, client, auth_headers, test_cv, test_project
+    ):
+        """Test mode=fast returns all metrics without calling the LLM."""
+        monkeypatch.setattr(settings, "AI_RATE_LIMIT_USER_REQUESTS_PER_MINUTE", 1)
+        for _ in range(2):
+            response = client.post(
+                "/api/v1/ai/score-cv",
+                headers=auth_headers,
+                json={"cv_id": test_cv.id, "mode": "fast"},
+            )
+            # Fast scoring does not count against the AI rate limit
+            assert response.status_code == 200
+
+        data = response.json()
+        assert data["mode"] == "fast"
+        for metric in (
+            "impact_achievement_density",
+            "clarity_readability",
+            "action_verb_strength",
+            "professionalism",
+            "section_completeness",
+        ):
+            assert 1 <= data[metric]["score"] <= 10
+            assert data[metric]["reason"]
+        assert json.loads(data["raw"])["summary_insight"] == data["summary_insight"]
+        assert groq_server.stats["requests"] == 0
+
+    def test_deep_mode_uses_llm(self, groq_server, client, auth_headers, test_cv):
+        """Test the default mode asks the LLM."""
+        response = client.post(
+            "/api/v1/ai/score-cv", headers=auth_headers, json={"cv_id": test_cv.id}
+        )
+        assert response.status_code == 200
+        assert response.json()["mode"] == "deep"
+        assert groq_server.stats["requests"] == 1
+
+    def test_fast_mode_is_not_streamed(
+        self, groq_server, client, auth_headers, test_cv
+    ):
+        """Test the stream endpoint rejects mode=fast."""
+        response = client.post(
+            "/api/v1/ai/score-cv/stream",
+            headers=auth_headers,
+            json={"cv_id": test_cv.id, "mode": "fast"},
+        )
+        assert response.status_code == 400
+
+
+class TestResponseCache:
+    """Tests for the AI response cache."""
+
+    def _optimize(self, client, auth_headers, text, **extra):
+        return client.post(
+            "/api/v1/ai/optimize-description",
+            headers=auth_headers,
+            json={"original_text": text, "field_type": "project", **extra},
+        )
+
+    def test_repeated_request_is_served_from_cache(
+        self, groq_server, client, auth_headers
+    ):
+        """Test identical (up to whitespace) requests call the LLM once."""
+        first = self._optimize(client, auth_headers, "Built an API")
+        second = self._optimize(client, auth_headers, "  Built   an API\n")
+        assert first.status_code == second.status_code == 200
+        assert second.json()["optimized"] == first.json()["optimized"]
+        assert groq_server.stats["requests"] == 1
+
+    def test_different_field_type_is_not_shared(
+        self, groq_server, client, auth_headers
+    ):
+        """Test the field type is part of the cache key."""
+        self._optimize(client, auth_headers, "Built an API")
+        client.post(
+            "/api/v1/ai/optimize-description",
+            headers=auth_headers,
+            json={"original_text": "Built an API", "field_type": "education"},
+        )
+        assert groq_server.stats["requests"] == 2
+
+    def test_regenerate_bypasses_cache(self, groq_server, client, auth_headers):
+        """Test regenerate=true always calls the LLM."""
+        self._optimize(client, auth_headers, "Built an API")
+        response = self._optimize(client, auth_headers, "Built an API", regenerate=True)
+        assert response.status_code == 200
+        assert groq_server.stats["requests"] == 2
+
+    def test_unparseable_score_is_not_cached(
+        self, groq_server, client, auth_headers, test_cv
+    ):
+        """Test a deep score reply without JSON is asked for again."""
+        for _ in range(2):
+            response = client.post(
+                "/api/v1/ai/score-cv",
+                headers=auth_headers,
+                json={"cv_id": test_cv.id},
+            )
+            assert response.status_code == 200
+        assert groq_server.stats["requests"] == 2
+
+    def test_empty_stream_is_not_cached(self, monkeypatch, client, auth_headers):
+        """Test a stream that produced no text is not replayed."""
+        emulator = GroqEmulator(reply="").start()
+        monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+        monkeypatch.setattr(settings, "GROQ_BASE_URL", emulator.base_url)
+        try:
+            for _ in range(2):
+                client.post(
+                    "/api/v1/ai/optimize-description/stream",
+                    headers=auth_headers,
+                    json={"original_text": "Built an API", "field_type": "project"},
+                )
+        finally:
+            emulator.stop()
+        assert emulator.stats["requests"] == 2
+
+    def test_cache_stats(self, groq_server, client, db, test_user, auth_headers):
+        """Test superusers can see hit rate and saved tokens."""
+        test_user.is_superuser = True
+        db.commit()
+        for _ in range(3):
+            self._optimize(client, auth_headers, "Built an API")
+
+        response = client.get("/api/v1/ai/cache-stats", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["enabled"] is True
+        assert data["hits"] == 2
+        assert data["misses"] == 1
+        assert data["hit_rate"] == pytest.approx(2 / 3, abs=1e-3)
+        assert data["saved_tokens"] == 30
+
+    def test_cache_stats_requires_superuser(self, groq_server, client, auth_headers):
+        """Test regular users cannot read cache statistics."""
+        response = client.get("/api/v1/ai/cache-stats", headers=auth_headers)
+        assert response.status_code == 403
+
+
+@pytest.fixture
+def slow_llm_client(monkeypatch, file_db):
+    """App client on a per-request database and a 2s-per-completion LLM."""
+    emulator = GroqEmulator(delay=2.0).start()
+    # These tests send many calls from one user on purpose
+    monkeypatch.setattr(settings, "AI_RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "GROQ_BASE_URL", emulator.base_url)
+    try:
+        with TestClient(app) as test_client:
+            test_client.headers.update(file_db)
+            yield test_client, emulator
+    finally:
+        emulator.stop()
+
+
+class TestConcurrentAICalls:
+    """AI calls must not occupy worker threads while waiting on the LLM."""
+
+    def test_crud_latency_with_100_ai_calls_in_flight(self, slow_llm_client):
+        """Test CRUD stays fast while 100 slow LLM calls are pending."""
+        client, emulator = slow_llm_client
+
+        def payload(i: int) -> dict:
+            # Distinct texts so no call is answered from the response cache
+            return {"original_text": f"Did backend work #{i}", "field_type": "project"}
+
+        def crud_latency() -> float:
+            started = time.perf_counter()
+            response = client.get("/api/v1/cvs/")
+            assert response.status_code == 200
+            return time.perf_counter() - started
+
+        baseline = max(crud_latency() for _ in range(5))
+
+        with ThreadPoolExecutor(max_workers=100) as pool:
+            futures = [
+                pool.submit(
+                    client.post, "/api/v1/ai/optimize-description", json=payload(i)
+                )
+                for i in range(100)
+            ]
+            deadline = time.monotonic() + 5
+            while emulator.stats["in_flight"] < 100 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            in_flight = emulator.stats["in_flight"]
+            during = max(crud_latency() for _ in range(5))
+            responses = [future.result() for future in futures]
+
+        assert in_flight == 100
+        assert all(response.status_code == 200 for response in responses)
+        assert emulator.stats["max_in_flight"] == 100
+        # The five CRUD calls above finished while the LLM calls were pending
+        assert during < max(baseline * 10, 0.5)
+
+
+def _read_events(lines) -> list:
+    """Parse ``event:``/``data:`` pairs from an SSE line iterator."""
+    events = []
+    event = None
+    for line in lines:
+        if line.startswith("event: "):
+            event = line[len("event: ") :]
+        elif line.startswith("data: "):
+            events.append((event, json.loads(line[len("data: ") :])))
+    return events
+
+
+class TestStreaming:
+    """Tests for the /stream variants of the AI endpoints."""
+
+    def test_cached_response_streams_as_one_token(
+        self, groq_server, client, auth_headers
+    ):
+        """Test a cache hit is replayed without calling the LLM again."""
+        payload = {"original_text": "Built an API", "field_type": "project"}
+        client.post(
+            "/api/v1/ai/optimize-description", headers=auth_headers, json=payload
+        )
+
+        response = client.post(
+            "/api/v1/ai/optimize-description/stream",
+            headers=auth_headers,
+            json=payload,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert _read_events(response.text.splitlines()) == [
+            ("token", {"text": "Optimized text"}),
+            ("done", {"text": "Optimized text"}),
+        ]
+        assert groq_server.stats["requests"] == 1
+
+    def test_stream_other_users_cv(
+        self, groq_server, client, auth_headers, test_cv_user2
+    ):
+        """Test streaming another user's CV returns 404 before any event."""
+        response = client.post(
+            "/api/v1/ai/generate-summary/stream",
+            headers=auth_headers,
+            json={"cv_id": test_cv_user2.id},
+        )
+        assert response.status_code == 404
+        assert groq_server.stats["requests"] == 0
+
+    def test_stream_llm_unreachable(self, monkeypatch, client, auth_headers):
+        """Test an unreachable LLM fails with 503 rather than an empty stream."""
+        monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+        monkeypatch.setattr(settings, "GROQ_BASE_URL", "http://127.0.0.1:1")
+        response = client.post(
+            "/api/v1/ai/optimize-description/stream",
+            headers=auth_headers,
+            json={"original_text": "Built an API", "field_type": "project"},
+        )
+        assert response.status_code == 503
+
+
+@pytest.fixture
+def streaming_server(monkeypatch, file_db):
+    """The real app under uvicorn, talking to a slowly-streaming LLM."""
+    reply = "Led a team of five engineers to ship a billing platform on time"
+    emulator = GroqEmulator(delay=0.05, reply=reply, token_delay=0.1).start()
+    monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "GROQ_BASE_URL", emulator.base_url)
+    server = EmulatorServer(app).start()
+    try:
+        yield server, emulator, file_db, reply
+    finally:
+        server.stop()
+        emulator.stop()
+
+
+class TestStreamingOverHTTP:
+    """Streaming behaviour that needs a real socket between client and app."""
+
+    def test_time_to_first_byte(self, streaming_server):
+        """Test the first token arrives long before the full completion."""
+        server, _, headers, reply = streaming_server
+        url = f"{server.base_url}/api/v1/ai/optimize-description/stream"
+        payload = {"original_text": "Did backend work", "field_type": "project"}
+
+        started = time.perf_counter()
+        with httpx.stream(
+            "POST", url, headers=headers, json=payload, timeout=10
+        ) as response:
+            assert response.status_code == 200
+            lines = response.iter_lines()
+            first_token = next(line for line in lines if line == "event: token")
+            time_to_first_byte = time.perf_counter() - started
+            events = _read_events([first_token, *lines])
+        total = time.perf_counter() - started
+
+        assert time_to_first_byte < 0.5
+        # 12 words at 0.1s apart: the full reply takes over a second
+        assert total > 1.0
+        assert events[-1] == ("done", {"text": reply})
+        assert "".join(data["text"] for event, data in events[:-1]) == reply
+
+    def test_client_disconnect_cancels_upstream(self, streaming_server):
+        """Test closing the stream stops generation at the LLM."""
+        server, emulator, headers, reply = streaming_server
+        url = f"{server.base_url}/api/v1/ai/optimize-description/stream"
+        payload = {"original_text": "Did backend work", "field_type": "project"}
+
+        with httpx.stream(
+            "POST", url, headers=headers, json=payload, timeout=10
+        ) as response:
+            next(line for line in response.iter_lines() if line == "event: token")
+
+        deadline = time.monotonic() + 5
+        while emulator.stats["in_flight"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert emulator.stats["in_flight"] == 0
+        assert emulator.stats["cancelled"] == 1
+        assert emulator.stats["chunks_sent"] < len(reply.split(" "))
+
+
+@pytest.fixture
+def full_cv(db, test_cv):
+    """A CV with three work experiences, two projects and one education."""
+    for i in range(3):
+        db.add(
+            WorkExperience(
+                cv_id=test_cv.id,
+                company=f"Company {i}",
+                position="Engineer",
+                start_date=date(2020, 1, 1),
+                end_date=date(2021, 7, 1),
+                description=f"Worked on system {i}",
+                display_order=i,
+            )
+        )
+    db.add(
+        Project(
+            cv_id=test_cv.id,
+            name="Parser",
+            description="Wrote a parser FAILME",
+            display_order=0,
+        )
+    )
+    db.add(
+        Project(
+            cv_id=test_cv.id,
+            name="Empty",
+            description="   ",
+            display_order=1,
+        )
+    )
+    db.add(
+        Education(
+            cv_id=test_cv.id,
+            institution="Uni",
+            degree="BSc",
+            start_date=date(2015, 9, 1),
+            description="Studied algorithms",
+        )
+    )
+    db.commit()
+    return test_cv
+
+
+@pytest.fixture
+def batch_llm(monkeypatch):
+    """A slow LLM that rejects prompts containing FAILME."""
+    emulator = GroqEmulator(delay=0.2, fail_on="FAILME").start()
+    monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "GROQ_BASE_URL", emulator.base_url)
+    try:
+        yield emulator
+    finally:
+        emulator.stop()
+
+
+class TestOptimizeAll:
+    """Tests for /ai/cvs/{cv_id}/optimize-all."""
+
+    def test_results_per_entry_with_partial_failure(
+        self, batch_llm, client, auth_headers, full_cv
+    ):
+        """Test every described entry gets a result and failures stay local."""
+        response = client.post(
+            f"/api/v1/ai/cvs/{full_cv.id}/optimize-all",
+            headers=auth_headers,
+            json={},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["succeeded"] == 4
+        assert data["failed"] == 1
+        sections = [result["section"] for result in data["results"]]
+        assert sections == ["work_experience"] * 3 + ["project", "education"]
+        failed = data["results"][3]
+        assert failed["optimized"] is None
+        assert "400" in failed["error"]
+        assert all(
+            result["optimized"] == "Optimized text"
+            for result in data["results"]
+            if result["section"] != "project"
+        )
+        # The blank project description is skipped
+        assert batch_llm.stats["requests"] == 5
+
+    def test_per_user_concurrency_limit(
+        self, monkeypatch, batch_llm, client, auth_headers, full_cv
+    ):
+        """Test a user's batch never has more calls in flight than allowed."""
+        monkeypatch.setattr(settings, "AI_BATCH_MAX_CONCURRENCY_PER_USER", 2)
+        response = client.post(
+            f"/api/v1/ai/cvs/{full_cv.id}/optimize-all",
+            headers=auth_headers,
+            json={"sections": ["work_experience", "education"]},
+        )
+        assert response.status_code == 200
+        assert response.json()["succeeded"] == 4
+        assert batch_llm.stats["max_in_flight"] == 2
+
+    def test_global_concurrency_limit(
+        self, monkeypatch, batch_llm, client, auth_headers, full_cv
+    ):
+        """Test the process-wide limit applies even when the user limit is higher."""
+        monkeypatch.setattr(settings, "AI_BATCH_MAX_CONCURRENCY", 1)
+        response = client.post(
+            f"/api/v1/ai/cvs/{full_cv.id}/optimize-all",
+            headers=auth_headers,
+            json={"sections": ["work_experience"]},
+        )
+        assert response.status_code == 200
+        assert batch_llm.stats["max_in_flight"] == 1
+
+    def test_stream(self, batch_llm, client, auth_headers, full_cv):
+        """Test streamed results arrive as item events followed by done."""
+        response = client.post(
+            f"/api/v1/ai/cvs/{full_cv.id}/optimize-all",
+            headers=auth_headers,
+            json={"stream": True},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _read_events(response.text.splitlines())
+        assert [event for event, _ in events] == ["item"] * 5 + ["done"]
+        assert events[-1][1] == {"succeeded": 4, "failed": 1}
+
+    def test_charged_per_description(
+        self, monkeypatch, batch_llm, client, auth_headers, full_cv
+    ):
+        """Test a batch larger than the request quota is rejected up front."""
+        monkeypatch.setattr(settings, "AI_RATE_LIMIT_USER_REQUESTS_PER_MINUTE", 4)
+        response = client.post(
+            f"/api/v1/ai/cvs/{full_cv.id}/optimize-all",
+            headers=auth_headers,
+            json={},
+        )
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+        assert batch_llm.stats["requests"] == 0
+
+    def test_other_users_cv(self, batch_llm, client, auth_headers, test_cv_user2):
+        """Test another user's CV returns 404 without calling the LLM."""
+        response = client.post(
+            f"/api/v1/ai/cvs/{test_cv_user2.id}/optimize-all",
+            headers=auth_headers,
+            json={},
+        )
+        assert response.status_code == 404
+        assert batch_llm.stats["requests"] == 0
+
+
+class TestCoalescing:
+    """Identical concurrent AI requests share one upstream call."""
+
+    def test_identical_concurrent_requests_call_llm_once(self, slow_llm_client):
+        """Test five simultaneous identical optimize calls hit the LLM once."""
+        client, emulator = slow_llm_client
+        payload = {"original_text": "Did backend work", "field_type": "project"}
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            responses = list(
+                pool.map(
+                    lambda _: client.post(
+                        "/api/v1/ai/optimize-description", json=payload
+                    ),
+                    range(5),
+                )
+            )
+
+        assert all(response.status_code == 200 for response in responses)
+        assert emulator.stats["requests"] == 1
+        stats = coalescing_stats()["groq"]
+        assert stats["coalesced"] == 4
+        assert stats["executions"] == 1
+
+
+SECTION_REPLY = json.dumps(
+    {
+        "impact_achievement_density": {"score": 6, "reason": "Few numbers."},
+        "clarity_readability": {"score": 8, "reason": "Clear."},
+        "action_verb_strength": {"score": 7, "reason": "Mostly strong verbs."},
+        "professionalism": {"score": 9, "reason": "Formal tone."},
+    }
+)
+
+
+@pytest.fixture
+def section_llm(monkeypatch):
+    """An LLM returning section scores that rejects prompts containing FAILME."""
+    emulator = GroqEmulator(reply=SECTION_REPLY, fail_on="FAILME").start()
+    monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "GROQ_BASE_URL", emulator.base_url)
+    try:
+        yield emulator
+    finally:
+        emulator.stop()
+
+
+class TestSectionScoring:
+    """Tests for /ai/score-cv with mode=sections."""
+
+    def _score(self, client, auth_headers, cv_id, **extra):
+        response = client.post(
+            "/api/v1/ai/score-cv",
+            headers=auth_headers,
+            json={"cv_id": cv_id, "mode": "sections", **extra},
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    def test_each_section_is_scored_separately(
+        self, section_llm, client, auth_headers, full_cv
+    ):
+        """Test one small call per section and a combined overall score."""
+        data = self._score(client, auth_headers, full_cv.id)
+
+        assert data["mode"] == "sections"
+        keys = [section["key"] for section in data["sections"]]
+        assert keys[0] == "general"
+        assert keys[-1] == "education"
+        assert len(keys) == 7
+        assert section_llm.stats["requests"] == 7
+        # The rejected project falls back to the local engine
+        scorers = {s["label"]: s["scorer"] for s in data["sections"]}
+        assert scorers.pop("Parser") == "local"
+        assert set(scorers.values()) == {"llm"}
+        assert data["local_sections"] == 1
+        reasons = {s["label"]: s["fallback_reason"] for s in data["sections"]}
+        assert reasons.pop("Parser").startswith("LLM call failed")
+        assert set(reasons.values()) == {None}
+        assert data["clarity_readability"]["score"] == 8
+        assert 1 <= data["impact_achievement_density"]["score"] <= 10
+        general = data["sections"][0]["metrics"]
+        assert set(general) == {"clarity_readability", "professionalism"}
+        assert data["summary_insight"]
+
+    def test_rescoring_only_calls_llm_for_changed_sections(
+        self, section_llm, client, db, auth_headers, full_cv
+    ):
+        """Test an edit to one work experience costs exactly one LLM call."""
+        full_cv.projects[0].description = "Wrote a parser"
+        db.commit()
+        self._score(client, auth_headers, full_cv.id)
+        before = section_llm.stats["requests"]
+
+        unchanged = self._score(client, auth_headers, full_cv.id)
+        assert section_llm.stats["requests"] == before
+        assert all(s["cached"] for s in unchanged["sections"] if s["scorer"] == "llm")
+
+        # The endpoint closes the shared session, so reload the entry
+        experience = (
+            db.query(WorkExperience)
+            .filter_by(cv_id=full_cv.id)
+            .order_by(WorkExperience.display_order)
+            .first()
+        )
+        experience.description = "Cut deploy time by 40% for 12 teams"
+        db.commit()
+        edited = self._score(client, auth_headers, full_cv.id)
+
+        assert section_llm.stats["requests"] == before + 1
+        rescored = [s["key"] for s in edited["sections"] if not s["cached"]]
+        assert rescored == [f"work_experience:{experience.id}"]
+
+    def test_charged_per_uncached_section(
+        self, monkeypatch, section_llm, client, auth_headers, full_cv
+    ):
+        """Test each LLM call counts against the quota and cache hits do not."""
+        monkeypatch.setattr(settings, "AI_RATE_LIMIT_USER_REQUESTS_PER_MINUTE", 8)
+        self._score(client, auth_headers, full_cv.id)
+        # Only the rejected project is asked again
+        self._score(client, auth_headers, full_cv.id)
+        assert section_llm.stats["requests"] == 8
+
+        response = client.post(
+            "/api/v1/ai/score-cv",
+            headers=auth_headers,
+            json={"cv_id": full_cv.id, "mode": "sections"},
+        )
+        assert response.status_code == 429
+        assert section_llm.stats["requests"] == 8
+
+    def test_without_cache_every_section_is_rescored(
+        self, monkeypatch, caplog, section_llm, client, auth_headers, test_cv
+    ):
+        """Test a disabled response cache is reported, not silently costly."""
+        # As built with AI_CACHE_ENABLED=false
+        monkeypatch.setattr(get_ai_service(), "cache", None)
+        monkeypatch.setattr(section_scoring, "_warned_no_cache", False)
+        self._score(client, auth_headers, test_cv.id)
+        self._score(client, auth_headers, test_cv.id)
+
+        assert section_llm.stats["requests"] == 2
+        warnings = [r for r in caplog.records if "cache is disabled" in r.message]
+        assert len(warnings) == 1
+
+    def test_unusable_reply_is_scored_locally_and_not_reused(
+        self, groq_server, client, auth_headers, test_cv
+    ):
+        """Test a non-JSON reply falls back locally and is asked again next time."""
+        data = self._score(client, auth_headers, test_cv.id)
+        assert [s["scorer"] for s in data["sections"]] == ["local"]
+        assert data["sections"][0]["fallback_reason"] == (
+            "LLM reply could not be parsed"
+        )
+        assert groq_server.stats["requests"] == 1
+
+        self._score(client, auth_headers, test_cv.id)
+        assert groq_server.stats["requests"] == 2
+
+    def test_sections_mode_is_not_streamed(
+        self, groq_server, client, auth_headers, test_cv
+    ):
+        """Test the stream endpoint rejects mode=sections."""
+        response = client.post(
+            "/api/v1/ai/score-cv/stream",
+            headers=auth_headers,
+            json={"cv_id": test_cv.id, "mode": "sections"},
+        )
+        assert response.status_code == 400
+
+
+class TestLLMMetrics:
+    """Tests for LLM call instrumentation and /ai/llm-metrics."""
+
+    @pytest.fixture
+    def admin_headers(self, db, test_user, auth_headers):
+        """Auth headers of a superuser (promoted before any AI request)."""
+        test_user.is_superuser = True
+        db.commit()
+        return auth_headers
+
+    def _metrics(self, client, headers):
+        response = client.get("/api/v1/ai/llm-metrics", headers=headers)
+        assert response.status_code == 200
+        return response.json()
+
+    def test_call_is_recorded_per_endpoint(self, groq_server, client, admin_headers):
+        """Test latency, tokens and outcome are recorded with Insights off."""
+        for _ in range(2):
+            client.post(
+                "/api/v1/ai/optimize-description",
+                headers=admin_headers,
+                json={"original_text": "Did backend work", "field_type": "project"},
+            )
+
+        data = self._metrics(client, admin_headers)
+
+        assert data["azure_insights_enabled"] is False
+        endpoint = data["endpoints"]["/api/v1/ai/optimize-description"]
+        # The second request was a cache hit and never reached the LLM
+        assert endpoint["calls"] == 1
+        assert endpoint["outcomes"] == {"success": 1}
+        assert endpoint["models"] == {get_ai_service().model: 1}
+        assert endpoint["prompt_tokens"] == 10
+        assert endpoint["completion_tokens"] == 5
+        assert endpoint["estimated_cost_usd"] > 0
+        assert endpoint["retries"] == 0
+        assert endpoint["latency_ms"]["count"] == 1
+        assert endpoint["latency_ms"]["buckets"]["+Inf"] == 1
+        assert endpoint["time_to_first_token_ms"]["count"] == 1
+        assert endpoint["upstream_queue_ms"]["mean"] == 2.0
+
+    def test_streamed_call_records_time_to_first_token(
+        self, groq_server, client, admin_headers
+    ):
+        """Test streamed calls report first-token time and final usage."""
+        client.post(
+            "/api/v1/ai/optimize-description/stream",
+            headers=admin_headers,
+            json={"original_text": "Did backend work", "field_type": "project"},
+        )
+
+        data = self._metrics(client, admin_headers)
+
+        endpoint = data["endpoints"]["/api/v1/ai/optimize-description/stream"]
+        assert endpoint["outcomes"] == {"success": 1}
+        assert endpoint["completion_tokens"] == 5
+        ttft = endpoint["time_to_first_token_ms"]
+        assert ttft["count"] == 1
+        assert ttft["sum"] <= endpoint["latency_ms"]["sum"]
+
+    def test_failures_and_retries_are_recorded(
+        self, monkeypatch, client, admin_headers
+    ):
+        """Test an unreachable LLM is recorded as an error with its retries."""
+        monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+        monkeypatch.setattr(settings, "GROQ_BASE_URL", "http://127.0.0.1:1")
+        response = client.post(
+            "/api/v1/ai/optimize-description",
+            headers=admin_headers,
+            json={"original_text": "Did backend work", "field_type": "project"},
+        )
+        assert response.status_code == 503
+
+        data = self._metrics(client, admin_headers)
+
+        endpoint = data["endpoints"]["/api/v1/ai/optimize-description"]
+        assert endpoint["outcomes"] == {"error": 1}
+        assert endpoint["retries"] == get_ai_service().dependency.max_retries
+        assert endpoint["prompt_tokens"] == 0
+
+    def test_path_parameters_are_templated(
+        self, batch_llm, client, admin_headers, full_cv
+    ):
+        """Test calls are grouped by route template, not by CV id."""
+        client.post(
+            f"/api/v1/ai/cvs/{full_cv.id}/optimize-all",
+            headers=admin_headers,
+            json={},
+        )
+
+        data = self._metrics(client, admin_headers)
+
+        endpoint = data["endpoints"]["/api/v1/ai/cvs/{cv_id}/optimize-all"]
+        assert endpoint["outcomes"] == {"success": 4, "error": 1}
+        assert endpoint["latency_ms"]["count"] == 5
+
+    def test_llm_metrics_requires_superuser(self, client, auth_headers):
+        """Test regular users cannot read LLM metrics."""
+        response = client.get("/api/v1/ai/llm-metrics", headers=auth_headers)
+        assert response.status_code == 403
@@ -0,0 +1,79 @@
+"""
+Tests for the AI response cache.
+"""
+
+from app.services.ai_cache import (
+    AIResponseCache,
+    CachedCompletion,
+    InMemoryCacheBackend,
+    normalize_text,
+)
+
+
+def _key(**overrides):
+    params = {
+        "model": "m",
+        "template_version": 1,
+        "operation": "optimize:project",
+        "inputs": {"text": "Built an API"},
+    }
+    params.update(overrides)
+    return AIResponseCache.make_key(**params)
+
+
+class TestCacheKey:
+    """Tests for cache key derivation."""
+
+    def test_key_is_stable(self):
+        """Test equal inputs give equal keys regardless of dict order."""
+        assert _key(inputs={"a": 1, "b": 2}) == _key(inputs={"b": 2, "a": 1})
+
+    def test_key_changes_with_model_and_template(self):
+        """Test model and prompt template version are part of the key."""
+        assert _key() != _key(model="other")
+        assert _key() != _key(template_version=2)
+        assert _key() != _key(operation="optimize:education")
+
+    def test_normalize_text(self):
+        """Test whitespace differences normalize away."""
+        assert normalize_text("  Built\tan\n API ") == "Built an API"
+
+
+class TestInMemoryCacheBackend:
+    """Tests for the in-process LRU backend."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the size bound evicts the oldest untouched entry."""
+        backend = InMemoryCacheBackend(max_entries=2)
+        backend.set("a", CachedCompletion("A", 1), ttl_seconds=60)
+        backend.set("b", CachedCompletion("B", 1), ttl_seconds=60)
+        backend.get("a")
+        backend.set("c", CachedCompletion("C", 1), ttl_seconds=60)
+
+        assert backend.get("b") is None
+        assert backend.get("a").text == "A"
+        assert len(backend) == 2
+
+    def test_expired_entries_are_misses(self):
+        """Test entries past their TTL are not returned."""
+        backend = InMemoryCacheBackend(max_entries=10)
+        backend.set("a", CachedCompletion("A", 1), ttl_seconds=0)
+        assert backend.get("a") is None
+
+
+class TestAIResponseCache:
+    """Tests for hit/miss accounting."""
+
+    def test_stats(self):
+        """Test hit rate and saved tokens are tracked."""
+        cache = AIResponseCache(InMemoryCacheBackend(10), ttl_seconds=60)
+        assert cache.get("k") is None
+        cache.set("k", "text", total_tokens=120)
+        assert cache.get("k") == "text"
+        assert cache.get("k") == "text"
+
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["saved_tokens"] == 240
+        assert stats["entries"] == 1
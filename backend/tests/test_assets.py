@@ -0,0 +1,168 @@
+"""
+Tests for long-lived asset redirect URLs and the signed URL cache.
+"""
+
+import io
+from datetime import datetime, timedelta
+
+from PIL import Image
+
+from app.core.config import Settings
+from app.models.share_link import ShareLink
+from app.services.storage_service import SignedUrlCache
+
+
+class FakeBackend:
+    """Backend stub that counts signing calls."""
+
+    def __init__(self, ttl_seconds: int = 3600):
+        self.calls = 0
+        self.ttl_seconds = ttl_seconds
+
+    def generate_signed_url(self, container, blob_name, ttl_minutes):
+        self.calls += 1
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        return f"https://storage/{container}/{blob_name}?sig={self.calls}", expires_at
+
+
+class TestSignedUrlCache:
+    """Tests for SignedUrlCache."""
+
+    def test_reuses_signed_url(self):
+        """Test repeated lookups are served from the cache."""
+        backend = FakeBackend()
+        cache = SignedUrlCache(
+            backend, ttl_minutes=60, refresh_margin_seconds=300, max_entries=10
+        )
+        first = cache.get("pfp", "a.png")
+        second = cache.get("pfp", "a.png")
+        assert first == second
+        assert backend.calls == 1
+        assert cache.hits == 1
+
+    def test_resigns_close_to_expiry(self):
+        """Test entries inside the refresh margin are signed again."""
+        backend = FakeBackend(ttl_seconds=60)
+        cache = SignedUrlCache(
+            backend, ttl_minutes=1, refresh_margin_seconds=300, max_entries=10
+        )
+        first, _ = cache.get("pfp", "a.png")
+        second, _ = cache.get("pfp", "a.png")
+        assert first != second
+        assert backend.calls == 2
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache stays within max_entries."""
+        backend = FakeBackend()
+        cache = SignedUrlCache(
+            backend, ttl_minutes=60, refresh_margin_seconds=0, max_entries=2
+        )
+        cache.get("pdf", "a")
+        cache.get("pdf", "b")
+        cache.get("pdf", "a")
+        cache.get("pdf", "c")
+        cache.get("pdf", "a")
+        assert backend.calls == 3
+        cache.get("pdf", "b")
+        assert backend.calls == 4
+
+    def test_sas_ttl_setting_is_a_deprecated_alias(self, monkeypatch):
+        """Test deployments setting the old SAS lifetime keep it."""
+        monkeypatch.delenv("ASSET_URL_TTL_MINUTES", raising=False)
+        monkeypatch.setenv("AZURE_STORAGE_SAS_TTL_MINUTES", "15")
+        assert Settings(_env_file=None).ASSET_URL_TTL_MINUTES == 15
+
+        monkeypatch.setenv("ASSET_URL_TTL_MINUTES", "30")
+        assert Settings(_env_file=None).ASSET_URL_TTL_MINUTES == 30
+
+
+class TestShareAssets:
+    """Tests for /assets/share redirects."""
+
+    def _share(self, client, auth_headers, cv_id) -> str:
+        response = client.post(
+            f"/api/v1/cvs/{cv_id}/share-link",
+            headers=auth_headers,
+            files={"file": ("cv.pdf", b"%PDF-1.4 shared", "application/pdf")},
+        )
+        assert response.status_code == 200
+        return response.json()["url"]
+
+    def test_share_link_redirects(self, local_storage, client, auth_headers, test_cv):
+        """Test a share link 302s to a signed URL with caching headers."""
+        url = self._share(client, auth_headers, test_cv.id)
+        assert "/api/v1/assets/share/" in url
+
+        first = client.get(url, follow_redirects=False)
+        second = client.get(url, follow_redirects=False)
+        assert first.status_code == 302
+        assert first.headers["location"] == second.headers["location"]
+        cache_control = first.headers["cache-control"]
+        assert cache_control.startswith("public, max-age=")
+        assert 0 < int(cache_control.split("max-age=")[1].split(",")[0]) <= 3600
+
+        pdf = client.get(url)
+        assert pdf.status_code == 200
+        assert pdf.content == b"%PDF-1.4 shared"
+
+    def test_share_link_stores_blob_name(
+        self, local_storage, client, auth_headers, test_cv, db
+    ):
+        """Test the database keeps the blob name rather than a signed URL."""
+        self._share(client, auth_headers, test_cv.id)
+        link = db.query(ShareLink).one()
+        assert link.blob_name.startswith(f"cvs/user-{test_cv.user_id}/")
+        assert "signature" not in link.url
+
+    def test_expired_share_link(self, local_storage, client, auth_headers, test_cv, db):
+        """Test expired share links no longer redirect."""
+        url = self._share(client, auth_headers, test_cv.id)
+        link = db.query(ShareLink).one()
+        link.expires_at = datetime.utcnow() - timedelta(minutes=1)
+        db.commit()
+        response = client.get(url, follow_redirects=False)
+        assert response.status_code == 404
+
+    def test_unknown_share_link(self, local_storage, client):
+        """Test unknown public ids return 404."""
+        response = client.get("/api/v1/assets/share/doesnotexist")
+        assert response.status_code == 404
+
+
+class TestProfilePictureAssets:
+    """Tests for /assets/pfp redirects."""
+
+    def _upload(self, client, auth_headers) -> dict:
+        buffer = io.BytesIO()
+        Image.new("RGB", (300, 300), (0, 128, 0)).save(buffer, format="PNG")
+        response = client.post(
+            "/api/v1/auth/profile-picture",
+            headers=auth_headers,
+            files={"file": ("avatar.png", buffer.getvalue(), "image/png")},
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    def test_profile_picture_redirects(self, local_storage, client, auth_headers):
+        """Test profile picture URLs are stable asset URLs that redirect."""
+        user = self._upload(client, auth_headers)
+        assert f"/api/v1/assets/pfp/{user['id']}" in user["profile_picture_url"]
+
+        response = client.get(user["profile_picture_url"], follow_redirects=False)
+        assert response.status_code == 302
+        assert "signature=" in response.headers["location"]
+
+        image = client.get(user["profile_picture_variants"]["64"])
+        assert image.status_code == 200
+        assert image.headers["content-type"] == "image/webp"
+
+    def test_unknown_variant(self, local_storage, client, auth_headers):
+        """Test requesting a size that was not generated returns 404."""
+        user = self._upload(client, auth_headers)
+        response = client.get(f"/api/v1/assets/pfp/{user['id']}?size=1000")
+        assert response.status_code == 404
+
+    def test_user_without_picture(self, local_storage, client, test_user):
+        """Test users without a picture return 404."""
+        response = client.get(f"/api/v1/assets/pfp/{test_user.id}")
+        assert response.status_code == 404
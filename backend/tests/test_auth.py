@@ -2,6 +2,13 @@
 Tests for authentication endpoints.
 """
 
+import io
+
+from PIL import Image
+
+from app.core.resilience import CircuitOpenError
+from app.services.storage_service import get_storage
+
 
 class TestRegistration:
     """Tests for user registration."""
@@ -163,3 +170,113 @@ class TestAuthenticatedEndpoints:
             headers={"Authorization": "Bearer expiredtoken123"},
         )
         assert response.status_code == 401
+
+
+class TestProfilePicture:
+    """Tests for profile picture uploads."""
+
+    def _jpeg(self) -> bytes:
+        buffer = io.BytesIO()
+        Image.new("RGB", (1024, 768), (10, 120, 200)).save(buffer, format="JPEG")
+        return buffer.getvalue()
+
+    def test_upload_profile_picture_variants(self, local_storage, client, auth_headers):
+        """Test uploading a picture stores the original and resized variants."""
+        response = client.post(
+            "/api/v1/auth/profile-picture",
+            headers=auth_headers,
+            files={"file": ("avatar.jpg", self._jpeg(), "image/jpeg")},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["profile_picture_url"]
+        assert set(data["profile_picture_variants"]) == {"64", "256", "512"}
+
+        version = data["profile_picture_url"].split("v=")[1]
+        stored = sorted(
+            path.name for path in (local_storage / "pfp").rglob("*") if path.is_file()
+        )
+        assert stored == [
+            f"profile-{version}-256.webp",
+            f"profile-{version}-512.webp",
+            f"profile-{version}-64.webp",
+            f"profile-{version}.jpg",
+        ]
+
+        variant = client.get(data["profile_picture_variants"]["64"])
+        assert variant.status_code == 200
+        assert variant.headers["content-type"] == "image/webp"
+
+    def test_reupload_changes_urls(self, local_storage, client, auth_headers):
+        """Test a new picture gets new URLs and the old blobs are removed."""
+
+        def upload(color) -> dict:
+            buffer = io.BytesIO()
+            Image.new("RGB", (300, 300), color).save(buffer, format="JPEG")
+            response = client.post(
+                "/api/v1/auth/profile-picture",
+                headers=auth_headers,
+                files={"file": ("avatar.jpg", buffer.getvalue(), "image/jpeg")},
+            )
+            assert response.status_code == 200
+            return response.json()
+
+        first = upload((255, 0, 0))
+        old_location = client.get(
+            first["profile_picture_url"], follow_redirects=False
+        ).headers["location"]
+        second = upload((0, 0, 255))
+        assert second["profile_picture_url"] != first["profile_picture_url"]
+        assert second["profile_picture_variants"] != first["profile_picture_variants"]
+
+        new_location = client.get(
+            second["profile_picture_url"], follow_redirects=False
+        ).headers["location"]
+        assert new_location != old_location
+        assert client.get(old_location).status_code == 404
+        stored = [path for path in (local_storage / "pfp").rglob("*") if path.is_file()]
+        assert len(stored) == 3  # original, 256 and 64
+
+    def test_upload_profile_picture_type_from_content(
+        self, local_storage, client, auth_headers
+    ):
+        """Test the stored type follows the image data, not the upload name."""
+        buffer = io.BytesIO()
+        Image.new("RGB", (100, 100)).save(buffer, format="PNG")
+        response = client.post(
+            "/api/v1/auth/profile-picture",
+            headers=auth_headers,
+            files={"file": ("avatar.jpg", buffer.getvalue(), "image/jpeg")},
+        )
+        assert response.status_code == 200
+        assert set(response.json()["profile_picture_variants"]) == {"64"}
+
+        original = client.get(response.json()["profile_picture_url"])
+        assert original.headers["content-type"] == "image/png"
+
+    def test_upload_profile_picture_circuit_open(
+        self, monkeypatch, local_storage, client, auth_headers
+    ):
+        """Test an open storage circuit is reported as 503, not 502."""
+
+        async def refuse(*args, **kwargs):
+            raise CircuitOpenError("storage", 30)
+
+        monkeypatch.setattr(type(get_storage()), "upload", refuse)
+        response = client.post(
+            "/api/v1/auth/profile-picture",
+            headers=auth_headers,
+            files={"file": ("avatar.jpg", self._jpeg(), "image/jpeg")},
+        )
+        assert response.status_code == 503
+
+    def test_upload_profile_picture_invalid_image(
+        self, local_storage, client, auth_headers
+    ):
+        """Test corrupt image data is rejected with 400."""
+        response = client.post(
+            "/api/v1/auth/profile-picture",
+            headers=auth_headers,
+            files={"file": ("avatar.png", b"not a png", "image/png")},
+        )
+        assert response.status_code == 400
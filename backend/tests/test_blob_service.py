@@ -0,0 +1,90 @@
+"""
+Tests for the async blob storage service.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.blob_service import AsyncAzureBlobService
+from mock_servers import BlobEmulator
+
+UPLOAD_DELAY = 0.5
+
+
+@pytest.fixture
+def slow_blob_storage(monkeypatch):
+    """Blob emulator that takes UPLOAD_DELAY seconds per blob operation."""
+    emulator = BlobEmulator(delay=UPLOAD_DELAY).start()
+    monkeypatch.setattr(
+        settings, "AZURE_STORAGE_CONNECTION_STRING", emulator.connection_string
+    )
+    monkeypatch.setattr(settings, "AZURE_STORAGE_PDF_CONTAINER_NAME", "pdfs")
+    monkeypatch.setattr(settings, "AZURE_STORAGE_PFP_CONTAINER_NAME", "pfp")
+    try:
+        yield emulator
+    finally:
+        emulator.stop()
+
+
+class TestAsyncAzureBlobService:
+    """Tests for AsyncAzureBlobService against a slow storage emulator."""
+
+    @pytest.mark.asyncio
+    async def test_upload_cv_pdf(self, slow_blob_storage):
+        """Test uploading a PDF stores the blob and it can be signed."""
+        service = AsyncAzureBlobService()
+        try:
+            await service.initialize()
+            blob_name = await service.upload_cv_pdf(
+                user_id=1, cv_id=2, data=b"%PDF-1.4", filename="cv.pdf"
+            )
+            url, expires_at = service.generate_signed_url("pdf", blob_name, 5)
+        finally:
+            await service.close()
+
+        blobs = slow_blob_storage.containers["pdfs"]
+        assert list(blobs) == [blob_name]
+        assert blob_name.startswith("cvs/user-1/cv-2-")
+        assert blobs[blob_name] == (b"%PDF-1.4", "application/pdf")
+        assert f"/pdfs/{blob_name}?" in url
+        assert "sig=" in url
+        assert expires_at is not None
+
+    @pytest.mark.asyncio
+    async def test_event_loop_responsive_during_uploads(self, slow_blob_storage):
+        """Test the event loop keeps running while slow uploads are in flight."""
+        service = AsyncAzureBlobService()
+        await service.initialize()
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(
+                *(
+                    service.upload_cv_pdf(
+                        user_id=1, cv_id=i, data=b"%PDF-1.4", filename="cv.pdf"
+                    )
+                    for i in range(5)
+                )
+            )
+        finally:
+            elapsed = time.perf_counter() - started
+            ticker_task.cancel()
+            await service.close()
+
+        assert len(slow_blob_storage.containers["pdfs"]) == 5
+        # Uploads overlap instead of running back to back...
+        assert elapsed < 5 * UPLOAD_DELAY
+        # ...and the loop kept scheduling other work the whole time.
+        assert ticks >= int(UPLOAD_DELAY / 0.01) // 2
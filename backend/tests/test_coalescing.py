@@ -0,0 +1,203 @@
+"""
+Tests for single-flight coalescing of identical concurrent calls.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.coalescing import FileLockStore, SingleFlight, request_key
+
+
+class TestRequestKey:
+    """Tests for request hashing."""
+
+    def test_key_ignores_dict_order(self):
+        """Test equal payloads hash the same regardless of key order."""
+        assert request_key("en", {"a": 1, "b": 2}) == request_key(
+            "en", {"b": 2, "a": 1}
+        )
+        assert request_key("en", {"a": 1}) != request_key("es", {"a": 1})
+
+
+class TestSingleFlightAsync:
+    """Tests for coroutine callers."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test ten identical concurrent calls run the function once."""
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "result"
+
+        results = await asyncio.gather(*(flight.ado("k", work) for _ in range(10)))
+
+        assert results == ["result"] * 10
+        assert calls == 1
+        assert flight.stats() == {
+            "calls": 10,
+            "executions": 1,
+            "coalesced": 9,
+            "shared_across_workers": 0,
+            "in_flight": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Test calls with different keys are not coalesced."""
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return "result"
+
+        await asyncio.gather(flight.ado("a", work), flight.ado("b", work))
+
+        assert flight.stats()["executions"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_is_shared_and_not_remembered(self):
+        """Test waiters see the leader's error and the next call retries."""
+        flight = SingleFlight("test")
+        attempts = 0
+
+        async def failing():
+            nonlocal attempts
+            attempts += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            *(flight.ado("k", failing) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert attempts == 1
+
+        with pytest.raises(RuntimeError):
+            await flight.ado("k", failing)
+        assert attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        """Test a disconnecting caller leaves the shared call running."""
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        first = asyncio.create_task(flight.ado("k", work))
+        second = asyncio.create_task(flight.ado("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "result"
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """Test a disabled group calls upstream every time."""
+        flight = SingleFlight("test", enabled=False)
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return "result"
+
+        await asyncio.gather(*(flight.ado("k", work) for _ in range(3)))
+
+        assert flight.stats()["executions"] == 3
+        assert flight.stats()["coalesced"] == 0
+
+
+class TestSingleFlightThreads:
+    """Tests for blocking callers in worker threads."""
+
+    def test_concurrent_threads_share_one_execution(self):
+        """Test identical calls from several threads run the function once."""
+        flight = SingleFlight("test")
+        calls = 0
+        started = threading.Event()
+
+        def work():
+            nonlocal calls
+            calls += 1
+            started.set()
+            time.sleep(0.1)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            leader = pool.submit(flight.do, "k", work)
+            started.wait(1)
+            followers = [pool.submit(flight.do, "k", work) for _ in range(4)]
+            results = [leader.result()] + [f.result() for f in followers]
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flight.stats()["coalesced"] == 4
+
+
+class TestFileLockStore:
+    """Tests for coalescing across processes through a lock directory."""
+
+    def test_waiter_in_other_worker_gets_published_result(self, tmp_path):
+        """Test two workers (separate groups) make a single upstream call."""
+        store = FileLockStore(str(tmp_path))
+        worker_a = SingleFlight("test", lock_store=store)
+        worker_b = SingleFlight("test", lock_store=store)
+        calls = 0
+        started = threading.Event()
+
+        def work():
+            nonlocal calls
+            calls += 1
+            started.set()
+            time.sleep(0.2)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(worker_a.do, "k", work)
+            started.wait(1)
+            follower = pool.submit(worker_b.do, "k", work)
+            assert leader.result() == follower.result() == "result"
+
+        assert calls == 1
+        assert worker_b.stats()["shared_across_workers"] == 1
+        assert worker_b.stats()["executions"] == 0
+
+    def test_finished_results_are_not_reused(self, tmp_path):
+        """Test a call made after the previous one finished goes upstream."""
+        store = FileLockStore(str(tmp_path))
+        worker_a = SingleFlight("test", lock_store=store)
+        worker_b = SingleFlight("test", lock_store=store)
+
+        assert worker_a.do("k", lambda: "first") == "first"
+        assert worker_b.do("k", lambda: "second") == "second"
+        assert worker_b.stats()["shared_across_workers"] == 0
+
+    def test_leader_failure_lets_waiter_call_upstream(self, tmp_path):
+        """Test nothing is published when the lock holder fails."""
+        store = FileLockStore(str(tmp_path))
+        worker_a = SingleFlight("test", lock_store=store)
+        worker_b = SingleFlight("test", lock_store=store)
+        started = threading.Event()
+
+        def failing():
+            started.set()
+            time.sleep(0.1)
+            raise RuntimeError("upstream down")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(worker_a.do, "k", failing)
+            started.wait(1)
+            follower = pool.submit(worker_b.do, "k", lambda: "retried")
+            with pytest.raises(RuntimeError):
+                leader.result()
+            assert follower.result() == "retried"
@@ -0,0 +1,155 @@
+"""
+Tests for the deterministic local CV scoring engine.
+"""
+
+from datetime import date, datetime
+
+from app.schemas.cv import CVWithRelations
+from app.services.cv_scoring import extract_statements, score_cv_locally
+
+NOW = datetime(2024, 1, 1)
+
+
+def make_cv(
+    *, summary=None, experiences=(), projects=(), skills=0, educations=0, **fields
+):
+    """Build a CVWithRelations with the given descriptions."""
+    stamps = {"created_at": NOW, "updated_at": NOW}
+    data = {
+        "id": 1,
+        "user_id": 1,
+        "title": "Engineer",
+        "full_name": "Test User",
+        "email": "test@example.com",
+        "phone": "+1234567890",
+        "location": "Berlin",
+        "summary": summary,
+        **stamps,
+        "work_experiences": [
+            {
+                "id": i,
+                "cv_id": 1,
+                "company": "Acme",
+                "position": "Engineer",
+                "start_date": date(2020, 1, 1),
+                "description": text,
+                "display_order": i,
+                **stamps,
+            }
+            for i, text in enumerate(experiences)
+        ],
+        "projects": [
+            {"id": i, "cv_id": 1, "name": "P", "description": text, **stamps}
+            for i, text in enumerate(projects)
+        ],
+        "skills": [
+            {"id": i, "cv_id": 1, "name": f"Skill {i}", **stamps} for i in range(skills)
+        ],
+        "educations": [
+            {
+                "id": i,
+                "cv_id": 1,
+                "institution": "Uni",
+                "degree": "BSc",
+                "start_date": date(2015, 9, 1),
+                **stamps,
+            }
+            for i in range(educations)
+        ],
+    }
+    data.update(fields)
+    return CVWithRelations.model_validate(data)
+
+
+STRONG = (
+    "• Led migration of 40 services to Kubernetes, cutting deploy time by 60%\n"
+    "• Reduced cloud spend by $120k a year by rightsizing clusters\n"
+    "• Mentored 5 engineers through their first on-call rotation"
+)
+WEAK = (
+    "• Responsible for code reviews\n"
+    "• Helped with various things etc\n"
+    "• Worked on the backend"
+)
+
+
+class TestExtractStatements:
+    """Tests for statement splitting."""
+
+    def test_bullets_and_sentences(self):
+        """Test bullets and sentences become separate statements."""
+        cv = make_cv(
+            summary="Backend engineer. Loves reliable systems.",
+            experiences=[STRONG],
+        )
+        statements = extract_statements(cv)
+        assert [s.section for s in statements] == ["summary"] * 2 + [
+            "work_experience"
+        ] * 3
+        assert statements[2].opener == "led"
+        assert statements[2].quantified
+
+
+class TestScoreCVLocally:
+    """Tests for the local scoring metrics."""
+
+    def test_strong_beats_weak(self):
+        """Test quantified, verb-led bullets outscore duty lists."""
+        strong = score_cv_locally(make_cv(experiences=[STRONG]))
+        weak = score_cv_locally(make_cv(experiences=[WEAK]))
+
+        for metric in ("impact_achievement_density", "action_verb_strength"):
+            assert strong[metric]["score"] > weak[metric]["score"]
+        assert strong["impact_achievement_density"]["score"] == 10
+        assert weak["impact_achievement_density"]["score"] == 1
+        assert "responsible for" in weak["action_verb_strength"]["reason"]
+
+    def test_informal_tone_lowers_professionalism(self):
+        """Test first person, slang and exclamations are penalized."""
+        formal = score_cv_locally(make_cv(experiences=[STRONG]))
+        informal = score_cv_locally(
+            make_cv(experiences=["I built some awesome stuff!"])
+        )
+        assert formal["professionalism"]["score"] == 10
+        assert informal["professionalism"]["score"] < 6
+
+    def test_long_statements_lower_clarity(self):
+        """Test run-on statements score lower on readability."""
+        run_on = " ".join(["Implemented the comprehensive integration"] * 12)
+        concise = score_cv_locally(make_cv(experiences=[STRONG]))
+        verbose = score_cv_locally(make_cv(experiences=[run_on]))
+        assert (
+            verbose["clarity_readability"]["score"]
+            < (concise["clarity_readability"]["score"])
+        )
+
+    def test_section_completeness(self):
+        """Test missing sections are named."""
+        complete = make_cv(
+            summary=" ".join(["Experienced backend engineer"] * 6),
+            experiences=[STRONG],
+            projects=["Built a parser"],
+            skills=5,
+            educations=1,
+        )
+        assert score_cv_locally(complete)["section_completeness"]["score"] == 10
+
+        sparse = score_cv_locally(make_cv(phone=None))
+        assert sparse["section_completeness"]["score"] == 1
+        assert "work experience" in sparse["section_completeness"]["reason"]
+
+    def test_empty_cv(self):
+        """Test a CV without descriptions still gets valid scores."""
+        result = score_cv_locally(make_cv())
+        for metric in (
+            "impact_achievement_density",
+            "clarity_readability",
+            "action_verb_strength",
+        ):
+            assert result[metric]["score"] == 1
+        assert result["summary_insight"]
+
+    def test_deterministic(self):
+        """Test identical CVs score identically."""
+        cv = make_cv(summary="Engineer.", experiences=[STRONG, WEAK])
+        assert score_cv_locally(cv) == score_cv_locally(cv)
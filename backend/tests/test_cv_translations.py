@@ -0,0 +1,230 @@
+"""
+Tests for stored CV translations and incremental re-translation.
+"""
+
+import json
+
+import pytest
+
+from app.api.v1.endpoints import cv_translations
+from app.core.config import settings
+from app.models.translated_cv import TranslatedCV
+from app.models.work_experience import WorkExperience
+from app.services import translation_service
+from app.services.translation_memory import TranslationMemory
+from mock_servers import Failures, TranslateEmulator
+
+
+@pytest.fixture
+def translator(monkeypatch, translate_server):
+    """Google Translate mock without the translation memory in front of it."""
+    monkeypatch.setattr(settings, "TRANSLATION_MEMORY_ENABLED", False)
+    monkeypatch.setattr(translation_service, "_translation_service", None)
+    return translate_server
+
+
+def _url(cv_id, language="de"):
+    return f"/api/v1/cvs/{cv_id}/translations/{language}"
+
+
+class TestCVTranslations:
+    """Tests for /cvs/{cv_id}/translations/{language}."""
+
+    def test_translate_and_serve(
+        self, translator, client, auth_headers, test_cv, test_work_experience
+    ):
+        """Test a translation is stored and then served without translating."""
+        response = client.post(_url(test_cv.id), headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["language"] == "de"
+        assert data["source_language"] == "en"
+        assert data["translated_fields"] == 8
+        assert data["reused_fields"] == 0
+        translation = data["translation"]
+        assert translation["title"] == "[de] Software Engineer Resume"
+        assert translation["email"] == "testuser@example.com"
+        experience = translation["work_experiences"][0]
+        assert experience["position"] == "[de] Senior Developer"
+        assert experience["start_date"] == "2020-01-01"
+
+        response = client.get(_url(test_cv.id, "German"), headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["translation"] == translation
+        assert response.json()["stale"] is False
+        assert translator.stats["requests"] == 1
+
+    def test_retranslates_only_changes(
+        self, translator, client, auth_headers, db, test_cv, test_work_experience
+    ):
+        """Test only fields whose source text changed are sent again."""
+        client.post(_url(test_cv.id), headers=auth_headers)
+        segments = translator.stats["segments"]
+
+        experience = db.get(WorkExperience, test_work_experience.id)
+        experience.description = "Led the platform team."
+        db.commit()
+        assert client.get(_url(test_cv.id), headers=auth_headers).json()["stale"]
+
+        response = client.post(_url(test_cv.id), headers=auth_headers)
+        data = response.json()
+        assert data["translated_fields"] == 1
+        assert data["reused_fields"] == 7
+        assert translator.stats["segments"] == segments + 1
+        experience = data["translation"]["work_experiences"][0]
+        assert experience["description"] == "[de] Led the platform team."
+        assert experience["company"] == "[de] Tech Corp"
+        assert not client.get(_url(test_cv.id), headers=auth_headers).json()["stale"]
+
+        response = client.post(_url(test_cv.id), headers=auth_headers)
+        assert response.json()["translated_fields"] == 0
+        assert translator.stats["segments"] == segments + 1
+        db.expire_all()
+        assert db.query(TranslatedCV).filter_by(cv_id=test_cv.id).count() == 1
+
+    def test_languages_are_stored_separately(
+        self, translator, client, auth_headers, test_cv
+    ):
+        """Test each target language gets its own stored translation."""
+        client.post(_url(test_cv.id, "de"), headers=auth_headers)
+        response = client.post(_url(test_cv.id, "fr"), headers=auth_headers)
+        assert response.json()["reused_fields"] == 0
+        assert response.json()["translation"]["title"].startswith("[fr] ")
+        german = client.get(_url(test_cv.id, "de"), headers=auth_headers).json()
+        assert german["translation"]["title"].startswith("[de] ")
+
+    def test_errors(
+        self, translator, client, auth_headers, auth_headers_user2, test_cv
+    ):
+        """Test unsupported languages, missing translations and other users."""
+        response = client.post(_url(test_cv.id, "xx"), headers=auth_headers)
+        assert response.status_code == 400
+        response = client.get(_url(test_cv.id), headers=auth_headers)
+        assert response.status_code == 404
+        response = client.post(_url(test_cv.id), headers=auth_headers_user2)
+        assert response.status_code == 404
+        assert translator.stats["requests"] == 0
+
+    def test_conflict_without_stored_translation(
+        self, translator, monkeypatch, client, auth_headers, db, test_cv
+    ):
+        """Test a failed insert that is not a stored translation gives 409."""
+        db.add(
+            TranslatedCV(
+                cv_id=test_cv.id,
+                language="de",
+                source_language="en",
+                content={},
+                segments={},
+            )
+        )
+        db.commit()
+        # The stored row is not found, so the endpoint inserts and conflicts
+        monkeypatch.setattr(cv_translations, "_get_variant", lambda *args: None)
+        response = client.post(_url(test_cv.id), headers=auth_headers)
+        assert response.status_code == 409
+
+
+class TestTranslateTargets:
+    """Tests for /cvs/{cv_id}/translate?targets=..."""
+
+    def test_translates_every_target(
+        self, translator, client, auth_headers, test_cv, test_skill
+    ):
+        """Test each distinct language is translated, in the requested order."""
+        response = client.post(
+            f"/api/v1/cvs/{test_cv.id}/translate",
+            params={"targets": "de,French,it,de"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["succeeded"] == 3
+        assert data["failed"] == 0
+        assert [r["language"] for r in data["results"]] == ["de", "fr", "it"]
+        for result in data["results"]:
+            skill = result["translation"]["skills"][0]
+            assert skill["name"] == f"[{result['language']}] Python"
+        assert translator.stats["requests"] == 3
+
+    def test_one_memory_lookup_for_all_targets(
+        self, monkeypatch, translate_server, client, auth_headers, test_cv
+    ):
+        """Test segments are looked up once for every language, then reused."""
+        monkeypatch.setattr(settings, "TRANSLATION_MEMORY_ENABLED", True)
+        monkeypatch.setattr(settings, "TRANSLATION_MEMORY_PERSIST", False)
+        lookups = []
+        lookup_targets = TranslationMemory.lookup_targets
+
+        async def counting_lookup_targets(memory, source, targets, texts):
+            lookups.append(list(targets))
+            return await lookup_targets(memory, source, targets, texts)
+
+        monkeypatch.setattr(
+            TranslationMemory, "lookup_targets", counting_lookup_targets
+        )
+        url = f"/api/v1/cvs/{test_cv.id}/translate"
+        for _ in range(2):
+            response = client.post(
+                url, params={"targets": "de,fr"}, headers=auth_headers
+            )
+            assert response.json()["succeeded"] == 2
+
+        assert lookups == [["de", "fr"], ["de", "fr"]]
+        # The second run is served by the memory alone
+        assert translate_server.stats["requests"] == 2
+        stats = translation_service.translation_memory_stats()
+        assert stats["requests"] == 4
+        assert stats["misses"] == stats["hits"]
+
+    def test_streams_each_language(self, translator, client, auth_headers, test_cv):
+        """Test languages arrive as events followed by a summary."""
+        response = client.post(
+            f"/api/v1/cvs/{test_cv.id}/translate",
+            params={"targets": "de,fr", "stream": True},
+            headers=auth_headers,
+        )
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            (block.split("\n")[0][7:], json.loads(block.split("\n")[1][6:]))
+            for block in response.text.strip().split("\n\n")
+        ]
+        assert sorted(data["language"] for _, data in events[:2]) == ["de", "fr"]
+        assert {name for name, _ in events[:2]} == {"translation"}
+        assert events[2] == ("done", {"succeeded": 2, "failed": 0})
+
+    def test_failures_are_per_language(
+        self, monkeypatch, client, auth_headers, test_cv
+    ):
+        """Test a failing upstream is reported per language, not raised."""
+        emulator = TranslateEmulator(failures=Failures(1.0, status=400)).start()
+        monkeypatch.setattr(settings, "EXTERNAL_TRANSLATION_API_URL", emulator.api_url)
+        monkeypatch.setattr(settings, "EXTERNAL_TRANSLATION_API_KEY", "test-key")
+        monkeypatch.setattr(translation_service, "_translation_service", None)
+        try:
+            response = client.post(
+                f"/api/v1/cvs/{test_cv.id}/translate",
+                params={"targets": "de,fr"},
+                headers=auth_headers,
+            )
+        finally:
+            emulator.stop()
+        data = response.json()
+        assert data["failed"] == 2
+        assert "returned 400" in data["results"][0]["error"]
+
+    def test_validation(
+        self, translator, client, auth_headers, auth_headers_user2, test_cv
+    ):
+        """Test bad target lists and other users' CVs are rejected."""
+        url = f"/api/v1/cvs/{test_cv.id}/translate"
+        for targets in ("de,xx", " , "):
+            response = client.post(
+                url, params={"targets": targets}, headers=auth_headers
+            )
+            assert response.status_code == 400
+        response = client.post(
+            url, params={"targets": "de"}, headers=auth_headers_user2
+        )
+        assert response.status_code == 404
+        assert translator.stats["requests"] == 0
@@ -0,0 +1,68 @@
+"""
+Tests for CV export/share link endpoints.
+"""
+
+
+class TestCreateShareLink:
+    """Tests for creating shareable CV links."""
+
+    def test_create_share_link(self, blob_storage, client, auth_headers, test_cv):
+        """Test uploading a PDF creates a share link."""
+        response = client.post(
+            f"/api/v1/cvs/{test_cv.id}/share-link",
+            headers=auth_headers,
+            files={"file": ("cv.pdf", b"%PDF-1.4 test", "application/pdf")},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert "url" in data
+        assert "expires_at" in data
+        assert len(blob_storage.containers["pdfs"]) == 1
+
+    def test_create_share_link_reuses_existing(
+        self, blob_storage, client, auth_headers, test_cv
+    ):
+        """Test a second request returns the existing link without re-uploading."""
+        files = {"file": ("cv.pdf", b"%PDF-1.4 test", "application/pdf")}
+        first = client.post(
+            f"/api/v1/cvs/{test_cv.id}/share-link", headers=auth_headers, files=files
+        )
+        second = client.post(
+            f"/api/v1/cvs/{test_cv.id}/share-link", headers=auth_headers, files=files
+        )
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.json()["url"] == second.json()["url"]
+        assert len(blob_storage.containers["pdfs"]) == 1
+
+    def test_create_share_link_rejects_non_pdf(
+        self, blob_storage, client, auth_headers, test_cv
+    ):
+        """Test non-PDF uploads are rejected."""
+        response = client.post(
+            f"/api/v1/cvs/{test_cv.id}/share-link",
+            headers=auth_headers,
+            files={"file": ("cv.txt", b"hello", "text/plain")},
+        )
+        assert response.status_code == 400
+
+    def test_create_share_link_other_users_cv(
+        self, blob_storage, client, auth_headers, test_cv_user2
+    ):
+        """Test sharing another user's CV returns 404."""
+        response = client.post(
+            f"/api/v1/cvs/{test_cv_user2.id}/share-link",
+            headers=auth_headers,
+            files={"file": ("cv.pdf", b"%PDF-1.4 test", "application/pdf")},
+        )
+        assert response.status_code == 404
+
+    def test_create_share_link_without_storage(self, client, auth_headers, test_cv):
+        """Test an unconfigured storage backend returns 503, not 500."""
+        response = client.post(
+            f"/api/v1/cvs/{test_cv.id}/share-link",
+            headers=auth_headers,
+            files={"file": ("cv.pdf", b"%PDF-1.4 test", "application/pdf")},
+        )
+        assert response.status_code == 503
+        assert response.json()["detail"] == "File storage is not configured"
@@ -35,6 +35,23 @@ class TestHealthCheck:
         # Common health check fields
         assert "status" in data or "app_name" in data or "version" in data
 
+    def test_health_stats_superuser_only(
+        self, client, auth_headers_user2, superuser_headers
+    ):
+        """Test internal statistics are kept off /health and need a superuser."""
+        assert "coalescing" not in client.get("/api/v1/health").json()
+        assert client.get("/api/v1/health/stats").status_code == 401
+        response = client.get("/api/v1/health/stats", headers=auth_headers_user2)
+        assert response.status_code == 403
+
+        response = client.get("/api/v1/health/stats", headers=superuser_headers)
+        assert response.status_code == 200
+        assert set(response.json()) == {
+            "coalescing",
+            "translation_memory",
+            "translation_routing",
+        }
+
 
 class TestRootEndpoint:
     """Tests for root endpoint."""
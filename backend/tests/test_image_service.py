@@ -0,0 +1,100 @@
+"""
+Tests for profile picture processing.
+"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from app.services.image_service import parse_variant_sizes, process_profile_picture
+
+
+def make_image(fmt: str = "JPEG", size=(800, 600), exif: bool = False) -> bytes:
+    """Create an in-memory test image, optionally with EXIF metadata."""
+    image = Image.new("RGB", size, (200, 30, 30))
+    buffer = io.BytesIO()
+    kwargs = {}
+    if exif:
+        exif_data = Image.Exif()
+        exif_data[0x010F] = "TestCamera"  # Make
+        exif_data[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+        kwargs["exif"] = exif_data.tobytes()
+    image.save(buffer, format=fmt, **kwargs)
+    return buffer.getvalue()
+
+
+class TestProcessProfilePicture:
+    """Tests for process_profile_picture."""
+
+    def test_variants_are_square_webp(self):
+        """Test each requested size produces a square WebP variant."""
+        variants = process_profile_picture(
+            make_image(), sizes=[64, 256, 512], variant_format="webp", quality=80
+        ).variants
+        assert set(variants) == {64, 256, 512}
+        for size, data in variants.items():
+            with Image.open(io.BytesIO(data)) as image:
+                assert image.format == "WEBP"
+                assert image.size == (size, size)
+
+    def test_jpeg_variants(self):
+        """Test JPEG variants are produced from PNG sources with alpha."""
+        source = Image.new("RGBA", (300, 300), (0, 0, 0, 0))
+        buffer = io.BytesIO()
+        source.save(buffer, format="PNG")
+        original, extension, content_type, variants = process_profile_picture(
+            buffer.getvalue(), sizes=[64], variant_format="jpeg", quality=80
+        )
+        assert (extension, content_type) == ("png", "image/png")
+        with Image.open(io.BytesIO(variants[64])) as image:
+            assert image.format == "JPEG"
+        with Image.open(io.BytesIO(original)) as image:
+            assert image.format == "PNG"
+
+    def test_metadata_is_stripped_and_orientation_applied(self):
+        """Test EXIF is removed after applying the orientation tag."""
+        original, _, _, variants = process_profile_picture(
+            make_image(size=(800, 600), exif=True),
+            sizes=[64],
+            variant_format="webp",
+            quality=80,
+        )
+        with Image.open(io.BytesIO(original)) as image:
+            assert image.format == "JPEG"
+            assert not image.getexif()
+            # Orientation 6 rotates the landscape source into portrait.
+            assert image.size == (600, 800)
+        with Image.open(io.BytesIO(variants[64])) as image:
+            assert not image.getexif()
+
+    def test_sizes_larger_than_source_are_skipped(self):
+        """Test small pictures are not upscaled into larger variants."""
+        picture = process_profile_picture(
+            make_image(size=(300, 100)),
+            sizes=[64, 100, 256],
+            variant_format="webp",
+            quality=80,
+        )
+        assert set(picture.variants) == {64, 100}
+        assert (picture.extension, picture.content_type) == ("jpg", "image/jpeg")
+
+    def test_invalid_image(self):
+        """Test non-image data raises ValueError."""
+        with pytest.raises(ValueError):
+            process_profile_picture(
+                b"not an image", sizes=[64], variant_format="webp", quality=80
+            )
+
+    def test_unsupported_source_format(self):
+        """Test formats other than JPEG/PNG are rejected."""
+        buffer = io.BytesIO()
+        Image.new("RGB", (10, 10)).save(buffer, format="GIF")
+        with pytest.raises(ValueError):
+            process_profile_picture(
+                buffer.getvalue(), sizes=[64], variant_format="webp", quality=80
+            )
+
+    def test_parse_variant_sizes(self):
+        """Test sizes are deduplicated and sorted largest first."""
+        assert parse_variant_sizes("64, 512,256,64") == [512, 256, 64]
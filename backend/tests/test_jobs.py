@@ -0,0 +1,345 @@
+"""
+Tests for the background job queue, worker and job endpoints.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from functools import partial
+
+import pytest
+
+from app.cli import build_parser
+from app.core.config import settings
+from app.models.job import Job
+from app.services import job_queue
+from app.services.job_queue import (
+    PermanentJobError,
+    claim_job,
+    complete_job,
+    enqueue_job,
+    fail_job,
+    run_claimed_job,
+    run_worker,
+)
+from tests.conftest import TestingSessionLocal
+
+
+def _run_jobs(db, client=None) -> int:
+    """
+    Drain runnable jobs with a worker, then let ``db`` see its writes.
+
+    Pass ``client`` to run on the app's event loop, which owns the AI client.
+    One slot only: the test database is a single shared SQLite connection.
+    """
+    worker = partial(
+        run_worker, concurrency=1, burst=True, session_factory=TestingSessionLocal
+    )
+    processed = client.portal.call(worker) if client else asyncio.run(worker())
+    db.expire_all()
+    return processed
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    """Register test handlers; returns the list of calls made to them."""
+    calls = []
+
+    async def echo(payload, user_id):
+        calls.append(payload)
+        return {"echo": payload, "user_id": user_id}
+
+    async def flaky(payload, user_id):
+        calls.append(payload)
+        raise ConnectionError("upstream unavailable")
+
+    async def broken(payload, user_id):
+        calls.append(payload)
+        raise PermanentJobError("bad input")
+
+    async def slow(payload, user_id):
+        calls.append(payload)
+        await asyncio.sleep(5)
+        return {}
+
+    for kind, handler in (
+        ("echo", echo),
+        ("flaky", flaky),
+        ("broken", broken),
+        ("slow", slow),
+    ):
+        monkeypatch.setitem(job_queue._handlers, kind, handler)
+    monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF_SECONDS", 0)
+    return calls
+
+
+class TestQueue:
+    """Tests for enqueueing, claiming and finishing jobs."""
+
+    def test_unknown_kind_rejected(self, db, test_user):
+        """Test jobs without a handler cannot be enqueued."""
+        with pytest.raises(ValueError):
+            enqueue_job(db, user_id=test_user.id, kind="missing", payload={})
+
+    def test_claim_leases_job_once(self, db, test_user, handlers):
+        """Test a claimed job is not handed to a second worker."""
+        job = enqueue_job(db, user_id=test_user.id, kind="echo", payload={"n": 1})
+
+        claimed = claim_job(TestingSessionLocal(), "worker-a")
+        assert claimed.id == job.id
+        assert claimed.attempt == 1
+        assert claimed.payload == {"n": 1}
+        assert claim_job(TestingSessionLocal(), "worker-b") is None
+
+        db.refresh(job)
+        assert job.status == "running"
+        assert job.locked_by == "worker-a"
+        assert job.locked_until > datetime.utcnow()
+
+    def test_claim_in_order_and_by_kind(self, db, test_user, handlers):
+        """Test oldest jobs are claimed first and kinds can be filtered."""
+        first = enqueue_job(db, user_id=test_user.id, kind="echo", payload={})
+        other = enqueue_job(db, user_id=test_user.id, kind="flaky", payload={})
+        enqueue_job(db, user_id=test_user.id, kind="echo", payload={})
+
+        assert claim_job(TestingSessionLocal(), "w", ["flaky"]).id == other.id
+        assert claim_job(TestingSessionLocal(), "w").id == first.id
+
+    def test_expired_lease_is_reclaimed(self, db, test_user, handlers, monkeypatch):
+        """Test a job whose worker vanished is claimed again after the timeout."""
+        monkeypatch.setattr(settings, "JOB_VISIBILITY_TIMEOUT_SECONDS", 0)
+        job = enqueue_job(
+            db, user_id=test_user.id, kind="echo", payload={}, max_attempts=2
+        )
+
+        assert claim_job(TestingSessionLocal(), "dead-worker").attempt == 1
+        reclaimed = claim_job(TestingSessionLocal(), "live-worker")
+        assert reclaimed.id == job.id
+        assert reclaimed.attempt == 2
+
+        # The first worker's late result is discarded
+        assert not complete_job(TestingSessionLocal(), job.id, "dead-worker", {})
+        assert complete_job(TestingSessionLocal(), job.id, "live-worker", {"ok": 1})
+        db.refresh(job)
+        assert job.status == "succeeded"
+        assert job.result == {"ok": 1}
+
+    def test_expired_last_attempt_fails(self, db, test_user, handlers, monkeypatch):
+        """Test a lease expiring on the final attempt fails the job."""
+        monkeypatch.setattr(settings, "JOB_VISIBILITY_TIMEOUT_SECONDS", 0)
+        job = enqueue_job(
+            db, user_id=test_user.id, kind="echo", payload={}, max_attempts=1
+        )
+        claim_job(TestingSessionLocal(), "dead-worker")
+
+        assert claim_job(TestingSessionLocal(), "live-worker") is None
+        db.refresh(job)
+        assert job.status == "failed"
+        assert "visibility timeout" in job.error
+
+    def test_failed_attempt_backs_off(self, db, test_user, handlers, monkeypatch):
+        """Test a retryable failure re-queues the job after the backoff."""
+        monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF_SECONDS", 60)
+        job = enqueue_job(db, user_id=test_user.id, kind="flaky", payload={})
+        claim_job(TestingSessionLocal(), "w")
+
+        assert fail_job(TestingSessionLocal(), job.id, "w", "boom")
+        db.refresh(job)
+        assert job.status == "queued"
+        assert job.error == "boom"
+        assert (job.run_after - datetime.utcnow()).total_seconds() > 50
+        assert claim_job(TestingSessionLocal(), "w") is None
+
+    def test_retry_delay_doubles(self, monkeypatch):
+        """Test exponential backoff between attempts."""
+        monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF_SECONDS", 10)
+        assert [job_queue.retry_delay(n) for n in (1, 2, 3)] == [10, 20, 40]
+
+
+class TestWorker:
+    """Tests for running jobs with the worker loop."""
+
+    def test_runs_job_to_success(self, db, test_user, handlers):
+        """Test the worker stores the handler's result."""
+        job = enqueue_job(db, user_id=test_user.id, kind="echo", payload={"n": 2})
+
+        assert _run_jobs(db) == 1
+        db.refresh(job)
+        assert job.status == "succeeded"
+        assert job.result == {"echo": {"n": 2}, "user_id": test_user.id}
+        assert job.attempts == 1
+        assert job.finished_at is not None
+
+    def test_retries_until_max_attempts(self, db, test_user, handlers):
+        """Test transient failures are retried, then the job fails."""
+        job = enqueue_job(
+            db, user_id=test_user.id, kind="flaky", payload={}, max_attempts=3
+        )
+
+        assert _run_jobs(db) == 3
+        db.refresh(job)
+        assert job.status == "failed"
+        assert job.attempts == 3
+        assert job.error == "upstream unavailable"
+        assert len(handlers) == 3
+
+    def test_permanent_error_is_not_retried(self, db, test_user, handlers):
+        """Test PermanentJobError fails the job on the first attempt."""
+        job = enqueue_job(db, user_id=test_user.id, kind="broken", payload={})
+
+        assert _run_jobs(db) == 1
+        db.refresh(job)
+        assert job.status == "failed"
+        assert job.error == "bad input"
+        assert job.attempts == 1
+
+    def test_attempt_stops_at_visibility_timeout(
+        self, db, test_user, handlers, monkeypatch
+    ):
+        """Test a handler outliving its lease is cancelled and retried."""
+        monkeypatch.setattr(settings, "JOB_VISIBILITY_TIMEOUT_SECONDS", 0.05)
+        job = enqueue_job(
+            db, user_id=test_user.id, kind="slow", payload={}, max_attempts=2
+        )
+
+        assert _run_jobs(db) == 2
+        db.refresh(job)
+        assert job.status == "failed"
+        assert job.error == "TimeoutError"
+
+    def test_attempt_stops_before_lease_ends(
+        self, db, test_user, handlers, monkeypatch
+    ):
+        """Test the timeout counts from the claim, not from the handler start."""
+        monkeypatch.setattr(settings, "JOB_VISIBILITY_TIMEOUT_SECONDS", 1.0)
+        monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF_SECONDS", 0)
+        job = enqueue_job(db, user_id=test_user.id, kind="slow", payload={})
+        claimed = claim_job(TestingSessionLocal(), "w")
+        # The worker picked the job up with 0.4s of its lease left
+        claimed = claimed._replace(
+            locked_until=datetime.utcnow() + timedelta(seconds=0.4)
+        )
+
+        started = time.monotonic()
+        assert not asyncio.run(run_claimed_job(claimed, "w", TestingSessionLocal))
+        assert time.monotonic() - started < 0.9
+        db.refresh(job)
+        assert job.error == "TimeoutError"
+
+        # A lease that ran out while waiting for a slot is not started at all
+        claimed = claim_job(TestingSessionLocal(), "w")
+        expired = claimed._replace(locked_until=datetime.utcnow())
+        assert not asyncio.run(run_claimed_job(expired, "w", TestingSessionLocal))
+        assert len(handlers) == 1
+        db.refresh(job)
+        assert job.error == "Lease expired before the job started"
+
+    def test_cli_parses_worker_options(self):
+        """Test the run-jobs command line."""
+        args = build_parser().parse_args(
+            ["run-jobs", "--burst", "--kind", "score_cv", "--kind", "translate_cv"]
+        )
+        assert args.burst is True
+        assert args.kind == ["score_cv", "translate_cv"]
+
+
+class TestJobEndpoints:
+    """Tests for the endpoints that start jobs and report their status."""
+
+    def test_score_cv_job(self, client, auth_headers, db, test_cv):
+        """Test a queued fast score returns the synchronous response body."""
+        response = client.post(
+            "/api/v1/ai/score-cv/jobs",
+            json={"cv_id": test_cv.id, "mode": "fast"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "queued"
+        assert job["kind"] == "score_cv"
+        assert job["result"] is None
+
+        assert _run_jobs(db) == 1
+        response = client.get(f"/api/v1/jobs/{job['id']}", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "succeeded"
+        assert data["result"]["mode"] == "fast"
+        expected = client.post(
+            "/api/v1/ai/score-cv",
+            json={"cv_id": test_cv.id, "mode": "fast"},
+            headers=auth_headers,
+        ).json()
+        assert data["result"] == expected
+
+    def test_score_cv_job_deep(self, groq_server, client, auth_headers, db, test_cv):
+        """Test a queued LLM score is run by the worker."""
+        job_id = client.post(
+            "/api/v1/ai/score-cv/jobs",
+            json={"cv_id": test_cv.id},
+            headers=auth_headers,
+        ).json()["id"]
+
+        assert _run_jobs(db, client) == 1
+        data = client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers).json()
+        assert data["status"] == "succeeded"
+        assert data["result"]["raw"] == "Optimized text"
+
+    def test_score_cv_job_requires_owned_cv(
+        self, client, auth_headers_user2, db, test_cv
+    ):
+        """Test jobs cannot be started for another user's CV."""
+        response = client.post(
+            "/api/v1/ai/score-cv/jobs",
+            json={"cv_id": test_cv.id, "mode": "fast"},
+            headers=auth_headers_user2,
+        )
+        assert response.status_code == 404
+        assert db.query(Job).count() == 0
+
+    def test_job_is_private(self, client, auth_headers, auth_headers_user2, test_cv):
+        """Test users only see their own jobs."""
+        job_id = client.post(
+            "/api/v1/ai/score-cv/jobs",
+            json={"cv_id": test_cv.id, "mode": "fast"},
+            headers=auth_headers,
+        ).json()["id"]
+
+        response = client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers_user2)
+        assert response.status_code == 404
+        response = client.get("/api/v1/jobs/9999", headers=auth_headers)
+        assert response.status_code == 404
+
+    def test_translate_job_unsupported_direction_fails(self, client, auth_headers, db):
+        """Test a translation that cannot succeed fails without retries."""
+        response = client.post(
+            "/api/v1/translation/translate-cv/jobs",
+            json={
+                "input_language": "en",
+                "output_language": "xx",
+                "cv": {"title": "Engineer"},
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 202
+
+        assert _run_jobs(db) == 1
+        data = client.get(
+            f"/api/v1/jobs/{response.json()['id']}", headers=auth_headers
+        ).json()
+        assert data["status"] == "failed"
+        assert data["attempts"] == 1
+        assert "Unsupported translation direction" in data["error"]
+
+    def test_translate_job_rejects_foreign_cv(self, client, auth_headers, test_user2):
+        """Test the ownership check runs before the job is queued."""
+        response = client.post(
+            "/api/v1/translation/translate-cv/jobs",
+            json={
+                "input_language": "en",
+                "output_language": "es",
+                "cv": {"user_id": test_user2.id, "title": "Engineer"},
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 403
@@ -0,0 +1,212 @@
+"""
+Tests for the local mock servers used by tests and load tests.
+"""
+
+import json
+import random
+
+import httpx
+import pytest
+
+from app.core.config import Settings, _env_files, settings
+from app.services import translation_service
+from mock_servers import Failures, GroqEmulator, Latency, TranslateEmulator
+from mock_servers.__main__ import build_parser, create_servers
+from mock_servers.groq import canned_reply
+
+
+class TestFaults:
+    """Tests for latency distributions and error injection."""
+
+    def test_constant_latency(self):
+        """Test a median alone gives a fixed delay."""
+        assert Latency(0.2).sample() == 0.2
+        assert Latency.parse("0.2").sample() == 0.2
+
+    def test_lognormal_latency(self):
+        """Test samples centre on the median with a tail near p99."""
+        latency = Latency.parse("0.1:1.0", random.Random(7))
+        samples = sorted(latency.sample() for _ in range(5000))
+        assert 0.09 < samples[2500] < 0.11
+        assert 0.8 < samples[4950] < 1.25
+
+    def test_invalid_latency(self):
+        """Test a p99 below the median is rejected."""
+        with pytest.raises(ValueError):
+            Latency(1.0, 0.5)
+
+    def test_failure_rate(self):
+        """Test roughly the configured share of calls fail."""
+        failures = Failures(0.2, rng=random.Random(3))
+        hits = sum(failures.hit() for _ in range(5000))
+        assert 900 < hits < 1100
+        assert not any(Failures(0).hit() for _ in range(100))
+
+
+@pytest.fixture
+def translate_mock():
+    emulator = TranslateEmulator().start()
+    try:
+        yield emulator
+    finally:
+        emulator.stop()
+
+
+class TestTranslateMock:
+    """Tests for the Google Translate v2 mock."""
+
+    def test_translates_batch(self, translate_mock):
+        """Test each segment comes back tagged with the target language."""
+        response = httpx.post(
+            translate_mock.api_url,
+            params={"key": "k"},
+            json={"q": ["Engineer", "Team lead"], "source": "en", "target": "es"},
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "data": {
+                "translations": [
+                    {"translatedText": "[es] Engineer"},
+                    {"translatedText": "[es] Team lead"},
+                ]
+            }
+        }
+        assert translate_mock.stats["segments"] == 2
+        assert translate_mock.stats["characters"] == len("EngineerTeam lead")
+
+    def test_rejects_like_google(self, translate_mock):
+        """Test missing keys and oversized batches are refused."""
+        response = httpx.post(translate_mock.api_url, json={"q": "a", "target": "es"})
+        assert response.status_code == 403
+        response = httpx.post(
+            translate_mock.api_url,
+            params={"key": "k"},
+            json={"q": ["a"] * 129, "target": "es"},
+        )
+        assert response.status_code == 400
+
+    def test_injected_errors(self):
+        """Test a failure rate of one fails every request."""
+        emulator = TranslateEmulator(failures=Failures(1.0)).start()
+        try:
+            response = httpx.post(
+                emulator.api_url, params={"key": "k"}, json={"q": "a", "target": "es"}
+            )
+        finally:
+            emulator.stop()
+        assert response.status_code == 503
+        assert response.json()["error"]["errors"][0]["reason"] == "backendError"
+
+    def test_translate_cv_through_mock(self, translate_server, client, auth_headers):
+        """Test the translation endpoint works end to end against the mock."""
+        response = client.post(
+            "/api/v1/translation/translate-cv",
+            headers=auth_headers,
+            json={
+                "input_language": "en",
+                "output_language": "de",
+                "cv": {"title": "Engineer", "skills": [{"name": "Python"}]},
+            },
+        )
+        assert response.status_code == 200
+        translation = response.json()["translation"]
+        assert translation["title"] == "[de] Engineer"
+        assert translation["skills"][0]["name"] == "[de] Python"
+        assert translate_server.stats["requests"] == 1
+
+    def test_translations_share_pooled_client(
+        self, translate_server, client, auth_headers
+    ):
+        """Test consecutive translations reuse one keep-alive client."""
+        body = {"input_language": "en", "output_language": "fr", "cv": {}}
+        for title in ("Engineer", "Manager"):
+            body["cv"] = {"title": title}
+            response = client.post(
+                "/api/v1/translation/translate-cv", headers=auth_headers, json=body
+            )
+            assert response.status_code == 200
+        service = translation_service.get_translation_service()
+        assert service.external_client.http_client is service.http_client
+        assert service.http_client is translation_service._http_client
+        assert translate_server.stats["requests"] == 2
+
+    def test_timeout_maps_to_503(self, monkeypatch, client, auth_headers):
+        """Test a mock slower than the timeout is reported as unavailable."""
+        emulator = TranslateEmulator(delay=1.0).start()
+        monkeypatch.setattr(settings, "EXTERNAL_TRANSLATION_API_URL", emulator.api_url)
+        monkeypatch.setattr(settings, "EXTERNAL_TRANSLATION_API_KEY", "test-key")
+        monkeypatch.setattr(translation_service, "_translation_service", None)
+        google = translation_service.get_translation_service().external_client
+        monkeypatch.setattr(google.dependency, "timeout", 0.1)
+        monkeypatch.setattr(google.dependency, "max_retries", 0)
+        try:
+            response = client.post(
+                "/api/v1/translation/translate-cv",
+                headers=auth_headers,
+                json={
+                    "input_language": "en",
+                    "output_language": "it",
+                    "cv": {"title": "Engineer"},
+                },
+            )
+        finally:
+            emulator.stop()
+        assert response.status_code == 503
+
+
+class TestGroqMock:
+    """Tests for the Groq mock's load-testing options."""
+
+    def test_canned_reply(self):
+        """Test score prompts get parsable scores and others get prose."""
+        scores = json.loads(
+            canned_reply('Rate "clarity_readability" and "professionalism"')
+        )
+        assert set(scores) == {"clarity_readability", "professionalism"}
+        assert scores["professionalism"]["score"] == 7
+        assert "engineer" in canned_reply("Improve this description")
+
+    def test_estimated_usage_and_errors(self):
+        """Test usage follows the text and injected errors are counted."""
+        emulator = GroqEmulator(reply="one two three", estimate_usage=True).start()
+        url = f"{emulator.base_url}/openai/v1/chat/completions"
+        body = {"model": "m", "messages": [{"role": "user", "content": "x" * 40}]}
+        try:
+            usage = httpx.post(url, json=body).json()["usage"]
+        finally:
+            emulator.stop()
+        assert usage["prompt_tokens"] == 10
+        assert usage["completion_tokens"] == 3
+
+        emulator = GroqEmulator(failures=Failures(1.0, status=429)).start()
+        try:
+            response = httpx.post(
+                f"{emulator.base_url}/openai/v1/chat/completions", json=body
+            )
+        finally:
+            emulator.stop()
+        assert response.status_code == 429
+        assert emulator.stats["errors"] == 1
+
+
+class TestProfile:
+    """Tests for running the mocks and the mock settings profile."""
+
+    def test_cli_builds_servers(self):
+        """Test the command line configures all three mocks."""
+        args = build_parser().parse_args(
+            ["--groq-port", "9101", "--groq-error-rate", "0.05", "--seed", "1"]
+        )
+        groq, translate, blob = create_servers(args)
+        assert groq.base_url == "http://127.0.0.1:9101"
+        assert translate.api_url.endswith(":8102/language/translate/v2")
+        assert "BlobEndpoint=http://127.0.0.1:8103/" in blob.connection_string
+
+    def test_settings_profile(self, monkeypatch):
+        """Test SETTINGS_PROFILE=mock layers .env.mock over .env."""
+        monkeypatch.setenv("SETTINGS_PROFILE", "mock")
+        monkeypatch.delenv("GROQ_BASE_URL", raising=False)
+        profiled = Settings(_env_file=_env_files())
+        assert profiled.GROQ_BASE_URL == "http://127.0.0.1:8101"
+        assert profiled.EXTERNAL_TRANSLATION_API_URL.startswith("http://127.0.0.1:8102")
+        assert "127.0.0.1:8103" in profiled.AZURE_STORAGE_CONNECTION_STRING
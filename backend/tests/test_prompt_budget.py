@@ -0,0 +1,140 @@
+"""
+Tests for prompt token budgeting of CV-wide prompts.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.services.ai_service import AIService
+from app.services.prompt_budget import (
+    BudgetItem,
+    by_recency,
+    estimate_tokens,
+    fit_to_budget,
+    truncate_words,
+)
+
+
+class TestFitToBudget:
+    """Tests for choosing entry renderings under a budget."""
+
+    def test_within_budget_is_unchanged(self):
+        """Test nothing is shortened when everything fits."""
+        items = [BudgetItem(("a" * 40, "a"), 0), BudgetItem(("b" * 40, ""), 1)]
+        assert fit_to_budget(items, 100) == ["a" * 40, "b" * 40]
+
+    def test_lowest_priority_is_shortened_first(self):
+        """Test the least important entry gives up detail before others."""
+        items = [
+            BudgetItem(("x" * 400, "x" * 40, ""), 0),
+            BudgetItem(("y" * 400, "y" * 40, ""), 1),
+        ]
+        assert fit_to_budget(items, 120) == ["x" * 400, "y" * 40]
+
+    def test_every_entry_is_trimmed_before_any_is_dropped(self):
+        """Test the second level is applied everywhere before the third."""
+        items = [
+            BudgetItem(("x" * 400, "x" * 40, ""), 0),
+            BudgetItem(("y" * 400, "y" * 40, ""), 1),
+        ]
+        assert fit_to_budget(items, 25) == ["x" * 40, "y" * 40]
+        assert fit_to_budget(items, 10) == ["x" * 40, ""]
+
+    def test_deterministic(self):
+        """Test equal inputs always give equal prompts (cache friendly)."""
+        items = [BudgetItem((f"{i}" * 100, f"{i}", ""), i % 3) for i in range(10)]
+        assert fit_to_budget(items, 60) == fit_to_budget(list(items), 60)
+
+
+class TestHelpers:
+    """Tests for token estimation, truncation and ordering."""
+
+    def test_estimate_tokens(self):
+        """Test roughly four characters per token, rounded up."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcde") == 2
+
+    def test_truncate_words(self):
+        """Test long text is cut at a word boundary and marked."""
+        assert truncate_words("one two three", 5) == "one two three"
+        assert truncate_words("one two three", 2) == "one two …"
+        assert truncate_words(None, 2) == ""
+
+    def test_by_recency(self):
+        """Test latest start date first and undated entries last in order."""
+        entries = [
+            {"id": 1, "start_date": "2015-01-01"},
+            {"id": 2},
+            {"id": 3, "start_date": "2021-06-01"},
+            {"id": 4, "start_date": None},
+        ]
+        assert [e["id"] for e in by_recency(entries)] == [3, 1, 2, 4]
+
+
+def _long_cv(roles: int) -> dict:
+    return {
+        "general": {"title": "Engineer", "summary": "Builds things. " * 20},
+        "work_experiences": [
+            {
+                "position": f"Engineer {year}",
+                "company": f"Company {year}",
+                "description": f"Delivered project {year}. " * 60,
+                "start_date": f"{year}-01-01",
+                "has_dates": True,
+            }
+            for year in range(2000, 2000 + roles)
+        ],
+        "skills": [{"name": f"Skill {i}"} for i in range(40)],
+    }
+
+
+@pytest.fixture
+def ai_service(monkeypatch):
+    monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+    return AIService()
+
+
+class TestCompactedPrompts:
+    """Tests for budgeted score and summary prompts."""
+
+    def test_score_prompt_fits_budget(self, monkeypatch, ai_service):
+        """Test a long CV is compacted, dropping the oldest roles first."""
+        monkeypatch.setattr(settings, "AI_SCORE_PROMPT_TOKEN_BUDGET", 1500)
+        full = ai_service.build_score_request(_long_cv(2)).prompt
+        compact = ai_service.build_score_request(_long_cv(20)).prompt
+
+        assert estimate_tokens(compact) < estimate_tokens(full) + 1500
+        assert "Delivered project 2019. Delivered" in compact
+        assert "Delivered project 2000." not in compact
+        assert "Position: Engineer 2000" in compact
+        assert "Description: (omitted for length)" in compact
+
+        monkeypatch.setattr(settings, "AI_SCORE_PROMPT_TOKEN_BUDGET", 400)
+        tiny = ai_service.build_score_request(_long_cv(20)).prompt
+        assert "Position: Engineer 2000" not in tiny
+        assert "Position: Engineer 2019" in tiny
+        assert "older entries omitted for length" in tiny
+
+    def test_short_cv_is_unchanged(self, ai_service):
+        """Test CVs within budget keep every description in full."""
+        prompt = ai_service.build_score_request(_long_cv(2)).prompt
+        assert ("Delivered project 2000. " * 60).strip() in prompt
+        assert "omitted" not in prompt
+
+    def test_compacted_prompt_is_stable(self, monkeypatch, ai_service):
+        """Test the same long CV yields the same cache key every time."""
+        monkeypatch.setattr(settings, "AI_SCORE_PROMPT_TOKEN_BUDGET", 1500)
+        first = ai_service.build_score_request(_long_cv(20))
+        second = ai_service.build_score_request(_long_cv(20))
+        assert first.cache_key == second.cache_key
+
+    def test_summary_prompt_uses_budget_not_counts(self, monkeypatch, ai_service):
+        """Test all roles fit when small, and the oldest go first when not."""
+        prompt = ai_service.build_summary_request(_long_cv(5)).prompt
+        assert prompt.count(" at Company ") == 5
+        assert "Skill 39" in prompt
+
+        monkeypatch.setattr(settings, "AI_SUMMARY_PROMPT_TOKEN_BUDGET", 60)
+        prompt = ai_service.build_summary_request(_long_cv(5)).prompt
+        assert "Engineer 2004 at Company 2004" in prompt
+        assert "Engineer 2000 at Company 2000" not in prompt
@@ -0,0 +1,168 @@
+"""
+Tests for AI rate limiting and quotas.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limit import (
+    AIRateLimiter,
+    Bucket,
+    DatabaseRateLimitStore,
+    InMemoryRateLimitStore,
+    RateLimitExceeded,
+)
+from app.db.base import get_db
+from app.main import app
+from tests.conftest import TestingSessionLocal
+
+
+class TestInMemoryRateLimitStore:
+    """Tests for the token-bucket store."""
+
+    def test_refills_over_time(self):
+        """Test a drained bucket refills at its rate."""
+        store = InMemoryRateLimitStore()
+        bucket = Bucket("k", capacity=2, rate=1.0, cost=1)
+        assert store.acquire([bucket], now=0) == 0
+        assert store.acquire([bucket], now=0) == 0
+        assert store.acquire([bucket], now=0) == pytest.approx(1.0)
+        assert store.acquire([bucket], now=1.0) == 0
+
+    def test_all_or_nothing(self):
+        """Test a rejection charges none of the buckets."""
+        store = InMemoryRateLimitStore()
+        roomy = Bucket("roomy", capacity=10, rate=1.0, cost=1)
+        tight = Bucket("tight", capacity=1, rate=1.0, cost=2)
+        assert store.acquire([roomy, tight], now=0) > 0
+        assert store.level("roomy", 10, 1.0, now=0) == 10
+
+
+class TestDatabaseRateLimitStore:
+    """Tests for the store shared between workers."""
+
+    def test_levels_are_shared(self, db):
+        """Test a charge in one worker is seen by another."""
+        first = DatabaseRateLimitStore(TestingSessionLocal)
+        second = DatabaseRateLimitStore(TestingSessionLocal)
+        bucket = Bucket("k", capacity=2, rate=1.0, cost=1)
+        assert first.acquire([bucket], now=0) == 0
+        assert second.acquire([bucket], now=0) == 0
+        assert first.acquire([bucket], now=0) == pytest.approx(1.0)
+        assert second.level("k", 2, 1.0, now=0.5) == pytest.approx(0.5)
+        assert second.acquire([bucket], now=1.0) == 0
+
+    def test_all_or_nothing(self, db):
+        """Test a rejection charges none of the buckets."""
+        store = DatabaseRateLimitStore(TestingSessionLocal)
+        roomy = Bucket("roomy", capacity=10, rate=1.0, cost=1)
+        tight = Bucket("tight", capacity=1, rate=1.0, cost=2)
+        assert store.acquire([roomy, tight], now=0) > 0
+        assert store.level("roomy", 10, 1.0, now=0) == 10
+
+
+class TestAIRateLimiter:
+    """Tests for per-user and global AI budgets."""
+
+    def _limiter(self, clock, **limits):
+        defaults = {
+            "user_requests": 2,
+            "user_tokens": 0,
+            "global_requests": 0,
+            "global_tokens": 0,
+        }
+        defaults.update(limits)
+        return AIRateLimiter(InMemoryRateLimitStore(), clock=clock, **defaults)
+
+    def test_user_request_limit(self, clock):
+        """Test a user's requests are capped while others are unaffected."""
+        limiter = self._limiter(clock)
+        limiter.check(1, 100)
+        limiter.check(1, 100)
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            limiter.check(1, 100)
+        assert exc_info.value.retry_after == pytest.approx(30.0)
+        assert exc_info.value.retry_after_header == "30"
+        limiter.check(2, 100)
+
+    def test_token_limit(self, clock):
+        """Test estimated tokens are budgeted separately from requests."""
+        limiter = self._limiter(clock, user_requests=0, user_tokens=1000)
+        limiter.check(1, 600)
+        with pytest.raises(RateLimitExceeded):
+            limiter.check(1, 600)
+        clock.now += 12  # 1000 tokens/min refills 200 in 12s
+        limiter.check(1, 600)
+
+    def test_global_limit(self, clock):
+        """Test the global bucket is shared by all users."""
+        limiter = self._limiter(clock, user_requests=10, global_requests=2)
+        limiter.check(1, 0)
+        limiter.check(2, 0)
+        with pytest.raises(RateLimitExceeded):
+            limiter.check(3, 0)
+
+    def test_usage(self, clock):
+        """Test remaining allowance is reported per user."""
+        limiter = self._limiter(clock, user_requests=20, user_tokens=1000)
+        limiter.check(1, 400)
+        usage = limiter.usage(1)
+        assert usage["requests"] == {"limit": 20, "remaining": 19, "reset_seconds": 3}
+        assert usage["tokens"] == {"limit": 1000, "remaining": 600, "reset_seconds": 24}
+
+
+class TestAIRateLimitEndpoints:
+    """Tests for rate limiting on the /ai routes."""
+
+    def _optimize(self, client, auth_headers):
+        return client.post(
+            "/api/v1/ai/optimize-description",
+            headers=auth_headers,
+            json={"original_text": "Did backend work", "field_type": "project"},
+        )
+
+    def test_429_with_retry_after(self, monkeypatch, groq_server, client, auth_headers):
+        """Test requests over the per-user limit are rejected before the LLM."""
+        monkeypatch.setattr(settings, "AI_RATE_LIMIT_USER_REQUESTS_PER_MINUTE", 2)
+        assert self._optimize(client, auth_headers).status_code == 200
+        assert self._optimize(client, auth_headers).status_code == 200
+
+        db_sessions = 0
+        get_test_db = app.dependency_overrides[get_db]
+
+        def counting_get_db():
+            nonlocal db_sessions
+            db_sessions += 1
+            yield from get_test_db()
+
+        monkeypatch.setitem(app.dependency_overrides, get_db, counting_get_db)
+        response = self._optimize(client, auth_headers)
+
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) == 30
+        assert db_sessions == 0
+        # The second call was a cache hit; the third never reached the LLM
+        assert groq_server.stats["requests"] == 1
+
+    def test_quota(self, monkeypatch, groq_server, client, auth_headers):
+        """Test users can see their remaining allowance."""
+        monkeypatch.setattr(settings, "AI_RATE_LIMIT_USER_REQUESTS_PER_MINUTE", 5)
+        self._optimize(client, auth_headers)
+
+        response = client.get("/api/v1/ai/quota", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["enabled"] is True
+        assert data["requests"]["limit"] == 5
+        assert data["requests"]["remaining"] == 4
+        assert data["tokens"]["remaining"] < data["tokens"]["limit"]
+
+    def test_disabled(self, monkeypatch, groq_server, client, auth_headers):
+        """Test no limits apply when rate limiting is disabled."""
+        monkeypatch.setattr(settings, "AI_RATE_LIMIT_ENABLED", False)
+        monkeypatch.setattr(settings, "AI_RATE_LIMIT_USER_REQUESTS_PER_MINUTE", 1)
+        for _ in range(3):
+            assert self._optimize(client, auth_headers).status_code == 200
+        response = client.get("/api/v1/ai/quota", headers=auth_headers)
+        assert response.json()["enabled"] is False
@@ -0,0 +1,171 @@
+"""
+Tests for outbound call timeouts, retries and circuit breaking.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Dependency,
+    register_dependency,
+)
+
+
+def _dependency(clock, max_retries=2, threshold=3):
+    breaker = CircuitBreaker(
+        "fake",
+        failure_threshold=threshold,
+        recovery_seconds=10,
+        clock=clock,
+    )
+    return Dependency(
+        "fake",
+        timeout=0.2,
+        max_retries=max_retries,
+        transient=lambda exc: isinstance(exc, ConnectionResetError),
+        backoff_base=0,
+        backoff_max=0,
+        breaker=breaker,
+    )
+
+
+def _flaky(failures):
+    calls = {"count": 0}
+
+    def fn():
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise ConnectionResetError("reset")
+        return "ok"
+
+    return fn, calls
+
+
+class TestDependencyRetries:
+    """Tests for Dependency.call / Dependency.acall."""
+
+    def test_retries_transient_errors(self, clock):
+        """Test transient failures are retried until the call succeeds."""
+        fn, calls = _flaky(failures=2)
+        dependency = _dependency(clock, max_retries=2)
+
+        assert dependency.call(fn) == "ok"
+        assert calls["count"] == 3
+        assert dependency.breaker.state == CircuitBreaker.CLOSED
+
+    def test_gives_up_after_max_retries(self, clock):
+        """Test the last transient error is raised once retries run out."""
+        fn, calls = _flaky(failures=5)
+        dependency = _dependency(clock, max_retries=1, threshold=10)
+
+        with pytest.raises(ConnectionResetError):
+            dependency.call(fn)
+        assert calls["count"] == 2
+
+    def test_non_idempotent_calls_are_not_retried(self, clock):
+        """Test idempotent=False makes a single attempt."""
+        fn, calls = _flaky(failures=1)
+        dependency = _dependency(clock, max_retries=3)
+
+        with pytest.raises(ConnectionResetError):
+            dependency.call(fn, idempotent=False)
+        assert calls["count"] == 1
+
+    def test_non_transient_errors_pass_through(self, clock):
+        """Test other errors are raised at once and do not trip the breaker."""
+        dependency = _dependency(clock, max_retries=3, threshold=1)
+        calls = {"count": 0}
+
+        def fn():
+            calls["count"] += 1
+            raise KeyError("missing")
+
+        with pytest.raises(KeyError):
+            dependency.call(fn)
+        assert calls["count"] == 1
+        assert dependency.breaker.state == CircuitBreaker.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_acall_timeout_is_transient(self, clock):
+        """Test a slow coroutine times out, is retried and counts as a failure."""
+        dependency = _dependency(clock, max_retries=1, threshold=5)
+        calls = {"count": 0}
+
+        async def slow():
+            calls["count"] += 1
+            await asyncio.sleep(5)
+
+        with pytest.raises(TimeoutError):
+            await dependency.acall(slow)
+        assert calls["count"] == 2
+        assert dependency.breaker.snapshot()["consecutive_failures"] == 2
+
+
+class TestCircuitBreaker:
+    """Tests for the circuit breaker state machine."""
+
+    def test_opens_after_threshold_and_fails_fast(self, clock):
+        """Test the circuit opens and later calls never reach the dependency."""
+        fn, calls = _flaky(failures=100)
+        dependency = _dependency(clock, max_retries=0, threshold=3)
+
+        for _ in range(3):
+            with pytest.raises(ConnectionResetError):
+                dependency.call(fn)
+        with pytest.raises(CircuitOpenError) as exc_info:
+            dependency.call(fn)
+
+        assert calls["count"] == 3
+        assert isinstance(exc_info.value, ConnectionError)
+        assert dependency.breaker.snapshot()["state"] == CircuitBreaker.OPEN
+
+    def test_half_open_probe_closes_circuit(self, clock):
+        """Test one probe is allowed after recovery and success closes it."""
+        breaker = CircuitBreaker(
+            "fake", failure_threshold=1, recovery_seconds=10, clock=clock
+        )
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        clock.now = 11
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens_circuit(self, clock):
+        """Test a failing half-open probe opens the circuit again."""
+        breaker = CircuitBreaker(
+            "fake", failure_threshold=3, recovery_seconds=10, clock=clock
+        )
+        for _ in range(3):
+            breaker.record_failure()
+
+        clock.now = 11
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.snapshot()["retry_after_seconds"] == 10
+
+
+class TestHealthDependencies:
+    """Tests for breaker state on /health."""
+
+    def test_health_reports_open_circuit(self, client):
+        """Test an open circuit is listed and marks the service degraded."""
+        dependency = register_dependency("health_probe", timeout=1, max_retries=0)
+        for _ in range(dependency.breaker.failure_threshold):
+            dependency.breaker.record_failure()
+
+        response = client.get("/api/v1/health")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "degraded"
+        assert data["dependencies"]["health_probe"]["state"] == "open"
@@ -0,0 +1,94 @@
+"""
+Tests for splitting, parsing and combining per-section CV scores.
+"""
+
+from app.services.section_scoring import (
+    CLARITY,
+    IMPACT,
+    PROFESSIONALISM,
+    SectionScore,
+    combine_section_scores,
+    cv_sections,
+    parse_section_metrics,
+    score_locally,
+)
+from tests.test_cv_scoring import make_cv
+
+
+class TestCVSections:
+    """Tests for splitting a CV into sections."""
+
+    def test_sections_in_cv_order(self):
+        """Test general first, then experiences, projects and education."""
+        cv = make_cv(
+            experiences=["Led the team", "Built the API"],
+            projects=["Wrote a compiler"],
+            educations=1,
+        )
+        kinds = [section.kind for section in cv_sections(cv)]
+        assert kinds == [
+            "general",
+            "work_experience",
+            "work_experience",
+            "project",
+            "education",
+        ]
+
+    def test_unchanged_sections_render_identically(self):
+        """Test editing one entry leaves the other sections' text untouched."""
+        before = cv_sections(make_cv(experiences=["Led the team", "Built the API"]))
+        after = cv_sections(make_cv(experiences=["Led the team", "Built the SDK"]))
+        changed = [a.key for a, b in zip(before, after) if a.text != b.text]
+        assert changed == [before[2].key]
+
+
+class TestParseSectionMetrics:
+    """Tests for reading LLM section replies."""
+
+    def test_json_inside_prose(self):
+        """Test the JSON object is found even with surrounding text."""
+        reply = (
+            'Here you go: {"clarity_readability": {"score": 12, "reason": "ok"}, '
+            '"professionalism": {"score": "7", "reason": "fine"}} Thanks!'
+        )
+        parsed = parse_section_metrics(reply, (CLARITY, PROFESSIONALISM))
+        assert parsed == {
+            CLARITY: {"score": 10, "reason": "ok"},
+            PROFESSIONALISM: {"score": 7, "reason": "fine"},
+        }
+
+    def test_missing_metric_is_rejected(self):
+        """Test replies lacking a requested metric are unusable."""
+        reply = '{"clarity_readability": {"score": 5, "reason": "ok"}}'
+        assert parse_section_metrics(reply, (CLARITY, PROFESSIONALISM)) is None
+        assert parse_section_metrics("Optimized text", (CLARITY,)) is None
+
+
+class TestCombineSectionScores:
+    """Tests for combining section scores into overall metrics."""
+
+    def test_weighted_by_text_length(self):
+        """Test a detailed section outweighs a one-liner."""
+        short, detailed = cv_sections(
+            make_cv(experiences=["Led it", " ".join(["Shipped features"] * 40)])
+        )[1:3]
+
+        def metric(score):
+            return {"score": score, "reason": f"scored {score}"}
+
+        combined = combine_section_scores(
+            [
+                SectionScore(short, {IMPACT: metric(2)}, scorer="llm"),
+                SectionScore(detailed, {IMPACT: metric(8)}, scorer="llm"),
+            ]
+        )
+        assert combined[IMPACT]["score"] == 7
+        assert combined[IMPACT]["reason"].endswith("scored 2")
+        # No section reported clarity
+        assert combined[CLARITY]["score"] == 1
+        assert combined["summary_insight"]
+
+    def test_local_scores_cover_section_metrics(self):
+        """Test the local engine scores exactly the metrics of the section."""
+        for section in cv_sections(make_cv(experiences=["Led the team"])):
+            assert set(score_locally(section).metrics) == set(section.metrics)
@@ -0,0 +1,133 @@
+"""
+Tests for the expired share link reaper.
+"""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+from app.models.share_link import ShareLink
+from app.services.share_link_reaper import reap_expired_share_links
+from app.services.storage_service import (
+    PDF_CONTAINER,
+    BlobNotFoundError,
+    LocalStorageBackend,
+)
+from tests.conftest import TestingSessionLocal
+
+
+@pytest_asyncio.fixture
+async def storage(tmp_path):
+    backend = LocalStorageBackend(root=tmp_path)
+    await backend.initialize()
+    yield backend
+    await backend.close()
+
+
+async def _add_link(db, storage, cv, *, expires_in, size=10, blob=True):
+    blob_name = None
+    if blob:
+        blob_name = await storage.upload_cv_pdf(
+            user_id=cv.user_id, cv_id=cv.id, data=b"x" * size, filename="cv.pdf"
+        )
+    link = ShareLink(
+        cv_id=cv.id,
+        user_id=cv.user_id,
+        public_id=uuid4().hex,
+        blob_name=blob_name,
+        url="https://example.com/share",
+        expires_at=datetime.utcnow() + expires_in,
+    )
+    db.add(link)
+    db.commit()
+    return link.id, blob_name
+
+
+@pytest.mark.asyncio
+class TestShareLinkReaper:
+    """Tests for reap_expired_share_links."""
+
+    async def test_deletes_expired_rows_and_blobs(self, db, storage, test_cv):
+        """Test expired links and their PDFs are removed, live ones are kept."""
+        expired = [
+            await _add_link(db, storage, test_cv, expires_in=timedelta(hours=-1))
+            for _ in range(3)
+        ]
+        live_id, live_blob = await _add_link(
+            db, storage, test_cv, expires_in=timedelta(hours=1)
+        )
+
+        result = await reap_expired_share_links(
+            storage=storage, session_factory=TestingSessionLocal
+        )
+
+        assert result.rows_deleted == 3
+        assert result.blobs_deleted == 3
+        assert result.bytes_reclaimed == 30
+        remaining = [row.id for row in db.query(ShareLink.id).all()]
+        assert remaining == [live_id]
+        for _, blob_name in expired:
+            with pytest.raises(BlobNotFoundError):
+                await storage.download(PDF_CONTAINER, blob_name)
+        assert await storage.download(PDF_CONTAINER, live_blob) == b"x" * 10
+
+    async def test_respects_batch_limits(self, db, storage, test_cv):
+        """Test a run stops after max_batches batches of batch_size rows."""
+        for _ in range(5):
+            await _add_link(db, storage, test_cv, expires_in=timedelta(hours=-1))
+
+        result = await reap_expired_share_links(
+            storage=storage,
+            session_factory=TestingSessionLocal,
+            batch_size=2,
+            max_batches=2,
+        )
+
+        assert result.batches == 2
+        assert result.rows_deleted == 4
+        assert db.query(ShareLink).count() == 1
+
+    async def test_rows_without_blob_and_missing_blobs(self, db, storage, test_cv):
+        """Test legacy rows and already-deleted blobs are still cleaned up."""
+        await _add_link(
+            db, storage, test_cv, expires_in=timedelta(hours=-1), blob=False
+        )
+        _, blob_name = await _add_link(
+            db, storage, test_cv, expires_in=timedelta(hours=-1)
+        )
+        await storage.delete(PDF_CONTAINER, blob_name)
+
+        result = await reap_expired_share_links(
+            storage=storage, session_factory=TestingSessionLocal
+        )
+
+        assert result.rows_deleted == 2
+        assert result.bytes_reclaimed == 0
+        assert db.query(ShareLink).count() == 0
+
+    async def test_failed_blob_delete_keeps_row(
+        self, db, storage, test_cv, monkeypatch
+    ):
+        """Test a row is kept for the next run when its blob cannot be deleted."""
+        failing_id, failing_blob = await _add_link(
+            db, storage, test_cv, expires_in=timedelta(hours=-2)
+        )
+        await _add_link(db, storage, test_cv, expires_in=timedelta(hours=-1))
+        original_delete = storage.delete
+
+        async def flaky_delete(container, blob_name):
+            if blob_name == failing_blob:
+                raise OSError("storage unavailable")
+            return await original_delete(container, blob_name)
+
+        monkeypatch.setattr(storage, "delete", flaky_delete)
+
+        result = await reap_expired_share_links(
+            storage=storage, session_factory=TestingSessionLocal, batch_size=1
+        )
+
+        assert result.rows_deleted == 1
+        assert result.failed_ids == {failing_id}
+        assert [row.id for row in db.query(ShareLink.id).all()] == [failing_id]
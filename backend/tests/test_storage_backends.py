@@ -0,0 +1,187 @@
+"""
+Contract tests shared by every storage backend, plus the local download endpoint.
+"""
+
+import pytest
+import pytest_asyncio
+
+from app.core.config import settings
+from app.services.blob_service import AsyncAzureBlobService
+from app.services.storage_service import (
+    PDF_CONTAINER,
+    PFP_CONTAINER,
+    BlobNotFoundError,
+    LocalStorageBackend,
+)
+from mock_servers import BlobEmulator
+
+
+@pytest_asyncio.fixture(params=["azure", "local"])
+async def storage_backend(request, monkeypatch, tmp_path):
+    """Yield an initialized backend of each kind."""
+    emulator = None
+    if request.param == "azure":
+        emulator = BlobEmulator().start()
+        monkeypatch.setattr(
+            settings, "AZURE_STORAGE_CONNECTION_STRING", emulator.connection_string
+        )
+        monkeypatch.setattr(settings, "AZURE_STORAGE_PDF_CONTAINER_NAME", "pdfs")
+        monkeypatch.setattr(settings, "AZURE_STORAGE_PFP_CONTAINER_NAME", "pfp")
+        backend = AsyncAzureBlobService()
+    else:
+        backend = LocalStorageBackend(root=tmp_path)
+
+    await backend.initialize()
+    try:
+        yield backend
+    finally:
+        await backend.close()
+        if emulator:
+            emulator.stop()
+
+
+class TestStorageBackendContract:
+    """Behaviour every StorageBackend implementation must provide."""
+
+    @pytest.mark.asyncio
+    async def test_upload_and_download_roundtrip(self, storage_backend):
+        """Test uploaded bytes can be read back unchanged."""
+        data = b"%PDF-1.4 " + bytes(range(256)) * 10
+        await storage_backend.upload(
+            PDF_CONTAINER, "cvs/user-1/a.pdf", data, content_type="application/pdf"
+        )
+        assert await storage_backend.download(PDF_CONTAINER, "cvs/user-1/a.pdf") == data
+
+    @pytest.mark.asyncio
+    async def test_upload_overwrites(self, storage_backend):
+        """Test uploading to an existing name replaces the blob."""
+        await storage_backend.upload(
+            PFP_CONTAINER, "p/profile.png", b"old", content_type="image/png"
+        )
+        await storage_backend.upload(
+            PFP_CONTAINER, "p/profile.png", b"newer", content_type="image/png"
+        )
+        assert (
+            await storage_backend.download(PFP_CONTAINER, "p/profile.png") == b"newer"
+        )
+
+    @pytest.mark.asyncio
+    async def test_containers_are_isolated(self, storage_backend):
+        """Test the same blob name in different containers does not collide."""
+        await storage_backend.upload(
+            PDF_CONTAINER, "same", b"pdf", content_type="application/pdf"
+        )
+        with pytest.raises(BlobNotFoundError):
+            await storage_backend.download(PFP_CONTAINER, "same")
+
+    @pytest.mark.asyncio
+    async def test_download_missing_blob(self, storage_backend):
+        """Test downloading a missing blob raises BlobNotFoundError."""
+        with pytest.raises(BlobNotFoundError):
+            await storage_backend.download(PDF_CONTAINER, "missing.pdf")
+
+    @pytest.mark.asyncio
+    async def test_get_size(self, storage_backend):
+        """Test get_size reports bytes for existing blobs and None otherwise."""
+        await storage_backend.upload(
+            PDF_CONTAINER, "sized.pdf", b"12345", content_type="application/pdf"
+        )
+        assert await storage_backend.get_size(PDF_CONTAINER, "sized.pdf") == 5
+        assert await storage_backend.get_size(PDF_CONTAINER, "missing.pdf") is None
+
+    @pytest.mark.asyncio
+    async def test_delete_returns_freed_bytes(self, storage_backend):
+        """Test delete removes the blob and reports its size."""
+        await storage_backend.upload(
+            PDF_CONTAINER, "gone.pdf", b"1234567", content_type="application/pdf"
+        )
+        assert await storage_backend.delete(PDF_CONTAINER, "gone.pdf") == 7
+        assert await storage_backend.get_size(PDF_CONTAINER, "gone.pdf") is None
+        assert await storage_backend.delete(PDF_CONTAINER, "gone.pdf") == 0
+
+    @pytest.mark.asyncio
+    async def test_signed_url(self, storage_backend):
+        """Test signed URLs reference the blob and expire in the future."""
+        url, expires_at = storage_backend.generate_signed_url(
+            PDF_CONTAINER, "cvs/user-1/a.pdf", ttl_minutes=5
+        )
+        assert "cvs/user-1/a.pdf" in url
+        assert "?" in url
+        assert expires_at is not None
+
+    @pytest.mark.asyncio
+    async def test_upload_cv_pdf(self, storage_backend):
+        """Test the CV PDF helper stores the file under the owner's prefix."""
+        blob_name = await storage_backend.upload_cv_pdf(
+            user_id=3, cv_id=4, data=b"%PDF-1.4", filename="cv.pdf"
+        )
+        assert blob_name.startswith("cvs/user-3/cv-4-")
+        assert await storage_backend.download(PDF_CONTAINER, blob_name) == b"%PDF-1.4"
+
+    @pytest.mark.asyncio
+    async def test_upload_profile_picture_rejects_unknown_format(self, storage_backend):
+        """Test unsupported image types are rejected."""
+        with pytest.raises(ValueError):
+            await storage_backend.upload_profile_picture(
+                user_id=1,
+                data=b"GIF89a",
+                content_type="image/gif",
+                version="1",
+                filename="avatar.gif",
+            )
+
+
+class TestLocalStorageDownload:
+    """Tests for the signed local storage download endpoint."""
+
+    def _upload(self, client, auth_headers, test_cv, data: bytes) -> str:
+        response = client.post(
+            f"/api/v1/cvs/{test_cv.id}/share-link",
+            headers=auth_headers,
+            files={"file": ("cv.pdf", data, "application/pdf")},
+        )
+        assert response.status_code == 200
+        redirect = client.get(response.json()["url"], follow_redirects=False)
+        assert redirect.status_code == 302
+        return redirect.headers["location"]
+
+    def test_download_signed_url(self, local_storage, client, auth_headers, test_cv):
+        """Test a signed URL streams the stored file."""
+        data = b"%PDF-1.4 " + b"x" * 200_000
+        url = self._upload(client, auth_headers, test_cv, data)
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.content == data
+        assert response.headers["content-type"] == "application/pdf"
+        assert response.headers["accept-ranges"] == "bytes"
+
+    def test_download_range(self, local_storage, client, auth_headers, test_cv):
+        """Test Range requests return the requested slice."""
+        data = bytes(range(256)) * 4
+        url = self._upload(client, auth_headers, test_cv, data)
+
+        response = client.get(url, headers={"Range": "bytes=10-19"})
+        assert response.status_code == 206
+        assert response.content == data[10:20]
+        assert response.headers["content-range"] == f"bytes 10-19/{len(data)}"
+
+        response = client.get(url, headers={"Range": "bytes=-4"})
+        assert response.status_code == 206
+        assert response.content == data[-4:]
+
+        response = client.get(url, headers={"Range": f"bytes={len(data)}-"})
+        assert response.status_code == 416
+
+    def test_download_bad_signature(self, local_storage, client, auth_headers, test_cv):
+        """Test tampered signatures are rejected."""
+        url = self._upload(client, auth_headers, test_cv, b"%PDF-1.4")
+        response = client.get(url[:-4] + "0000")
+        assert response.status_code == 403
+
+    def test_download_expired(self, local_storage, client, auth_headers, test_cv):
+        """Test expired signed URLs are rejected."""
+        storage = LocalStorageBackend(root=local_storage)
+        url, _ = storage.generate_signed_url(PDF_CONTAINER, "x.pdf", ttl_minutes=1)
+        expired = url.replace("expires=", "expires=1")
+        response = client.get(expired)
+        assert response.status_code == 403
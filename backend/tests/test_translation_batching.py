@@ -0,0 +1,104 @@
+"""
+Tests for deduplicating and splitting Google Translate requests.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.services import translation_service
+from app.services.translation_service import _split_batches
+from mock_servers import TranslateEmulator
+
+
+@pytest.fixture
+def slow_translate_server(monkeypatch):
+    """Google Translate mock that holds every request briefly."""
+    emulator = TranslateEmulator(delay=0.05).start()
+    monkeypatch.setattr(settings, "EXTERNAL_TRANSLATION_API_URL", emulator.api_url)
+    monkeypatch.setattr(settings, "EXTERNAL_TRANSLATION_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "TRANSLATION_MEMORY_ENABLED", False)
+    monkeypatch.setattr(translation_service, "_translation_service", None)
+    try:
+        yield emulator
+    finally:
+        emulator.stop()
+
+
+def _translate(client, headers, cv):
+    response = client.post(
+        "/api/v1/translation/translate-cv",
+        headers=headers,
+        json={"input_language": "en", "output_language": "es", "cv": cv},
+    )
+    assert response.status_code == 200
+    return response.json()["translation"]
+
+
+class TestSplitBatches:
+    """Tests for grouping texts within per-request limits."""
+
+    def test_segment_limit(self):
+        """Test batches hold at most the segment limit, in order."""
+        texts = [str(i) for i in range(7)]
+        assert _split_batches(texts, 3, 1000) == [
+            ["0", "1", "2"],
+            ["3", "4", "5"],
+            ["6"],
+        ]
+
+    def test_character_limit(self):
+        """Test batches stay under the character limit; long texts go alone."""
+        texts = ["aaaa", "bbb", "cc", "d" * 20, "e"]
+        assert _split_batches(texts, 100, 8) == [
+            ["aaaa", "bbb"],
+            ["cc"],
+            ["d" * 20],
+            ["e"],
+        ]
+
+
+class TestTranslateLargeCV:
+    """Tests for CVs larger than one Google Translate request."""
+
+    def test_duplicates_are_sent_once(self, translate_server, client, auth_headers):
+        """Test a string repeated across entries is translated once."""
+        cv = {
+            "work_experiences": [
+                {"company": "Acme", "position": "Engineer"},
+                {"company": "Acme", "position": "Senior Engineer"},
+            ],
+            "skills": [{"name": "Python"}, {"name": "Python", "category": "Acme"}],
+        }
+        translation = _translate(client, auth_headers, cv)
+        assert [w["company"] for w in translation["work_experiences"]] == [
+            "[es] Acme",
+            "[es] Acme",
+        ]
+        assert translation["skills"][1]["name"] == "[es] Python"
+        assert translation["skills"][1]["category"] == "[es] Acme"
+        assert translate_server.stats["segments"] == 4
+
+    def test_split_into_concurrent_batches(
+        self, slow_translate_server, monkeypatch, client, auth_headers
+    ):
+        """Test a CV over the segment limit is split and sent in parallel."""
+        monkeypatch.setattr(settings, "TRANSLATION_BATCH_CONCURRENCY", 2)
+        skills = [{"name": f"Skill {i}"} for i in range(400)]
+        translation = _translate(client, auth_headers, {"skills": skills})
+        assert [s["name"] for s in translation["skills"]] == [
+            f"[es] Skill {i}" for i in range(400)
+        ]
+        stats = slow_translate_server.stats
+        assert stats["requests"] == 4
+        assert stats["segments"] == 400
+        assert stats["max_in_flight"] == 2
+
+    def test_character_limit_is_respected(self, translate_server, client, auth_headers):
+        """Test long descriptions are spread over requests the API accepts."""
+        experiences = [{"description": "x" * 9000 + str(i)} for i in range(5)]
+        translation = _translate(
+            client, auth_headers, {"work_experiences": experiences}
+        )
+        assert translation["work_experiences"][4]["description"].endswith("x4")
+        assert translate_server.stats["requests"] == 2
+        assert translate_server.stats["errors"] == 0
@@ -0,0 +1,154 @@
+"""
+Tests for the segment-level translation memory.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from app.models.translation_segment import TranslationSegment
+from app.schemas.translation import CVTranslation
+from app.services.translation_memory import TranslationMemory, segment_hash
+from app.services.translation_service import (
+    CustomTranslationClient,
+    get_translation_service,
+)
+from tests.conftest import TestingSessionLocal
+
+TRANSLATE_URL = "/api/v1/translation/translate-cv"
+
+
+def _translate(client, headers, cv, target="es"):
+    response = client.post(
+        TRANSLATE_URL,
+        headers=headers,
+        json={"input_language": "en", "output_language": target, "cv": cv},
+    )
+    assert response.status_code == 200
+    return response.json()["translation"]
+
+
+class TestTranslationMemory:
+    """Tests for the in-process and persistent tiers."""
+
+    @pytest.mark.asyncio
+    async def test_lookup_and_store(self):
+        """Test stored segments hit by normalized text and language pair."""
+        memory = TranslationMemory(max_entries=10)
+        await memory.store("en", "es", [("Team lead", "Jefe de equipo")])
+        found = await memory.lookup("en", "es", ["Team  lead ", "Python"])
+        assert found == ["Jefe de equipo", None]
+        assert await memory.lookup("en", "de", ["Team lead"]) == [None]
+        assert memory.stats()["requests"] == 2
+        assert memory.stats()["hits"] == 1
+        assert memory.stats()["hit_rate"] == pytest.approx(1 / 3, abs=1e-4)
+
+    @pytest.mark.asyncio
+    async def test_lru_is_bounded(self):
+        """Test the least recently used segment is evicted first."""
+        memory = TranslationMemory(max_entries=2)
+        await memory.store("en", "es", [("a", "A"), ("b", "B")])
+        await memory.lookup("en", "es", ["a"])
+        await memory.store("en", "es", [("c", "C")])
+        assert await memory.lookup("en", "es", ["a", "b", "c"]) == ["A", None, "C"]
+
+    @pytest.mark.asyncio
+    async def test_persistent_tier(self, db):
+        """Test segments survive a new process through the database."""
+        writer = TranslationMemory(10, session_factory=TestingSessionLocal)
+        await writer.store("en", "fr", [("Engineer", "Ingénieur")])
+        await writer.store("en", "fr", [("Engineer", "Ingénieur")])
+        rows = db.query(TranslationSegment).all()
+        assert len(rows) == 1
+        assert rows[0].text_hash == segment_hash("Engineer")
+
+        reader = TranslationMemory(10, session_factory=TestingSessionLocal)
+        assert await reader.lookup("en", "fr", ["Engineer"]) == ["Ingénieur"]
+        assert reader.stats()["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lookup_targets(self, db):
+        """Test several languages are read from both tiers in one call."""
+        writer = TranslationMemory(10, session_factory=TestingSessionLocal)
+        await writer.store("en", "fr", [("Engineer", "Ingénieur")])
+        await writer.store("en", "de", [("Python", "Python")])
+
+        reader = TranslationMemory(10, session_factory=TestingSessionLocal)
+        await reader.store("en", "de", [("Engineer", "Ingenieur")])
+        found = await reader.lookup_targets(
+            "en", ["de", "fr", "it"], ["Engineer", "Python"]
+        )
+        assert found == {
+            "de": ["Ingenieur", "Python"],
+            "fr": ["Ingénieur", None],
+            "it": [None, None],
+        }
+        assert reader.stats()["requests"] == 3
+        assert reader.stats()["hits"] == 3
+
+
+class TestTranslateWithMemory:
+    """Tests for the translation clients sending only cache misses."""
+
+    def test_retranslation_sends_only_changes(
+        self, translate_server, client, auth_headers, superuser_headers
+    ):
+        """Test unchanged fields are served from memory on a re-translation."""
+        cv = {"title": "Engineer", "skills": [{"name": "Python"}]}
+        _translate(client, auth_headers, cv)
+        assert translate_server.stats["segments"] == 2
+
+        cv["skills"].append({"name": "Go"})
+        translation = _translate(client, auth_headers, cv)
+        assert translation["title"] == "[es] Engineer"
+        assert [s["name"] for s in translation["skills"]] == ["[es] Python", "[es] Go"]
+        assert translate_server.stats["requests"] == 2
+        assert translate_server.stats["segments"] == 3
+
+        _translate(client, auth_headers, cv)
+        assert translate_server.stats["requests"] == 2
+        stats = get_translation_service().memory.stats()
+        assert stats["hits"] == 2 + 3
+        response = client.get("/api/v1/health/stats", headers=superuser_headers)
+        assert response.json()["translation_memory"] == stats
+
+    def test_segments_are_per_language_pair(
+        self, translate_server, client, auth_headers
+    ):
+        """Test a segment translated to one language is not reused for another."""
+        _translate(client, auth_headers, {"title": "Engineer"}, target="es")
+        translation = _translate(client, auth_headers, {"title": "Engineer"}, "de")
+        assert translation["title"] == "[de] Engineer"
+        assert translate_server.stats["requests"] == 2
+
+    @pytest.mark.asyncio
+    async def test_internal_client_sends_only_misses(self):
+        """Test the microservice receives the CV with known fields cleared."""
+        sent = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            cv = json.loads(request.content)["cv"]
+            sent.append(cv)
+            for skill in cv["skills"]:
+                if skill["name"]:
+                    skill["name"] = skill["name"].upper()
+            if cv["title"]:
+                cv["title"] = cv["title"].upper()
+            return httpx.Response(200, json={"translation": cv})
+
+        memory = TranslationMemory(10)
+        await memory.store("en", "es", [("Python", "Pitón")])
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            client = CustomTranslationClient("http://translator", http, memory)
+            cv = CVTranslation(
+                title="Engineer", email="a@b.co", skills=[{"name": "Python"}]
+            )
+            translated = await client.translate_cv(cv, "en", "es")
+            assert translated.title == "ENGINEER"
+            assert translated.skills[0].name == "Pitón"
+            assert translated.email == "a@b.co"
+            assert sent[0]["skills"][0]["name"] is None
+
+            await client.translate_cv(cv, "en", "es")
+        assert len(sent) == 1
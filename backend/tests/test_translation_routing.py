@@ -0,0 +1,287 @@
+"""
+Tests for routing translations between the in-house and external translators.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.resilience import CircuitBreaker, CircuitOpenError
+from app.schemas.translation import CVTranslation
+from app.services import translation_service
+from app.services.translation_routing import (
+    EXTERNAL,
+    INTERNAL,
+    Backend,
+    BackendStats,
+    TranslationRouter,
+)
+from app.services.translation_memory import create_translation_memory
+from app.services.translation_service import TranslationService
+
+
+def _router(**overrides) -> TranslationRouter:
+    options = {
+        "window_seconds": 60,
+        "min_samples": 3,
+        "max_error_rate": 0.5,
+        "max_p95_ms": 500,
+    }
+    return TranslationRouter(**{**options, **overrides})
+
+
+def _backend(
+    name, reply="ok", delay=0.0, error=None, calls=None, router=None
+) -> Backend:
+    """A backend whose upstream call is recorded on ``router`` if given."""
+    stats = router.backends[name] if router is not None else BackendStats(60)
+
+    async def call():
+        if calls is not None:
+            calls.append(name)
+        with stats.timing():
+            await asyncio.sleep(delay)
+            if error is not None:
+                raise error
+        return reply
+
+    return Backend(
+        name, call, CircuitBreaker(name, failure_threshold=3, recovery_seconds=30)
+    )
+
+
+class TestBackendStats:
+    """Tests for the rolling latency and error window."""
+
+    def test_percentiles_and_errors(self):
+        """Test p50/p95 come from successes and errors count in the rate."""
+        stats = BackendStats(window_seconds=60)
+        for latency in range(1, 101):
+            stats.record(latency, ok=True)
+        stats.record(5000, ok=False)
+        snapshot = stats.snapshot()
+        assert snapshot["samples"] == 101
+        assert snapshot["p50_ms"] == 50
+        assert snapshot["p95_ms"] == 95
+        assert snapshot["error_rate"] == pytest.approx(1 / 101, abs=1e-4)
+
+    def test_old_samples_expire(self, clock):
+        """Test samples older than the window are dropped."""
+        stats = BackendStats(window_seconds=60, clock=clock)
+        stats.record(100, ok=False)
+        clock.now = 61
+        stats.record(10, ok=True)
+        assert stats.snapshot() == {
+            "samples": 1,
+            "error_rate": 0.0,
+            "p50_ms": 10,
+            "p95_ms": 10,
+        }
+
+    @pytest.mark.asyncio
+    async def test_timing(self):
+        """Test failures, cancellations and open circuits are told apart."""
+        stats = BackendStats(window_seconds=60)
+        with pytest.raises(RuntimeError), stats.timing():
+            raise RuntimeError("500")
+        with pytest.raises(CircuitOpenError), stats.timing():
+            raise CircuitOpenError("translation", 30)
+
+        async def slow():
+            with stats.timing():
+                await asyncio.sleep(1)
+
+        task = asyncio.create_task(slow())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        snapshot = stats.snapshot()
+        assert snapshot["samples"] == 2
+        assert snapshot["error_rate"] == 0.5
+        assert snapshot["p50_ms"] >= 50
+
+
+class TestTranslationRouter:
+    """Tests for choosing, falling back and hedging between backends."""
+
+    @pytest.mark.asyncio
+    async def test_prefers_healthy_backend(self):
+        """Test the preferred backend serves while it is healthy."""
+        router = _router()
+        internal = _backend(INTERNAL, "in", router=router)
+        external = _backend(EXTERNAL, "ex", router=router)
+        assert await router.run(internal, external) == "in"
+        assert await router.run(None, external) == "ex"
+        assert router.decisions == {"routed_internal": 1, "routed_external": 1}
+        assert router.stats()["backends"][INTERNAL]["samples"] == 1
+        with pytest.raises(ValueError):
+            await router.run(None, None)
+
+    @pytest.mark.asyncio
+    async def test_falls_back_on_failure(self):
+        """Test a failed preferred call is retried on the fallback."""
+        router = _router()
+        internal = _backend(INTERNAL, error=ConnectionError("down"), router=router)
+        external = _backend(EXTERNAL, "ex", router=router)
+        assert await router.run(internal, external) == "ex"
+        assert router.decisions["fallbacks"] == 1
+        assert router.stats()["backends"][INTERNAL]["error_rate"] == 1.0
+
+        with pytest.raises(ValueError):
+            await router.run(_backend(INTERNAL, error=ValueError("bad")), external)
+
+    @pytest.mark.asyncio
+    async def test_reroutes_when_slow_or_failing(self):
+        """Test high p95, high error rate or an open circuit skip the backend."""
+        router = _router()
+        calls = []
+        internal = _backend(INTERNAL, "in", calls=calls)
+        external = _backend(EXTERNAL, "ex")
+        for _ in range(3):
+            router.backends[INTERNAL].record(900, ok=True)
+        assert await router.run(internal, external) == "ex"
+        assert calls == []
+
+        router = _router()
+        for ok in (True, False, False):
+            router.backends[INTERNAL].record(10, ok=ok)
+        assert await router.run(internal, external) == "ex"
+
+        router = _router()
+        for _ in range(3):
+            internal.breaker.record_failure()
+        assert await router.run(internal, external) == "ex"
+        assert router.decisions["rerouted"] == 1
+        # Without a fallback the preferred backend is still tried
+        assert await router.run(_backend(INTERNAL, "in"), None) == "in"
+
+    @pytest.mark.asyncio
+    async def test_hedges_after_p95(self):
+        """Test a slow call is hedged after its p95 and the faster reply wins."""
+        router = _router(hedge=True, hedge_min_delay_ms=10)
+        for _ in range(3):
+            router.backends[INTERNAL].record(20, ok=True)
+        internal = _backend(INTERNAL, "in", delay=0.3, router=router)
+        external = _backend(EXTERNAL, "ex", delay=0.01, router=router)
+        assert await router.run(internal, external) == "ex"
+        assert router.decisions["hedged"] == 1
+        assert router.decisions["hedge_wins"] == 1
+        # The cancelled loser counts with the time it had taken
+        internal_stats = router.stats()["backends"][INTERNAL]
+        assert internal_stats["samples"] == 4
+        assert internal_stats["error_rate"] == 0.0
+        assert internal_stats["p95_ms"] >= 20
+
+        fast = _backend(INTERNAL, "in", delay=0)
+        assert await router.run(fast, external) == "in"
+        assert router.decisions["hedged"] == 1
+
+
+@pytest.fixture
+def routed_service(monkeypatch):
+    """
+    TranslationService with an in-house service and Google mocked in-process.
+
+    The in-house service answers with upper-cased text; Google prefixes the
+    target language. Set ``state["internal_status"]`` to make it fail.
+    """
+    monkeypatch.setattr(settings, "TRANSLATION_SERVICE_URL", "http://internal")
+    monkeypatch.setattr(
+        settings, "EXTERNAL_TRANSLATION_API_URL", "http://google/translate"
+    )
+    monkeypatch.setattr(settings, "EXTERNAL_TRANSLATION_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "TRANSLATION_MEMORY_ENABLED", False)
+    state = {"internal_status": 200, "hosts": []}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        state["hosts"].append(request.url.host)
+        if request.url.host == "internal":
+            if state["internal_status"] != 200:
+                return httpx.Response(state["internal_status"])
+            cv = body["cv"]
+            cv["title"] = cv["title"].upper()
+            return httpx.Response(200, json={"translation": cv})
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "translations": [
+                        {"translatedText": f"[{body['target']}] {text}"}
+                        for text in body["q"]
+                    ]
+                }
+            },
+        )
+
+    service = TranslationService(
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    return service, state
+
+
+class TestServiceRouting:
+    """Tests for the routing policy inside TranslationService."""
+
+    @pytest.mark.asyncio
+    async def test_routes_by_direction(self, routed_service):
+        """Test en->es goes in-house and other directions to Google."""
+        service, state = routed_service
+        cv = CVTranslation(title="Engineer")
+        assert (await service.translate_cv(cv, "en", "es")).title == "ENGINEER"
+        assert (await service.translate_cv(cv, "en", "de")).title == "[de] Engineer"
+        assert state["hosts"] == ["internal", "google"]
+        assert service.router.decisions == {
+            "routed_internal": 1,
+            "routed_external": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_google(self, routed_service):
+        """Test a failing in-house service is covered by the external API."""
+        service, state = routed_service
+        state["internal_status"] = 500
+        cv = CVTranslation(title="Engineer")
+        translated = await service.translate_cv(cv, "en", "es")
+        assert translated.title == "[es] Engineer"
+        # The in-house service's own retries run before falling back
+        assert state["hosts"] == ["internal"] * 3 + ["google"]
+        assert service.router.decisions["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_memory_hits_are_not_samples(self, monkeypatch, routed_service):
+        """Test only upstream HTTP calls count towards a backend's latency."""
+        monkeypatch.setattr(settings, "TRANSLATION_MEMORY_ENABLED", True)
+        service, state = routed_service
+        service.memory = create_translation_memory()
+        service.external_client.memory = service.memory
+        cv = CVTranslation(title="Engineer")
+        for _ in range(3):
+            assert (await service.translate_cv(cv, "en", "de")).title == (
+                "[de] Engineer"
+            )
+        assert state["hosts"] == ["google"]
+        assert service.router.stats()["backends"][EXTERNAL]["samples"] == 1
+
+    def test_routing_metrics_on_health(
+        self, translate_server, client, superuser_headers
+    ):
+        """Test routing decisions are reported by /health/stats."""
+        client.post(
+            "/api/v1/translation/translate-cv",
+            headers=superuser_headers,
+            json={
+                "input_language": "en",
+                "output_language": "it",
+                "cv": {"title": "Engineer"},
+            },
+        )
+        response = client.get("/api/v1/health/stats", headers=superuser_headers)
+        routing = response.json()["translation_routing"]
+        assert routing["decisions"] == {"routed_external": 1}
+        assert routing["backends"]["external"]["samples"] == 1
+        assert translation_service.translation_routing_stats() == routing
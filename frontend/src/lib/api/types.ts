@@ -339,6 +339,9 @@ export interface GenerateSummaryResponse {
 
 export interface ScoreCVRequest {
 	cv_id: number;
+	// fast: local scoring; sections: LLM review of changed sections only;
+	// deep (default): LLM review of the whole CV
+	mode?: "fast" | "sections" | "deep";
 }
 
 export interface MetricScore {
@@ -346,13 +349,24 @@ export interface MetricScore {
 	reason: string; // short explanation
 }
 
+export interface SectionScore {
+	key: string; // general, work_experience:<id>, project:<id>, education
+	label: string;
+	scorer: "llm" | "local";
+	cached: boolean; // unchanged since the last review
+	metrics: Record<string, MetricScore>;
+}
+
 export interface ScoreCVResponse {
 	raw: string;
+	mode?: "fast" | "sections" | "deep";
 	impact_achievement_density?: MetricScore;
 	clarity_readability?: MetricScore;
 	action_verb_strength?: MetricScore;
 	professionalism?: MetricScore;
+	section_completeness?: MetricScore; // fast mode only
 	summary_insight?: string; // 2–3 sentence overview
+	sections?: SectionScore[]; // sections mode only
 }
 
 // Exports
@@ -162,6 +162,10 @@ function CVPreviewPlaceholder() {
 					value:
 						scoreMutation.data.professionalism || fromParsed?.professionalism,
 				},
+				{
+					label: "Section Completeness",
+					value: scoreMutation.data.section_completeness,
+				},
 			] as const
 		).filter((m) => m.value);
 	}, [parsedRawScores, scoreMutation.data]);
@@ -196,10 +200,16 @@ function CVPreviewPlaceholder() {
 		setSheetMode("ai");
 		setIsSheetOpen(true);
 		if (cv && !scoreMutation.data && !scoreMutation.isPending) {
-			scoreMutation.mutate({ cv_id: cv.id });
+			scoreMutation.mutate({ cv_id: cv.id, mode: "fast" });
 		}
 	};
 
+	const handleDeepReview = () => {
+		if (!cv || scoreMutation.isPending) return;
+		// Sections unchanged since the last review are served from cache
+		scoreMutation.mutate({ cv_id: cv.id, mode: "sections" });
+	};
+
 	const handleOpenTranslateSheet = () => {
 		translateMutation.reset();
 		setSheetMode("translate");
@@ -342,6 +352,17 @@ function CVPreviewPlaceholder() {
 							>
 								Close
 							</Button>
+							<Button
+								className="flex-1"
+								onClick={handleDeepReview}
+								disabled={
+									!cv ||
+									scoreMutation.isPending ||
+									scoreMutation.data?.mode === "sections"
+								}
+							>
+								{scoreMutation.isPending ? "Reviewing…" : "Deep review"}
+							</Button>
 						</div>
 					) : (
 						<div className="flex gap-2">